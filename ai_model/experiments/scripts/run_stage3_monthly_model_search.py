@@ -24,6 +24,11 @@ if str(SCRIPT_DIR) not in sys.path:
 
 import modeling_common as common
 
+if str(common.PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(common.PROJECT_ROOT))
+
+from ai_model.monthly_forecast import LockstepMonthlyForecaster
+
 
 PROJECT_ROOT = common.PROJECT_ROOT
 EXPERIMENTS_DIR = common.EXPERIMENTS_DIR
@@ -205,38 +210,15 @@ def model_specs() -> list[dict]:
     ]
 
 
-def make_feature_row(working_counts: list[float], trend: int, month: int) -> dict:
-    def lag(n: int) -> float:
-        return working_counts[-n] if len(working_counts) >= n else np.nan
-
-    return {
-        "trend": trend,
-        "month": month,
-        "month_sin": float(np.sin(2 * np.pi * month / 12)),
-        "month_cos": float(np.cos(2 * np.pi * month / 12)),
-        "lag_1": lag(1),
-        "lag_2": lag(2),
-        "lag_3": lag(3),
-        "lag_6": lag(6),
-        "lag_12": lag(12),
-        "rolling_mean_3": float(np.mean(working_counts[-3:])) if len(working_counts) >= 3 else np.nan,
-        "rolling_mean_6": float(np.mean(working_counts[-6:])) if len(working_counts) >= 6 else np.nan,
-        "rolling_std_6": float(np.std(working_counts[-6:], ddof=1)) if len(working_counts) >= 6 else np.nan,
-    }
-
-
 def recursive_forecast(model, history: pd.DataFrame, future: pd.DataFrame, features: list[str], fill_values: pd.Series) -> np.ndarray:
-    working_counts = history["actual_count"].astype(float).tolist()
-    preds = []
-    for _, row in future.iterrows():
-        month = int(row["event_month"].month)
-        feat_row = pd.DataFrame([make_feature_row(working_counts, len(working_counts), month)])
-        feat_row = feat_row[features].fillna(fill_values[features])
-        pred = float(model.predict(feat_row)[0])
-        pred = max(0.0, pred)
-        preds.append(pred)
-        working_counts.append(pred)
-    return np.asarray(preds)
+    # app/ai_server.py와 같은 엔진을 써서 백테스트와 서버 예측의 재귀 로직이 어긋나지 않게 한다.
+    forecaster = LockstepMonthlyForecaster(model, features)
+    future_months = future["event_month"].dt.month.astype(int).tolist()
+    return forecaster.forecast(
+        [history["actual_count"].astype(float).to_numpy()],
+        [future_months],
+        fill_values[features].to_numpy(dtype=float)[np.newaxis, :],
+    )[0]
 
 
 def fit_model(monthly_feat: pd.DataFrame, train_history: pd.DataFrame, model_key: str, params: dict, features: list[str]):
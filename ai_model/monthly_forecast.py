@@ -0,0 +1,123 @@
+"""
+monthly_forecast.py
+- 월별 수요 모델의 재귀(recursive) 예측 엔진 (app/ai_server.py, run_stage3_monthly_model_search.py 공용)
+- 학습/백테스트와 서버가 같은 재귀 로직을 쓰도록 app 패키지에 의존하지 않는 이 모듈 하나에만 둔다.
+- 한 달씩 1행짜리 DataFrame을 만들어 predict하는 대신, 범위(scope)별 최근 12개월 값을 numpy 버퍼에 두고
+  모든 범위를 같은 예측 단계(horizon step)에서 한 번의 predict로 함께 예측한다 (lockstep).
+- 특성 정의: trend, 달력, lag_1/2/3/6/12, rolling_mean_3/6, rolling_std_6
+  (이력이 부족한 lag/rolling 값은 NaN이며 fill_values로 채운다)
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+MONTHLY_BASE_FEATURES = [
+    "trend",
+    "month",
+    "month_sin",
+    "month_cos",
+    "lag_1",
+    "lag_2",
+    "lag_3",
+    "lag_6",
+    "lag_12",
+    "rolling_mean_3",
+    "rolling_mean_6",
+    "rolling_std_6",
+]
+
+# lag/rolling 특성 계산에 필요한 최대 과거 개월 수
+LOOKBACK = 12
+
+
+def init_lag_buffers(histories: Sequence[Sequence[float]]) -> np.ndarray:
+    """범위별 최근 LOOKBACK개월 값 버퍼 (이력이 짧으면 앞쪽을 NaN으로 채운다)"""
+    buffers = np.full((len(histories), LOOKBACK), np.nan)
+    for idx, history in enumerate(histories):
+        tail = np.asarray(history, dtype=np.float64)[-LOOKBACK:]
+        if len(tail):
+            buffers[idx, LOOKBACK - len(tail):] = tail
+    return buffers
+
+
+def base_feature_matrix(buffers: np.ndarray, lengths: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """
+    버퍼에서 MONTHLY_BASE_FEATURES 순서의 특성 행렬을 만든다.
+    버퍼 앞쪽 NaN이 평균/표준편차에 그대로 전파되므로 '이력이 부족하면 NaN' 규칙이 자연스럽게 지켜진다.
+    """
+    months = months.astype(np.float64)
+    with np.errstate(invalid="ignore"):
+        return np.column_stack([
+            lengths.astype(np.float64),
+            months,
+            np.sin(2 * np.pi * months / 12),
+            np.cos(2 * np.pi * months / 12),
+            buffers[:, -1],
+            buffers[:, -2],
+            buffers[:, -3],
+            buffers[:, -6],
+            buffers[:, -12],
+            buffers[:, -3:].mean(axis=1),
+            buffers[:, -6:].mean(axis=1),
+            buffers[:, -6:].std(axis=1, ddof=1),
+        ])
+
+
+class LockstepMonthlyForecaster:
+    """
+    여러 범위의 월별 수요를 예측 단계별로 함께 재귀 예측한다.
+    features는 모델 학습 시 특성 순서이며, MONTHLY_BASE_FEATURES에 없는 특성은 NaN(-> fill_values)으로 둔다.
+    """
+
+    def __init__(self, model, features: Sequence[str]):
+        self.model = model
+        self.features = list(features)
+        base_index = {name: idx for idx, name in enumerate(MONTHLY_BASE_FEATURES)}
+        self._columns = np.array([base_index.get(name, -1) for name in self.features])
+
+    def _select(self, base: np.ndarray) -> np.ndarray:
+        selected = base[:, np.clip(self._columns, 0, None)]
+        selected[:, self._columns < 0] = np.nan
+        return selected
+
+    def forecast(
+        self,
+        histories: Sequence[Sequence[float]],
+        future_months: Sequence[Sequence[int]],
+        fill_values: np.ndarray,
+    ) -> List[np.ndarray]:
+        """
+        histories[i]: i번째 범위의 과거 월별 건수 / future_months[i]: 예측할 달(1~12) 순서 /
+        fill_values[i]: features 순서의 결측 대체값. 범위별 예측 배열(음수는 0으로 절사)을 반환한다.
+        """
+        n_scopes = len(histories)
+        horizons = np.array([len(months) for months in future_months], dtype=np.int64)
+        results = [np.empty(horizon, dtype=np.float64) for horizon in horizons]
+        if n_scopes == 0 or not horizons.any():
+            return results
+
+        buffers = init_lag_buffers(histories)
+        lengths = np.array([len(history) for history in histories], dtype=np.int64)
+        fill_values = np.asarray(fill_values, dtype=np.float64).reshape(n_scopes, len(self.features))
+        month_table = np.zeros((n_scopes, horizons.max()), dtype=np.int64)
+        for idx, months in enumerate(future_months):
+            month_table[idx, :len(months)] = months
+
+        for step in range(horizons.max()):
+            active = np.flatnonzero(horizons > step)
+            base = base_feature_matrix(buffers[active], lengths[active], month_table[active, step])
+            feat = self._select(base)
+            feat = np.where(np.isnan(feat), fill_values[active], feat)
+            preds = np.maximum(0.0, self.model.predict(pd.DataFrame(feat, columns=self.features)).astype(np.float64))
+
+            for row, scope_idx in enumerate(active):
+                results[scope_idx][step] = preds[row]
+            # 버퍼를 한 칸 밀고 예측값을 다음 단계의 lag_1로 넣는다.
+            buffers[active, :-1] = buffers[active, 1:]
+            buffers[active, -1] = preds
+            lengths[active] += 1
+
+        return results
@@ -4,7 +4,10 @@ import argparse
 import csv
 import json
 import os
+import statistics
 import sys
+import time
+from collections import Counter
 from pathlib import Path
 from typing import Any
 
@@ -20,6 +23,7 @@ for path in (AI_RAG_DIR, PROJECT_ROOT):
 
 from app import config
 from ingestion.embedder import get_embedding_model
+from rag import chain as rag_chain
 from rag.chain import run_rag_chain
 from vectorstore.chroma_store import load_chroma_db
 
@@ -53,7 +57,12 @@ def _write_csv(path: Path, rows: list[dict[str, Any]]) -> None:
         "eval_id",
         "question",
         "category",
+        "front_end",
+        "latency_ms",
         "classification",
+        "classification_path",
+        "local_confidence",
+        "answer_cache_hit",
         "refined_query",
         "retrieved_count",
         "filtered_count",
@@ -74,7 +83,12 @@ def _write_csv(path: Path, rows: list[dict[str, Any]]) -> None:
                     "eval_id": row.get("eval_id"),
                     "question": row.get("question"),
                     "category": row.get("category"),
+                    "front_end": row.get("front_end"),
+                    "latency_ms": row.get("latency_ms"),
                     "classification": diagnostics.get("classification"),
+                    "classification_path": diagnostics.get("classification_path"),
+                    "local_confidence": diagnostics.get("local_confidence"),
+                    "answer_cache_hit": (diagnostics.get("answer_cache") or {}).get("hit"),
                     "refined_query": diagnostics.get("refined_query"),
                     "retrieved_count": diagnostics.get("retrieved_count"),
                     "filtered_count": diagnostics.get("filtered_count"),
@@ -89,6 +103,71 @@ def _write_csv(path: Path, rows: list[dict[str, Any]]) -> None:
             )
 
 
+def _latency_stats(latencies: list[float]) -> dict[str, Any]:
+    if not latencies:
+        return {"count": 0}
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 1),
+        "p50_ms": round(statistics.median(ordered), 1),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+    }
+
+
+def _summarize_latency(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    front-end 모드별 지연 시간과 분류 경로(structured | local | llm) 건수,
+    두 모드를 모두 실행한 경우 질문별로 줄어든 시간을 요약한다.
+    """
+    by_mode: dict[str, dict[str, dict[str, Any]]] = {}
+    for row in rows:
+        by_mode.setdefault(row["front_end"], {})[row["eval_id"]] = row
+
+    summary: dict[str, Any] = {
+        mode: {
+            **_latency_stats([row["latency_ms"] for row in mode_rows.values()]),
+            "classification_paths": dict(
+                Counter((row.get("diagnostics") or {}).get("classification_path") or "unknown" for row in mode_rows.values())
+            ),
+        }
+        for mode, mode_rows in by_mode.items()
+    }
+
+    separate, structured = by_mode.get("separate", {}), by_mode.get("structured", {})
+    paired = [eval_id for eval_id in separate if eval_id in structured]
+    if paired:
+        saved = [separate[eval_id]["latency_ms"] - structured[eval_id]["latency_ms"] for eval_id in paired]
+        separate_total = sum(separate[eval_id]["latency_ms"] for eval_id in paired)
+        # classification은 RAG 경로를 탄 결과의 diagnostics에만 있으므로 양쪽 모두 있는 질문만 비교한다.
+        classified = [
+            (
+                (separate[eval_id].get("diagnostics") or {}).get("classification"),
+                (structured[eval_id].get("diagnostics") or {}).get("classification"),
+            )
+            for eval_id in paired
+        ]
+        classified = [pair for pair in classified if all(pair)]
+        summary["comparison"] = {
+            "paired_questions": len(paired),
+            "latency_saved_mean_ms": round(statistics.fmean(saved), 1),
+            "latency_saved_p50_ms": round(statistics.median(saved), 1),
+            "latency_saved_pct": round(sum(saved) / separate_total * 100, 1) if separate_total else 0.0,
+            "classification_agreement": (
+                round(sum(left == right for left, right in classified) / len(classified), 3) if classified else None
+            ),
+            # 구조화 호출이 파싱에 실패해 기존 3회 호출로 진행한 비율
+            "structured_fallback_rate": round(
+                sum(
+                    (structured[eval_id].get("diagnostics") or {}).get("front_end") == "separate"
+                    for eval_id in paired
+                ) / len(paired),
+                3,
+            ),
+        }
+    return summary
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Run the production RAG chain and save per-question diagnostics."
@@ -109,7 +188,20 @@ def main() -> None:
         default=AI_RAG_DIR / "results" / "chain_diagnostics",
     )
     parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument(
+        "--front-end",
+        choices=["config", "separate", "structured", "compare"],
+        default="config",
+        help="RAG front end: config flag, three separate LLM calls, one structured call, or both per question.",
+    )
+    parser.add_argument(
+        "--answer-cache",
+        action="store_true",
+        help="Keep the semantic answer cache on. Off by default so every run measures the full chain.",
+    )
     args = parser.parse_args()
+    # compare 모드는 같은 질문을 두 번 실행하므로, 캐시를 켜 두면 두 번째 실행이 캐시 적중으로 측정된다.
+    rag_chain.USE_SEMANTIC_ANSWER_CACHE = args.answer_cache
 
     load_dotenv(PROJECT_ROOT / ".env")
     if not os.getenv("OPENAI_API_KEY"):
@@ -122,30 +214,54 @@ def main() -> None:
     vectordb = load_chroma_db(embeddings=embeddings, persist_dir=str(args.vector_db_path))
     llm = ChatOpenAI(model=config.LLM_MODEL_NAME, temperature=config.LLM_TEMPERATURE)
 
+    if args.front_end == "compare":
+        modes = ["separate", "structured"]
+    elif args.front_end == "config":
+        modes = ["structured" if config.USE_STRUCTURED_FRONT_END else "separate"]
+    else:
+        modes = [args.front_end]
+
     rows = []
     for index, sample in enumerate(samples, start=1):
         question = sample["question"]
         print(f"[{index}/{len(samples)}] {sample['eval_id']} {question[:60]}")
-        result = run_rag_chain(llm, vectordb, question)
-        rows.append(
-            {
-                "eval_id": sample["eval_id"],
-                "question": question,
-                "category": sample.get("category", ""),
-                "reference_answer": sample.get("answer", ""),
-                "answer": result.get("answer", ""),
-                "attribution": result.get("attribution", []),
-                "diagnostics": result.get("diagnostics", {}),
-            }
-        )
+        for mode in modes:
+            started = time.perf_counter()
+            result = run_rag_chain(llm, vectordb, question, structured_front_end=mode == "structured")
+            latency_ms = round((time.perf_counter() - started) * 1000, 1)
+            rows.append(
+                {
+                    "eval_id": sample["eval_id"],
+                    "question": question,
+                    "category": sample.get("category", ""),
+                    "front_end": mode,
+                    "latency_ms": latency_ms,
+                    "reference_answer": sample.get("answer", ""),
+                    "answer": result.get("answer", ""),
+                    "attribution": result.get("attribution", []),
+                    "diagnostics": result.get("diagnostics", {}),
+                }
+            )
 
     jsonl_path = args.output_dir / "chain_diagnostics.jsonl"
     csv_path = args.output_dir / "chain_diagnostics.csv"
+    latency_path = args.output_dir / "chain_latency_summary.json"
     _write_jsonl(jsonl_path, rows)
     _write_csv(csv_path, rows)
+    latency_summary = _summarize_latency(rows)
+    if config.USE_STAGE_RESULT_CACHE:
+        latency_summary["stage_cache"] = rag_chain.get_stage_cache().stats()
+    latency_path.write_text(json.dumps(latency_summary, ensure_ascii=False, indent=2), encoding="utf-8")
 
     print(f"Wrote {jsonl_path}")
     print(f"Wrote {csv_path}")
+    print(f"Wrote {latency_path}")
+    if "comparison" in latency_summary:
+        comparison = latency_summary["comparison"]
+        print(
+            f"Structured front end saved {comparison['latency_saved_mean_ms']} ms/question on average "
+            f"({comparison['latency_saved_pct']}%), classification agreement {comparison['classification_agreement']}"
+        )
 
 
 if __name__ == "__main__":
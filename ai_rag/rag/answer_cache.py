@@ -0,0 +1,190 @@
+"""
+시맨틱 답변 캐시 (run_rag_chain 앞단)
+- 표현만 조금 다른 같은 질문이 분류 / 정제 / 검색 / 재정렬 / 답변 생성을 다시 거치지 않도록,
+  질문 임베딩의 코사인 유사도가 임계값 이상인 이전 RAG 답변(answer / attribution)을 그대로 돌려준다.
+- 자산번호(G2B목록번호, 물품고유번호 등), 날짜, 숫자, 상대 날짜 표현("오늘", "지난달")이 다르면
+  임베딩이 비슷해도 다른 질문이므로, 이 토큰 집합(lexical guard)이 같은 항목만 비교한다.
+- 항목 수 상한(LRU)과 보관 시간(TTL)은 app/cache_utils.LRUTTLCache가 관리하고, 여기서는 벡터/토큰 집합 비교만 한다.
+- Chroma 인덱스가 다시 만들어지면(컬렉션 ID 또는 chroma.sqlite3 파일이 바뀌면) 저장된 답변을 모두 비운다.
+"""
+
+import copy
+import itertools
+import logging
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+try:
+    from app.cache_utils import LRUTTLCache
+    from app.config import (
+        SEMANTIC_CACHE_MAX_SIZE,
+        SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+        SEMANTIC_CACHE_TTL_SECONDS,
+    )
+except ModuleNotFoundError:
+    project_root = Path(__file__).resolve().parents[2]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+    from app.cache_utils import LRUTTLCache
+    from app.config import (
+        SEMANTIC_CACHE_MAX_SIZE,
+        SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+        SEMANTIC_CACHE_TTL_SECONDS,
+    )
+
+
+logger = logging.getLogger(__name__)
+
+# 숫자가 들어간 토큰 (자산번호, 날짜, 수량 등). 예: "12345678-abcdefg", "2024.03.01", "3월" -> "3"
+_GUARD_TOKEN_PATTERN = re.compile(r"[0-9a-z]*\d[0-9a-z\-./]*")
+# 같은 문장이라도 묻는 시점에 따라 답이 달라지는 표현 (공백 제거 후 비교)
+RELATIVE_DATE_TERMS = (
+    "오늘", "어제", "내일", "이번주", "지난주", "다음주", "이번달", "지난달", "다음달", "올해", "작년", "내년",
+)
+
+
+def lexical_guard(user_query: str) -> frozenset:
+    """질문 속 자산번호/날짜/숫자 토큰과 상대 날짜 표현. 이 집합이 같은 질문끼리만 캐시를 공유한다."""
+    text = str(user_query).lower()
+    tokens = {token.rstrip("-./") for token in _GUARD_TOKEN_PATTERN.findall(text)}
+    compact = re.sub(r"\s+", "", text)
+    tokens.update(term for term in RELATIVE_DATE_TERMS if term in compact)
+    return frozenset(tokens)
+
+
+def index_version(vectordb) -> str:
+    """
+    run_rag_chain이 검색하는 Chroma 인덱스의 버전.
+    컬렉션을 다시 만들면 컬렉션 ID가, create_vector_db.py로 폴더를 교체하면 chroma.sqlite3의 inode/수정 시간/크기가 바뀐다.
+    """
+    collection = getattr(vectordb, "_collection", None)
+    parts = [str(getattr(collection, "id", None) or id(vectordb))]
+    persist_dir = getattr(vectordb, "_persist_directory", None)
+    if persist_dir:
+        try:
+            stat = (Path(persist_dir) / "chroma.sqlite3").stat()
+            parts += [str(stat.st_ino), str(stat.st_mtime_ns), str(stat.st_size)]
+        except OSError:
+            parts.append("missing")
+    return ":".join(parts)
+
+
+def is_cacheable(result: Any) -> bool:
+    """검색 문서로 답변까지 생성한 RAG 결과만 저장한다 (도구 결과/일반 대화/오류/문서 없음 응답 제외)."""
+    if not isinstance(result, dict):
+        return False
+    diagnostics = result.get("diagnostics") or {}
+    return bool(result.get("attribution")) and diagnostics.get("final_context_count", 0) > 0
+
+
+class _CacheEntry(NamedTuple):
+    query: str
+    vector: np.ndarray
+    guard: frozenset
+    result: dict
+    created_at: float    # monotonic
+
+
+class CacheMatch(NamedTuple):
+    result: dict
+    similarity: float
+    cached_query: str
+    age_seconds: float
+
+
+class SemanticAnswerCache:
+    def __init__(
+        self,
+        max_size: int = SEMANTIC_CACHE_MAX_SIZE,
+        ttl_seconds: float = SEMANTIC_CACHE_TTL_SECONDS,
+        similarity_threshold: float = SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+    ):
+        self.similarity_threshold = similarity_threshold
+        self._entries = LRUTTLCache(max_size, ttl_seconds)  # 저장 순번 -> _CacheEntry
+        self._next_key = itertools.count()
+        self._index_version: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def max_size(self) -> int:
+        return self._entries.max_size
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._entries.ttl_seconds
+
+    def sync_index_version(self, version: str) -> None:
+        """인덱스 버전이 바뀌었으면 이전 인덱스로 만든 답변을 모두 버린다."""
+        with self._lock:
+            if version == self._index_version:
+                return
+            if len(self._entries):
+                logger.info("[Answer Cache] Chroma 인덱스 변경 감지, 답변 %d건 삭제", len(self._entries))
+                self._entries.clear()
+                self.invalidations += 1
+            self._index_version = version
+
+    def lookup(self, user_query: str, vector: Sequence[float]) -> Optional[CacheMatch]:
+        query_vector = _unit_vector(vector)
+        guard = lexical_guard(user_query)
+        candidates = [(key, entry) for key, entry in self._entries.items() if entry.guard == guard]
+        best_key, best_similarity = None, -1.0
+        if candidates:
+            similarities = np.vstack([entry.vector for _, entry in candidates]) @ query_vector
+            best = int(np.argmax(similarities))
+            best_key, best_similarity = candidates[best][0], float(similarities[best])
+
+        # get으로 다시 읽어 최근 사용 순서를 갱신한다 (그 사이 만료/삭제됐으면 미적중).
+        entry = self._entries.get(best_key) if best_similarity >= self.similarity_threshold else None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return CacheMatch(copy.deepcopy(entry.result), round(best_similarity, 4), entry.query, time.monotonic() - entry.created_at)
+
+    def store(self, user_query: str, vector: Sequence[float], result: dict) -> None:
+        if self.max_size == 0 or self.ttl_seconds <= 0:
+            return
+        entry = _CacheEntry(
+            query=user_query,
+            vector=_unit_vector(vector),
+            guard=lexical_guard(user_query),
+            result=copy.deepcopy(result),
+            created_at=time.monotonic(),
+        )
+        self._entries.set(next(self._next_key), entry)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _unit_vector(vector: Sequence[float]) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(array))
+    return array / norm if norm > 0 else array
+
+
+_answer_cache: Optional[SemanticAnswerCache] = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> SemanticAnswerCache:
+    global _answer_cache
+    if _answer_cache is None:
+        with _answer_cache_lock:
+            if _answer_cache is None:
+                _answer_cache = SemanticAnswerCache()
+    return _answer_cache
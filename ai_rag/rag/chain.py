@@ -1,10 +1,12 @@
+import asyncio
 import traceback
 import logging
 import json
 import re
 import sys
+import threading
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Iterable, NamedTuple, Optional
 
 from langchain_core.messages import HumanMessage, ToolMessage, SystemMessage
 
@@ -12,8 +14,17 @@ from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
 from vectorstore.retriever import retrieve_docs
-from rag.prompt import assemble_prompt, build_question_classifier_prompt, build_query_refine_prompt, build_tool_aware_system_prompt
+from rag.prompt import (
+    assemble_prompt,
+    build_question_classifier_prompt,
+    build_query_refine_prompt,
+    build_structured_front_end_prompt,
+    build_tool_aware_system_prompt,
+)
 from rag.tools import get_item_detail_info, open_usage_prediction_page
+from rag.query_classifier import LocalClassification, pre_classify_question
+from rag.answer_cache import get_answer_cache, index_version, is_cacheable
+from rag.stage_cache import get_stage_cache, prompt_version
 from rag.reranker import CrossEncoderReranker
 try:
     from app.config import (
@@ -22,7 +33,11 @@ try:
         RERANK_CANDIDATE_K,
         RERANK_TOP_N,
         USE_RERANKING,
-        RERANK_DEBUG
+        RERANK_DEBUG,
+        USE_STRUCTURED_FRONT_END,
+        USE_LOCAL_QUESTION_CLASSIFIER,
+        USE_SEMANTIC_ANSWER_CACHE,
+        USE_STAGE_RESULT_CACHE
     )
 except ModuleNotFoundError:
     project_root = Path(__file__).resolve().parents[2]
@@ -34,7 +49,11 @@ except ModuleNotFoundError:
         RERANK_CANDIDATE_K,
         RERANK_TOP_N,
         USE_RERANKING,
-        RERANK_DEBUG
+        RERANK_DEBUG,
+        USE_STRUCTURED_FRONT_END,
+        USE_LOCAL_QUESTION_CLASSIFIER,
+        USE_SEMANTIC_ANSWER_CACHE,
+        USE_STAGE_RESULT_CACHE
     )
 
 # [설정] 민감 정보 키 목록 정의
@@ -55,6 +74,12 @@ CONTEXT_DOC_TYPE_PRIORITY = {
 }
 COMPARISON_TERMS = ("차이", "비교", "구분", "다른", "vs", "VS")
 
+# run_rag_chain_concurrent가 작업을 넘기는 전용 이벤트 루프 (스레드 하나에서 계속 실행)
+# ChatOpenAI/OpenAIEmbeddings는 httpx.AsyncClient를 공유하고 그 연결은 처음 사용한 이벤트 루프에 묶이므로,
+# 호출마다 새 루프(asyncio.run)를 만들면 두 번째 호출부터 "Event loop is closed" 오류가 난다.
+_CHAIN_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_CHAIN_LOOP_LOCK = threading.Lock()
+
 
 # [최적화] 모듈 레벨 상수 정의 (서버 켜질 때 1번만 실행됨)
 # 1. 사용할 도구 목록
@@ -82,38 +107,240 @@ def _build_text_chain(template: str, llm):
     return prompt | llm | StrOutputParser()
 
 
+def _match_classification(raw: Any) -> Optional[str]:
+    """모델 출력에서 NEED_RAG / NO_RAG를 찾는다. 없으면 None."""
+    match = re.search(r"\b(NEED_RAG|NO_RAG)\b", str(raw).strip().upper())
+    return match.group(1) if match else None
+
+
+def _parse_classification(raw: Any) -> str:
+    classification = _match_classification(raw)
+    if classification is None:
+        logger.warning("[Question Classification] invalid output %r, fallback to NEED_RAG", raw)
+        return "NEED_RAG"
+    return classification
+
+
+def _clean_refined_query(refined: str, user_query: str) -> str:
+    refined = refined.replace("```", "").strip()
+    if not refined:
+        return user_query
+    if "\n" in refined:
+        refined = next((line.strip() for line in refined.splitlines() if line.strip()), user_query)
+    return refined[:500]
+
+
+def _stage_version(llm, template: str) -> str:
+    """결과 캐시 키용 프롬프트 버전 (템플릿 + 모델 이름)"""
+    model_name = getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+    return prompt_version(template, str(model_name))
+
+
+def _cached_stage_result(stage: str, version: str, user_query: str) -> Optional[str]:
+    if not USE_STAGE_RESULT_CACHE:
+        return None
+    return get_stage_cache().get(stage, version, user_query)
+
+
+def _remember_stage_result(stage: str, version: str, user_query: str, result: str) -> None:
+    """LLM 호출이 성공한 결과만 저장한다 (오류로 인한 기본값은 저장하지 않음)."""
+    if USE_STAGE_RESULT_CACHE:
+        get_stage_cache().set(stage, version, user_query, result)
+
+
+async def _acached_stage_result(stage: str, version: str, user_query: str) -> Optional[str]:
+    """_cached_stage_result의 비동기 버전 (SQLite 조회는 이벤트 루프 밖에서 실행)"""
+    if not USE_STAGE_RESULT_CACHE:
+        return None
+    return await get_stage_cache().aget(stage, version, user_query)
+
+
+async def _aremember_stage_result(stage: str, version: str, user_query: str, result: str) -> None:
+    if USE_STAGE_RESULT_CACHE:
+        await get_stage_cache().aset(stage, version, user_query, result)
+
+
 def classify_question(llm, user_query: str) -> str:
     """질문이 RAG 검색을 필요로 하는지 분류한다. 실패/모호함은 NEED_RAG로 둔다."""
+    template = build_question_classifier_prompt()
+    version = _stage_version(llm, template)
+    cached = _cached_stage_result("classify", version, user_query)
+    if cached is not None:
+        return cached
     try:
-        chain = _build_text_chain(build_question_classifier_prompt(), llm)
+        chain = _build_text_chain(template, llm)
         raw = chain.invoke({"question": user_query})
     except Exception as exc:
         logger.warning("[Question Classification] failed, fallback to NEED_RAG: %s", exc)
         return "NEED_RAG"
 
-    normalized = str(raw).strip().upper()
-    match = re.search(r"\b(NEED_RAG|NO_RAG)\b", normalized)
-    if not match:
-        logger.warning("[Question Classification] invalid output %r, fallback to NEED_RAG", raw)
+    classification = _parse_classification(raw)
+    # 출력 파싱에 실패해 기본값(NEED_RAG)으로 둔 경우는 저장하지 않는다.
+    if _match_classification(raw) is not None:
+        _remember_stage_result("classify", version, user_query, classification)
+    return classification
+
+
+async def aclassify_question(llm, user_query: str) -> str:
+    """classify_question의 비동기 버전"""
+    template = build_question_classifier_prompt()
+    version = _stage_version(llm, template)
+    cached = await _acached_stage_result("classify", version, user_query)
+    if cached is not None:
+        return cached
+    try:
+        chain = _build_text_chain(template, llm)
+        raw = await chain.ainvoke({"question": user_query})
+    except Exception as exc:
+        logger.warning("[Question Classification] failed, fallback to NEED_RAG: %s", exc)
         return "NEED_RAG"
-    return match.group(1)
+
+    classification = _parse_classification(raw)
+    # 출력 파싱에 실패해 기본값(NEED_RAG)으로 둔 경우는 저장하지 않는다.
+    if _match_classification(raw) is not None:
+        await _aremember_stage_result("classify", version, user_query, classification)
+    return classification
 
 
 def refine_query(llm, user_query: str) -> str:
     """검색용 질의를 생성한다. 출력이 불안정하면 원 질문으로 되돌린다."""
+    template = build_query_refine_prompt()
+    version = _stage_version(llm, template)
+    cached = _cached_stage_result("refine", version, user_query)
+    if cached is not None:
+        return cached
     try:
-        chain = _build_text_chain(build_query_refine_prompt(), llm)
+        chain = _build_text_chain(template, llm)
         refined = str(chain.invoke({"question": user_query})).strip()
     except Exception as exc:
         logger.warning("[Query Refinement] failed, fallback to original query: %s", exc)
         return user_query
 
-    refined = refined.replace("```", "").strip()
-    if not refined:
+    refined_query = _clean_refined_query(refined, user_query)
+    _remember_stage_result("refine", version, user_query, refined_query)
+    return refined_query
+
+
+async def arefine_query(llm, user_query: str) -> str:
+    """refine_query의 비동기 버전"""
+    template = build_query_refine_prompt()
+    version = _stage_version(llm, template)
+    cached = await _acached_stage_result("refine", version, user_query)
+    if cached is not None:
+        return cached
+    try:
+        chain = _build_text_chain(template, llm)
+        refined = str(await chain.ainvoke({"question": user_query})).strip()
+    except Exception as exc:
+        logger.warning("[Query Refinement] failed, fallback to original query: %s", exc)
         return user_query
-    if "\n" in refined:
-        refined = next((line.strip() for line in refined.splitlines() if line.strip()), user_query)
-    return refined[:500]
+
+    refined_query = _clean_refined_query(refined, user_query)
+    await _aremember_stage_result("refine", version, user_query, refined_query)
+    return refined_query
+
+
+def _local_pre_classification(user_query: str) -> Optional[LocalClassification]:
+    """로컬 분류기 결과 (비활성화/실패 시 None). decided가 False면 LLM 분류가 필요하다."""
+    if not USE_LOCAL_QUESTION_CLASSIFIER:
+        return None
+    try:
+        local = pre_classify_question(user_query)
+    except Exception as exc:
+        logger.warning("[Local Classifier] failed, fallback to LLM classification: %s", exc)
+        return None
+    logger.info(
+        "[Local Classifier] %s confidence=%.3f decided=%s source=%s",
+        local.label,
+        local.confidence,
+        local.decided,
+        local.source,
+    )
+    return local
+
+
+async def _alocal_pre_classification(user_query: str) -> Optional[LocalClassification]:
+    """_local_pre_classification의 비동기 버전 (첫 호출의 모델 학습이 이벤트 루프를 막지 않도록 스레드에서 실행)"""
+    if not USE_LOCAL_QUESTION_CLASSIFIER:
+        return None
+    return await asyncio.to_thread(_local_pre_classification, user_query)
+
+
+def _route_diagnostics(front_end: str, classification_path: str, local: Optional[LocalClassification]) -> dict:
+    """전처리 방식과 분류 경로 (structured | local | llm), 로컬 분류기 판단값"""
+    return {
+        "front_end": front_end,
+        "classification_path": classification_path,
+        "local_classification": local.label if local is not None else None,
+        "local_confidence": local.confidence if local is not None else None,
+    }
+
+
+def _embed_for_answer_cache(vectordb, user_query: str) -> Optional[list[float]]:
+    """답변 캐시 조회용 질문 임베딩 (캐시 비활성화/실패 시 None → 캐시 없이 진행)"""
+    if not USE_SEMANTIC_ANSWER_CACHE:
+        return None
+    try:
+        return vectordb.embeddings.embed_query(user_query)
+    except Exception as exc:
+        logger.warning("[Answer Cache] query embedding failed, skip cache: %s", exc)
+        return None
+
+
+async def _aembed_for_answer_cache(vectordb, user_query: str) -> Optional[list[float]]:
+    if not USE_SEMANTIC_ANSWER_CACHE:
+        return None
+    try:
+        return await vectordb.embeddings.aembed_query(user_query)
+    except Exception as exc:
+        logger.warning("[Answer Cache] query embedding failed, skip cache: %s", exc)
+        return None
+
+
+def _cached_answer(vectordb, user_query: str, query_vector: Optional[list[float]]) -> Optional[dict]:
+    """현재 Chroma 인덱스로 만든 비슷한 질문의 답변이 있으면 answer / attribution을 그대로 반환한다."""
+    if query_vector is None:
+        return None
+    try:
+        cache = get_answer_cache()
+        cache.sync_index_version(index_version(vectordb))
+        match = cache.lookup(user_query, query_vector)
+    except Exception as exc:
+        logger.warning("[Answer Cache] lookup failed: %s", exc)
+        return None
+    if match is None:
+        return None
+
+    logger.info("[Answer Cache] hit similarity=%.4f cached_query=%r", match.similarity, match.cached_query)
+    result = match.result
+    result["diagnostics"] = {
+        **(result.get("diagnostics") or {}),
+        "answer_cache": {
+            "hit": True,
+            "similarity": match.similarity,
+            "cached_query": match.cached_query,
+            "age_seconds": round(match.age_seconds, 1),
+        },
+    }
+    return result
+
+
+def _remember_answer(user_query: str, query_vector: Optional[list[float]], result):
+    """검색 문서로 생성한 RAG 답변만 캐시에 저장한다."""
+    if query_vector is None or not isinstance(result, dict):
+        return result
+    if is_cacheable(result):
+        get_answer_cache().store(user_query, query_vector, result)
+    if isinstance(result.get("diagnostics"), dict):
+        result["diagnostics"]["answer_cache"] = {"hit": False}
+    return result
+
+
+def _with_stage_cache_stats(result):
+    """분류/정제 결과 캐시의 단계별 누적 적중률을 diagnostics에 붙인다."""
+    if USE_STAGE_RESULT_CACHE and isinstance(result, dict) and isinstance(result.get("diagnostics"), dict):
+        result["diagnostics"]["stage_cache"] = get_stage_cache().stats()
+    return result
 
 
 def _doc_key(doc) -> str:
@@ -136,14 +363,23 @@ def _merge_retrieval_results(result_sets: Iterable[Iterable[tuple]]) -> list[tup
     return sorted(merged.values(), key=lambda item: item[1])
 
 
-def retrieve_candidate_docs(vectordb, user_query: str, refined_query: str, top_k: int) -> list[tuple]:
-    """원 질문과 정제 질문을 함께 검색해 query rewrite 실패 위험을 줄인다."""
-    refined_results = retrieve_docs(vectordb=vectordb, query=refined_query, top_k=top_k)
+def retrieve_candidate_docs(
+    vectordb,
+    user_query: str,
+    refined_query: str,
+    top_k: int,
+    query_vector: Optional[list[float]] = None,
+) -> list[tuple]:
+    """
+    원 질문과 정제 질문을 함께 검색해 query rewrite 실패 위험을 줄인다.
+    query_vector는 답변 캐시 조회 때 이미 계산한 원 질문 임베딩이며, 있으면 원 질문 검색에 재사용한다.
+    """
     if refined_query.strip() == user_query.strip():
-        return refined_results
+        return retrieve_docs(vectordb=vectordb, query=user_query, top_k=top_k, query_vector=query_vector)
 
+    refined_results = retrieve_docs(vectordb=vectordb, query=refined_query, top_k=top_k)
     original_k = max(5, top_k // 2)
-    original_results = retrieve_docs(vectordb=vectordb, query=user_query, top_k=original_k)
+    original_results = retrieve_docs(vectordb=vectordb, query=user_query, top_k=original_k, query_vector=query_vector)
     merged = _merge_retrieval_results([refined_results, original_results])
     logger.info(
         "[Retrieval] refined=%d original=%d merged=%d",
@@ -329,219 +565,293 @@ def _build_attribution(top_docs: list) -> list[dict]:
     return attribution
 
 
-def run_rag_chain(
-    llm,
-    vectordb,
-    user_query: str,
-    retriever_top_k: int = RETRIEVER_TOP_K
-):
-    
-    # 1. Function Calling (도구 사용) 시도
+def _build_router_messages(user_query: str) -> list:
+    """Router 단계 입력: 도구 안내 시스템 프롬프트 + 사용자 질문"""
+    return [
+        SystemMessage(content=build_tool_aware_system_prompt()),
+        HumanMessage(content=user_query)
+    ]
+
+
+# 전처리 1회 호출에서 도구를 호출하지 않을 때의 응답 JSON 스키마 (title이 response_format 이름으로 쓰인다)
+FRONT_END_RESPONSE_SCHEMA = {
+    "title": "rag_front_end",
+    "description": "RAG 검색 필요 여부와 검색용 질의",
+    "type": "object",
+    "properties": {
+        "classification": {"type": "string", "enum": ["NEED_RAG", "NO_RAG"]},
+        "refined_query": {"type": "string"},
+    },
+    "required": ["classification", "refined_query"],
+    "additionalProperties": False,
+}
+
+
+class FrontEndDecision(NamedTuple):
+    """전처리 1회 호출 결과. 도구를 호출한 응답이면 classification/refined_query는 None일 수 있다."""
+    response: Any
+    classification: Optional[str]
+    refined_query: Optional[str]
+
+
+def _use_structured_front_end(structured_front_end: Optional[bool]) -> bool:
+    return USE_STRUCTURED_FRONT_END if structured_front_end is None else structured_front_end
+
+
+def _build_front_end_call(llm, user_query: str):
+    front_end_llm = llm.bind_tools(TOOLS, response_format=FRONT_END_RESPONSE_SCHEMA)
+    messages = [
+        SystemMessage(content=build_structured_front_end_prompt()),
+        HumanMessage(content=user_query)
+    ]
+    return front_end_llm, messages
+
+
+def _parse_front_end_response(response, user_query: str) -> Optional[FrontEndDecision]:
+    """도구 호출이 없는데 JSON 응답이 스키마에 맞지 않으면 None (기존 3회 호출 경로로 전환)."""
+    payload = (getattr(response, "additional_kwargs", {}) or {}).get("parsed")
+    if not isinstance(payload, dict):
+        try:
+            payload = json.loads(_message_content(response) or "null")
+        except (json.JSONDecodeError, TypeError):
+            payload = None
+
+    classification = refined_query = None
+    if isinstance(payload, dict):
+        if payload.get("classification") in ("NEED_RAG", "NO_RAG"):
+            classification = payload["classification"]
+        if isinstance(payload.get("refined_query"), str) and payload["refined_query"].strip():
+            refined_query = _clean_refined_query(payload["refined_query"], user_query)
+
+    if not getattr(response, "tool_calls", None):
+        if classification is None or (classification == "NEED_RAG" and refined_query is None):
+            logger.warning(
+                "[Front End] invalid structured output %r, fallback to separate calls",
+                _message_content(response)[:200],
+            )
+            return None
+    return FrontEndDecision(response, classification, refined_query)
+
+
+def decide_front_end(llm, user_query: str) -> Optional[FrontEndDecision]:
+    """도구 판단 / 질문 분류 / 검색 질의 정제를 JSON 스키마 응답 LLM 호출 1번으로 처리한다. 실패하면 None."""
     try:
-        # [최적화] 매번 리스트 생성 없이 미리 만들어둔 전역 상수 TOOLS 사용
-        llm_with_tools = llm.bind_tools(TOOLS)
-        
-        # 시스템 프롬프트 구성
-        system_instruction = build_tool_aware_system_prompt()
-        
-        messages = [
-            SystemMessage(content=system_instruction),
-            HumanMessage(content=user_query)
-        ]
-        
-        # Router 단계: 도구 사용 여부 판단
-        tool_check_response = llm_with_tools.invoke(messages)
-        
-        # ----------------------------------------------------------------------
-        # 도구 호출(Tool Calls)이 감지된 경우
-        # ----------------------------------------------------------------------
-        if tool_check_response.tool_calls:
-            logger.info(f"[Tool Check] 도구 사용 감지: {len(tool_check_response.tool_calls)}건")
-            
-            tool_messages = []  # 결과 누적용 리스트
-
-            pending_navigation = None  # 페이지 이동 명령 대기용 변수
-
-            # 감지된 모든 도구 순차 실행
-            for tool_call in tool_check_response.tool_calls:
-                tool_name = tool_call["name"]
-                tool_args = tool_call["args"]
-                
-                # [안전장치 1] 정의되지 않은 도구 무시
-                if tool_name not in TOOL_MAP:
-                    logger.warning(f"[Tool Execution] 정의되지 않은 도구 요청 무시: {tool_name}")
-                    continue
-                 
-                # [안전장치 2] 로깅 보안 (Sanitization + Redaction)
-                if isinstance(tool_args, dict):
-                    safe_args = {}
-                    for k, v in tool_args.items():
-                        # [보안] 1. 민감한 키(Key)인지 확인 -> 마스킹 처리
-                        if str(k).lower() in SENSITIVE_KEYS:
-                            safe_args[k] = "[REDACTED]" # 혹은 "*****"
-                        
-                        # [기존] 2. 일반 데이터는 길이 제한 (Truncation)
-                        else:
-                            val_str = str(v).replace("\n", "\\n")
-                            safe_args[k] = val_str[:100] + "..." if len(val_str) > 100 else val_str
-                
-                else:
-                    # 딕셔너리가 아닌 경우 (단일 문자열 등) -> 기존 방식 유지
-                    safe_args = str(tool_args)[:100].replace("\n", "\\n")
-                
-                logger.info(f"[Tool Execution] '{tool_name}' 실행 중... | 인자: {safe_args}")
-                
-                try:
-                    # 도구 객체 가져오기 및 실행
-                    selected_tool = TOOL_MAP[tool_name]
-                    tool_output_str = selected_tool.invoke(tool_args)
-                    
-                    # 결과 분석: JSON 파싱 시도
-                    parsed_output = None
-                    try:
-                        parsed_output = json.loads(tool_output_str)
-                    except (json.JSONDecodeError, TypeError):
-                        # JSON 파싱에 실패한 경우, 도구 출력은 일반 텍스트로 처리하기 위해 parsed_output을 None으로 유지합니다.
-                        parsed_output = None
-
-                    # -------------------------------------------------------
-                    # [Case A] 페이지 이동 (Navigate) -> 임시 저장 (즉시 종료 X)
-                    # -------------------------------------------------------
-                    if (
-                        isinstance(parsed_output, dict)
-                        and parsed_output.get("action") == "navigate"
-                        and parsed_output.get("target_url")
-                    ):
-                        logger.info("[Tool Output] 페이지 이동 요청 감지 -> 다른 작업 완료 후 이동 예정")
-                        
-                        # 즉시 return 하지 않고 변수에 저장해둡니다.
-                        pending_navigation = {
-                            "answer": parsed_output.get("guide_msg", "페이지로 이동합니다."),
-                            "target_url": parsed_output.get("target_url"),
-                            "query": user_query,
-                            "action": "navigate"
-                        }
-                        continue  # 다음 도구 처리나 로직으로 넘어감
-
-                    # -------------------------------------------------------
-                    # [Case B] 정보 조회 (Search) -> 결과 누적(Append)
-                    # -------------------------------------------------------
-                    
-                    # 타입 체크 및 안전한 문자열 변환 로직
-                    final_content = ""
-                    
-                    if isinstance(tool_output_str, str):
-                        # 정상적인 문자열인 경우 그대로 사용
-                        final_content = tool_output_str
-                    else:
-                        # 문자열이 아닌 경우 (예: Dict, List, Int 등)
-                        # 1. 코파일럿 지적 반영: 버그를 숨기지 않도록 경고 로그 출력
-                        logger.warning(f"[Tool Warning] {tool_name} 도구가 문자열이 아닌 타입({type(tool_output_str)})을 반환했습니다. 자동 변환합니다.")
-                        
-                        # 2. LLM이 이해하기 쉬운 JSON 형태의 문자열로 변환 (실패 시 일반 str 변환)
-                        try:
-                            final_content = json.dumps(tool_output_str, ensure_ascii=False)
-                        except:
-                            final_content = str(tool_output_str)
-
-                    logger.info(f"[Tool Output] 데이터 조회 완료. (메시지 이력에 추가)")
-                    
-                    tool_messages.append(
-                        ToolMessage(
-                            content=final_content,  # 검증된 문자열 사용
-                            tool_call_id=tool_call["id"],
-                            name=tool_name
-                        )
-                    )
-
-                except Exception as e:
-                    # 개별 도구 에러 처리 (멈추지 않고 에러 메시지를 LLM에게 전달)
-                    logger.error(f"[Tool Execution Error] {tool_name} 실행 실패: {e}", exc_info=True)
-                    tool_messages.append(
-                        ToolMessage(
-                            content=f"Error: {str(e)}",
-                            tool_call_id=tool_call["id"],
-                            name=tool_name,
-                        )
-                    )
-
-            # ------------------------------------------------------------------
-            # 도구 실행 후 최종 답변 생성 (Generator)
-            # ------------------------------------------------------------------
-            # 도구 메시지가 있거나(OR) 화면 이동 명령이 있다면 RAG를 스킵하고 여기서 처리
-            if tool_messages or pending_navigation:
-                
-                final_answer_text = ""
-
-                # Case A: 도구 실행 결과(데이터)가 있는 경우 -> LLM이 내용을 정리해서 답변
-                if tool_messages:
-                    logger.info(f"[Tool Finalizing] 총 {len(tool_messages)}건의 정보를 바탕으로 답변 생성 중...")
-
-                    # 대화 이력 재구성: [시스템, 유저질문, (AI의 도구호출), 도구결과1, 도구결과2...]
-                    history = [
-                        SystemMessage(content=system_instruction),
-                        HumanMessage(content=user_query),
-                        tool_check_response, 
-                    ] + tool_messages
-                    
-                    # 순수 LLM으로 최종 답변 생성
-                    final_response = llm.invoke(history)
-                    final_answer_text = final_response.content
-
-                # Case B: 데이터는 없지만 화면 이동 명령만 있는 경우 ("설정 화면으로 가줘")
+        front_end_llm, messages = _build_front_end_call(llm, user_query)
+        response = front_end_llm.invoke(messages)
+    except Exception as exc:
+        logger.warning("[Front End] structured call failed, fallback to separate calls: %s", exc)
+        return None
+    return _parse_front_end_response(response, user_query)
+
+
+async def adecide_front_end(llm, user_query: str) -> Optional[FrontEndDecision]:
+    """decide_front_end의 비동기 버전"""
+    try:
+        front_end_llm, messages = _build_front_end_call(llm, user_query)
+        response = await front_end_llm.ainvoke(messages)
+    except Exception as exc:
+        logger.warning("[Front End] structured call failed, fallback to separate calls: %s", exc)
+        return None
+    return _parse_front_end_response(response, user_query)
+
+
+def _handle_tool_calls(llm, router_messages: list, tool_check_response, user_query: str):
+    """
+    Router 응답의 도구 호출을 실행하고 최종 답변을 만든다.
+    도구 결과도 이동 명령도 없으면 None을 반환한다 (RAG로 전환).
+    """
+    # ----------------------------------------------------------------------
+    # 도구 호출(Tool Calls)이 감지된 경우
+    # ----------------------------------------------------------------------
+    if not tool_check_response.tool_calls:
+        # 애초에 도구 호출이 필요 없는 질문인 경우 -> RAG로 넘어감
+        logger.info("[Tool Fallback] 도구 호출 요청 없음 -> RAG로 전환")
+        return None
+
+    logger.info(f"[Tool Check] 도구 사용 감지: {len(tool_check_response.tool_calls)}건")
+
+    tool_messages = []  # 결과 누적용 리스트
+
+    pending_navigation = None  # 페이지 이동 명령 대기용 변수
+
+    # 감지된 모든 도구 순차 실행
+    for tool_call in tool_check_response.tool_calls:
+        tool_name = tool_call["name"]
+        tool_args = tool_call["args"]
+
+        # [안전장치 1] 정의되지 않은 도구 무시
+        if tool_name not in TOOL_MAP:
+            logger.warning(f"[Tool Execution] 정의되지 않은 도구 요청 무시: {tool_name}")
+            continue
+
+        # [안전장치 2] 로깅 보안 (Sanitization + Redaction)
+        if isinstance(tool_args, dict):
+            safe_args = {}
+            for k, v in tool_args.items():
+                # [보안] 1. 민감한 키(Key)인지 확인 -> 마스킹 처리
+                if str(k).lower() in SENSITIVE_KEYS:
+                    safe_args[k] = "[REDACTED]" # 혹은 "*****"
+
+                # [기존] 2. 일반 데이터는 길이 제한 (Truncation)
                 else:
-                    logger.info("[Tool Finalizing] 데이터 조회 없이 화면 이동만 수행합니다.")
-                    final_answer_text = "요청하신 화면으로 이동합니다."
-
-                # --------------------------------------------------------------
-                # 결과 반환 처리
-                # --------------------------------------------------------------
-                
-                # 1. 화면 이동 명령이 있는 경우
-                if pending_navigation:
-                    logger.info(f"[Final Step] 페이지 이동 명령 실행: {pending_navigation.get('target_url')}")
-                    
-                    # LLM이 만든 답변(혹은 기본 문구)을 이동 명령 패키지에 담음
-                    pending_navigation["answer"] = final_answer_text
-                    
-                    # 이동 명령 반환 (RAG 스킵)
-                    return pending_navigation
-
-                # 2. 이동 없이 답변만 있는 경우
-                return {
-                    "answer": final_answer_text,
-                    "attribution": []
+                    val_str = str(v).replace("\n", "\\n")
+                    safe_args[k] = val_str[:100] + "..." if len(val_str) > 100 else val_str
+
+        else:
+            # 딕셔너리가 아닌 경우 (단일 문자열 등) -> 기존 방식 유지
+            safe_args = str(tool_args)[:100].replace("\n", "\\n")
+
+        logger.info(f"[Tool Execution] '{tool_name}' 실행 중... | 인자: {safe_args}")
+
+        try:
+            # 도구 객체 가져오기 및 실행
+            selected_tool = TOOL_MAP[tool_name]
+            tool_output_str = selected_tool.invoke(tool_args)
+
+            # 결과 분석: JSON 파싱 시도
+            parsed_output = None
+            try:
+                parsed_output = json.loads(tool_output_str)
+            except (json.JSONDecodeError, TypeError):
+                # JSON 파싱에 실패한 경우, 도구 출력은 일반 텍스트로 처리하기 위해 parsed_output을 None으로 유지합니다.
+                parsed_output = None
+
+            # -------------------------------------------------------
+            # [Case A] 페이지 이동 (Navigate) -> 임시 저장 (즉시 종료 X)
+            # -------------------------------------------------------
+            if (
+                isinstance(parsed_output, dict)
+                and parsed_output.get("action") == "navigate"
+                and parsed_output.get("target_url")
+            ):
+                logger.info("[Tool Output] 페이지 이동 요청 감지 -> 다른 작업 완료 후 이동 예정")
+
+                # 즉시 return 하지 않고 변수에 저장해둡니다.
+                pending_navigation = {
+                    "answer": parsed_output.get("guide_msg", "페이지로 이동합니다."),
+                    "target_url": parsed_output.get("target_url"),
+                    "query": user_query,
+                    "action": "navigate"
                 }
-            
-            # ------------------------------------------------------------------
-            # 도구 결과도 없고, 이동 명령도 없는 경우 -> RAG 검색 수행
-            # ------------------------------------------------------------------
+                continue  # 다음 도구 처리나 로직으로 넘어감
+
+            # -------------------------------------------------------
+            # [Case B] 정보 조회 (Search) -> 결과 누적(Append)
+            # -------------------------------------------------------
+
+            # 타입 체크 및 안전한 문자열 변환 로직
+            final_content = ""
+
+            if isinstance(tool_output_str, str):
+                # 정상적인 문자열인 경우 그대로 사용
+                final_content = tool_output_str
             else:
-                logger.info("[Tool Fallback] 유효한 도구 결과 및 이동 명령 없음 -> RAG로 전환")
+                # 문자열이 아닌 경우 (예: Dict, List, Int 등)
+                # 1. 코파일럿 지적 반영: 버그를 숨기지 않도록 경고 로그 출력
+                logger.warning(f"[Tool Warning] {tool_name} 도구가 문자열이 아닌 타입({type(tool_output_str)})을 반환했습니다. 자동 변환합니다.")
 
-        else:
-            # 애초에 도구 호출이 필요 없는 질문인 경우 -> RAG로 넘어감
-            logger.info("[Tool Fallback] 도구 호출 요청 없음 -> RAG로 전환")
+                # 2. LLM이 이해하기 쉬운 JSON 형태의 문자열로 변환 (실패 시 일반 str 변환)
+                try:
+                    final_content = json.dumps(tool_output_str, ensure_ascii=False)
+                except:
+                    final_content = str(tool_output_str)
 
-    except Exception as e:
-        logger.error(f"[Tool System Error] 도구 처리 중 오류 -> RAG로 전환: {e}", exc_info=True)
+            logger.info(f"[Tool Output] 데이터 조회 완료. (메시지 이력에 추가)")
 
-    # 0. 질문 분류 (업무 도메인 질문은 기본적으로 RAG를 사용)
-    classification = classify_question(llm, user_query)
-    use_rag = classification == "NEED_RAG"
-    logger.info("[Question Classification] %s", classification)
+            tool_messages.append(
+                ToolMessage(
+                    content=final_content,  # 검증된 문자열 사용
+                    tool_call_id=tool_call["id"],
+                    name=tool_name
+                )
+            )
 
-    # A. RAG 필요 없는 질문 → LLM 바로 응답
-    if not use_rag:
-        response = llm.invoke([HumanMessage(content=user_query)])
+        except Exception as e:
+            # 개별 도구 에러 처리 (멈추지 않고 에러 메시지를 LLM에게 전달)
+            logger.error(f"[Tool Execution Error] {tool_name} 실행 실패: {e}", exc_info=True)
+            tool_messages.append(
+                ToolMessage(
+                    content=f"Error: {str(e)}",
+                    tool_call_id=tool_call["id"],
+                    name=tool_name,
+                )
+            )
 
-        return {
-            "answer": _message_content(response),
-            "attribution": []        # RAG 미사용
-        }
-    # B. RAG 필요한 경우만 아래 로직 수행
+    # ------------------------------------------------------------------
+    # 도구 결과도 없고, 이동 명령도 없는 경우 -> RAG 검색 수행
+    # ------------------------------------------------------------------
+    if not (tool_messages or pending_navigation):
+        logger.info("[Tool Fallback] 유효한 도구 결과 및 이동 명령 없음 -> RAG로 전환")
+        return None
+
+    # ------------------------------------------------------------------
+    # 도구 실행 후 최종 답변 생성 (Generator)
+    # ------------------------------------------------------------------
+    # 도구 메시지가 있거나(OR) 화면 이동 명령이 있다면 RAG를 스킵하고 여기서 처리
+    final_answer_text = ""
+
+    # Case A: 도구 실행 결과(데이터)가 있는 경우 -> LLM이 내용을 정리해서 답변
+    if tool_messages:
+        logger.info(f"[Tool Finalizing] 총 {len(tool_messages)}건의 정보를 바탕으로 답변 생성 중...")
+
+        # 대화 이력 재구성: [시스템, 유저질문, (AI의 도구호출), 도구결과1, 도구결과2...]
+        history = router_messages + [tool_check_response] + tool_messages
+
+        # 순수 LLM으로 최종 답변 생성
+        final_response = llm.invoke(history)
+        final_answer_text = final_response.content
+
+    # Case B: 데이터는 없지만 화면 이동 명령만 있는 경우 ("설정 화면으로 가줘")
+    else:
+        logger.info("[Tool Finalizing] 데이터 조회 없이 화면 이동만 수행합니다.")
+        final_answer_text = "요청하신 화면으로 이동합니다."
+
+    # --------------------------------------------------------------
+    # 결과 반환 처리
+    # --------------------------------------------------------------
+
+    # 1. 화면 이동 명령이 있는 경우
+    if pending_navigation:
+        logger.info(f"[Final Step] 페이지 이동 명령 실행: {pending_navigation.get('target_url')}")
+
+        # LLM이 만든 답변(혹은 기본 문구)을 이동 명령 패키지에 담음
+        pending_navigation["answer"] = final_answer_text
+
+        # 이동 명령 반환 (RAG 스킵)
+        return pending_navigation
+
+    # 2. 이동 없이 답변만 있는 경우
+    return {
+        "answer": final_answer_text,
+        "attribution": []
+    }
+
+
+def _direct_answer(response, route_diagnostics: Optional[dict] = None) -> dict:
+    """RAG 필요 없는 질문의 LLM 응답을 결과 형식으로 감싼다."""
+    return {
+        "answer": _message_content(response),
+        "attribution": [],       # RAG 미사용
+        "diagnostics": {
+            "classification": "NO_RAG",
+            **(route_diagnostics or {}),
+        },
+    }
+
+
+def _generate_rag_answer(
+    llm,
+    vectordb,
+    user_query: str,
+    classification: str,
+    refined_query: str,
+    retriever_top_k: int,
+    route_diagnostics: Optional[dict] = None,
+    query_vector: Optional[list[float]] = None,
+) -> dict:
+    """검색 → 필터링 → (재정렬) → context 구성 → 답변 생성"""
+    route_diagnostics = route_diagnostics or {}
     try:
-        refined_query = refine_query(llm, user_query)
         logger.info("[Query Refinement] 원본=%r -> 변환=%r", user_query, refined_query)
 
         # 1. Retrieval (검색)
@@ -549,7 +859,8 @@ def run_rag_chain(
             vectordb=vectordb,
             user_query=user_query,
             refined_query=refined_query,
-            top_k=retriever_top_k
+            top_k=retriever_top_k,
+            query_vector=query_vector,
         )
 
         if not retrieved_docs:
@@ -559,6 +870,7 @@ def run_rag_chain(
                 "diagnostics": {
                     "classification": classification,
                     "refined_query": refined_query,
+                    **route_diagnostics,
                     "retrieved_count": 0,
                 },
             }
@@ -574,6 +886,7 @@ def run_rag_chain(
                 "diagnostics": {
                     "classification": classification,
                     "refined_query": refined_query,
+                    **route_diagnostics,
                     "retrieved_count": len(retrieved_docs),
                     "filtered_count": 0,
                 },
@@ -642,6 +955,7 @@ def run_rag_chain(
                 "diagnostics": {
                     "classification": classification,
                     "refined_query": refined_query,
+                    **route_diagnostics,
                     "retrieved_count": len(retrieved_docs),
                     "filtered_count": len(filtered_docs),
                     "final_context_count": 0,
@@ -674,6 +988,7 @@ def run_rag_chain(
             "diagnostics": {
                 "classification": classification,
                 "refined_query": refined_query,
+                **route_diagnostics,
                 "retrieved_count": len(retrieved_docs),
                 "filtered_count": len(filtered_docs),
                 "final_context_count": len(top_docs),
@@ -705,6 +1020,258 @@ def run_rag_chain(
             "attribution": []
         }
 
+def run_rag_chain(
+    llm,
+    vectordb,
+    user_query: str,
+    retriever_top_k: int = RETRIEVER_TOP_K,
+    structured_front_end: Optional[bool] = None
+):
+    """
+    structured_front_end가 True면 도구 판단 / 질문 분류 / 질의 정제를 LLM 호출 1번으로 처리하고,
+    응답 파싱에 실패하면 기존 3회 호출 경로로 진행한다. None이면 config의 USE_STRUCTURED_FRONT_END를 따른다.
+    USE_SEMANTIC_ANSWER_CACHE가 켜져 있으면 비슷한 질문의 이전 RAG 답변을 먼저 찾는다 (rag/answer_cache.py).
+    조회에 쓴 질문 임베딩은 원 질문 검색에 재사용하므로 임베딩 호출이 늘지 않는다.
+    """
+    query_vector = _embed_for_answer_cache(vectordb, user_query)
+    cached = _cached_answer(vectordb, user_query, query_vector)
+    if cached is not None:
+        return _with_stage_cache_stats(cached)
+
+    front_end = decide_front_end(llm, user_query) if _use_structured_front_end(structured_front_end) else None
+    result = _run_rag_chain_stages(llm, vectordb, user_query, retriever_top_k, front_end, query_vector)
+    return _with_stage_cache_stats(_remember_answer(user_query, query_vector, result))
+
+
+def _run_rag_chain_stages(
+    llm,
+    vectordb,
+    user_query: str,
+    retriever_top_k: int,
+    front_end: Optional[FrontEndDecision] = None,
+    query_vector: Optional[list[float]] = None
+):
+    
+    # 1. Function Calling (도구 사용) 시도
+    try:
+        router_messages = _build_router_messages(user_query)
+
+        if front_end is not None:
+            # 전처리 1회 호출 응답에 도구 호출 여부가 함께 담겨 있다.
+            tool_check_response = front_end.response
+        else:
+            # [최적화] 매번 리스트 생성 없이 미리 만들어둔 전역 상수 TOOLS 사용
+            llm_with_tools = llm.bind_tools(TOOLS)
+
+            # Router 단계: 도구 사용 여부 판단
+            tool_check_response = llm_with_tools.invoke(router_messages)
+
+        tool_result = _handle_tool_calls(llm, router_messages, tool_check_response, user_query)
+        if tool_result is not None:
+            return tool_result
+
+    except Exception as e:
+        logger.error(f"[Tool System Error] 도구 처리 중 오류 -> RAG로 전환: {e}", exc_info=True)
+
+    # 0. 질문 분류 (업무 도메인 질문은 기본적으로 RAG를 사용)
+    front_end_mode = "structured" if front_end is not None else "separate"
+    if front_end is not None and front_end.classification:
+        classification = front_end.classification
+        route_diagnostics = _route_diagnostics(front_end_mode, "structured", None)
+    else:
+        # 로컬 분류기가 확실하게 판단한 질문은 LLM 분류 호출을 생략한다.
+        local = _local_pre_classification(user_query)
+        if local is not None and local.decided:
+            classification = local.label
+            route_diagnostics = _route_diagnostics(front_end_mode, "local", local)
+        else:
+            classification = classify_question(llm, user_query)
+            route_diagnostics = _route_diagnostics(front_end_mode, "llm", local)
+    use_rag = classification == "NEED_RAG"
+    logger.info("[Question Classification] %s (%s)", classification, route_diagnostics["classification_path"])
+
+    # A. RAG 필요 없는 질문 → LLM 바로 응답
+    if not use_rag:
+        return _direct_answer(llm.invoke([HumanMessage(content=user_query)]), route_diagnostics)
+
+    # B. RAG 필요한 경우만 아래 로직 수행
+    if front_end is not None and front_end.refined_query:
+        refined_query = front_end.refined_query
+    else:
+        refined_query = refine_query(llm, user_query)
+    return _generate_rag_answer(
+        llm, vectordb, user_query, classification, refined_query, retriever_top_k, route_diagnostics, query_vector
+    )
+
+
+async def _ainvoke_router(llm, router_messages: list):
+    return await llm.bind_tools(TOOLS).ainvoke(router_messages)
+
+
+def _cancel_tasks(*tasks: Optional[asyncio.Task]) -> None:
+    for task in tasks:
+        if task is not None and not task.done():
+            task.cancel()
+
+
+def _start_classification_tasks(llm, user_query: str, local_label: Optional[str]):
+    """
+    (분류 task, 질의 정제 task)를 시작한다.
+    로컬 분류기가 확실하게 판단했으면 분류 LLM 호출을 생략하고(None), NO_RAG면 질의 정제도 시작하지 않는다.
+    """
+    classify_task = None if local_label else asyncio.create_task(aclassify_question(llm, user_query))
+    refine_task = None if local_label == "NO_RAG" else asyncio.create_task(arefine_query(llm, user_query))
+
+    if classify_task is not None and refine_task is not None:
+        def cancel_refine_if_no_rag(task: asyncio.Task) -> None:
+            if not task.cancelled() and task.result() != "NEED_RAG":
+                _cancel_tasks(refine_task)
+
+        classify_task.add_done_callback(cancel_refine_if_no_rag)
+    return classify_task, refine_task
+
+
+async def arun_rag_chain(
+    llm,
+    vectordb,
+    user_query: str,
+    retriever_top_k: int = RETRIEVER_TOP_K,
+    structured_front_end: Optional[bool] = None
+):
+    """
+    run_rag_chain의 비동기 버전. 결과 형식과 diagnostics는 같다.
+    Router(도구 판단) / 질문 분류 / 검색 질의 정제는 모두 원 질문만 필요하므로 동시에 시작하고,
+    필요 없어진 단계는 취소한다.
+    - Router가 등록된 도구를 호출하면 분류/정제를 취소
+    - 분류 결과가 NO_RAG면 정제를 취소
+    - 로컬 분류기가 확실하게 판단한 질문은 분류 LLM 호출을 시작하지 않음 (NO_RAG면 정제도 시작하지 않음)
+    도구 실행과 검색/재정렬/답변 생성은 기존 동기 단계를 스레드에서 그대로 실행한다.
+    structured_front_end가 켜져 있으면 전처리 1회 호출을 먼저 시도하고, 실패할 때만 위의 동시 실행 경로로 진행한다.
+    답변 캐시(run_rag_chain과 같은 캐시)용 질문 임베딩도 위 단계들과 동시에 시작한다.
+    캐시에 비슷한 질문이 있으면 진행 중인 단계를 모두 취소하고, 없으면 그 임베딩을 원 질문 검색에 재사용한다.
+    """
+    embed_task = asyncio.create_task(_aembed_for_answer_cache(vectordb, user_query)) if USE_SEMANTIC_ANSWER_CACHE else None
+    stages_task = asyncio.create_task(
+        _arun_rag_chain_stages(llm, vectordb, user_query, retriever_top_k, structured_front_end, embed_task)
+    )
+    try:
+        query_vector = await embed_task if embed_task is not None else None
+        cached = _cached_answer(vectordb, user_query, query_vector)
+        if cached is not None:
+            return _with_stage_cache_stats(cached)
+
+        result = await stages_task
+        return _with_stage_cache_stats(_remember_answer(user_query, query_vector, result))
+    finally:
+        _cancel_tasks(embed_task, stages_task)
+
+
+async def _arun_rag_chain_stages(
+    llm,
+    vectordb,
+    user_query: str,
+    retriever_top_k: int,
+    structured_front_end: Optional[bool],
+    embed_task: Optional[asyncio.Task] = None
+):
+    """arun_rag_chain의 캐시 조회 이후 단계. embed_task는 검색 직전에만 기다린다."""
+    if _use_structured_front_end(structured_front_end):
+        front_end = await adecide_front_end(llm, user_query)
+        if front_end is not None:
+            query_vector = await embed_task if embed_task is not None else None
+            return await asyncio.to_thread(
+                _run_rag_chain_stages, llm, vectordb, user_query, retriever_top_k, front_end, query_vector
+            )
+
+    local = await _alocal_pre_classification(user_query)
+    local_label = local.label if local is not None and local.decided else None
+
+    router_messages = _build_router_messages(user_query)
+    router_task = asyncio.create_task(_ainvoke_router(llm, router_messages))
+    classify_task, refine_task = _start_classification_tasks(llm, user_query, local_label)
+    branches_cancelled = False
+
+    try:
+        # 1. Function Calling (도구 사용) 시도
+        try:
+            tool_check_response = await router_task
+            if any(tool_call["name"] in TOOL_MAP for tool_call in tool_check_response.tool_calls):
+                _cancel_tasks(classify_task, refine_task)
+                branches_cancelled = True
+
+            tool_result = await asyncio.to_thread(
+                _handle_tool_calls, llm, router_messages, tool_check_response, user_query
+            )
+            if tool_result is not None:
+                return tool_result
+
+        except Exception as e:
+            logger.error(f"[Tool System Error] 도구 처리 중 오류 -> RAG로 전환: {e}", exc_info=True)
+
+        # 도구 처리가 실패해 RAG로 전환하는 경우, 취소했던 분류/정제를 다시 시작한다.
+        if branches_cancelled:
+            classify_task, refine_task = _start_classification_tasks(llm, user_query, local_label)
+
+        # 0. 질문 분류 (업무 도메인 질문은 기본적으로 RAG를 사용)
+        if local_label is not None:
+            classification = local_label
+            route_diagnostics = _route_diagnostics("separate", "local", local)
+        else:
+            classification = await classify_task
+            route_diagnostics = _route_diagnostics("separate", "llm", local)
+        use_rag = classification == "NEED_RAG"
+        logger.info("[Question Classification] %s (%s)", classification, route_diagnostics["classification_path"])
+
+        # A. RAG 필요 없는 질문 → LLM 바로 응답
+        if not use_rag:
+            return _direct_answer(await llm.ainvoke([HumanMessage(content=user_query)]), route_diagnostics)
+
+        # B. RAG 필요한 경우만 아래 로직 수행
+        refined_query = await refine_task
+        query_vector = await embed_task if embed_task is not None else None
+        return await asyncio.to_thread(
+            _generate_rag_answer, llm, vectordb, user_query, classification, refined_query, retriever_top_k,
+            route_diagnostics, query_vector,
+        )
+    finally:
+        _cancel_tasks(router_task, classify_task, refine_task)
+
+
+def run_rag_chain_concurrent(
+    llm,
+    vectordb,
+    user_query: str,
+    retriever_top_k: int = RETRIEVER_TOP_K,
+    structured_front_end: Optional[bool] = None
+):
+    """
+    동기 호출부용 arun_rag_chain 래퍼.
+    호출 스레드에서 이미 이벤트 루프가 돌고 있어도 쓸 수 있도록 전용 스레드의 이벤트 루프에서 실행한다.
+    여러 스레드에서 동시에 호출하면 같은 루프 안에서 동시에 처리된다.
+    """
+    loop = _get_chain_loop()
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is loop:
+        raise RuntimeError("run_rag_chain_concurrent cannot be called from the chain event loop; await arun_rag_chain")
+
+    return asyncio.run_coroutine_threadsafe(
+        arun_rag_chain(llm, vectordb, user_query, retriever_top_k, structured_front_end), loop
+    ).result()
+
+
+def _get_chain_loop() -> asyncio.AbstractEventLoop:
+    global _CHAIN_LOOP
+    if _CHAIN_LOOP is None:
+        with _CHAIN_LOOP_LOCK:
+            if _CHAIN_LOOP is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="rag-chain-loop", daemon=True).start()
+                _CHAIN_LOOP = loop
+    return _CHAIN_LOOP
+
 """
 RAG Chain 구성
 - Retrieval: Chroma(HNSW) 기반 후보 문서 검색
@@ -250,4 +250,47 @@ PREDICTION_METADATA = {
     "칠판보조장": {"code": "56121798", "lifespan": 10},
     "인터랙티브화이트보드": {"code": "44111911", "lifespan": 7},
     "레이저프린터": {"code": "43212105", "lifespan": 5},
-}
\ No newline at end of file
+}
+
+# ---------------------------------------------------------
+# 3. [로컬 질문 분류기] 업무 도메인 용어 / NO_RAG 예시 질문
+# ---------------------------------------------------------
+# 질문(공백/기호 제거, 소문자)에 아래 용어가 하나라도 포함되면 업무 문서 근거가 필요한 질문(NEED_RAG)으로 본다.
+# 질문 분류 프롬프트(build_question_classifier_prompt)와 질의 정제 프롬프트의 도메인 용어를 기준으로 한다.
+# 물품명(KEYWORD_SYNONYMS, PREDICTION_METADATA)은 rag/query_classifier.py에서 함께 사용한다.
+DOMAIN_TERMS = (
+    "취득", "등록", "검수", "반납", "불용", "처분", "관리전환", "사용주기", "내용연수",
+    "규정", "절차", "g2b", "물품고유번호", "고유번호", "목록번호", "자산번호", "물품분류",
+    "정리일자", "정리구분", "운용부서", "운용상태", "운용", "보유현황", "재물조사", "매각", "폐기",
+    "승인요청", "승인취소", "물품", "자산", "비품", "기자재",
+)
+
+# NO_RAG 학습용 예시 질문 (인사말, 잡담, 자기소개, 챗봇 사용법, 다시 써달라는 요청 등)
+NO_RAG_SEED_QUERIES = (
+    "안녕",
+    "안녕하세요",
+    "하이",
+    "반가워",
+    "고마워",
+    "감사합니다",
+    "수고했어",
+    "잘 가",
+    "너는 누구야?",
+    "자기소개 해줘",
+    "넌 뭘 할 수 있어?",
+    "이름이 뭐야?",
+    "오늘 기분 어때?",
+    "심심해",
+    "농담 하나 해줘",
+    "오늘 날씨 어때?",
+    "점심 메뉴 추천해줘",
+    "ㅋㅋㅋ",
+    "좋아",
+    "알겠어",
+    "방금 내 질문 다시 써줘",
+    "더 짧게 다시 말해줘",
+    "영어로 번역해줘",
+    "테스트",
+    "hello",
+    "thanks",
+)
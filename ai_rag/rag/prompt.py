@@ -289,3 +289,27 @@ def build_tool_aware_system_prompt():
     - 위와 같은 질문에서는 도구를 호출하지 말고 RAG 검색 단계로 넘기세요.
     - 다만, 위와 같은 질문에 자산의 실시간 정보 조회나 수명 예측이 **함께** 필요한 경우에는, [판단 기준 1]에 따라 해당 목적에 맞는 도구는 병행해서 사용할 수 있습니다.
     """)
+
+
+def build_structured_front_end_prompt():
+    """
+    [RAG 전처리 1회 호출용] 도구 판단 + NEED_RAG/NO_RAG 분류 + 검색 질의 정제를 한 번에 요청하는 시스템 프롬프트.
+    도구가 필요하면 도구를 호출하고, 아니면 JSON 스키마(classification, refined_query)에 맞춰 응답하게 한다.
+    """
+    return build_tool_aware_system_prompt() + textwrap.dedent("""
+    [판단 기준 3: 도구를 사용하지 않는 경우의 응답 형식]
+    도구를 호출하지 않을 때는 아래 두 항목을 JSON으로만 응답하세요.
+
+    1. classification: 매뉴얼/FAQ/업무 지식 검색이 필요한지 판단
+    - NEED_RAG: 물품 취득, 등록, 검수, 반납, 불용, 처분, 관리전환, 사용주기, 내용연수, 규정, 절차, 시스템 사용법,
+      "어떻게 해?", "기준이 뭐야?", "차이가 뭐야?", "절차 알려줘"처럼 업무 문서 근거가 필요한 질문,
+      대학 물품 관리 업무와 관련된 용어가 하나라도 포함된 질문
+    - NO_RAG: 인사말, 잡담, 자기소개, 챗봇 사용법, 질문을 다시 써달라는 요청처럼 지식베이스 근거가 필요 없는 질문
+    - 애매하면 NEED_RAG로 판단하세요.
+
+    2. refined_query: 사용자 질문을 벡터 검색에 적합한 한국어 검색 질의 1문장으로 바꾼 것
+    - 원 질문의 핵심 키워드와 도메인 용어(G2B, 물품고유번호, 내용연수 등)를 보존하세요.
+    - 구어체 표현은 행정 매뉴얼에서 쓰일 법한 표현으로 정리하세요. (예: "버리는 법" -> "물품 불용 또는 처분 절차")
+    - G2B목록번호, 물품고유번호, 자산번호, 날짜, 부서명, 물품명은 절대 삭제하지 마세요.
+    - 잘 모르겠으면 원 질문을 거의 그대로 유지하세요.
+    """)
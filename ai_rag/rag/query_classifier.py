@@ -0,0 +1,243 @@
+"""
+로컬 질문 분류기 (classify_question LLM 호출 전 단계)
+- 업무 도메인 용어(rag/dictionaries.py)가 포함된 질문은 바로 NEED_RAG로 판단한다.
+- 그 외 질문은 글자 n-gram TF-IDF + 로지스틱 회귀 모델로 NEED_RAG 확률을 계산한다.
+  학습 데이터: 체인 진단 로그(chain_diagnostics.jsonl)의 LLM 분류 결과 + 매뉴얼 QA 질문(NEED_RAG) + NO_RAG 예시 질문
+  (같은 질문은 한 번만 사용. 현재 진단 로그는 매뉴얼 QA 평가 질문을 돌린 결과라 두 출처가 대부분 겹친다)
+- NEED_RAG 확률이 설정 임계값 밖(확실한 구간)일 때만 로컬 결과를 쓰고, 애매한 구간은 LLM 분류로 넘긴다.
+- evaluate_held_out: 학습에 쓰지 않은 질문으로 확실한 구간의 정밀도/재현율을 잰다.
+  `python -m rag.query_classifier` (ai_rag 폴더에서 실행)로 기본 학습 데이터 기준 결과를 출력한다.
+"""
+
+import json
+import logging
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Iterable, NamedTuple, Optional
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+
+from rag.dictionaries import DOMAIN_TERMS, KEYWORD_SYNONYMS, NO_RAG_SEED_QUERIES, PREDICTION_METADATA
+try:
+    from app.config import (
+        LOCAL_CLASSIFIER_NEED_RAG_THRESHOLD,
+        LOCAL_CLASSIFIER_NO_RAG_THRESHOLD,
+    )
+except ModuleNotFoundError:
+    project_root = Path(__file__).resolve().parents[2]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+    from app.config import (
+        LOCAL_CLASSIFIER_NEED_RAG_THRESHOLD,
+        LOCAL_CLASSIFIER_NO_RAG_THRESHOLD,
+    )
+
+
+logger = logging.getLogger(__name__)
+
+AI_RAG_DIR = Path(__file__).resolve().parents[1]
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# 기본 학습 데이터 경로
+CHAIN_DIAGNOSTICS_LOG_PATH = AI_RAG_DIR / "results" / "chain_diagnostics" / "chain_diagnostics.jsonl"
+MANUAL_QA_PATH = PROJECT_ROOT / "dataset" / "qa_output" / "manual_qa_final.json"
+
+LABELS = ("NEED_RAG", "NO_RAG")
+# 단어 경계 안쪽의 1~3글자 n-gram
+NGRAM_RANGE = (1, 3)
+
+# 도메인 용어가 포함된 질문의 최소 NEED_RAG 확률
+DOMAIN_TERM_PROBABILITY = 0.97
+
+
+def _normalize(text: str) -> str:
+    """공백/기호를 제거하고 소문자로 바꾼다. 예: "불용 차이?" -> "불용차이" """
+    return re.sub(r"[^a-zA-Z0-9가-힣ㄱ-ㅎ]", "", str(text)).lower()
+
+
+def _build_domain_terms() -> tuple[str, ...]:
+    terms = {_normalize(term) for term in DOMAIN_TERMS}
+    terms.update(_normalize(term) for term in KEYWORD_SYNONYMS)
+    terms.update(_normalize(term) for term in KEYWORD_SYNONYMS.values())
+    terms.update(_normalize(term) for term in PREDICTION_METADATA)
+    # 한 글자/두 글자 약어(예: pc, tv, 빔)는 일반 대화에도 섞이므로 물품명 중 세 글자 이상만 사용한다.
+    return tuple(sorted(term for term in terms if term in DOMAIN_TERMS or len(term) >= 3))
+
+
+DOMAIN_TERM_SET = _build_domain_terms()
+
+
+class LocalClassification(NamedTuple):
+    label: str
+    # 판단한 label의 확률 (0.5 ~ 1.0)
+    confidence: float
+    # LLM 호출 없이 이 결과를 써도 되는지 (확실한 구간)
+    decided: bool
+    # "domain_term" | "model"
+    source: str
+
+
+def train_query_model(texts: Iterable[str], labels: Iterable[str]):
+    """글자 n-gram TF-IDF + 로지스틱 회귀. predict_proba의 두 번째 열이 NEED_RAG 확률이다."""
+    targets = [1 if label == "NEED_RAG" else 0 for label in labels]
+    model = make_pipeline(
+        TfidfVectorizer(analyzer="char_wb", ngram_range=NGRAM_RANGE, sublinear_tf=True),
+        # NO_RAG 예시가 훨씬 적으므로 클래스 가중치를 맞춘다.
+        LogisticRegression(class_weight="balanced", C=4.0, max_iter=1000),
+    )
+    return model.fit(list(texts), targets)
+
+
+def find_domain_term(text: str) -> Optional[str]:
+    normalized = _normalize(text)
+    return next((term for term in DOMAIN_TERM_SET if term in normalized), None)
+
+
+def load_training_examples(
+    log_paths: Iterable[Path] = (CHAIN_DIAGNOSTICS_LOG_PATH,),
+    qa_paths: Iterable[Path] = (MANUAL_QA_PATH,),
+) -> tuple[list[str], list[str]]:
+    """
+    (질문 목록, label 목록)을 반환한다.
+    - 진단 로그: LLM(또는 구조화 전처리)이 분류한 결과만 사용 (로컬 분류 결과로 다시 학습하지 않도록)
+    - 매뉴얼 QA 질문: NEED_RAG
+    - NO_RAG_SEED_QUERIES: NO_RAG
+    - 공백/기호만 다른 같은 질문은 처음 나온 것만 쓴다 (진단 로그 > 매뉴얼 QA > 예시 질문 순서).
+    """
+    texts: list[str] = []
+    labels: list[str] = []
+    seen: set[str] = set()
+
+    def add(text: str, label: str) -> None:
+        key = _normalize(text)
+        if key and key not in seen:
+            seen.add(key)
+            texts.append(text)
+            labels.append(label)
+
+    for path in log_paths:
+        if not Path(path).exists():
+            continue
+        with Path(path).open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                diagnostics = row.get("diagnostics") or {}
+                label = diagnostics.get("classification")
+                if not row.get("question") or label not in LABELS or diagnostics.get("classification_path") == "local":
+                    continue
+                add(row["question"], label)
+
+    for path in qa_paths:
+        if not Path(path).exists():
+            continue
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except json.JSONDecodeError as exc:
+            logger.warning("[Local Classifier] QA 데이터 파싱 실패 %s: %s", path, exc)
+            continue
+        for item in data if isinstance(data, list) else []:
+            if isinstance(item, dict) and item.get("question"):
+                add(item["question"], "NEED_RAG")
+
+    for text in NO_RAG_SEED_QUERIES:
+        add(text, "NO_RAG")
+    return texts, labels
+
+
+class LocalQueryClassifier:
+    def __init__(
+        self,
+        model: Any,
+        need_rag_threshold: float = LOCAL_CLASSIFIER_NEED_RAG_THRESHOLD,
+        no_rag_threshold: float = LOCAL_CLASSIFIER_NO_RAG_THRESHOLD,
+    ):
+        self.model = model
+        self.need_rag_threshold = need_rag_threshold
+        self.no_rag_threshold = no_rag_threshold
+
+    def classify(self, user_query: str) -> LocalClassification:
+        need_rag_proba = float(self.model.predict_proba([user_query])[0, 1])
+        source = "model"
+        if find_domain_term(user_query):
+            need_rag_proba = max(need_rag_proba, DOMAIN_TERM_PROBABILITY)
+            source = "domain_term"
+
+        label = "NEED_RAG" if need_rag_proba >= 0.5 else "NO_RAG"
+        confidence = need_rag_proba if label == "NEED_RAG" else 1.0 - need_rag_proba
+        decided = need_rag_proba >= self.need_rag_threshold or need_rag_proba <= self.no_rag_threshold
+        return LocalClassification(label, round(confidence, 4), decided, source)
+
+
+def evaluate_held_out(
+    texts: list[str],
+    labels: list[str],
+    test_size: float = 0.3,
+    seed: int = 42,
+    need_rag_threshold: float = LOCAL_CLASSIFIER_NEED_RAG_THRESHOLD,
+    no_rag_threshold: float = LOCAL_CLASSIFIER_NO_RAG_THRESHOLD,
+) -> dict:
+    """
+    라벨 비율을 유지해 나눈 평가용 질문으로 확실한 구간(decided)의 성능을 잰다.
+    - coverage: LLM 없이 로컬 결과로 결정된 질문 비율
+    - label별 precision: 로컬에서 그 label로 결정한 질문 중 정답 비율
+    - label별 recall: 그 label이 정답인 평가 질문 중 로컬에서 맞게 결정한 비율
+    """
+    train_texts, test_texts, train_labels, test_labels = train_test_split(
+        texts, labels, test_size=test_size, random_state=seed, stratify=labels
+    )
+    classifier = LocalQueryClassifier(train_query_model(train_texts, train_labels), need_rag_threshold, no_rag_threshold)
+    results = [classifier.classify(text) for text in test_texts]
+
+    report = {
+        "train_size": len(train_texts),
+        "test_size": len(test_texts),
+        "coverage": round(sum(result.decided for result in results) / len(results), 4),
+    }
+    for label in LABELS:
+        decided = [truth for truth, result in zip(test_labels, results) if result.decided and result.label == label]
+        correct = sum(truth == label for truth in decided)
+        support = test_labels.count(label)
+        report[label] = {
+            "support": support,
+            "decided": len(decided),
+            "precision": round(correct / len(decided), 4) if decided else None,
+            "recall": round(correct / support, 4) if support else None,
+        }
+    return report
+
+
+_classifier: Optional[LocalQueryClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def get_local_classifier() -> LocalQueryClassifier:
+    """기본 학습 데이터로 처음 한 번만 학습해 재사용한다 (수백 건 규모라 학습은 수십 ms 이내)."""
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                texts, labels = load_training_examples()
+                _classifier = LocalQueryClassifier(train_query_model(texts, labels))
+                logger.info(
+                    "[Local Classifier] 학습 완료: NEED_RAG=%d NO_RAG=%d",
+                    labels.count("NEED_RAG"),
+                    labels.count("NO_RAG"),
+                )
+    return _classifier
+
+
+def pre_classify_question(user_query: str) -> LocalClassification:
+    return get_local_classifier().classify(user_query)
+
+
+if __name__ == "__main__":
+    examples = load_training_examples()
+    print(json.dumps(evaluate_held_out(*examples), ensure_ascii=False, indent=2))
@@ -0,0 +1,234 @@
+"""
+질문 분류(classify_question) / 검색 질의 정제(refine_query) 결과 캐시
+- 두 단계는 같은 질문이면 거의 같은 결과를 내는 LLM 호출(temperature 0.1)이므로, 정규화한 질문 기준으로 결과를 재사용한다.
+- 키에 프롬프트 템플릿 + 모델 이름의 해시(prompt_version)를 넣어, rag/prompt.py를 고치거나 모델을 바꾸면 이전 결과를 쓰지 않는다.
+- 메모리 LRU가 기본이고, db_path를 지정하면 SQLite 파일에도 저장해 서버를 다시 켜도 재사용한다.
+  (SQLite 쪽은 행 수가 max_size를 넘을 때만 저장 순서 기준으로 오래된 결과를 정리한다)
+- 비동기 경로는 aget/aset을 쓴다. SQLite를 쓸 때는 파일 I/O를 asyncio.to_thread로 넘겨 이벤트 루프를 막지 않는다.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+try:
+    from app.config import (
+        STAGE_RESULT_CACHE_DB_PATH,
+        STAGE_RESULT_CACHE_MAX_SIZE,
+    )
+except ModuleNotFoundError:
+    project_root = Path(__file__).resolve().parents[2]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+    from app.config import (
+        STAGE_RESULT_CACHE_DB_PATH,
+        STAGE_RESULT_CACHE_MAX_SIZE,
+    )
+
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("classify", "refine")
+
+
+def normalize_query(user_query: str) -> str:
+    """NFKC 정규화 + 소문자 + 공백 정리 + 끝 문장부호 제거. 예: " 반납은  어떻게 해?? " -> "반납은 어떻게 해" """
+    text = unicodedata.normalize("NFKC", str(user_query)).lower()
+    text = re.sub(r"\s+", " ", text).strip()
+    return re.sub(r"[\s?!.~…]+$", "", text)
+
+
+def prompt_version(template: str, model_name: str = "") -> str:
+    return hashlib.sha1(f"{model_name}\n{template}".encode("utf-8")).hexdigest()[:16]
+
+
+class StageResultCache:
+    def __init__(self, max_size: int = STAGE_RESULT_CACHE_MAX_SIZE, db_path: Optional[Path] = None):
+        self.max_size = max(0, max_size)
+        self._items: "OrderedDict[tuple, str]" = OrderedDict()  # (stage, prompt_version, 정규화 질문) -> 결과
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()  # SQLite 연결 전용 (메모리 조회가 파일 I/O를 기다리지 않도록 분리)
+        self._db_rows = 0
+        self._stats = {stage: {"hits": 0, "misses": 0} for stage in STAGES}
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_path is not None:
+            self._open_db(Path(db_path))
+
+    def _open_db(self, db_path: Path) -> None:
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(db_path), check_same_thread=False, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS stage_results (
+                    stage          TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    query          TEXT NOT NULL,
+                    result         TEXT NOT NULL,
+                    created_at     REAL NOT NULL,
+                    PRIMARY KEY (stage, prompt_version, query)
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_stage_results_created ON stage_results(created_at)")
+            self._db_rows = conn.execute("SELECT COUNT(*) FROM stage_results").fetchone()[0]
+            self._conn = conn
+        except sqlite3.Error as e:
+            logger.warning(f"[Stage Cache] SQLite 파일을 열 수 없어 메모리 캐시만 사용: {e}")
+
+    @property
+    def uses_db(self) -> bool:
+        return self._conn is not None
+
+    def get(self, stage: str, version: str, user_query: str) -> Optional[str]:
+        key = (stage, version, normalize_query(user_query))
+        with self._lock:
+            result = self._items.get(key)
+            if result is not None:
+                self._items.move_to_end(key)
+                self._count(stage, "hits")
+                return result
+        result = self._db_get(key) if self._conn is not None else None
+        with self._lock:
+            if result is None:
+                self._count(stage, "misses")
+                return None
+            self._put(key, result)
+            self._count(stage, "hits")
+            return result
+
+    def set(self, stage: str, version: str, user_query: str, result: str) -> None:
+        if self.max_size == 0:
+            return
+        key = (stage, version, normalize_query(user_query))
+        with self._lock:
+            self._put(key, result)
+        if self._conn is not None:
+            self._db_set(key, result)
+
+    async def aget(self, stage: str, version: str, user_query: str) -> Optional[str]:
+        if self._conn is None:
+            return self.get(stage, version, user_query)
+        return await asyncio.to_thread(self.get, stage, version, user_query)
+
+    async def aset(self, stage: str, version: str, user_query: str, result: str) -> None:
+        if self._conn is None:
+            self.set(stage, version, user_query, result)
+            return
+        await asyncio.to_thread(self.set, stage, version, user_query, result)
+
+    def stats(self) -> dict:
+        """단계별 누적 적중 수 / 미적중 수 / 적중률"""
+        with self._lock:
+            return {
+                stage: {
+                    **counts,
+                    "hit_rate": (
+                        round(counts["hits"] / (counts["hits"] + counts["misses"]), 3)
+                        if counts["hits"] + counts["misses"] else None
+                    ),
+                }
+                for stage, counts in self._stats.items()
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+        with self._db_lock:
+            if self._conn is not None:
+                try:
+                    self._conn.execute("DELETE FROM stage_results")
+                    self._db_rows = 0
+                except sqlite3.Error as e:
+                    logger.warning(f"[Stage Cache] SQLite 삭제 실패: {e}")
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    # --- 내부 함수 (_count/_put은 _lock, _db_*는 스스로 _db_lock을 잡는다) ---
+    def _count(self, stage: str, field: str) -> None:
+        self._stats.setdefault(stage, {"hits": 0, "misses": 0})[field] += 1
+
+    def _put(self, key: tuple, result: str) -> None:
+        self._items[key] = result
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def _db_get(self, key: tuple) -> Optional[str]:
+        with self._db_lock:
+            if self._conn is None:
+                return None
+            try:
+                row = self._conn.execute(
+                    "SELECT result FROM stage_results WHERE stage = ? AND prompt_version = ? AND query = ?", key
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"[Stage Cache] SQLite 조회 실패: {e}")
+                return None
+        return row[0] if row else None
+
+    def _db_set(self, key: tuple, result: str) -> None:
+        with self._db_lock:
+            if self._conn is None:
+                return
+            try:
+                # 기존 행을 먼저 갱신해 보고, 없을 때만 추가해 행 수를 정확히 센다.
+                updated = self._conn.execute(
+                    "UPDATE stage_results SET result = ?, created_at = ? "
+                    "WHERE stage = ? AND prompt_version = ? AND query = ?",
+                    (result, time.time(), *key),
+                ).rowcount
+                if not updated:
+                    self._conn.execute(
+                        "INSERT INTO stage_results (stage, prompt_version, query, result, created_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (*key, result, time.time()),
+                    )
+                    self._db_rows += 1
+                if self._db_rows > self.max_size:
+                    self._db_prune()
+            except sqlite3.Error as e:
+                logger.warning(f"[Stage Cache] SQLite 저장 실패: {e}")
+
+    def _db_prune(self) -> None:
+        """max_size를 넘으면 오래된 순서로 정리한다. 매번 정리하지 않도록 max_size의 90%까지 줄여 둔다."""
+        keep = self.max_size - self.max_size // 10
+        # 이전 프롬프트 버전의 결과도 오래된 순서로 함께 정리된다.
+        self._conn.execute(
+            "DELETE FROM stage_results WHERE rowid IN ("
+            "SELECT rowid FROM stage_results ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (keep,),
+        )
+        self._db_rows = self._conn.execute("SELECT COUNT(*) FROM stage_results").fetchone()[0]
+
+
+_stage_cache: Optional[StageResultCache] = None
+_stage_cache_lock = threading.Lock()
+
+
+def get_stage_cache() -> StageResultCache:
+    global _stage_cache
+    if _stage_cache is None:
+        with _stage_cache_lock:
+            if _stage_cache is None:
+                db_path = Path(STAGE_RESULT_CACHE_DB_PATH) if STAGE_RESULT_CACHE_DB_PATH else None
+                _stage_cache = StageResultCache(STAGE_RESULT_CACHE_MAX_SIZE, db_path)
+    return _stage_cache
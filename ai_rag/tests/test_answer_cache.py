@@ -0,0 +1,118 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from rag import answer_cache
+from rag.answer_cache import SemanticAnswerCache, index_version, is_cacheable, lexical_guard
+
+
+def _result(answer: str = "반납 절차 답변") -> dict:
+    return {
+        "answer": answer,
+        "attribution": [{"doc_id": "doc-1"}],
+        "diagnostics": {"classification": "NEED_RAG", "final_context_count": 1},
+    }
+
+
+class TestLexicalGuard(unittest.TestCase):
+    def test_asset_ids_dates_and_relative_dates_are_extracted(self):
+        self.assertEqual(
+            lexical_guard("G2B목록번호 12345678-abcdefg 물품 2024년 3월 상태"),
+            frozenset({"g2b", "12345678-abcdefg", "2024", "3"}),
+        )
+        self.assertEqual(lexical_guard("이번 달 반납 현황"), frozenset({"이번달"}))
+        self.assertEqual(lexical_guard("반납 절차 알려줘"), frozenset())
+
+
+class TestSemanticAnswerCache(unittest.TestCase):
+    def test_hit_requires_similarity_and_same_lexical_guard(self):
+        cache = SemanticAnswerCache(max_size=8, ttl_seconds=60, similarity_threshold=0.95)
+        cache.store("12345678 물품 반납 방법", [1.0, 0.0], _result())
+
+        self.assertIsNotNone(cache.lookup("12345678 물품은 어떻게 반납해?", [0.99, 0.05]))
+        self.assertIsNone(cache.lookup("87654321 물품 반납 방법", [1.0, 0.0]))
+        self.assertIsNone(cache.lookup("12345678 물품 불용 방법", [0.6, 0.8]))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_returned_result_is_a_copy(self):
+        cache = SemanticAnswerCache(max_size=8, ttl_seconds=60, similarity_threshold=0.95)
+        cache.store("반납 방법", [1.0, 0.0], _result())
+
+        cache.lookup("반납 방법", [1.0, 0.0]).result["attribution"].clear()
+
+        self.assertEqual(cache.lookup("반납 방법", [1.0, 0.0]).result["attribution"], [{"doc_id": "doc-1"}])
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = SemanticAnswerCache(max_size=2, ttl_seconds=60, similarity_threshold=0.95)
+        cache.store("반납", [1.0, 0.0, 0.0], _result("반납"))
+        cache.store("불용", [0.0, 1.0, 0.0], _result("불용"))
+        cache.lookup("반납", [1.0, 0.0, 0.0])
+        cache.store("처분", [0.0, 0.0, 1.0], _result("처분"))
+
+        self.assertIsNotNone(cache.lookup("반납", [1.0, 0.0, 0.0]))
+        self.assertIsNone(cache.lookup("불용", [0.0, 1.0, 0.0]))
+
+    def test_missed_lookup_does_not_refresh_scanned_entries(self):
+        cache = SemanticAnswerCache(max_size=2, ttl_seconds=60, similarity_threshold=0.95)
+        cache.store("반납", [1.0, 0.0, 0.0], _result("반납"))
+        cache.store("불용", [0.0, 1.0, 0.0], _result("불용"))
+        # 후보를 모두 비교하지만 임계값 미만이므로 "반납"은 최근 사용으로 바뀌지 않는다.
+        self.assertIsNone(cache.lookup("반납", [0.7, 0.0, 0.7]))
+        cache.store("처분", [0.0, 0.0, 1.0], _result("처분"))
+
+        self.assertIsNone(cache.lookup("반납", [1.0, 0.0, 0.0]))
+        self.assertEqual(cache.lookup("불용", [0.0, 1.0, 0.0]).cached_query, "불용")
+        self.assertEqual(len(cache), 2)
+
+    def test_expired_entry_is_not_returned(self):
+        cache = SemanticAnswerCache(max_size=8, ttl_seconds=10, similarity_threshold=0.95)
+        with patch.object(answer_cache.time, "monotonic", return_value=100.0):
+            cache.store("반납", [1.0, 0.0], _result())
+        with patch.object(answer_cache.time, "monotonic", return_value=111.0):
+            self.assertIsNone(cache.lookup("반납", [1.0, 0.0]))
+        self.assertEqual(len(cache), 0)
+
+    def test_index_change_clears_entries(self):
+        cache = SemanticAnswerCache(max_size=8, ttl_seconds=60, similarity_threshold=0.95)
+        cache.sync_index_version("v1")
+        cache.store("반납", [1.0, 0.0], _result())
+
+        cache.sync_index_version("v1")
+        self.assertEqual(len(cache), 1)
+        cache.sync_index_version("v2")
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.invalidations, 1)
+
+    def test_index_version_follows_rebuilt_chroma_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            sqlite_path = Path(tmp) / "chroma.sqlite3"
+            sqlite_path.write_bytes(b"old")
+            vectordb = SimpleNamespace(_collection=SimpleNamespace(id="collection-1"), _persist_directory=tmp)
+            before = index_version(vectordb)
+
+            sqlite_path.unlink()
+            sqlite_path.write_bytes(b"rebuilt index")
+
+            self.assertNotEqual(index_version(vectordb), before)
+            vectordb._collection = SimpleNamespace(id="collection-2")
+            self.assertTrue(index_version(vectordb).startswith("collection-2:"))
+
+    def test_only_generated_rag_answers_are_cacheable(self):
+        self.assertTrue(is_cacheable(_result()))
+        self.assertFalse(is_cacheable({"answer": "안녕하세요.", "attribution": []}))
+        self.assertFalse(
+            is_cacheable({"answer": "문서 없음", "attribution": [], "diagnostics": {"retrieved_count": 0}})
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,18 @@
+import asyncio
 import json
 import os
 import sys
+import tempfile
+import threading
 import unittest
-from unittest.mock import MagicMock, patch
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from langchain_core.documents import Document
 from langchain_core.messages import AIMessage
+from langchain_openai import ChatOpenAI
 
 
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -13,7 +20,9 @@ if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 
 from rag import chain
-from rag.chain import run_rag_chain
+from rag.answer_cache import SemanticAnswerCache
+from rag.stage_cache import StageResultCache
+from rag.chain import arun_rag_chain, run_rag_chain, run_rag_chain_concurrent
 
 
 def _doc(
@@ -46,6 +55,12 @@ class TestRunRagChain(unittest.TestCase):
         self.base_llm.bind_tools.return_value = self.tool_llm
         self.tool_llm.invoke.return_value = AIMessage(content="", tool_calls=[])
 
+        # 기존 테스트는 LLM 분류 경로를 검증하므로 로컬 분류기와 캐시를 끈다.
+        for name in ("USE_LOCAL_QUESTION_CLASSIFIER", "USE_SEMANTIC_ANSWER_CACHE", "USE_STAGE_RESULT_CACHE"):
+            flag_patch = patch.object(chain, name, False)
+            flag_patch.start()
+            self.addCleanup(flag_patch.stop)
+
     def test_rag_flow_uses_refined_query_and_returns_diagnostics(self):
         vectordb = MagicMock(name="vectordb")
         docs = [(_doc("doc-1"), 0.11), (_doc("doc-2"), 0.18)]
@@ -65,6 +80,7 @@ class TestRunRagChain(unittest.TestCase):
             user_query="반납은 어떻게 해?",
             refined_query="물품 반납 절차",
             top_k=chain.RETRIEVER_TOP_K,
+            query_vector=None,
         )
         self.assertEqual(result["answer"], "반납 절차 답변")
         self.assertEqual(result["diagnostics"]["classification"], "NEED_RAG")
@@ -126,6 +142,149 @@ class TestRunRagChain(unittest.TestCase):
         self.assertEqual(result["answer"], "노트북 재고는 10대입니다.")
         self.assertEqual(result["attribution"], [])
 
+    def test_structured_front_end_replaces_classifier_and_refiner_calls(self):
+        docs = [(_doc("doc-1"), 0.11), (_doc("doc-2"), 0.18)]
+        self.tool_llm.invoke.return_value = AIMessage(
+            content=json.dumps({"classification": "NEED_RAG", "refined_query": "물품 반납 절차"}, ensure_ascii=False)
+        )
+        self.base_llm.invoke.return_value = AIMessage(content="반납 절차 답변")
+
+        with (
+            patch.object(chain, "USE_RERANKING", False),
+            patch.object(chain, "classify_question") as classify_mock,
+            patch.object(chain, "refine_query") as refine_mock,
+            patch.object(chain, "retrieve_candidate_docs", return_value=docs) as retrieve_mock,
+            patch.object(chain, "filter_retrieved_docs", return_value=docs),
+        ):
+            result = run_rag_chain(self.base_llm, MagicMock(), "반납은 어떻게 해?", structured_front_end=True)
+
+        self.tool_llm.invoke.assert_called_once()
+        self.assertEqual(
+            self.base_llm.bind_tools.call_args.kwargs["response_format"], chain.FRONT_END_RESPONSE_SCHEMA
+        )
+        classify_mock.assert_not_called()
+        refine_mock.assert_not_called()
+        self.assertEqual(retrieve_mock.call_args.kwargs["refined_query"], "물품 반납 절차")
+        self.assertEqual(result["answer"], "반납 절차 답변")
+        self.assertEqual(result["diagnostics"]["front_end"], "structured")
+
+    def test_structured_front_end_falls_back_to_separate_calls_on_invalid_output(self):
+        docs = [(_doc("doc-1"), 0.11)]
+        self.tool_llm.invoke.side_effect = [
+            AIMessage(content="반납 절차를 검색하면 됩니다."),
+            AIMessage(content="", tool_calls=[]),
+        ]
+        self.base_llm.invoke.return_value = AIMessage(content="반납 절차 답변")
+
+        with (
+            patch.object(chain, "USE_RERANKING", False),
+            patch.object(chain, "classify_question", return_value="NEED_RAG") as classify_mock,
+            patch.object(chain, "refine_query", return_value="물품 반납 절차") as refine_mock,
+            patch.object(chain, "retrieve_candidate_docs", return_value=docs),
+            patch.object(chain, "filter_retrieved_docs", return_value=docs),
+        ):
+            result = run_rag_chain(self.base_llm, MagicMock(), "반납은 어떻게 해?", structured_front_end=True)
+
+        self.assertEqual(self.tool_llm.invoke.call_count, 2)
+        classify_mock.assert_called_once()
+        refine_mock.assert_called_once()
+        self.assertEqual(result["diagnostics"]["front_end"], "separate")
+
+    def test_structured_front_end_tool_call_skips_rag(self):
+        fake_tool = MagicMock()
+        fake_tool.invoke.return_value = json.dumps({"result": "재고 10대 있음"}, ensure_ascii=False)
+        self.tool_llm.invoke.return_value = AIMessage(
+            content="",
+            tool_calls=[{"name": "get_item_detail_info", "args": {"asset_name": "노트북"}, "id": "call-1"}],
+        )
+        self.base_llm.invoke.return_value = AIMessage(content="노트북 재고는 10대입니다.")
+
+        with (
+            patch.object(chain, "TOOL_MAP", {"get_item_detail_info": fake_tool}),
+            patch.object(chain, "classify_question") as classify_mock,
+        ):
+            result = run_rag_chain(self.base_llm, MagicMock(), "노트북 재고 조회해줘", structured_front_end=True)
+
+        self.tool_llm.invoke.assert_called_once()
+        classify_mock.assert_not_called()
+        self.assertEqual(result, {"answer": "노트북 재고는 10대입니다.", "attribution": []})
+
+    def test_local_classifier_decision_skips_llm_classification(self):
+        self.base_llm.invoke.return_value = AIMessage(content="안녕하세요.")
+        local = chain.LocalClassification("NO_RAG", 0.91, True, "model")
+
+        with (
+            patch.object(chain, "USE_LOCAL_QUESTION_CLASSIFIER", True),
+            patch.object(chain, "pre_classify_question", return_value=local),
+            patch.object(chain, "classify_question") as classify_mock,
+            patch.object(chain, "refine_query") as refine_mock,
+        ):
+            result = run_rag_chain(self.base_llm, MagicMock(), "안녕")
+
+        classify_mock.assert_not_called()
+        refine_mock.assert_not_called()
+        self.assertEqual(result["answer"], "안녕하세요.")
+        self.assertEqual(result["diagnostics"]["classification_path"], "local")
+        self.assertEqual(result["diagnostics"]["local_confidence"], 0.91)
+
+    def test_uncertain_local_classification_falls_back_to_llm(self):
+        self.base_llm.invoke.return_value = AIMessage(content="반납 절차 답변")
+        docs = [(_doc("doc-1"), 0.11)]
+        local = chain.LocalClassification("NEED_RAG", 0.62, False, "model")
+
+        with (
+            patch.object(chain, "USE_LOCAL_QUESTION_CLASSIFIER", True),
+            patch.object(chain, "USE_RERANKING", False),
+            patch.object(chain, "pre_classify_question", return_value=local),
+            patch.object(chain, "classify_question", return_value="NEED_RAG") as classify_mock,
+            patch.object(chain, "refine_query", return_value="물품 반납 절차"),
+            patch.object(chain, "retrieve_candidate_docs", return_value=docs),
+            patch.object(chain, "filter_retrieved_docs", return_value=docs),
+        ):
+            result = run_rag_chain(self.base_llm, MagicMock(), "로그인이 안돼요")
+
+        classify_mock.assert_called_once()
+        self.assertEqual(result["diagnostics"]["classification_path"], "llm")
+        self.assertEqual(result["diagnostics"]["local_classification"], "NEED_RAG")
+
+    def test_semantic_answer_cache_returns_stored_answer_for_similar_question(self):
+        vectordb = MagicMock(name="vectordb")
+        vectors = {"반납은 어떻게 해?": [1.0, 0.0], "반납 어떻게 하나요?": [0.99, 0.05], "불용은 어떻게 해?": [0.0, 1.0]}
+        vectordb.embeddings.embed_query.side_effect = vectors.__getitem__
+        docs = [(_doc("doc-1"), 0.11)]
+        self.base_llm.invoke.return_value = AIMessage(content="반납 절차 답변")
+
+        with (
+            patch.object(chain, "USE_SEMANTIC_ANSWER_CACHE", True),
+            patch.object(chain, "USE_RERANKING", False),
+            patch.object(chain, "get_answer_cache", return_value=SemanticAnswerCache(8, 60, 0.95)),
+            patch.object(chain, "classify_question", return_value="NEED_RAG") as classify_mock,
+            patch.object(chain, "refine_query", return_value="물품 반납 절차"),
+            patch.object(chain, "retrieve_candidate_docs", return_value=docs),
+            patch.object(chain, "filter_retrieved_docs", return_value=docs),
+        ):
+            first = run_rag_chain(self.base_llm, vectordb, "반납은 어떻게 해?")
+            cached = run_rag_chain(self.base_llm, vectordb, "반납 어떻게 하나요?")
+            different = run_rag_chain(self.base_llm, vectordb, "불용은 어떻게 해?")
+
+        self.assertEqual(classify_mock.call_count, 2)
+        self.assertFalse(first["diagnostics"]["answer_cache"]["hit"])
+        self.assertTrue(cached["diagnostics"]["answer_cache"]["hit"])
+        self.assertEqual(cached["diagnostics"]["answer_cache"]["cached_query"], "반납은 어떻게 해?")
+        self.assertEqual((cached["answer"], cached["attribution"]), (first["answer"], first["attribution"]))
+        self.assertFalse(different["diagnostics"]["answer_cache"]["hit"])
+
+    def test_retrieval_reuses_query_vector_for_original_question(self):
+        vectordb = MagicMock(name="vectordb")
+        vectordb.similarity_search_with_score.return_value = [(_doc("refined"), 0.1)]
+        vectordb.similarity_search_by_vector_with_relevance_scores.return_value = [(_doc("original"), 0.2)]
+
+        merged = chain.retrieve_candidate_docs(vectordb, "반납은 어떻게 해?", "물품 반납 절차", 10, [0.1, 0.2])
+
+        vectordb.similarity_search_with_score.assert_called_once_with(query="물품 반납 절차", k=10)
+        vectordb.similarity_search_by_vector_with_relevance_scores.assert_called_once_with(embedding=[0.1, 0.2], k=5)
+        self.assertEqual([doc.metadata["doc_id"] for doc, _score in merged], ["refined", "original"])
+
     def test_filter_retrieved_docs_uses_adaptive_cutoff_when_config_threshold_is_wide(self):
         docs = [
             (_doc("near"), 0.10),
@@ -146,6 +305,103 @@ class TestRunRagChain(unittest.TestCase):
 
         self.assertEqual(result, "NEED_RAG")
 
+    def test_classify_and_refine_results_are_reused_for_normalized_repeat(self):
+        fake_chain = MagicMock()
+        fake_chain.invoke.side_effect = ["NEED_RAG", "물품 반납 절차", "NEED_RAG"]
+        stage_cache = StageResultCache(max_size=8)
+
+        with (
+            patch.object(chain, "USE_STAGE_RESULT_CACHE", True),
+            patch.object(chain, "get_stage_cache", return_value=stage_cache),
+            patch.object(chain, "_build_text_chain", return_value=fake_chain),
+        ):
+            self.assertEqual(chain.classify_question(self.base_llm, "반납은 어떻게 해?"), "NEED_RAG")
+            self.assertEqual(chain.refine_query(self.base_llm, "반납은 어떻게 해?"), "물품 반납 절차")
+            self.assertEqual(chain.classify_question(self.base_llm, " 반납은  어떻게 해 "), "NEED_RAG")
+            self.assertEqual(chain.refine_query(self.base_llm, "반납은 어떻게 해??"), "물품 반납 절차")
+            self.assertEqual(fake_chain.invoke.call_count, 2)
+
+            # 프롬프트가 바뀌면 이전 결과를 쓰지 않는다.
+            with patch.object(chain, "build_question_classifier_prompt", return_value="new prompt {question}"):
+                chain.classify_question(self.base_llm, "반납은 어떻게 해?")
+            self.assertEqual(fake_chain.invoke.call_count, 3)
+
+        self.assertEqual(stage_cache.stats()["classify"]["hits"], 1)
+        self.assertEqual(stage_cache.stats()["refine"]["hit_rate"], 0.5)
+
+    def test_diagnostics_report_stage_cache_hit_rates(self):
+        self.base_llm.invoke.return_value = AIMessage(content="반납 절차 답변")
+        docs = [(_doc("doc-1"), 0.11)]
+
+        with (
+            patch.object(chain, "USE_STAGE_RESULT_CACHE", True),
+            patch.object(chain, "USE_RERANKING", False),
+            patch.object(chain, "get_stage_cache", return_value=StageResultCache(max_size=8)),
+            patch.object(chain, "classify_question", return_value="NEED_RAG"),
+            patch.object(chain, "refine_query", return_value="물품 반납 절차"),
+            patch.object(chain, "retrieve_candidate_docs", return_value=docs),
+            patch.object(chain, "filter_retrieved_docs", return_value=docs),
+        ):
+            result = run_rag_chain(self.base_llm, MagicMock(), "반납은 어떻게 해?")
+
+        self.assertEqual(set(result["diagnostics"]["stage_cache"]), {"classify", "refine"})
+        self.assertIn("hit_rate", result["diagnostics"]["stage_cache"]["classify"])
+
+    def test_async_stages_reuse_sqlite_results_off_the_event_loop(self):
+        fake_chain = MagicMock()
+        fake_chain.ainvoke = AsyncMock(side_effect=["NEED_RAG", "물품 반납 절차"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            stage_cache = StageResultCache(max_size=8, db_path=Path(tmp) / "stage_cache.sqlite3")
+
+            async def scenario():
+                results = []
+                for _ in range(2):
+                    results.append(await chain.aclassify_question(self.base_llm, "반납은 어떻게 해?"))
+                    results.append(await chain.arefine_query(self.base_llm, "반납은 어떻게 해?"))
+                return results
+
+            with (
+                patch.object(chain, "USE_STAGE_RESULT_CACHE", True),
+                patch.object(chain, "get_stage_cache", return_value=stage_cache),
+                patch.object(chain, "_build_text_chain", return_value=fake_chain),
+                patch("rag.stage_cache.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread,
+            ):
+                results = asyncio.run(scenario())
+            stage_cache.close()
+
+        self.assertEqual(results, ["NEED_RAG", "물품 반납 절차"] * 2)
+        self.assertEqual(fake_chain.ainvoke.await_count, 2)
+        # 조회 4번 + 저장 2번 모두 스레드에서 실행된다.
+        self.assertEqual(to_thread.call_count, 6)
+
+    def test_failed_classification_is_not_cached(self):
+        fake_chain = MagicMock()
+        fake_chain.invoke.side_effect = [RuntimeError("timeout"), "NO_RAG"]
+
+        with (
+            patch.object(chain, "USE_STAGE_RESULT_CACHE", True),
+            patch.object(chain, "get_stage_cache", return_value=StageResultCache(max_size=8)),
+            patch.object(chain, "_build_text_chain", return_value=fake_chain),
+        ):
+            self.assertEqual(chain.classify_question(self.base_llm, "안녕"), "NEED_RAG")
+            self.assertEqual(chain.classify_question(self.base_llm, "안녕"), "NO_RAG")
+
+    def test_unparsable_classification_is_not_cached(self):
+        fake_chain = MagicMock()
+        fake_chain.invoke.side_effect = ["잘 모르겠습니다", "NO_RAG", "NEED_RAG"]
+
+        with (
+            patch.object(chain, "USE_STAGE_RESULT_CACHE", True),
+            patch.object(chain, "get_stage_cache", return_value=StageResultCache(max_size=8)),
+            patch.object(chain, "_build_text_chain", return_value=fake_chain),
+        ):
+            self.assertEqual(chain.classify_question(self.base_llm, "안녕"), "NEED_RAG")
+            self.assertEqual(chain.classify_question(self.base_llm, "안녕"), "NO_RAG")
+            self.assertEqual(chain.classify_question(self.base_llm, "안녕"), "NO_RAG")
+
+        self.assertEqual(fake_chain.invoke.call_count, 2)
+
     def test_context_sort_prefers_manual_and_faq_over_qa(self):
         docs = [
             _doc("qa-1", doc_type="qa"),
@@ -180,5 +436,315 @@ class TestRunRagChain(unittest.TestCase):
         self.assertEqual([doc.metadata["doc_id"] for doc in focused], ["return-1", "return-2", "disuse-1"])
 
 
+class TestArunRagChain(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.base_llm = MagicMock(name="base_llm")
+        self.tool_llm = MagicMock(name="tool_llm")
+        self.base_llm.bind_tools.return_value = self.tool_llm
+        self.tool_llm.ainvoke = AsyncMock(return_value=AIMessage(content="", tool_calls=[]))
+        self.docs = [(_doc("doc-1"), 0.11), (_doc("doc-2"), 0.18)]
+
+        # 기존 테스트는 LLM 분류 경로를 검증하므로 로컬 분류기와 캐시를 끈다.
+        for name in ("USE_LOCAL_QUESTION_CLASSIFIER", "USE_SEMANTIC_ANSWER_CACHE", "USE_STAGE_RESULT_CACHE"):
+            flag_patch = patch.object(chain, name, False)
+            flag_patch.start()
+            self.addCleanup(flag_patch.stop)
+
+    async def test_router_classifier_and_refiner_run_concurrently(self):
+        started = set()
+        all_started = asyncio.Event()
+
+        def stage(name, result):
+            async def run(*_args):
+                started.add(name)
+                if len(started) == 3:
+                    all_started.set()
+                # 세 단계가 모두 시작되어야 진행되므로, 순차 실행이면 시간 초과로 실패한다.
+                await asyncio.wait_for(all_started.wait(), timeout=1.0)
+                return result
+            return run
+
+        self.tool_llm.ainvoke = stage("router", AIMessage(content="", tool_calls=[]))
+        self.base_llm.invoke.return_value = AIMessage(content="반납 절차 답변")
+
+        with (
+            patch.object(chain, "USE_RERANKING", False),
+            patch.object(chain, "aclassify_question", stage("classify", "NEED_RAG")),
+            patch.object(chain, "arefine_query", stage("refine", "물품 반납 절차")),
+            patch.object(chain, "retrieve_candidate_docs", return_value=self.docs) as retrieve_mock,
+            patch.object(chain, "filter_retrieved_docs", return_value=self.docs),
+        ):
+            result = await arun_rag_chain(self.base_llm, MagicMock(), "반납은 어떻게 해?")
+
+        self.assertEqual(started, {"router", "classify", "refine"})
+        self.assertEqual(retrieve_mock.call_args.kwargs["refined_query"], "물품 반납 절차")
+        self.assertEqual(result["answer"], "반납 절차 답변")
+        self.assertEqual(result["diagnostics"]["classification"], "NEED_RAG")
+        self.assertEqual(result["diagnostics"]["final_context_count"], 2)
+
+    async def test_answer_cache_embedding_runs_with_front_end_and_is_reused_for_retrieval(self):
+        started = set()
+        all_started = asyncio.Event()
+
+        def stage(name, result):
+            async def run(*_args):
+                started.add(name)
+                if len(started) == 4:
+                    all_started.set()
+                # 네 단계가 모두 시작되어야 진행되므로, 임베딩을 먼저 기다리면 시간 초과로 실패한다.
+                await asyncio.wait_for(all_started.wait(), timeout=1.0)
+                return result
+            return run
+
+        vectordb = MagicMock(name="vectordb")
+        vectordb.embeddings.aembed_query = stage("embed", [1.0, 0.0])
+        self.tool_llm.ainvoke = stage("router", AIMessage(content="", tool_calls=[]))
+        self.base_llm.invoke.return_value = AIMessage(content="반납 절차 답변")
+
+        with (
+            patch.object(chain, "USE_SEMANTIC_ANSWER_CACHE", True),
+            patch.object(chain, "USE_RERANKING", False),
+            patch.object(chain, "get_answer_cache", return_value=SemanticAnswerCache(8, 60, 0.95)),
+            patch.object(chain, "aclassify_question", stage("classify", "NEED_RAG")),
+            patch.object(chain, "arefine_query", stage("refine", "물품 반납 절차")),
+            patch.object(chain, "retrieve_candidate_docs", return_value=self.docs) as retrieve_mock,
+            patch.object(chain, "filter_retrieved_docs", return_value=self.docs),
+        ):
+            result = await asyncio.wait_for(arun_rag_chain(self.base_llm, vectordb, "반납은 어떻게 해?"), timeout=2.0)
+
+        self.assertEqual(started, {"embed", "router", "classify", "refine"})
+        self.assertEqual(retrieve_mock.call_args.kwargs["query_vector"], [1.0, 0.0])
+        self.assertFalse(result["diagnostics"]["answer_cache"]["hit"])
+
+    async def test_answer_cache_hit_cancels_front_end_stages(self):
+        cancelled = []
+
+        def slow_stage(name):
+            async def run(*_args):
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(name)
+                    raise
+            return run
+
+        answer_cache = SemanticAnswerCache(8, 60, 0.95)
+        answer_cache.sync_index_version("v1")
+        answer_cache.store(
+            "반납은 어떻게 해?",
+            [1.0, 0.0],
+            {"answer": "반납 절차 답변", "attribution": [{"doc_id": "doc-1"}], "diagnostics": {"final_context_count": 1}},
+        )
+        async def embed(*_args):
+            # 세 단계가 모두 시작된 뒤에 임베딩이 끝나도록 한다.
+            await asyncio.sleep(0.05)
+            return [1.0, 0.0]
+
+        vectordb = MagicMock(name="vectordb")
+        vectordb.embeddings.aembed_query = embed
+        self.tool_llm.ainvoke = slow_stage("router")
+
+        with (
+            patch.object(chain, "USE_SEMANTIC_ANSWER_CACHE", True),
+            patch.object(chain, "get_answer_cache", return_value=answer_cache),
+            patch.object(chain, "index_version", return_value="v1"),
+            patch.object(chain, "aclassify_question", slow_stage("classify")),
+            patch.object(chain, "arefine_query", slow_stage("refine")),
+        ):
+            result = await asyncio.wait_for(arun_rag_chain(self.base_llm, vectordb, "반납 어떻게 하나요?"), timeout=2.0)
+            for _ in range(3):
+                await asyncio.sleep(0)
+
+        self.assertEqual(result["answer"], "반납 절차 답변")
+        self.assertTrue(result["diagnostics"]["answer_cache"]["hit"])
+        self.assertEqual(sorted(cancelled), ["classify", "refine", "router"])
+
+    async def test_tool_call_cancels_classifier_and_refiner(self):
+        cancelled = []
+
+        def slow_stage(name):
+            async def run(*_args):
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(name)
+                    raise
+            return run
+
+        fake_tool = MagicMock()
+        fake_tool.invoke.return_value = json.dumps({"result": "재고 10대 있음"}, ensure_ascii=False)
+        self.tool_llm.ainvoke = AsyncMock(return_value=AIMessage(
+            content="",
+            tool_calls=[{"name": "get_item_detail_info", "args": {"asset_name": "노트북"}, "id": "call-1"}],
+        ))
+        self.base_llm.invoke.return_value = AIMessage(content="노트북 재고는 10대입니다.")
+
+        with (
+            patch.object(chain, "TOOL_MAP", {"get_item_detail_info": fake_tool}),
+            patch.object(chain, "aclassify_question", slow_stage("classify")),
+            patch.object(chain, "arefine_query", slow_stage("refine")),
+        ):
+            result = await asyncio.wait_for(arun_rag_chain(self.base_llm, MagicMock(), "노트북 재고 조회해줘"), timeout=2.0)
+            await asyncio.sleep(0)
+
+        self.assertEqual(result, {"answer": "노트북 재고는 10대입니다.", "attribution": []})
+        self.assertEqual(sorted(cancelled), ["classify", "refine"])
+
+    async def test_no_rag_classification_cancels_refiner(self):
+        refine_cancelled = asyncio.Event()
+
+        async def slow_refine(*_args):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                refine_cancelled.set()
+                raise
+
+        self.base_llm.ainvoke = AsyncMock(return_value=AIMessage(content="안녕하세요."))
+
+        with (
+            patch.object(chain, "aclassify_question", AsyncMock(return_value="NO_RAG")),
+            patch.object(chain, "arefine_query", slow_refine),
+            patch.object(chain, "retrieve_candidate_docs") as retrieve_mock,
+        ):
+            result = await asyncio.wait_for(arun_rag_chain(self.base_llm, MagicMock(), "안녕"), timeout=2.0)
+            await asyncio.sleep(0)
+
+        retrieve_mock.assert_not_called()
+        self.assertTrue(refine_cancelled.is_set())
+        self.assertEqual(result["answer"], "안녕하세요.")
+        self.assertEqual(result["attribution"], [])
+        self.assertEqual(result["diagnostics"]["classification_path"], "llm")
+
+    async def test_local_no_rag_decision_starts_neither_classifier_nor_refiner(self):
+        self.base_llm.ainvoke = AsyncMock(return_value=AIMessage(content="안녕하세요."))
+        local = chain.LocalClassification("NO_RAG", 0.9, True, "model")
+
+        with (
+            patch.object(chain, "USE_LOCAL_QUESTION_CLASSIFIER", True),
+            patch.object(chain, "pre_classify_question", return_value=local),
+            patch.object(chain, "aclassify_question") as classify_mock,
+            patch.object(chain, "arefine_query") as refine_mock,
+        ):
+            result = await asyncio.wait_for(arun_rag_chain(self.base_llm, MagicMock(), "안녕"), timeout=2.0)
+
+        classify_mock.assert_not_called()
+        refine_mock.assert_not_called()
+        self.assertEqual(result["answer"], "안녕하세요.")
+        self.assertEqual(result["diagnostics"]["classification_path"], "local")
+
+    async def test_local_classifier_runs_off_the_event_loop(self):
+        self.base_llm.ainvoke = AsyncMock(return_value=AIMessage(content="안녕하세요."))
+        loop_thread = threading.get_ident()
+        threads = []
+
+        def pre_classify(user_query):
+            # 첫 호출은 모델 학습까지 하므로 이벤트 루프 스레드에서 실행되면 안 된다.
+            threads.append(threading.get_ident())
+            return chain.LocalClassification("NO_RAG", 0.9, True, "model")
+
+        with (
+            patch.object(chain, "USE_LOCAL_QUESTION_CLASSIFIER", True),
+            patch.object(chain, "pre_classify_question", side_effect=pre_classify),
+        ):
+            result = await asyncio.wait_for(arun_rag_chain(self.base_llm, MagicMock(), "안녕"), timeout=2.0)
+
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], loop_thread)
+        self.assertEqual(result["diagnostics"]["classification_path"], "local")
+
+    def test_sync_wrapper_matches_sequential_chain(self):
+        self.tool_llm.invoke.return_value = AIMessage(content="", tool_calls=[])
+        self.base_llm.invoke.return_value = AIMessage(content="반납 절차 답변")
+
+        with (
+            patch.object(chain, "USE_RERANKING", False),
+            patch.object(chain, "classify_question", return_value="NEED_RAG"),
+            patch.object(chain, "refine_query", return_value="물품 반납 절차"),
+            patch.object(chain, "aclassify_question", AsyncMock(return_value="NEED_RAG")),
+            patch.object(chain, "arefine_query", AsyncMock(return_value="물품 반납 절차")),
+            patch.object(chain, "retrieve_candidate_docs", return_value=self.docs),
+            patch.object(chain, "filter_retrieved_docs", return_value=self.docs),
+        ):
+            sequential = run_rag_chain(self.base_llm, MagicMock(), "반납은 어떻게 해?")
+            concurrent = run_rag_chain_concurrent(self.base_llm, MagicMock(), "반납은 어떻게 해?")
+
+        self.assertEqual(concurrent, sequential)
+
+
+class _FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """OpenAI 호환 /chat/completions (비스트리밍). 질문 분류 프롬프트에는 NO_RAG, 그 외에는 인사말로 답한다."""
+
+    # keep-alive 연결이어야 클라이언트가 연결을 재사용한다 (실제 OpenAI 서버와 같은 조건).
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = "\n".join(str(message.get("content", "")) for message in body.get("messages", []))
+        content = "" if body.get("tools") else ("NO_RAG" if "NEED_RAG" in prompt else "안녕하세요!")
+        payload = json.dumps(
+            {
+                "id": "chatcmpl-test",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body.get("model", "fake"),
+                "choices": [
+                    {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+                ],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *_args):
+        pass
+
+
+class TestRunRagChainConcurrentWithOpenAIClient(unittest.TestCase):
+    """mock이 아닌 ChatOpenAI(공유 httpx.AsyncClient)로 동기 래퍼를 여러 번 / 동시에 호출한다."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOpenAIHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        for name in ("USE_LOCAL_QUESTION_CLASSIFIER", "USE_SEMANTIC_ANSWER_CACHE", "USE_STAGE_RESULT_CACHE"):
+            flag_patch = patch.object(chain, name, False)
+            flag_patch.start()
+            self.addCleanup(flag_patch.stop)
+        self.llm = ChatOpenAI(
+            model="fake-model",
+            api_key="test-key",
+            base_url=f"http://127.0.0.1:{self.server.server_address[1]}/v1",
+            max_retries=0,
+            timeout=5,
+        )
+
+    def _assert_direct_answer(self, result):
+        self.assertEqual(result["answer"], "안녕하세요!")
+        self.assertEqual(result["diagnostics"]["classification"], "NO_RAG")
+
+    def test_repeated_calls_reuse_the_client(self):
+        for _ in range(3):
+            self._assert_direct_answer(run_rag_chain_concurrent(self.llm, MagicMock(), "안녕"))
+
+    def test_calls_from_several_threads(self):
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: run_rag_chain_concurrent(self.llm, MagicMock(), "안녕"), range(8)))
+
+        for result in results:
+            self._assert_direct_answer(result)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,138 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from rag.dictionaries import NO_RAG_SEED_QUERIES
+from rag.query_classifier import (
+    LocalQueryClassifier,
+    _normalize,
+    evaluate_held_out,
+    find_domain_term,
+    load_training_examples,
+    train_query_model,
+)
+
+
+class _FixedProbaModel:
+    """predict_proba가 항상 같은 NEED_RAG 확률을 돌려주는 모델"""
+
+    def __init__(self, need_rag_proba: float):
+        self.need_rag_proba = need_rag_proba
+
+    def predict_proba(self, texts):
+        return np.array([[1.0 - self.need_rag_proba, self.need_rag_proba] for _ in texts])
+
+
+class TestLocalQueryClassifier(unittest.TestCase):
+    def test_domain_term_question_is_decided_as_need_rag(self):
+        classifier = LocalQueryClassifier(_FixedProbaModel(0.3), need_rag_threshold=0.85, no_rag_threshold=0.15)
+
+        result = classifier.classify("불용 처리 절차 알려줘")
+
+        self.assertEqual(result.label, "NEED_RAG")
+        self.assertTrue(result.decided)
+        self.assertEqual(result.source, "domain_term")
+
+    def test_probability_inside_thresholds_is_left_to_llm(self):
+        cases = [(0.9, "NEED_RAG", True), (0.6, "NEED_RAG", False), (0.4, "NO_RAG", False), (0.1, "NO_RAG", True)]
+        for proba, label, decided in cases:
+            with self.subTest(proba=proba):
+                classifier = LocalQueryClassifier(
+                    _FixedProbaModel(proba), need_rag_threshold=0.85, no_rag_threshold=0.15
+                )
+
+                result = classifier.classify("로그인이 안돼요")
+
+                self.assertEqual(result.label, label)
+                self.assertEqual(result.decided, decided)
+                self.assertEqual(result.source, "model")
+
+    def test_trained_model_separates_greetings_from_domain_questions(self):
+        texts, labels = load_training_examples(log_paths=(), qa_paths=())
+        texts += ["물품 반납은 어떻게 하나요?", "내용연수가 지난 물품 처리 방법", "취득 등록 절차가 궁금해요"]
+        labels += ["NEED_RAG"] * 3
+
+        classifier = LocalQueryClassifier(train_query_model(texts, labels), need_rag_threshold=0.85, no_rag_threshold=0.15)
+
+        self.assertEqual(classifier.classify("안녕하세요").label, "NO_RAG")
+        self.assertEqual(classifier.classify("반납 기한 알려줘").label, "NEED_RAG")
+
+    def test_short_generic_words_are_not_domain_terms(self):
+        self.assertIsNone(find_domain_term("오늘 기분 어때?"))
+        self.assertEqual(find_domain_term("G2B 번호 확인"), "g2b")
+
+
+class TestLoadTrainingExamples(unittest.TestCase):
+    def test_skips_rows_classified_by_local_model(self):
+        rows = [
+            {"question": "반납 절차", "diagnostics": {"classification": "NEED_RAG", "classification_path": "llm"}},
+            {"question": "고마워", "diagnostics": {"classification": "NO_RAG", "classification_path": "local"}},
+            {"question": "날씨 어때", "diagnostics": {"classification": "NO_RAG"}},
+            {"question": "알 수 없음", "diagnostics": {"classification": "ERROR"}},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = Path(tmp) / "chain_diagnostics.jsonl"
+            log_path.write_text("\n".join(json.dumps(row, ensure_ascii=False) for row in rows) + "\n{broken", encoding="utf-8")
+            qa_path = Path(tmp) / "qa.json"
+            qa_path.write_text(json.dumps([{"question": "불용 기준은?"}], ensure_ascii=False), encoding="utf-8")
+
+            texts, labels = load_training_examples(log_paths=(log_path,), qa_paths=(qa_path,))
+
+        self.assertEqual(texts[:3], ["반납 절차", "날씨 어때", "불용 기준은?"])
+        self.assertEqual(labels[:3], ["NEED_RAG", "NO_RAG", "NEED_RAG"])
+        self.assertNotIn("고마워", texts[:3])
+        self.assertTrue(all(label == "NO_RAG" for label in labels[3:]))
+
+    def test_same_question_from_logs_and_qa_is_used_once(self):
+        rows = [
+            {"question": "불용 기준은?", "diagnostics": {"classification": "NEED_RAG", "classification_path": "llm"}},
+            {"question": "불용 기준은?", "diagnostics": {"classification": "NEED_RAG", "classification_path": "llm"}},
+            {"question": NO_RAG_SEED_QUERIES[0], "diagnostics": {"classification": "NO_RAG"}},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = Path(tmp) / "chain_diagnostics.jsonl"
+            log_path.write_text("\n".join(json.dumps(row, ensure_ascii=False) for row in rows), encoding="utf-8")
+            qa_path = Path(tmp) / "qa.json"
+            qa_path.write_text(json.dumps([{"question": "불용  기준은"}, {"question": "반납 절차"}], ensure_ascii=False), encoding="utf-8")
+
+            texts, labels = load_training_examples(log_paths=(log_path,), qa_paths=(qa_path,))
+
+        self.assertEqual(texts[:3], ["불용 기준은?", NO_RAG_SEED_QUERIES[0], "반납 절차"])
+        self.assertEqual(len(texts), len(labels))
+        self.assertEqual(len({_normalize(text) for text in texts}), len(texts))
+
+
+class TestEvaluateHeldOut(unittest.TestCase):
+    def test_reports_decided_band_precision_and_recall_on_unseen_questions(self):
+        texts, labels = load_training_examples(log_paths=(), qa_paths=())
+        need_rag = [f"물품 {term} 절차 알려줘" for term in ("반납", "불용", "처분", "취득", "대여", "이관", "수리", "폐기")]
+        texts += need_rag + [f"{text} 방법" for text in need_rag]
+        labels += ["NEED_RAG"] * (len(need_rag) * 2)
+
+        report = evaluate_held_out(texts, labels, test_size=0.3, seed=0)
+
+        self.assertEqual(report["train_size"] + report["test_size"], len(texts))
+        self.assertTrue(0.0 <= report["coverage"] <= 1.0)
+        for label in ("NEED_RAG", "NO_RAG"):
+            stats = report[label]
+            self.assertLessEqual(stats["decided"], report["test_size"])
+            if stats["decided"]:
+                self.assertTrue(0.0 <= stats["precision"] <= 1.0)
+            self.assertTrue(0.0 <= stats["recall"] <= 1.0)
+        self.assertEqual(report["NEED_RAG"]["support"] + report["NO_RAG"]["support"], report["test_size"])
+        # 도메인 용어가 들어간 평가 질문은 LLM 없이 NEED_RAG로 결정된다.
+        self.assertEqual(report["NEED_RAG"]["precision"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from rag.stage_cache import StageResultCache, normalize_query, prompt_version
+
+
+class TestStageResultCache(unittest.TestCase):
+    def test_normalize_query_ignores_spacing_case_and_trailing_punctuation(self):
+        self.assertEqual(normalize_query("  G2B 번호  조회 방법?? "), "g2b 번호 조회 방법")
+        self.assertEqual(normalize_query("반납은 어떻게 해…"), normalize_query("반납은 어떻게 해"))
+        self.assertNotEqual(normalize_query("반납 절차"), normalize_query("반납절차 12"))
+
+    def test_prompt_version_depends_on_template_and_model(self):
+        base = prompt_version("template {question}", "gpt-4o")
+        self.assertEqual(base, prompt_version("template {question}", "gpt-4o"))
+        self.assertNotEqual(base, prompt_version("template v2 {question}", "gpt-4o"))
+        self.assertNotEqual(base, prompt_version("template {question}", "gpt-4o-mini"))
+
+    def test_lru_eviction_and_stats(self):
+        cache = StageResultCache(max_size=2)
+        cache.set("classify", "v1", "반납", "NEED_RAG")
+        cache.set("classify", "v1", "안녕", "NO_RAG")
+        cache.get("classify", "v1", "반납")
+        cache.set("classify", "v1", "불용", "NEED_RAG")
+
+        self.assertEqual(cache.get("classify", "v1", "반납"), "NEED_RAG")
+        self.assertIsNone(cache.get("classify", "v1", "안녕"))
+        self.assertIsNone(cache.get("classify", "v2", "반납"))
+        self.assertEqual(cache.stats()["classify"], {"hits": 2, "misses": 2, "hit_rate": 0.5})
+        self.assertIsNone(cache.stats()["refine"]["hit_rate"])
+
+    def test_sqlite_file_survives_restart_and_keeps_max_size_rows(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "stage_cache.sqlite3"
+            cache = StageResultCache(max_size=2, db_path=db_path)
+            cache.set("refine", "v1", "반납은 어떻게 해?", "물품 반납 절차")
+            cache.set("refine", "v1", "불용 기준", "물품 불용 기준")
+            cache.set("refine", "v1", "처분 방법", "물품 처분 방법")
+            cache.close()
+
+            restarted = StageResultCache(max_size=2, db_path=db_path)
+            self.assertIsNone(restarted.get("refine", "v1", "반납은 어떻게 해"))
+            self.assertEqual(restarted.get("refine", "v1", "처분 방법"), "물품 처분 방법")
+            self.assertEqual(restarted.get("refine", "v1", "불용 기준"), "물품 불용 기준")
+            restarted.close()
+
+    def test_sqlite_rows_are_pruned_only_over_max_size(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = StageResultCache(max_size=20, db_path=Path(tmp) / "stage_cache.sqlite3")
+            prunes = []
+            original_prune = cache._db_prune
+
+            def prune():
+                prunes.append(cache._db_rows)
+                original_prune()
+
+            with patch.object(cache, "_db_prune", prune):
+                for i in range(20):
+                    cache.set("refine", "v1", f"질문 {i}", f"결과 {i}")
+                # 같은 키를 다시 저장하면 행 수가 늘지 않는다.
+                cache.set("refine", "v1", "질문 0", "결과 0 갱신")
+                self.assertEqual(prunes, [])
+
+                cache.set("refine", "v1", "질문 20", "결과 20")
+                self.assertEqual(prunes, [21])
+                self.assertEqual(cache._db_rows, 18)
+
+                # 정리 후 여유분(max_size의 10%)이 찰 때까지는 다시 정리하지 않는다.
+                cache.set("refine", "v1", "질문 21", "결과 21")
+                cache.set("refine", "v1", "질문 22", "결과 22")
+                self.assertEqual(prunes, [21])
+            count = cache._conn.execute("SELECT COUNT(*) FROM stage_results").fetchone()[0]
+            self.assertEqual(count, cache._db_rows)
+            cache.close()
+
+            restarted = StageResultCache(max_size=20, db_path=Path(tmp) / "stage_cache.sqlite3")
+            self.assertEqual(restarted._db_rows, 20)
+            self.assertEqual(restarted.get("refine", "v1", "질문 0"), "결과 0 갱신")
+            self.assertIsNone(restarted.get("refine", "v1", "질문 1"))
+            restarted.close()
+
+    def test_async_access_runs_sqlite_io_off_the_event_loop(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = StageResultCache(max_size=8, db_path=Path(tmp) / "stage_cache.sqlite3")
+            memory_only = StageResultCache(max_size=8)
+
+            async def scenario():
+                await cache.aset("classify", "v1", "반납", "NEED_RAG")
+                memory = StageResultCache(max_size=8, db_path=Path(tmp) / "stage_cache.sqlite3")
+                try:
+                    from_db = await memory.aget("classify", "v1", "반납")
+                finally:
+                    memory.close()
+                await memory_only.aset("classify", "v1", "반납", "NO_RAG")
+                return from_db, await memory_only.aget("classify", "v1", "반납")
+
+            with patch("rag.stage_cache.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+                from_db, from_memory = asyncio.run(scenario())
+
+            self.assertEqual((from_db, from_memory), ("NEED_RAG", "NO_RAG"))
+            # SQLite를 쓰는 캐시의 저장/조회만 스레드로 넘기고, 메모리 캐시는 바로 처리한다.
+            self.assertEqual(to_thread.call_count, 2)
+            cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,21 +1,28 @@
 import logging
-from typing import List, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 
 logger = logging.getLogger(__name__)
 
 
-def retrieve_docs(vectordb, query: str, top_k: int) -> List[Tuple]:
+def retrieve_docs(vectordb, query: str, top_k: int, query_vector: Optional[Sequence[float]] = None) -> List[Tuple]:
     """
     Chroma VectorStore를 통해 유사 문서 검색을 수행한다.
 
     반환값은 [(Document, score), ...] 형식이며 Chroma score는 일반적으로
     낮을수록 더 유사한 거리 점수다.
+    query_vector(query의 임베딩)가 있으면 임베딩 API를 다시 호출하지 않고 벡터로 검색한다 (점수 의미는 같다).
     """
-    results = vectordb.similarity_search_with_score(
-        query=query,
-        k=top_k
-    )
+    if query_vector is not None:
+        results = vectordb.similarity_search_by_vector_with_relevance_scores(
+            embedding=list(query_vector),
+            k=top_k
+        )
+    else:
+        results = vectordb.similarity_search_with_score(
+            query=query,
+            k=top_k
+        )
 
     if results:
         best_score = results[0][1]
@@ -1,30 +1,131 @@
+import asyncio
 import json
 import os
-import joblib
 import numpy as np
 import pandas as pd
 import math
+import copy
+import hmac
 from datetime import datetime, timedelta
 from pathlib import Path
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List
+import httpx
 import openai
+import sys
+import threading
+import time
 import uuid
 
+try:
+    from app.manual_cache import get_manual_content, preload_manuals
+    from app.keyword_matcher import ChatKeywordRouter
+    from app.session_store import create_session_store
+    from app.chat_history import ConversationWindow
+    from app.forecast_index import ScopeIndex
+    from app.rul_table import artifact_version, load_or_build_rul_table
+    from app.forecast_features import add_derived_features, failure_dates
+    from app.cache_utils import LRUTTLCache
+    from app.compute_pool import BoundedComputePool, ComputePoolSaturated
+    from ai_model.monthly_forecast import LockstepMonthlyForecaster
+    from app.forecast_index import normalize_category
+    from app.dataset_snapshot import load_dataset
+    from app.forecast_artifacts import ForecastArtifacts
+    from app.metrics import MetricsRegistry
+    from app.model_mmap import load_model
+except ModuleNotFoundError:
+    project_root = Path(__file__).resolve().parents[1]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+    from app.manual_cache import get_manual_content, preload_manuals
+    from app.keyword_matcher import ChatKeywordRouter
+    from app.session_store import create_session_store
+    from app.chat_history import ConversationWindow
+    from app.forecast_index import ScopeIndex
+    from app.rul_table import artifact_version, load_or_build_rul_table
+    from app.forecast_features import add_derived_features, failure_dates
+    from app.cache_utils import LRUTTLCache
+    from app.compute_pool import BoundedComputePool, ComputePoolSaturated
+    from ai_model.monthly_forecast import LockstepMonthlyForecaster
+    from app.forecast_index import normalize_category
+    from app.dataset_snapshot import load_dataset
+    from app.forecast_artifacts import ForecastArtifacts
+    from app.metrics import MetricsRegistry
+    from app.model_mmap import load_model
+
 # ==========================================
 # [1] 설정 영역
 # ==========================================
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+# OpenAI 호환 API 주소 (비우면 OpenAI 기본 주소, 부하 테스트에서는 로컬 가짜 LLM 서버 주소)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
 AI_MODEL = "gpt-4o" 
 
+# OpenAI 호출 설정 (커넥션 풀 크기, 호출별 타임아웃, 재시도 횟수)
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "50"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5.0"))
+OPENAI_CHAT_TIMEOUT = float(os.getenv("OPENAI_CHAT_TIMEOUT", "60.0"))
+OPENAI_GUIDE_TIMEOUT = float(os.getenv("OPENAI_GUIDE_TIMEOUT", "20.0"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
+# 대화 이력 창 설정 (최근 대화는 원문, 그 이전 대화는 누적 요약으로 전달)
+HISTORY_TOKEN_BUDGET = int(os.getenv("AI_HISTORY_TOKEN_BUDGET", "3000"))
+HISTORY_MAX_MESSAGES = int(os.getenv("AI_HISTORY_MAX_MESSAGES", "12"))
+HISTORY_SUMMARY_STEP = int(os.getenv("AI_HISTORY_SUMMARY_STEP", "4"))
+HISTORY_SUMMARY_MAX_TOKENS = int(os.getenv("AI_HISTORY_SUMMARY_MAX_TOKENS", "400"))
+
 # ==========================================
-# [1.5] 임시 데이터베이스 (인메모리 DB)
+# [1.5] 세션 / 예측 기록 저장소
 # ==========================================
-sessions_db = {}
-predictions_db = {}
+# memory: 프로세스 내부 저장 (재시작 시 소실) / sqlite: 로컬 SQLite(WAL) 파일 (여러 워커 공유)
+SESSION_STORE_BACKEND = os.getenv("AI_SESSION_STORE", "sqlite")
+SESSION_DB_PATH = Path(os.getenv("AI_SESSION_DB_PATH", Path(__file__).resolve().parent / "runtime" / "ai_sessions.sqlite3"))
+SESSION_MAX_THREADS = int(os.getenv("AI_SESSION_MAX_THREADS", "10000"))
+SESSION_THREAD_IDLE_TTL = float(os.getenv("AI_SESSION_THREAD_IDLE_TTL", str(60 * 60 * 24 * 30)))
+# 유휴 쓰레드 정리 주기(초, 0이면 새 쓰레드를 만들 때만 정리)
+SESSION_EVICT_INTERVAL = float(os.getenv("AI_SESSION_EVICT_INTERVAL", "3600"))
+SESSION_MAX_FORECASTS = int(os.getenv("AI_SESSION_MAX_FORECASTS", "5000"))
+SEARCH_DEFAULT_LIMIT = int(os.getenv("AI_SEARCH_DEFAULT_LIMIT", "100"))
+SEARCH_MAX_LIMIT = int(os.getenv("AI_SEARCH_MAX_LIMIT", "500"))
+
+# 동일 조건 예측 결과 캐시 (모델/데이터 파일이 바뀌면 버전 해시가 달라져 자동으로 무효화)
+FORECAST_CACHE_SIZE = int(os.getenv("AI_FORECAST_CACHE_SIZE", "256"))
+FORECAST_CACHE_TTL = float(os.getenv("AI_FORECAST_CACHE_TTL", "600"))
+
+# 예측 AI 요약 코멘트(LLM) 캐시와 응답 마감 시간(초, 넘기면 기본 문구로 대체 / 0이면 마감 없음)
+FORECAST_GUIDE_CACHE_SIZE = int(os.getenv("AI_FORECAST_GUIDE_CACHE_SIZE", "1024"))
+FORECAST_GUIDE_CACHE_TTL = float(os.getenv("AI_FORECAST_GUIDE_CACHE_TTL", str(60 * 60 * 24)))
+FORECAST_GUIDE_DEADLINE = float(os.getenv("AI_FORECAST_GUIDE_DEADLINE", "8.0"))
+
+# 예측 연산 작업 풀 (동시 실행 수 / 대기열 상한, 포화 시 503 응답의 Retry-After 초)
+FORECAST_WORKERS = int(os.getenv("AI_FORECAST_WORKERS", "2"))
+FORECAST_QUEUE_DEPTH = int(os.getenv("AI_FORECAST_QUEUE_DEPTH", "8"))
+FORECAST_RETRY_AFTER = int(os.getenv("AI_FORECAST_RETRY_AFTER", "2"))
+FORECAST_WARMUP_RETRY_AFTER = int(os.getenv("AI_FORECAST_WARMUP_RETRY_AFTER", "5"))
+FORECAST_BATCH_MAX_SIZE = int(os.getenv("AI_FORECAST_BATCH_MAX_SIZE", "100"))
+
+# 범위(부서/분류)별 월별 이력 캐시 크기 (데이터/모델 버전이 키에 포함되므로 TTL 없이 LRU로만 관리)
+MONTHLY_HISTORY_CACHE_SIZE = int(os.getenv("AI_MONTHLY_HISTORY_CACHE_SIZE", "2048"))
+
+# 새 모델/데이터 파일 확인 주기(초, 0이면 자동 교체 끄기)와 관리자 교체 API 토큰 (비어 있으면 교체 API 비활성화)
+ARTIFACT_WATCH_INTERVAL = float(os.getenv("AI_ARTIFACT_WATCH_INTERVAL", "60"))
+ADMIN_TOKEN = os.getenv("AI_ADMIN_TOKEN", "")
+
+# 단계별 소요 시간 분위수(p50/p95/p99) 계산에 쓰는 최근 표본 수
+METRICS_WINDOW = int(os.getenv("AI_METRICS_WINDOW", "1024"))
+
+session_store = create_session_store(
+    SESSION_STORE_BACKEND,
+    SESSION_DB_PATH,
+    max_threads=SESSION_MAX_THREADS,
+    max_forecasts=SESSION_MAX_FORECASTS,
+    thread_idle_ttl=SESSION_THREAD_IDLE_TTL,
+)
 
 # ==========================================
 # [2] 서버 초기화 및 데이터 모델 정의
@@ -43,16 +144,22 @@ MODEL_META_PATH = Path(os.getenv("AI_MODEL_META_PATH", MODEL_PATH.with_name("mod
 CSV_PATH = Path(os.getenv("AI_DATA_PATH", PROJECT_ROOT / "dataset" / "create_data" / "data_ml" / "phase4_training_data.csv"))
 FALLBACK_MODEL_PATH = PROJECT_ROOT / "ai_model" / "saved_models" / "random_forest" / "rf_final_model.pkl"
 
+# 학습용 CSV 컬럼형 스냅샷 저장 위치 (CSV가 바뀐 경우에만 재생성)
+DATA_SNAPSHOT_DIR = Path(os.getenv("AI_DATA_SNAPSHOT_DIR", Path(__file__).resolve().parent / "runtime" / "data_snapshots"))
+
+# 자산별 예측 총수명 사전 계산 테이블 저장 위치 (모델/데이터 버전별 .npy)
+RUL_TABLE_DIR = Path(os.getenv("AI_RUL_TABLE_DIR", Path(__file__).resolve().parent / "runtime" / "rul_tables"))
+
+# 데이터 스냅샷 / RUL 테이블 / 모델 배열을 읽기 전용 메모리 매핑으로 읽어 여러 워커가 같은 물리 페이지를 공유한다 (0이면 끄기)
+ARTIFACT_MMAP = os.getenv("AI_ARTIFACT_MMAP", "1") != "0"
+# joblib.load(mmap_mode='r')용 비압축 모델 사본 저장 위치
+MODEL_MMAP_DIR = Path(os.getenv("AI_MODEL_MMAP_DIR", Path(__file__).resolve().parent / "runtime" / "model_mmap"))
+
 DEFAULT_FEATURES = [
     '내용연수', '취득금액', '부서가혹도', '가격민감도', '장비중요도',
     'G2B목록명_Code', '물품분류명_Code', '운용부서코드_Code', '캠퍼스_Code'
 ]
 
-rf_model = None
-df = None
-model_meta = {}
-model_features = DEFAULT_FEATURES.copy()
-
 DEFAULT_MONTHLY_DEMAND_FEATURES = [
     "trend",
     "month",
@@ -68,8 +175,16 @@ DEFAULT_MONTHLY_DEMAND_FEATURES = [
     "rolling_std_6",
 ]
 
-monthly_demand_model = None
-monthly_demand_features = DEFAULT_MONTHLY_DEMAND_FEATURES.copy()
+# 현재 예측 경로용 모델/데이터 묶음 (교체 시 이 참조 하나만 바뀐다)
+forecast_artifacts: Optional[ForecastArtifacts] = None
+
+# 예측 경로 준비 상태 (모델/데이터는 서버 기동 후 백그라운드에서 로딩)
+forecast_ready = threading.Event()
+forecast_warmup_status = {"state": "pending", "started_at": None, "finished_at": None, "elapsed_sec": None, "data_source": None}
+
+# 모델/데이터 교체 상태 (변경 감지 또는 관리자 요청으로 다시 로딩)
+forecast_reload_lock = threading.Lock()
+forecast_reload_status = {"state": "idle", "checked_at": None, "swapped_at": None, "elapsed_sec": None}
 
 
 def find_latest_run_artifact(run_suffix: str, filename: str) -> Path | None:
@@ -97,42 +212,52 @@ def find_latest_monthly_model_artifact() -> Path | None:
         return None
     return max(candidates, key=lambda p: p.stat().st_mtime)
 
-# 모델 로딩
-if not MODEL_PATH.exists() and FALLBACK_MODEL_PATH.exists():
-    MODEL_PATH = FALLBACK_MODEL_PATH
-    MODEL_META_PATH = MODEL_PATH.with_name("model_meta.json")
+def resolve_life_model_paths() -> tuple:
+    """자산 수명 모델 (모델 경로, 메타 경로). 기본 경로에 모델이 없으면 fallback 모델을 사용한다."""
+    if not MODEL_PATH.exists() and FALLBACK_MODEL_PATH.exists():
+        return FALLBACK_MODEL_PATH, FALLBACK_MODEL_PATH.with_name("model_meta.json")
+    return MODEL_PATH, MODEL_META_PATH
 
-if MODEL_PATH.exists():
-    try:
-        rf_model = joblib.load(MODEL_PATH)
-        if MODEL_META_PATH.exists():
-            with open(MODEL_META_PATH, "r", encoding="utf-8") as f:
-                model_meta = json.load(f)
-            model_features = model_meta.get("features", DEFAULT_FEATURES)
-        print(f"✅ AI 모델 로딩 성공! ({MODEL_PATH})")
-    except Exception as e:
-        print(f"❌ 모델 로딩 실패: {e}")
-
-# 데이터 파일 로딩
-MONTHLY_MODEL_PATH = find_latest_monthly_model_artifact()
-if MONTHLY_MODEL_PATH is not None and MONTHLY_MODEL_PATH.exists():
-    try:
-        monthly_demand_model = joblib.load(MONTHLY_MODEL_PATH)
-        monthly_meta_path = MONTHLY_MODEL_PATH.with_name("monthly_model_meta.json")
-        if monthly_meta_path.exists():
-            with open(monthly_meta_path, "r", encoding="utf-8") as f:
-                monthly_meta = json.load(f)
-            monthly_demand_features = monthly_meta.get("features", DEFAULT_MONTHLY_DEMAND_FEATURES)
-        print(f"✅ 월별 수요 모델 로딩 성공! ({MONTHLY_MODEL_PATH})")
-    except Exception as e:
-        print(f"⚠️ 월별 수요 모델 로딩 실패: {e}")
 
-if CSV_PATH.exists():
-    try:
+def load_life_model(model_path: Path, model_meta_path: Path):
+    """자산 수명 모델과 feature 순서를 읽는다. 없거나 실패하면 (None, {}, 기본 feature)."""
+    loaded_model, loaded_meta, loaded_features = None, {}, DEFAULT_FEATURES.copy()
+    if model_path.exists():
+        try:
+            loaded_model = load_model(model_path, MODEL_MMAP_DIR if ARTIFACT_MMAP else None)
+            if model_meta_path.exists():
+                with open(model_meta_path, "r", encoding="utf-8") as f:
+                    loaded_meta = json.load(f)
+                loaded_features = loaded_meta.get("features", DEFAULT_FEATURES)
+            print(f"✅ AI 모델 로딩 성공! ({model_path})")
+        except Exception as e:
+            print(f"❌ 모델 로딩 실패: {e}")
+    return loaded_model, loaded_meta, loaded_features
+
+
+def load_monthly_model(monthly_model_path: Optional[Path]):
+    """월별 수요 모델과 feature 순서를 읽는다. 없거나 실패하면 (None, 기본 feature)."""
+    loaded_model, loaded_features = None, DEFAULT_MONTHLY_DEMAND_FEATURES.copy()
+    if monthly_model_path is not None and monthly_model_path.exists():
         try:
-            df = pd.read_csv(CSV_PATH, encoding="utf-8")
-        except UnicodeDecodeError:
-            df = pd.read_csv(CSV_PATH, encoding="cp949")
+            loaded_model = load_model(monthly_model_path, MODEL_MMAP_DIR if ARTIFACT_MMAP else None)
+            monthly_meta_path = monthly_model_path.with_name("monthly_model_meta.json")
+            if monthly_meta_path.exists():
+                with open(monthly_meta_path, "r", encoding="utf-8") as f:
+                    monthly_meta = json.load(f)
+                loaded_features = monthly_meta.get("features", DEFAULT_MONTHLY_DEMAND_FEATURES)
+            print(f"✅ 월별 수요 모델 로딩 성공! ({monthly_model_path})")
+        except Exception as e:
+            print(f"⚠️ 월별 수요 모델 로딩 실패: {e}")
+    return loaded_model, loaded_features
+
+
+def load_training_data():
+    """학습용 데이터를 스냅샷(없으면 CSV)에서 읽고 부서/분류 색인을 만든다. 없거나 실패하면 (None, None, None)."""
+    if not CSV_PATH.exists():
+        return None, None, None
+    try:
+        loaded_df, source = load_dataset(CSV_PATH, DATA_SNAPSHOT_DIR, mmap=ARTIFACT_MMAP)
 
         # Phase 4에서 target encoding 컬럼이 이미 만들어진 경우 보존한다.
         # 구버전 CSV만 있을 때에만 fallback category code를 만든다.
@@ -143,11 +268,199 @@ if CSV_PATH.exists():
             '캠퍼스_Code': '캠퍼스',
         }
         for code_col, source_col in fallback_code_cols.items():
-            if code_col not in df.columns and source_col in df.columns:
-                df[code_col] = df[source_col].astype('category').cat.codes
-        print(f"✅ 학습용 데이터 로딩 완료! ({CSV_PATH})")
+            if code_col not in loaded_df.columns and source_col in loaded_df.columns:
+                loaded_df[code_col] = loaded_df[source_col].astype('category').cat.codes
+        print(f"✅ 학습용 데이터 로딩 완료! ({CSV_PATH}, {source})")
+
+        # 부서/분류/학습데이터 여부별 행 위치 색인 (요청마다 전체 데이터를 마스크 필터링하지 않도록)
+        return loaded_df, ScopeIndex(loaded_df), source
     except Exception as e:
         print(f"❌ 데이터 로딩 실패: {e}")
+        return None, None, None
+
+
+def locate_forecast_sources() -> dict:
+    """예측 묶음을 만들 원본 모델 파일 위치 (자산 수명 모델/메타, 최신 월별 수요 모델)"""
+    model_path, model_meta_path = resolve_life_model_paths()
+    return {
+        "model_path": model_path,
+        "model_meta_path": model_meta_path,
+        "monthly_model_path": find_latest_monthly_model_artifact(),
+    }
+
+
+def forecast_source_fingerprint(sources: dict) -> str:
+    """원본 파일(모델/메타, 월별 모델/메타, 학습용 CSV)의 경로 + 수정 시간 + 크기 지문"""
+    monthly_model_path = sources["monthly_model_path"]
+    monthly_meta_path = monthly_model_path.with_name("monthly_model_meta.json") if monthly_model_path else None
+    return artifact_version([
+        sources["model_path"],
+        sources["model_meta_path"],
+        monthly_model_path,
+        monthly_meta_path,
+        CSV_PATH,
+    ])
+
+
+def load_forecast_artifacts(sources: dict) -> ForecastArtifacts:
+    """원본 파일에서 새 예측 묶음을 만든다 (현재 사용 중인 묶음은 건드리지 않는다)."""
+    source_fingerprint = forecast_source_fingerprint(sources)
+    loaded_model, loaded_meta, loaded_features = load_life_model(sources["model_path"], sources["model_meta_path"])
+    monthly_model, monthly_features = load_monthly_model(sources["monthly_model_path"])
+    loaded_df, loaded_scope_index, data_source = load_training_data()
+    return ForecastArtifacts(
+        rf_model=loaded_model,
+        model_meta=loaded_meta,
+        model_features=loaded_features,
+        model_path=sources["model_path"],
+        monthly_model=monthly_model,
+        monthly_features=monthly_features,
+        monthly_model_path=sources["monthly_model_path"],
+        df=loaded_df,
+        scope_index=loaded_scope_index,
+        csv_path=CSV_PATH,
+        data_source=data_source,
+        source_fingerprint=source_fingerprint,
+    )
+
+
+def warm_up_forecast_artifacts() -> None:
+    """
+    예측 경로용 모델/데이터를 로딩하고 RUL 테이블을 준비한다 (서버 기동 후 백그라운드 스레드에서 실행).
+    로딩이 끝나기 전의 예측 요청은 503으로 응답한다.
+    """
+    global forecast_artifacts
+
+    started = time.perf_counter()
+    forecast_warmup_status.update(state="loading", started_at=datetime.now().isoformat())
+    try:
+        forecast_artifacts = load_forecast_artifacts(locate_forecast_sources())
+        forecast_warmup_status.update(
+            state="ready" if forecast_artifacts.available else "unavailable",
+            data_source=forecast_artifacts.data_source,
+        )
+    except Exception as e:
+        forecast_warmup_status.update(state="failed", error=str(e))
+        print(f"❌ 예측 모델/데이터 준비 실패: {e}")
+    finally:
+        forecast_warmup_status.update(
+            finished_at=datetime.now().isoformat(),
+            elapsed_sec=round(time.perf_counter() - started, 3),
+        )
+        forecast_ready.set()
+
+    # RUL 테이블은 준비 전에도 요청 시 직접 예측으로 대체되므로 준비 완료 표시 후에 만든다.
+    if forecast_artifacts is not None:
+        prepare_rul_table(forecast_artifacts)
+
+
+def reload_forecast_artifacts(force: bool = False) -> dict:
+    """
+    원본 파일이 바뀌었으면(force면 항상) 새 묶음을 요청 경로 밖에서 로딩하고 RUL 테이블/월별 이력까지 준비한 뒤 교체한다.
+    새 묶음을 쓸 수 없거나 로딩 중에 파일이 다시 바뀌면 기존 묶음을 그대로 유지한다.
+    """
+    global forecast_artifacts
+
+    if not forecast_ready.is_set() or not forecast_reload_lock.acquire(blocking=False):
+        return {"reloaded": False, "reason": "busy"}
+
+    started = time.perf_counter()
+    try:
+        current = forecast_artifacts
+        sources = locate_forecast_sources()
+        fingerprint = forecast_source_fingerprint(sources)
+        forecast_reload_status.update(checked_at=datetime.now().isoformat())
+        if not force and (
+            (current is not None and current.source_fingerprint == fingerprint)
+            or forecast_reload_status.get("rejected_fingerprint") == fingerprint
+        ):
+            return {"reloaded": False, "reason": "unchanged", "version": current.version if current else None}
+
+        forecast_reload_status.update(state="loading")
+        candidate = load_forecast_artifacts(sources)
+        if not candidate.available:
+            # 같은 파일로 반복 로딩하지 않도록 기록해 두고, 파일이 다시 바뀌면 재시도한다.
+            forecast_reload_status.update(rejected_fingerprint=candidate.source_fingerprint)
+            result = {"reloaded": False, "reason": "unavailable"}
+        elif forecast_source_fingerprint(locate_forecast_sources()) != candidate.source_fingerprint:
+            # 복사 중인 파일을 읽었을 수 있으므로 다음 확인 때 다시 로딩한다.
+            result = {"reloaded": False, "reason": "changed_during_load"}
+        else:
+            prepare_rul_table(candidate)
+            warm_scope_histories(candidate, current)
+            forecast_artifacts = candidate
+            drop_stale_forecast_caches(candidate.version)
+            forecast_reload_status.update(swapped_at=datetime.now().isoformat(), rejected_fingerprint=None)
+            result = {
+                "reloaded": True,
+                "version": candidate.version,
+                "previous_version": current.version if current else None,
+            }
+            print(f"✅ 예측 모델/데이터 교체 완료! (version={candidate.version})")
+
+        forecast_reload_status.update(
+            state="swapped" if result["reloaded"] else result["reason"],
+            elapsed_sec=round(time.perf_counter() - started, 3),
+            error=None,
+        )
+        return result
+    except Exception as e:
+        forecast_reload_status.update(state="failed", error=str(e))
+        print(f"❌ 예측 모델/데이터 교체 실패 (기존 버전 유지): {e}")
+        return {"reloaded": False, "reason": "failed"}
+    finally:
+        forecast_reload_lock.release()
+
+
+forecast_cache = LRUTTLCache(FORECAST_CACHE_SIZE, FORECAST_CACHE_TTL)
+monthly_history_cache = LRUTTLCache(MONTHLY_HISTORY_CACHE_SIZE, float("inf"))
+guide_cache = LRUTTLCache(FORECAST_GUIDE_CACHE_SIZE, FORECAST_GUIDE_CACHE_TTL)
+guide_tasks = {}  # 진행 중인 AI 요약 코멘트 호출 (캐시 키 -> asyncio.Task)
+summary_tasks = {}  # 진행 중인 대화 요약 갱신 (threadId -> asyncio.Task)
+
+
+def drop_stale_forecast_caches(version: str) -> None:
+    """교체 후 이전 버전의 예측 결과/월별 이력 캐시 항목을 버린다 (다시 조회되지 않는 항목이 LRU 자리를 차지하지 않도록)."""
+    for cache in (forecast_cache, monthly_history_cache):
+        for key in cache.keys():
+            if key[0] != version:
+                cache.discard(key)
+
+
+forecast_compute_pool = BoundedComputePool(FORECAST_WORKERS, FORECAST_QUEUE_DEPTH, thread_name_prefix="forecast-compute")
+
+# 단계별 소요 시간 / 요청 수 / 캐시 적중 / LLM 토큰 사용량 지표 (/metrics)
+metrics = MetricsRegistry(window=METRICS_WINDOW)
+metrics.describe("stage_duration_seconds", "Duration of internal request stages (recent-window quantiles).")
+metrics.describe("http_request_duration_seconds", "Time until the response starts, per route (recent-window quantiles).")
+metrics.describe("http_requests_total", "Handled HTTP requests by route and status.")
+metrics.describe("http_requests_in_flight", "HTTP requests currently being handled.")
+metrics.describe("llm_requests_total", "OpenAI chat completion calls by purpose and outcome.")
+metrics.describe("llm_tokens_total", "OpenAI token usage by purpose and kind.")
+metrics.describe("cache_hits_total", "Cache lookups that returned a stored value.")
+metrics.describe("cache_misses_total", "Cache lookups that found nothing (or an expired value).")
+metrics.describe("cache_entries", "Entries currently stored in each cache.")
+metrics.describe("forecast_guide_fallback_total", "Forecast guide comments replaced by the default template.")
+metrics.describe("forecast_compute_in_flight", "Running plus queued jobs in the forecast compute pool.")
+metrics.describe("forecast_compute_capacity", "Maximum running plus queued jobs in the forecast compute pool.")
+for cache_name, cache in (("forecast", forecast_cache), ("monthly_history", monthly_history_cache), ("forecast_guide", guide_cache)):
+    metrics.register_function("cache_hits_total", "counter", lambda cache=cache: cache.hits, cache=cache_name)
+    metrics.register_function("cache_misses_total", "counter", lambda cache=cache: cache.misses, cache=cache_name)
+    metrics.register_function("cache_entries", "gauge", lambda cache=cache: len(cache), cache=cache_name)
+metrics.register_function("forecast_compute_in_flight", "gauge", lambda: forecast_compute_pool.in_flight)
+metrics.register_function("forecast_compute_capacity", "gauge", lambda: forecast_compute_pool.capacity)
+
+# 매뉴얼 챕터 로딩 (챗봇 시스템 프롬프트용)
+loaded_manual_count = preload_manuals()
+print(f"✅ 매뉴얼 챕터 캐시 로딩 완료! ({loaded_manual_count}개)")
+
+# 챗봇 라우팅/바로가기 버튼 키워드 매처 컴파일
+try:
+    chat_keyword_router = ChatKeywordRouter.from_file()
+    print("✅ 챗봇 키워드 매처 컴파일 완료!")
+except Exception as e:
+    chat_keyword_router = ChatKeywordRouter([], [])
+    print(f"⚠️ 챗봇 키워드 테이블 로딩 실패: {e}")
 
 # --- CORS 설정 ---
 app.add_middleware(
@@ -158,7 +471,85 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-client = openai.OpenAI(api_key=OPENAI_API_KEY)
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    # 경로 변수(threadId 등)마다 지표가 늘어나지 않도록 실제 경로 대신 라우트 템플릿을 라벨로 쓴다.
+    metrics.add_gauge("http_requests_in_flight", 1)
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", "unmatched")
+        metrics.observe("http_request_duration_seconds", time.perf_counter() - started, method=request.method, route=route_path)
+        metrics.inc("http_requests_total", method=request.method, route=route_path, status=status)
+        metrics.add_gauge("http_requests_in_flight", -1)
+
+# 동기 클라이언트는 LLM 응답을 기다리는 동안 이벤트 루프 전체를 막으므로
+# 비동기 클라이언트 + 공유 커넥션 풀을 사용한다.
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    ),
+    timeout=httpx.Timeout(OPENAI_CHAT_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT),
+)
+client = openai.AsyncOpenAI(
+    api_key=OPENAI_API_KEY,
+    base_url=OPENAI_BASE_URL,
+    http_client=http_client,
+    max_retries=OPENAI_MAX_RETRIES,
+    timeout=OPENAI_CHAT_TIMEOUT,
+)
+
+
+artifact_watch_task: Optional[asyncio.Task] = None
+session_evict_task: Optional[asyncio.Task] = None
+
+
+async def watch_forecast_artifacts():
+    """새 모델/데이터 파일을 주기적으로 확인해 바뀌었으면 백그라운드 스레드에서 교체한다."""
+    while True:
+        await asyncio.sleep(ARTIFACT_WATCH_INTERVAL)
+        try:
+            await asyncio.to_thread(reload_forecast_artifacts)
+        except Exception as e:
+            print(f"⚠️ 모델/데이터 변경 확인 실패: {e}")
+
+
+async def evict_idle_sessions():
+    """오래 접근하지 않은 쓰레드를 주기적으로 정리한다 (새 쓰레드가 만들어지지 않는 동안에도 TTL을 지키도록)."""
+    while True:
+        await asyncio.sleep(SESSION_EVICT_INTERVAL)
+        try:
+            evicted = await asyncio.to_thread(session_store.evict_idle_threads)
+            if evicted:
+                print(f"🧹 유휴 쓰레드 {evicted}개 정리")
+        except Exception as e:
+            print(f"⚠️ 유휴 쓰레드 정리 실패: {e}")
+
+
+@app.on_event("startup")
+async def start_forecast_warmup():
+    global artifact_watch_task, session_evict_task
+    # 모델/데이터 로딩과 RUL 배치 예측은 수 초가 걸릴 수 있으므로 서버 기동을 막지 않도록 백그라운드에서 수행한다.
+    threading.Thread(target=warm_up_forecast_artifacts, name="forecast-warmup", daemon=True).start()
+    if ARTIFACT_WATCH_INTERVAL > 0:
+        artifact_watch_task = asyncio.create_task(watch_forecast_artifacts())
+    if SESSION_EVICT_INTERVAL > 0:
+        session_evict_task = asyncio.create_task(evict_idle_sessions())
+
+
+@app.on_event("shutdown")
+async def close_openai_client():
+    for task in (artifact_watch_task, session_evict_task):
+        if task is not None:
+            task.cancel()
+    await client.close()
+    forecast_compute_pool.shutdown()
 
 # --- Request 스키마 정의 ---
 class ChatRequest(BaseModel):
@@ -183,19 +574,30 @@ class PredictionConditions(BaseModel):
 class PredictionRequest(BaseModel):
     prompt: str
     conditions: PredictionConditions
+
+class BatchPredictionRequest(BaseModel):
+    prompt: str = ""
+    conditions: List[PredictionConditions]
+    include_guide: bool = True   # False면 LLM 요약 코멘트 대신 기본 문구를 사용 (GPT 호출 생략)
+    save_history: bool = False   # True면 조건별 결과를 예측 기록에도 저장 (기본은 저장하지 않음)
  
 
 # ==========================================
 # [3] 유틸리티 및 LLM 함수
 # ==========================================
 
-def get_lead_time_info(price: float):
-    if price <= 20000000:
-        return 0, 20.0, 0.48, 7
-    elif price < 50000000:
-        return 1, 60.0, 0.81, 20
+def get_semester_date_range(year: int, semester: Optional[str]):
+    """학기(방학) 구분을 분석 기간 (시작일, 종료일)로 변환한다."""
+    if semester in ["1", "1학기"]:
+        return datetime(year, 3, 2), datetime(year, 6, 20)
+    elif semester in ["여름", "여름방학", "summer"]:
+        return datetime(year, 6, 21), datetime(year, 8, 31)
+    elif semester in ["2", "2학기"]:
+        return datetime(year, 9, 1), datetime(year, 12, 20)
+    elif semester in ["겨울", "겨울방학", "winter"]:
+        return datetime(year, 12, 21), datetime(year + 1, 2, 28)
     else:
-        return 2, 100.0, 1.12, 38
+        return datetime(year, 1, 1), datetime(year, 12, 31)
 
 def calculate_sigma_d(counts_list: list):
     n = len(counts_list)
@@ -205,24 +607,54 @@ def calculate_sigma_d(counts_list: list):
     variance = sum((x - mean) ** 2 for x in counts_list) / (n - 1)
     return math.sqrt(variance)
 
-def build_model_input(target_df: pd.DataFrame) -> pd.DataFrame:
+def to_numeric_feature(values: pd.Series) -> pd.Series:
+    # 데이터 스냅샷의 문자열 컬럼은 category dtype이므로 값 기준으로 숫자 변환한다.
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    return pd.to_numeric(values, errors="coerce")
+
+
+def build_model_input(target_df: pd.DataFrame, artifacts: ForecastArtifacts) -> pd.DataFrame:
     """model_meta.json의 feature 순서에 맞춰 서버 예측 입력을 만든다."""
-    global df
+    source_df = artifacts.df
     prepared = target_df.copy()
-    for feature in model_features:
+    for feature in artifacts.model_features:
         if feature not in prepared.columns:
             prepared[feature] = 0
-        prepared[feature] = pd.to_numeric(prepared[feature], errors="coerce")
+        prepared[feature] = to_numeric_feature(prepared[feature])
         if prepared[feature].isna().any():
-            if df is not None and feature in df.columns:
-                fallback = pd.to_numeric(df[feature], errors="coerce").median()
+            if source_df is not None and feature in source_df.columns:
+                fallback = to_numeric_feature(source_df[feature]).median()
             else:
                 fallback = 0
             if pd.isna(fallback):
                 fallback = 0
             prepared[feature] = prepared[feature].fillna(fallback)
-    return prepared[model_features]
+    return prepared[artifacts.model_features]
+
+
 
+def score_all_assets(artifacts: ForecastArtifacts) -> np.ndarray:
+    """전체 자산의 예측 총수명(개월)을 원본 행 순서대로 한 번에 예측한다."""
+    scored_df = add_derived_features(artifacts.df.copy())
+    return artifacts.rf_model.predict(build_model_input(scored_df, artifacts))
+
+
+def prepare_rul_table(artifacts: ForecastArtifacts) -> None:
+    """예측 묶음의 모델/데이터 버전에 맞는 RUL 테이블을 준비한다 (저장된 테이블이 있으면 재사용)."""
+    if not artifacts.available or artifacts.rul_table_version is None or artifacts.rul_table_ready:
+        return
+    try:
+        artifacts.rul_table = load_or_build_rul_table(
+            artifacts.rul_table_version,
+            len(artifacts.df),
+            lambda: score_all_assets(artifacts),
+            RUL_TABLE_DIR,
+            mmap=ARTIFACT_MMAP,
+        )
+        print(f"✅ 자산별 예측 수명 테이블 준비 완료! ({len(artifacts.rul_table)}건, version={artifacts.rul_table_version})")
+    except Exception as e:
+        print(f"⚠️ 자산별 예측 수명 테이블 준비 실패 (요청 시 직접 예측): {e}")
 
 
 def make_event_date(df: pd.DataFrame) -> pd.Series:
@@ -245,7 +677,39 @@ def build_monthly_history_series(scope_df: pd.DataFrame) -> pd.DataFrame:
         return pd.DataFrame()
 
     historical["event_month"] = historical["event_date"].dt.to_period("M").dt.to_timestamp()
-    monthly = historical.groupby("event_month").size().rename("actual_count").reset_index()
+    return complete_monthly_series(historical.groupby("event_month").size())
+
+
+def build_monthly_history_batch(scope_positions: List[np.ndarray], source_df: pd.DataFrame) -> List[pd.DataFrame]:
+    """
+    여러 범위(학습데이터 행 위치 배열)의 월별 이력을 한 번에 만든다.
+    범위마다 이벤트 월을 따로 계산하지 않고, 행 합집합에 대해 한 번 계산한 뒤 (범위, 이벤트 월) 단일 groupby로 집계한다.
+    """
+    histories = [pd.DataFrame() for _ in scope_positions]
+    lengths = [len(positions) for positions in scope_positions]
+    if not sum(lengths):
+        return histories
+
+    all_positions = np.concatenate(scope_positions)
+    unique_positions, inverse = np.unique(all_positions, return_inverse=True)
+    historical = source_df.iloc[unique_positions]
+    event_dates = make_event_date(historical)
+    event_dates = event_dates.where(historical["학습데이터여부"].eq("Y"))
+    event_months = event_dates.dt.to_period("M").dt.to_timestamp().to_numpy()[inverse]
+
+    events = pd.DataFrame({
+        "scope": np.repeat(np.arange(len(scope_positions)), lengths),
+        "event_month": event_months,
+    }).dropna(subset=["event_month"])
+    counts = events.groupby(["scope", "event_month"]).size()
+    for scope_id, scope_counts in counts.groupby(level="scope"):
+        histories[scope_id] = complete_monthly_series(scope_counts.droplevel("scope"))
+    return histories
+
+
+def complete_monthly_series(event_counts: pd.Series) -> pd.DataFrame:
+    """월별 발생 건수(event_month 인덱스)를 빈 달 0건으로 채운 월별 이력과 달력 특성으로 만든다."""
+    monthly = event_counts.rename("actual_count").rename_axis("event_month").reset_index()
     full_index = pd.date_range(monthly["event_month"].min(), monthly["event_month"].max(), freq="MS")
     monthly = monthly.set_index("event_month").reindex(full_index, fill_value=0).reset_index()
     monthly = monthly.rename(columns={"index": "event_month"})
@@ -266,57 +730,155 @@ def add_monthly_lag_features(monthly: pd.DataFrame) -> pd.DataFrame:
     return out
 
 
-def forecast_scope_monthly_demand(scope_df: pd.DataFrame, start_date: datetime, end_date: datetime):
-    if monthly_demand_model is None:
-        return None, None, None
-
-    monthly = build_monthly_history_series(scope_df)
+def build_scope_history(monthly: pd.DataFrame, features: List[str]) -> Optional[dict]:
+    """월별 수요 재귀 예측에 필요한 범위별 이력 (과거 건수, 월 -> 실제 건수, 특성별 결측 대체값). 이력이 6개월 미만이면 None."""
     if monthly.empty or len(monthly) < 6:
-        return None, None, None
+        return None
 
     history_feat = add_monthly_lag_features(monthly)
-    for feature in monthly_demand_features:
+    for feature in features:
         if feature not in history_feat.columns:
             history_feat[feature] = np.nan
-    fill_values = history_feat[monthly_demand_features].median(numeric_only=True).fillna(0)
-    actual_lookup = {pd.Timestamp(row.event_month): int(row.actual_count) for row in monthly.itertuples()}
-    working_counts = monthly["actual_count"].astype(float).tolist()
-    target_month_dates = list(pd.date_range(start_date, end_date, freq="MS"))
-    forecast_map = {}
+    fill_values = history_feat[features].median(numeric_only=True).fillna(0)
+    return {
+        "counts": monthly["actual_count"].to_numpy(dtype=np.float64),
+        "actual_lookup": {pd.Timestamp(row.event_month): int(row.actual_count) for row in monthly.itertuples()},
+        "fill_values": fill_values.reindex(features).fillna(0).to_numpy(dtype=np.float64),
+    }
+
 
-    for month_dt in target_month_dates:
-        month_key = pd.Timestamp(month_dt.to_period("M").to_timestamp())
-        if month_key in actual_lookup:
-            forecast_map[month_dt.month] = int(actual_lookup[month_key])
+def get_scope_histories(conds: List[PredictionConditions], artifacts: ForecastArtifacts) -> List[Optional[dict]]:
+    """
+    조건별 월별 이력. 데이터/모델 버전이 같으면 범위별 이력이 변하지 않으므로 캐시해 두고,
+    캐시에 없는 범위만 build_monthly_history_batch의 단일 groupby로 만든다.
+    """
+    keys = [(artifacts.version, cond.dept_name, normalize_category(cond.category)) for cond in conds]
+    histories: List[Optional[dict]] = [None] * len(conds)
+    missing = []
+    for idx, key in enumerate(keys):
+        cached = monthly_history_cache.get(key)
+        if cached is None:
+            missing.append(idx)
+        else:
+            # 이력이 부족한 범위는 빈 dict로 캐시해 둔다.
+            histories[idx] = cached or None
+
+    if missing:
+        monthly_list = build_monthly_history_batch([
+            artifacts.scope_index.positions(conds[idx].dept_name, conds[idx].category, trainable_only=True) for idx in missing
+        ], artifacts.df)
+        for idx, monthly in zip(missing, monthly_list):
+            histories[idx] = build_scope_history(monthly, artifacts.monthly_features)
+            monthly_history_cache.set(keys[idx], histories[idx] or {})
+    return histories
+
+
+def warm_scope_histories(artifacts: ForecastArtifacts, previous: Optional[ForecastArtifacts]) -> None:
+    """교체 전 묶음에서 조회되던 범위의 월별 이력을 새 묶음으로 미리 만들어 둔다 (교체 직후 요청의 지연 방지)."""
+    if previous is None or previous.version is None or artifacts.monthly_model is None:
+        return
+    scopes = [key[1:] for key in monthly_history_cache.keys() if key[0] == previous.version]
+    if scopes:
+        get_scope_histories(
+            [PredictionConditions(dept_name=dept_name, category=category) for dept_name, category in scopes],
+            artifacts,
+        )
+
+
+def forecast_monthly_demand_batch(histories: List[Optional[dict]], date_ranges: List[tuple], artifacts: ForecastArtifacts) -> List[tuple]:
+    """
+    범위별 분석 기간의 월별 수요를 예측한다. 결과는 (월 -> 수량, 최대 수요 월, 기간 내 월 시작일 목록) 또는 (None, None, None).
+    이력에 실제 건수가 있는 달은 실제 값을 쓰고, 나머지 달은 모든 범위를 한 번의 lockstep 재귀 예측으로 처리한다.
+    """
+    results = [(None, None, None)] * len(histories)
+    if artifacts.monthly_model is None:
+        return results
+
+    jobs = []
+    for idx, (history, (start_date, end_date)) in enumerate(zip(histories, date_ranges)):
+        if history is None:
             continue
+        target_month_dates = list(pd.date_range(start_date, end_date, freq="MS"))
+        slots = []
+        for month_dt in target_month_dates:
+            month_key = pd.Timestamp(month_dt.to_period("M").to_timestamp())
+            slots.append((month_dt.month, history["actual_lookup"].get(month_key)))
+        jobs.append((idx, target_month_dates, slots, history))
+
+    forecaster = LockstepMonthlyForecaster(artifacts.monthly_model, artifacts.monthly_features)
+    predictions = forecaster.forecast(
+        [history["counts"] for _, _, _, history in jobs],
+        [[month for month, actual in slots if actual is None] for _, _, slots, _ in jobs],
+        np.array([history["fill_values"] for _, _, _, history in jobs]),
+    )
+
+    for (idx, target_month_dates, slots, _), preds in zip(jobs, predictions):
+        pred_iter = iter(preds)
+        forecast_map = {}
+        for month, actual in slots:
+            forecast_map[month] = actual if actual is not None else int(round(float(next(pred_iter))))
+        if not forecast_map:
+            continue
+        peak_month = max(forecast_map.keys(), key=lambda m: forecast_map.get(m, 0))
+        results[idx] = (forecast_map, peak_month, target_month_dates)
+    return results
+
+
+HISTORY_SUMMARY_PROMPT = """
+당신은 대학 물품관리시스템 AI 챗봇의 대화 기록 관리자입니다.
+[기존 요약]과 [새 대화]를 합쳐, 이후 답변에 필요한 정보(사용자가 물어본 업무 주제, 안내된 절차/기준, 사용자가 알려준 조건)만 남긴 요약을 작성하세요.
+- 5문장 이내의 한국어 평서문으로 작성하세요.
+- 인사말이나 중복된 내용은 제외하세요.
+"""
+
+conversation_window = ConversationWindow(
+    token_budget=HISTORY_TOKEN_BUDGET,
+    max_messages=HISTORY_MAX_MESSAGES,
+    summary_step=HISTORY_SUMMARY_STEP,
+    summary_max_tokens=HISTORY_SUMMARY_MAX_TOKENS,
+)
 
-        feat_row = pd.DataFrame([
-            {
-                "trend": len(working_counts),
-                "month": month_dt.month,
-                "month_sin": np.sin(2 * np.pi * month_dt.month / 12),
-                "month_cos": np.cos(2 * np.pi * month_dt.month / 12),
-                "lag_1": working_counts[-1] if len(working_counts) >= 1 else np.nan,
-                "lag_2": working_counts[-2] if len(working_counts) >= 2 else np.nan,
-                "lag_3": working_counts[-3] if len(working_counts) >= 3 else np.nan,
-                "lag_6": working_counts[-6] if len(working_counts) >= 6 else np.nan,
-                "lag_12": working_counts[-12] if len(working_counts) >= 12 else np.nan,
-                "rolling_mean_3": float(np.mean(working_counts[-3:])) if len(working_counts) >= 3 else np.nan,
-                "rolling_mean_6": float(np.mean(working_counts[-6:])) if len(working_counts) >= 6 else np.nan,
-                "rolling_std_6": float(np.std(working_counts[-6:], ddof=1)) if len(working_counts) >= 6 else np.nan,
-            }
-        ])
-        feat_row = feat_row[monthly_demand_features].fillna(fill_values)
-        pred_count = float(monthly_demand_model.predict(feat_row)[0])
-        pred_count = max(0.0, pred_count)
-        forecast_map[month_dt.month] = int(round(pred_count))
-        working_counts.append(pred_count)
-
-    if not forecast_map:
-        return None, None, None
 
-    peak_month = max(forecast_map.keys(), key=lambda m: forecast_map.get(m, 0))
-    return forecast_map, peak_month, target_month_dates
+def record_llm_usage(purpose: str, usage) -> None:
+    """OpenAI 응답의 토큰 사용량을 지표에 더한다 (usage가 없으면 무시)."""
+    if usage is None:
+        return
+    metrics.inc("llm_tokens_total", getattr(usage, "prompt_tokens", 0) or 0, purpose=purpose, kind="prompt")
+    metrics.inc("llm_tokens_total", getattr(usage, "completion_tokens", 0) or 0, purpose=purpose, kind="completion")
+
+
+async def create_chat_completion(purpose: str, **kwargs):
+    """client.chat.completions.create 호출 + 소요 시간/호출 결과/토큰 사용량 지표 기록 (스트리밍 호출 제외)"""
+    started = time.perf_counter()
+    try:
+        resp = await client.chat.completions.create(**kwargs)
+    except Exception:
+        metrics.inc("llm_requests_total", purpose=purpose, outcome="error")
+        raise
+    finally:
+        metrics.observe("stage_duration_seconds", time.perf_counter() - started, stage=f"llm_{purpose}")
+    metrics.inc("llm_requests_total", purpose=purpose, outcome="ok")
+    record_llm_usage(purpose, getattr(resp, "usage", None))
+    return resp
+
+
+async def summarize_history(previous_summary: str, messages: list) -> str:
+    """창 밖으로 밀려난 대화를 기존 요약에 합쳐 새 요약을 만든다."""
+    dialogue = "\n".join(
+        f"{'사용자' if msg['role'] == 'user' else 'AI'}: {msg['content']}" for msg in messages
+    )
+    resp = await create_chat_completion(
+        "history_summary",
+        model=AI_MODEL,
+        messages=[
+            {"role": "system", "content": HISTORY_SUMMARY_PROMPT},
+            {"role": "user", "content": f"[기존 요약]\n{previous_summary or '(없음)'}\n\n[새 대화]\n{dialogue}"},
+        ],
+        temperature=0.2,
+        max_tokens=HISTORY_SUMMARY_MAX_TOKENS,
+        timeout=OPENAI_GUIDE_TIMEOUT,
+    )
+    return resp.choices[0].message.content or ""
 
 
 REPORT_SYSTEM_PROMPT = """
@@ -334,72 +896,115 @@ REPORT_SYSTEM_PROMPT = """
 }
 """
 
-def get_llm_ai_guide(prompt: str, target_item: str, total_qty: int, rec_date_str: str, peak_month: int):
+async def request_llm_ai_guide(prompt: str, target_item: str, total_qty: int, rec_date_str: str, peak_month: int) -> dict:
+    context = f"품목:{target_item}, 총 필요수량:{total_qty}개, 최적 발주마감일:{rec_date_str}, 고장집중월:{peak_month}월. 사용자요청:{prompt}"
+    resp = await create_chat_completion(
+        "forecast_guide",
+        model=AI_MODEL,
+        messages=[{"role": "system", "content": REPORT_SYSTEM_PROMPT}, {"role": "user", "content": context}],
+        response_format={"type": "json_object"},
+        temperature=0.7,
+        timeout=OPENAI_GUIDE_TIMEOUT,
+    )
+    return json.loads(resp.choices[0].message.content)
+
+
+def finish_guide_task(key: tuple, task: asyncio.Task) -> None:
+    # 마감 시간이 지난 호출도 끝까지 진행되며, 성공한 결과는 다음 요청을 위해 캐시에 남긴다.
+    guide_tasks.pop(key, None)
+    if task.cancelled() or task.exception() is not None:
+        return
+    guide_cache.set(key, task.result())
+
+
+async def get_llm_ai_guide(prompt: str, target_item: str, total_qty: int, rec_date_str: str, peak_month: int) -> Optional[dict]:
+    """
+    AI 요약 코멘트. 결과는 입력(요청 문구, 품목, 수량, 발주마감일, 고장집중월)에만 의존하므로 캐시하고,
+    같은 입력의 호출이 진행 중이면 그 호출을 함께 기다린다.
+    FORECAST_GUIDE_DEADLINE초 안에 끝나지 않거나 실패하면 None을 반환한다 (호출 측에서 기본 문구로 대체).
+    """
+    key = (" ".join(prompt.split()), target_item, int(total_qty), rec_date_str, int(peak_month))
+    cached = guide_cache.get(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
+    task = guide_tasks.get(key)
+    if task is None:
+        task = asyncio.create_task(request_llm_ai_guide(prompt, target_item, total_qty, rec_date_str, peak_month))
+        guide_tasks[key] = task
+        task.add_done_callback(lambda done, key=key: finish_guide_task(key, done))
+
     try:
-        context = f"품목:{target_item}, 총 필요수량:{total_qty}개, 최적 발주마감일:{rec_date_str}, 고장집중월:{peak_month}월. 사용자요청:{prompt}"
-        resp = client.chat.completions.create(
-            model=AI_MODEL,
-            messages=[{"role": "system", "content": REPORT_SYSTEM_PROMPT}, {"role": "user", "content": context}],
-            response_format={"type": "json_object"},
-            temperature=0.7 
-        )
-        return json.loads(resp.choices[0].message.content)
+        # shield: 마감 시간이 지나거나 요청이 취소되어도 LLM 호출 자체는 취소하지 않는다.
+        guide = await asyncio.wait_for(asyncio.shield(task), FORECAST_GUIDE_DEADLINE if FORECAST_GUIDE_DEADLINE > 0 else None)
+        return copy.deepcopy(guide)
+    except asyncio.TimeoutError:
+        metrics.inc("forecast_guide_fallback_total", reason="deadline")
     except Exception:
-        return {
-            "ai_summary_comment": f"수요 분석 결과, {peak_month}월 전후로 노후 장비 처분이 예측됩니다. 원활한 실습실 운영을 위해 가이드된 일정에 맞춰 발주를 진행해 주세요."
-        }
+        metrics.inc("forecast_guide_fallback_total", reason="error")
+    return None
+
+def default_ai_guide(peak_month: int) -> dict:
+    return {
+        "ai_summary_comment": f"수요 분석 결과, {peak_month}월 전후로 노후 장비 처분이 예측됩니다. 원활한 실습실 운영을 위해 가이드된 일정에 맞춰 발주를 진행해 주세요."
+    }
 
 # ==========================================
 # [4] 챗봇 세션(쓰레드) 관리 API 
 # ==========================================
+# 저장소 호출(SQLite)은 동기 I/O이므로 저장소만 쓰는 API는 일반 def로 두어 FastAPI 스레드 풀에서 실행하고,
+# async API에서는 asyncio.to_thread로 감싸 이벤트 루프를 막지 않는다.
 
 @app.post("/api/ai/chat/threads")
-async def create_thread():
+def create_thread():
     threadId = str(uuid.uuid4())
-    sessions_db[threadId] = {
-        "title": "새 채팅",
-        "messages": []
-    }
+    session_store.ensure_thread(threadId, title="새 채팅")
     return {"status": "success", "data": {"threadId": threadId, "title": "새 채팅"}}
 
 @app.get("/api/ai/chat/threads")
-async def get_threads():
-    thread_list = [{"threadId": tid, "title": data["title"]} for tid, data in sessions_db.items()]
+def get_threads(offset: int = Query(0, ge=0), limit: Optional[int] = Query(None, ge=1, le=1000)):
+    thread_list = session_store.list_threads(offset=offset, limit=limit)
     return {"status": "success", "data": thread_list}
 
 @app.put("/api/ai/chat/threads/{threadId}")
-async def rename_thread(threadId: str, req: SessionRenameRequest):
-    if threadId not in sessions_db:
+def rename_thread(threadId: str, req: SessionRenameRequest):
+    if not session_store.rename_thread(threadId, req.new_title):
         raise HTTPException(status_code=404, detail="쓰레드를 찾을 수 없습니다.")
-    sessions_db[threadId]["title"] = req.new_title
     return {"status": "success", "message": "이름이 변경되었습니다.", "data": {"threadId": threadId, "new_title": req.new_title}}
 
 @app.delete("/api/ai/chat/threads")
-async def delete_thread(threadId: str):
-    if threadId in sessions_db:
-        del sessions_db[threadId]
+def delete_thread(threadId: str):
+    if session_store.delete_thread(threadId):
         return {"status": "success", "message": "삭제 완료"}
     raise HTTPException(status_code=404, detail="쓰레드를 찾을 수 없습니다.")
 
 @app.get("/api/ai/chat/messages/{threadId}/search")
-async def get_thread_messages(threadId: str):
+def get_thread_messages(threadId: str):
     # 수정 포인트: 프론트엔드가 [+] 버튼 등으로 새 쓰레드ID만 가지고 조회 요청을 할 때 터지지 않도록 방어 로직 추가
-    if threadId not in sessions_db:
-        sessions_db[threadId] = {"title": "새 채팅", "messages": []}
-    return {"status": "success", "data": sessions_db[threadId]["messages"]}
+    session_store.ensure_thread(threadId, title="새 채팅")
+    return {"status": "success", "data": session_store.get_messages(threadId)}
 
 @app.get("/api/ai/chat/messages/search")
-async def search_all_messages(keyword: Optional[str] = None):
-    result = []
-    for tid, data in sessions_db.items():
-        for msg in data["messages"]:
-            if keyword is None or keyword.lower() in msg["content"].lower():
-                result.append({
-                    "threadId": tid, 
-                    "role": msg["role"], 
-                    "content": msg["content"],
-                    "created_at": msg.get("created_at", "")
-                })
+def search_all_messages(
+    keyword: Optional[str] = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(SEARCH_DEFAULT_LIMIT, ge=1, le=SEARCH_MAX_LIMIT),
+):
+    # 전체 메시지를 매번 훑지 않고, 메시지 추가/쓰레드 삭제 시 갱신되는 n-gram 역색인으로 후보를 좁힌다.
+    if keyword:
+        messages = session_store.search_messages(keyword, offset=offset, limit=limit)
+    else:
+        messages = session_store.list_all_messages(offset=offset, limit=limit)
+
+    result = [
+        {
+            "threadId": msg["threadId"], 
+            "role": msg["role"], 
+            "content": msg["content"],
+            "created_at": msg.get("created_at") or ""
+        }
+        for msg in messages
+    ]
     return {"status": "success", "data": result}
 
 
@@ -407,37 +1012,34 @@ async def search_all_messages(keyword: Optional[str] = None):
 # [5] API 엔드포인트 (AI 응답)
 # ==========================================
 
-@app.post("/api/ai/chat")
-async def chat_completions(req: ChatRequest):
+def record_user_message(req: ChatRequest, current_time: str) -> tuple:
+    """사용자 질문을 쓰레드 이력에 추가하고 (전체 이력, 누적 요약, 요약된 메시지 수)를 반환한다."""
+    session_store.ensure_thread(req.threadId, title=req.query[:10])
+    session_store.append_message(req.threadId, "user", req.query, current_time)
+    history = session_store.get_messages(req.threadId)
+    summary, summarized_upto = session_store.get_summary(req.threadId)
+    return history, summary, summarized_upto
+
+
+async def prepare_chat_context(req: ChatRequest):
+    """쓰레드 이력에 사용자 질문을 추가하고 LLM 입력 메시지와 참고 매뉴얼 목록을 만든다."""
     current_time = datetime.now().isoformat()
-    
-    if req.threadId not in sessions_db:
-        sessions_db[req.threadId] = {"title": req.query[:10], "messages": []}
-    
-    history = sessions_db[req.threadId]["messages"]
-    history.append({"role": "user", "content": req.query, "created_at": current_time})
+    history, summary, summarized_upto = await asyncio.to_thread(record_user_message, req, current_time)
 
-    q = req.query.replace(" ", "") 
-    selected_file = None
-    
-    if any(w in q for w in ["취득", "취득정리구분", "취득일자", "정리일자", "자산등록"]): selected_file = "manual_chapter1.json"
-    elif any(w in q for w in ["운용", "라벨", "물품고유번호", "운용대장"]): selected_file = "manual_chapter2.json"
-    elif any(w in q for w in ["반납", "반납사유", "반납일자", "반납확정일자"]): selected_file = "manual_chapter3.json"
-    elif any(w in q for w in ["불용", "불용일자", "불용확정일자"]): selected_file = "manual_chapter4.json"
-    elif any(w in q for w in ["처분", "처분정리구분", "처분일자", "처분확정일자"]): selected_file = "manual_chapter5.json"
-    elif any(w in q for w in ["보유현황", "보유", "현황", "조회기준", "목록"]): selected_file = "manual_chapter6.json"
-    elif any(w in q for w in ["사용주기", "AI예측", "수명", "교체시기", "분석"]): selected_file = "manual_chapter7.json"
-    elif any(w in q for w in ["챗봇", "도움말", "사용법", "가이드"]): selected_file = "manual_chapter8.json"
+    # 요약 이후의 대화만 원문으로 보내고, 그 이전 대화는 누적 요약으로 대체한다.
+    # 요약 갱신은 답변을 저장한 뒤 schedule_summary_refresh가 백그라운드에서 한다.
+    window = conversation_window.build(history, summarized_upto)
+
+    # 시작 시 컴파일한 키워드 매처로 질문을 한 번만 훑어 매뉴얼 챕터를 고른다.
+    selected_file = chat_keyword_router.select_manual(req.query)
 
     manual_content = ""
     refs = []
     if selected_file:
         refs = [selected_file] 
-        try:
-            if os.path.exists(selected_file):
-                with open(selected_file, "r", encoding="utf-8") as f:
-                    manual_content = json.dumps(json.load(f), ensure_ascii=False)
-        except Exception as e: pass
+        # 시작 시 미리 직렬화해 둔 캐시를 사용 (파일이 바뀐 경우에만 재로딩)
+        with metrics.timer("stage_duration_seconds", stage="chat_manual_load"):
+            manual_content = get_manual_content(selected_file)
 
     # 수정 포인트: 보유현황조회 안내 및 메뉴 라우팅 강화
     sys_inst = f"""당신은 대학 물품관리시스템을 돕는 똑똑하고 친절한 AI 챗봇입니다.
@@ -451,37 +1053,75 @@ async def chat_completions(req: ChatRequest):
     [매뉴얼 데이터]
     {manual_content}
     """
+    if summary:
+        sys_inst += f"""
+    [이전 대화 요약]
+    {summary}
+    """
+
+    messages_for_llm = [{"role": "system", "content": sys_inst}] + window
+    return messages_for_llm, refs, current_time
+
+
+def load_thread_history(thread_id: str) -> tuple:
+    history = session_store.get_messages(thread_id)
+    summary, summarized_upto = session_store.get_summary(thread_id)
+    return history, summary, summarized_upto
+
+
+async def refresh_history_summary(thread_id: str) -> None:
+    """창 밖으로 밀려난 대화를 누적 요약에 합친다 (다음 질문부터 새 요약을 사용)."""
+    history, summary, summarized_upto = await asyncio.to_thread(load_thread_history, thread_id)
+    new_summary, new_upto = await conversation_window.advance_summary(
+        history, summary, summarized_upto, summarize_history
+    )
+    if new_upto != summarized_upto:
+        await asyncio.to_thread(session_store.set_summary, thread_id, new_summary, new_upto)
+
+
+def finish_summary_task(thread_id: str, task: asyncio.Task) -> None:
+    summary_tasks.pop(thread_id, None)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"⚠️ 대화 요약 갱신 실패 ({thread_id}): {task.exception()}")
+
+
+def schedule_summary_refresh(thread_id: str) -> None:
+    """답변 저장 후 요약 갱신을 백그라운드로 예약한다. 같은 쓰레드의 갱신이 진행 중이면 다음 턴에 맡긴다."""
+    if thread_id in summary_tasks:
+        return
+    task = asyncio.create_task(refresh_history_summary(thread_id))
+    summary_tasks[thread_id] = task
+    task.add_done_callback(lambda done, thread_id=thread_id: finish_summary_task(thread_id, done))
 
-    try:
-        messages_for_llm = [{"role": "system", "content": sys_inst}] + history
 
-        response = client.chat.completions.create(
+def build_action_buttons(query: str, ai_reply: str) -> list:
+    """질문뿐만 아니라 AI 답변 내용까지 파악하여 관련된 바로가기 버튼을 모두 만든다."""
+    return chat_keyword_router.build_action_buttons(query + " " + ai_reply)
+
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/api/ai/chat")
+async def chat_completions(req: ChatRequest):
+    with metrics.timer("stage_duration_seconds", stage="chat_context"):
+        messages_for_llm, refs, current_time = await prepare_chat_context(req)
+
+    try:
+        response = await create_chat_completion(
+            "chat",
             model=AI_MODEL,
             messages=messages_for_llm,
-            temperature=0.6 
+            temperature=0.6,
+            timeout=OPENAI_CHAT_TIMEOUT,
         )
         ai_reply = response.choices[0].message.content
 
-        history.append({"role": "assistant", "content": ai_reply, "created_at": current_time})
+        await asyncio.to_thread(session_store.append_message, req.threadId, "assistant", ai_reply, current_time)
+        schedule_summary_refresh(req.threadId)
 
-        # 수정 포인트: 질문뿐만 아니라 AI 답변 내용까지 파악하여 관련된 바로가기 버튼을 모두 띄움
-        action_buttons = []
-        q_and_a = req.query + " " + ai_reply
-        
-        if any(w in q_and_a for w in ["반납"]):
-            action_buttons.append({"label": "물품 반납 관리 바로가기", "url": "/return-management"})
-        if any(w in q_and_a for w in ["처분", "불용"]):
-            action_buttons.append({"label": "불용/처분 관리 바로가기", "url": "/disposal-management"})
-        if any(w in q_and_a for w in ["취득", "자산등록"]):
-            action_buttons.append({"label": "자산 취득 등록 바로가기", "url": "/acquisition-management"})
-        if any(w in q_and_a for w in ["보유현황", "보유현황조회", "상태"]):
-            action_buttons.append({"label": "보유현황조회 바로가기", "url": "/status-inquiry"})
-        if any(w in q_and_a for w in ["사용주기", "AI예측", "AI 예측"]):
-            action_buttons.append({"label": "사용주기 AI 예측 바로가기", "url": "/ai-forecast"})
-
-        # 중복된 버튼 제거 (같은 목적지의 버튼이 여러 개 달리는 것 방지)
-        unique_buttons = {btn["label"]: btn for btn in action_buttons}.values()
-        action_buttons = list(unique_buttons)
+        action_buttons = build_action_buttons(req.query, ai_reply)
 
         return {
             "status": "success", 
@@ -496,222 +1136,516 @@ async def chat_completions(req: ChatRequest):
         return {"status": "error", "error": str(e)}
 
 
-@app.post("/api/ai/forecast")
-async def predict_analysis(req: PredictionRequest):
-    if rf_model is None or df is None:
-        return {"status": "error", "message": "모델이나 데이터가 없습니다."}
-        
-    # 수정 포인트: 분석 조건 필수 입력 방어 코드 추가
+@app.post("/api/ai/chat/stream")
+async def chat_completions_stream(req: ChatRequest):
+    """
+    /api/ai/chat의 SSE 버전.
+    토큰이 도착하는 즉시 `token` 이벤트로 내보내고, 답변이 끝나면
+    action_buttons / references / created_at을 `done` 이벤트로 한 번에 보낸다.
+    """
+    with metrics.timer("stage_duration_seconds", stage="chat_context"):
+        messages_for_llm, refs, current_time = await prepare_chat_context(req)
+
+    async def event_stream():
+        chunks = []
+        started = time.perf_counter()
+        try:
+            stream = await client.chat.completions.create(
+                model=AI_MODEL,
+                messages=messages_for_llm,
+                temperature=0.6,
+                timeout=OPENAI_CHAT_TIMEOUT,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            async for chunk in stream:
+                # 토큰 사용량은 choices가 빈 마지막 청크에만 담겨 온다.
+                record_llm_usage("chat_stream", getattr(chunk, "usage", None))
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if not chunks:
+                        metrics.observe("stage_duration_seconds", time.perf_counter() - started, stage="llm_chat_stream_first_token")
+                    chunks.append(delta)
+                    yield format_sse("token", {"delta": delta})
+
+            metrics.observe("stage_duration_seconds", time.perf_counter() - started, stage="llm_chat_stream")
+            metrics.inc("llm_requests_total", purpose="chat_stream", outcome="ok")
+            ai_reply = "".join(chunks)
+            await asyncio.to_thread(session_store.append_message, req.threadId, "assistant", ai_reply, current_time)
+            schedule_summary_refresh(req.threadId)
+
+            yield format_sse("done", {
+                "status": "success",
+                "data": {
+                    "reply": ai_reply,
+                    "action_buttons": build_action_buttons(req.query, ai_reply),
+                    "references": refs,
+                    "created_at": current_time
+                }
+            })
+        except Exception as e:
+            metrics.inc("llm_requests_total", purpose="chat_stream", outcome="error")
+            yield format_sse("error", {"status": "error", "error": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def ensure_forecast_ready() -> Optional[ForecastArtifacts]:
+    """
+    백그라운드 모델/데이터 로딩이 끝나기 전에는 대기시키지 않고 바로 503으로 응답한다.
+    준비가 끝났으면 현재 예측 묶음을 반환한다 (요청은 처리가 끝날 때까지 이 묶음만 사용한다).
+    """
+    if not forecast_ready.is_set():
+        raise HTTPException(
+            status_code=503,
+            detail="예측 모델을 준비 중입니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(FORECAST_WARMUP_RETRY_AFTER)},
+        )
+    return forecast_artifacts
+
+
+def build_forecast_cache_key(req: PredictionRequest, artifacts: ForecastArtifacts) -> tuple:
+    """
+    결과가 같아지는 요청끼리 같은 키가 되도록 조건을 정규화한다.
+    (학기 표기는 분석 기간으로, 분류 ''/'전체'는 None으로 통일하고, 고장 예상일이 현재 시각 기준이므로 오늘 날짜를 포함)
+    """
     cond = req.conditions
-    if not cond.year or not cond.semester or not cond.dept_name:
-        raise HTTPException(status_code=400, detail="분석조건(운용부서, 년도, 학기)을 필수로 입력해주세요.")
+    start_date, end_date = get_semester_date_range(int(cond.year), cond.semester)
+    category = (cond.category or "").strip()
+    return (
+        artifacts.version,
+        datetime.now().date().isoformat(),
+        cond.dept_name.strip(),
+        None if category in ("", "전체") else category,
+        start_date.isoformat(),
+        end_date.isoformat(),
+        cond.risk_level,
+        " ".join(req.prompt.split()),
+    )
 
-    try:
-        # 1. 대상 데이터 필터링
-        target_df = df[df['운용부서명'] == cond.dept_name].copy()
-        if cond.category and cond.category != "전체":
-            target_df = target_df[target_df['물품분류명'] == cond.category]
+
+def build_forecast_result(req: PredictionRequest, sections: dict, forecastId: Optional[str] = None) -> dict:
+    """분석 결과 구역에 요청 정보를 붙인다 (기록으로 저장하지 않는 결과는 forecastId가 None)."""
+    cond = req.conditions
+    created_at = datetime.now().isoformat()
+    
+    # =========================================================
+    # 프론트엔드가 화면 상단에 그릴 수 있도록 
+    # prompt, target, risk, period 데이터를 final_result의 1Depth에 추가
+    # =========================================================
+    final_result = {
+        "forecastId": forecastId,
+        "created_at": created_at,
+        "prompt": req.prompt,                                # <-- 프론트엔드 '이전 예측' 영역에 표시될 질문 내용
+        "target": cond.dept_name,                            # <-- Target 표시용
+        "risk": cond.risk_level,                             # <-- Risk 표시용
+        "period": f"{cond.year} - {cond.semester}",          # <-- Period 표시용 (예: "2030 - 2학기")
+        "conditions": {                                      # <-- 원본 조건도 백업용으로 전달 (필요시 프론트 사용)
+            "year": cond.year,
+            "semester": cond.semester,
+            "dept_name": cond.dept_name,
+            "category": cond.category,
+            "risk_level": cond.risk_level
+        },
+        **sections,
+    }
+    return final_result
+
+
+def save_forecast_result(req: PredictionRequest, sections: dict) -> dict:
+    """분석 결과 구역에 요청 정보와 새 forecastId를 붙여 예측 기록으로 저장한다."""
+    final_result = build_forecast_result(req, sections, f"pred-{str(uuid.uuid4())[:8]}")
+    session_store.save_forecast(final_result["forecastId"], {
+        "title": req.prompt[:15] + "..." if len(req.prompt) > 15 else req.prompt,
+        "prompt": req.prompt,
+        "created_at": final_result["created_at"],
+        "data": final_result
+    })
+
+    return final_result
+
+
+def compute_forecast(cond: PredictionConditions, artifacts: ForecastArtifacts) -> Optional[dict]:
+    """
+    예측의 CPU 연산 단계 (대상 필터링 -> 모델 예측 -> 월별 수요 예측 -> 구역 1 시계열).
+    이벤트 루프를 막지 않도록 작업 풀 스레드에서 실행하며, 대상 자산이 없으면 None을 반환한다.
+    """
+    with metrics.timer("stage_duration_seconds", stage="forecast_filter"):
+        # 1. 대상 데이터 필터링 (로딩 시 만들어 둔 부서/분류 색인 조회)
+        target_positions = artifacts.scope_index.positions(cond.dept_name, cond.category)
+        target_df = artifacts.df.iloc[target_positions].copy()
 
         if target_df.empty:
-            return {
-                "status": "success", 
-                "data": { 
-                    "section_1_time_series": [], 
-                    "section_2_strategic_guide": {}, 
-                    "section_3_recommendations": [],
-                    "section_4_algorithm_guide": {}
-                }
-            }
+            return None
 
         # 2. 파생변수 동적 계산
-        if '취득금액' in target_df.columns:
-            target_df['리드타임등급'], target_df['등급점수'], target_df['sqrt_L'], target_df['리드타임_일'] = zip(*target_df['취득금액'].apply(get_lead_time_info))
-            if '가격민감도' in target_df.columns:
-                target_df['장비중요도'] = (target_df['가격민감도'] * 100 * 0.5) + (target_df['등급점수'] * 0.5)
-
-        # 3. AI 모델 예측 수행
-        input_data = build_model_input(target_df)
-        target_df['예측수명_월'] = rf_model.predict(input_data)
-        
-        # 4. 고장 예상일 계산
-        # 모델은 총수명(개월)을 예측하므로 현재 운용연차를 뺀 RUL을 사용한다.
-        age_months = pd.to_numeric(target_df.get('운용연차', 0), errors='coerce').fillna(0) * 12
-        target_df['RUL_개월_raw'] = target_df['예측수명_월'] - age_months
-        target_df['RUL_개월'] = target_df['RUL_개월_raw'].clip(lower=0.5)
-        target_df['고장예상일'] = target_df['RUL_개월'].apply(
-            lambda x: datetime.now() + timedelta(days=float(x) * 30.4375)
-        )
+        target_df = add_derived_features(target_df)
 
-        req_year = int(cond.year)
-        req_semester = cond.semester
-        
-        # 학기별 날짜 필터링
-        if req_semester in ["1", "1학기"]:      
-            start_date = datetime(req_year, 3, 2)
-            end_date = datetime(req_year, 6, 20)
-        elif req_semester in ["여름", "여름방학", "summer"]: 
-            start_date = datetime(req_year, 6, 21)
-            end_date = datetime(req_year, 8, 31)
-        elif req_semester in ["2", "2학기"]:    
-            start_date = datetime(req_year, 9, 1)
-            end_date = datetime(req_year, 12, 20)
-        elif req_semester in ["겨울", "겨울방학", "winter"]: 
-            start_date = datetime(req_year, 12, 21)
-            end_date = datetime(req_year + 1, 2, 28)
-        else: 
-            start_date = datetime(req_year, 1, 1)
-            end_date = datetime(req_year, 12, 31)
-            
-        filtered_df = target_df[(target_df['고장예상일'] >= start_date) & (target_df['고장예상일'] <= end_date)].copy()
-
-        if start_date.year == end_date.year:
-            target_months = list(range(start_date.month, end_date.month + 1))
-        else:
-            target_months = list(range(start_date.month, 13)) + list(range(1, end_date.month + 1))
+    # 3. AI 모델 예측 수행 / 4. 고장 예상일 계산
+    with metrics.timer("stage_duration_seconds", stage="forecast_rf_predict"):
+        target_df = add_failure_estimates(target_df, predict_asset_life(target_df, target_positions, artifacts))
 
-        target_month_dates = list(pd.date_range(start_date, end_date, freq="MS"))
+    with metrics.timer("stage_duration_seconds", stage="forecast_monthly"):
+        monthly_forecast = forecast_monthly_demand_batch(
+            get_scope_histories([cond], artifacts),
+            [get_semester_date_range(int(cond.year), cond.semester)],
+            artifacts,
+        )[0]
+    with metrics.timer("stage_duration_seconds", stage="forecast_summarize"):
+        return summarize_scope_forecast(cond, target_df, monthly_forecast)
 
-        # -------------------------------------------------------------------
-        # [구역 3] 조달권고안 (개별 품목별 데이터)
-        # -------------------------------------------------------------------
-        recommendations = []
-        rop_trigger_months = [] 
 
-        total_base_qty_all = 0
-        total_safety_stock_all = 0
-        
-        # 수정 포인트: High 선택 시 버퍼를 크게 잡아 안전하고 "일찍" 발주하도록 매핑값 반전 변경
-        z_val_map = {
-            "Low": 0.0, "LOW": 0.0,         # 리스크 수용(재고 안 둠) -> 늦은 발주
-            "Medium": 1.28, "MEDIUM": 1.28, # 표준 타협
-            "High": 1.65, "HIGH": 1.65      # 결품 리스크 회피 최우선 -> 안전 재고 증가 -> 앞당겨진 이른 발주
-        }
-        
-        z_val = z_val_map.get(cond.risk_level, 1.28)
-        model_rmse = 5.0 
-        buffer_days = math.ceil(z_val * model_rmse) 
-
-        forecast_monthly_counts, forecast_peak_month, target_month_dates = forecast_scope_monthly_demand(
-            df[(df['운용부서명'] == cond.dept_name) & (df['학습데이터여부'] == 'Y')].copy()
-            if (not cond.category or cond.category == "전체")
-            else df[(df['운용부서명'] == cond.dept_name) & (df['학습데이터여부'] == 'Y') & (df['물품분류명'] == cond.category)].copy(),
-            start_date,
-            end_date,
-        )
+def predict_asset_life(target_df: pd.DataFrame, positions: np.ndarray, artifacts: ForecastArtifacts) -> np.ndarray:
+    """
+    자산별 예측 총수명(개월).
+    정적 특성에만 의존하므로 사전 계산 테이블을 사용하고, 테이블 준비 전에만 직접 예측한다.
+    """
+    current_rul_table = artifacts.rul_table
+    if current_rul_table is not None and current_rul_table.version == artifacts.rul_table_version:
+        return current_rul_table.take(positions)
+    return artifacts.rf_model.predict(build_model_input(target_df, artifacts))
 
-        if forecast_monthly_counts is not None:
-            monthly_counts_total = forecast_monthly_counts
-            peak_month = forecast_peak_month if forecast_peak_month else (max(target_months, key=lambda m: monthly_counts_total.get(m, 0)) if target_months else 0)
-        else:
-            if not filtered_df.empty:
-                monthly_counts_total = filtered_df.groupby('고장예상월').size().to_dict()
-            else:
-                monthly_counts_total = {}
-            peak_month = max(rop_trigger_months, key=rop_trigger_months.count) if rop_trigger_months else (max(target_months, key=lambda m: monthly_counts_total.get(m, 0)) if target_months else 0)
 
-        if target_months and peak_month in target_months:
-            peak_idx = target_months.index(peak_month)
-            final_rop_month = target_months[max(0, peak_idx - 1)]
-        else:
-            final_rop_month = target_months[0] if target_months else 0
+def add_failure_estimates(target_df: pd.DataFrame, predicted_life: np.ndarray, now: Optional[datetime] = None) -> pd.DataFrame:
+    # 모델은 총수명(개월)을 예측하므로 현재 운용연차를 뺀 RUL을 사용한다.
+    target_df['예측수명_월'] = predicted_life
+    age_months = pd.to_numeric(target_df.get('운용연차', 0), errors='coerce').fillna(0) * 12
+    target_df['RUL_개월_raw'] = target_df['예측수명_월'] - age_months
+    target_df['RUL_개월'] = target_df['RUL_개월_raw'].clip(lower=0.5)
+    target_df['고장예상일'] = failure_dates(target_df['RUL_개월'], now)
+    target_df['고장예상월'] = target_df['고장예상일'].dt.month
+    return target_df
 
-        time_series = []
-        for m in range(1, 13):
-            qty = int(monthly_counts_total.get(m, 0)) if m in target_months else 0
-            is_rop_flag = (m == final_rop_month)
 
-            ts_item = {
-                "month": m,
-                "quantity": qty,
-                "is_rop": is_rop_flag
-            }
-            if is_rop_flag:
-                rop_date_value = earliest_order_date
-                if target_month_dates:
-                    rop_anchor = next((dt for dt in target_month_dates if dt.month == final_rop_month), None)
-                    if rop_anchor is not None:
-                        rop_date_value = rop_anchor.strftime("%Y-%m-%d")
-                ts_item["rop_date"] = rop_date_value
-                ts_item["base_qty"] = total_base_qty_all
-                ts_item["safety_stock"] = total_safety_stock_all
-                ts_item["total_order_qty"] = total_base_qty_all + total_safety_stock_all
-
-            time_series.append(ts_item)
+def recommend_order_deadline(start_date: datetime, end_date: datetime, rop_month: int, failing_df: pd.DataFrame) -> str:
+    """
+    권장 발주마감일: 발주 시점(ROP) 월 시작일에서 분석 기간 내 고장 예상 장비의 최대 리드타임(일)을 역산한다.
+    ROP 월 시작일이 분석 기간 안에 없으면(예: 3월 2일에 시작하는 1학기의 3월) 분석 시작일을 기준으로 하고,
+    기간 내 고장 예상 장비가 없으면 리드타임을 0일로 본다.
+    """
+    rop_anchor = next((dt for dt in pd.date_range(start_date, end_date, freq="MS") if dt.month == rop_month), None)
+    if rop_anchor is None:
+        rop_anchor = pd.Timestamp(start_date)
+    lead_time_days = 0
+    if not failing_df.empty and '리드타임_일' in failing_df.columns:
+        lead_time_days = int(failing_df['리드타임_일'].max())
+    return (rop_anchor - timedelta(days=lead_time_days)).strftime("%Y-%m-%d")
+
+
+def summarize_scope_forecast(cond: PredictionConditions, target_df: pd.DataFrame, monthly_forecast: tuple) -> dict:
+    """고장 예상일이 계산된 대상 자산과 월별 수요 예측 결과로 분석 기간의 월별 수요, 발주 시점, 구역 1 시계열을 만든다."""
+    # 학기별 날짜 필터링
+    start_date, end_date = get_semester_date_range(int(cond.year), cond.semester)
+
+    filtered_df = target_df[(target_df['고장예상일'] >= start_date) & (target_df['고장예상일'] <= end_date)].copy()
+
+    if start_date.year == end_date.year:
+        target_months = list(range(start_date.month, end_date.month + 1))
+    else:
+        target_months = list(range(start_date.month, 13)) + list(range(1, end_date.month + 1))
+
+    target_month_dates = list(pd.date_range(start_date, end_date, freq="MS"))
+
+    # -------------------------------------------------------------------
+    # [구역 3] 조달권고안 (개별 품목별 데이터)
+    # -------------------------------------------------------------------
+    recommendations = []
+    rop_trigger_months = [] 
+
+    total_base_qty_all = 0
+    total_safety_stock_all = 0
+
+    # 수정 포인트: High 선택 시 버퍼를 크게 잡아 안전하고 "일찍" 발주하도록 매핑값 반전 변경
+    z_val_map = {
+        "Low": 0.0, "LOW": 0.0,         # 리스크 수용(재고 안 둠) -> 늦은 발주
+        "Medium": 1.28, "MEDIUM": 1.28, # 표준 타협
+        "High": 1.65, "HIGH": 1.65      # 결품 리스크 회피 최우선 -> 안전 재고 증가 -> 앞당겨진 이른 발주
+    }
 
+    z_val = z_val_map.get(cond.risk_level, 1.28)
+    model_rmse = 5.0 
+    buffer_days = math.ceil(z_val * model_rmse) 
+
+    forecast_monthly_counts, forecast_peak_month, target_month_dates = monthly_forecast
+
+    if forecast_monthly_counts is not None:
+        monthly_counts_total = forecast_monthly_counts
+        peak_month = forecast_peak_month if forecast_peak_month else (max(target_months, key=lambda m: monthly_counts_total.get(m, 0)) if target_months else 0)
+    else:
         if not filtered_df.empty:
-            total_qty_all = sum(r['quantity'] for r in recommendations)
-            total_budget_all = sum(r['estimated_budget'] for r in recommendations)
-            
-            target_item_name = cond.category if cond.category and cond.category != "전체" else "전체 품목"
-            peak_month = peak_month if peak_month else final_rop_month
-            
-            ai_guide_data = get_llm_ai_guide(req.prompt, target_item_name, total_qty_all, earliest_order_date, peak_month)
-            
-            # Risk Level 표기 맵핑 조정 반영
-            service_level_map = {"Low": "50% 수준", "Medium": "90% 수준", "High": "95% 이상 안정"}
-            sl_text = service_level_map.get(cond.risk_level, "90% 수준")
-
-            budget_in_thousands = total_budget_all // 1000
-            
-            ai_strategic_guide = {
-                "ai_summary_comment": ai_guide_data.get("ai_summary_comment", ""),
-                "smart_forecasting": f"분석 기간 내 발생할 것으로 예상되는 순수 고장 예상 수량({total_base_qty_all}개)에, 예상치 못한 장비 부족으로 인한 수업 결손을 방지하기 위한 안전 재고({total_safety_stock_all}개)를 더하여 최종 권장 발주 수량을 산출했습니다. (설정된 {sl_text} 서비스 수준 기준, 총 {total_qty_all}대의 필요 수량 도출)",
-                "time_to_procure": f"물품 발주부터 실제 실습실 설치까지 소요되는 리드 타임(Lead Time)을 역산하여 산출한 결과입니다. 수업 운영에 차질이 없도록 늦어도 {earliest_order_date} 이전까지 발주 절차를 진행하시는 것이 가장 적합합니다.",
-                "budget_guide": f"해당 수량 조달 및 설치를 위해 약 {budget_in_thousands:,}천 원의 예산 확보를 권고합니다."
-            }
+            monthly_counts_total = filtered_df.groupby('고장예상월').size().to_dict()
         else:
-            ai_strategic_guide = {
-                "ai_summary_comment": "선택하신 기간 내 교체가 필요한 노후 장비가 발견되지 않았습니다.",
-                "smart_forecasting": "고장 예상 수량 및 필요 안전 재고가 0대로 도출되었습니다.",
-                "time_to_procure": "현재 양호한 상태를 유지 중이므로 당장의 발주 절차는 필요하지 않습니다.",
-                "budget_guide": "해당 기간 내 추가 조달로 요구되는 예산은 없습니다."
-            }
-        
-        # -------------------------------------------------------------------
-        # [구역 4] AI 분석 알고리즘 가이드
-        # -------------------------------------------------------------------
-        algorithm_guide = {
-            "formula_1": "적정 권장 수량 = 고장 예상 수량 + 안전 재고 (갑작스러운 고장이나 수급 불안정 시에도 수업 중단 없이 운영 가능한 최소 물량)",
-            "formula_2": "발주 시점(ROP) = (월 별 평균 수요량 X 리드 타임) + 안전 재고",
-            "formula_3": "잔여 수명(RUL): 장비의 상태 기록과 부품별 내구연한을 딥러닝 모델로 분석하여 예측한 남은 가동 가능 시간"
+            monthly_counts_total = {}
+        peak_month = max(rop_trigger_months, key=rop_trigger_months.count) if rop_trigger_months else (max(target_months, key=lambda m: monthly_counts_total.get(m, 0)) if target_months else 0)
+
+    if target_months and peak_month in target_months:
+        peak_idx = target_months.index(peak_month)
+        final_rop_month = target_months[max(0, peak_idx - 1)]
+    else:
+        final_rop_month = target_months[0] if target_months else 0
+
+    earliest_order_date = recommend_order_deadline(start_date, end_date, final_rop_month, filtered_df)
+
+    time_series = []
+    for m in range(1, 13):
+        qty = int(monthly_counts_total.get(m, 0)) if m in target_months else 0
+        is_rop_flag = (m == final_rop_month)
+
+        ts_item = {
+            "month": m,
+            "quantity": qty,
+            "is_rop": is_rop_flag
         }
+        if is_rop_flag:
+            rop_date_value = earliest_order_date
+            if target_month_dates:
+                rop_anchor = next((dt for dt in target_month_dates if dt.month == final_rop_month), None)
+                if rop_anchor is not None:
+                    rop_date_value = rop_anchor.strftime("%Y-%m-%d")
+            ts_item["rop_date"] = rop_date_value
+            ts_item["base_qty"] = total_base_qty_all
+            ts_item["safety_stock"] = total_safety_stock_all
+            ts_item["total_order_qty"] = total_base_qty_all + total_safety_stock_all
+
+        time_series.append(ts_item)
 
-        forecastId = f"pred-{str(uuid.uuid4())[:8]}"
-        created_at = datetime.now().isoformat()
-        
-        # =========================================================
-        # 프론트엔드가 화면 상단에 그릴 수 있도록 
-        # prompt, target, risk, period 데이터를 final_result의 1Depth에 추가
-        # =========================================================
-        final_result = {
-            "forecastId": forecastId,
-            "created_at": created_at,
-            "prompt": req.prompt,                                # <-- 프론트엔드 '이전 예측' 영역에 표시될 질문 내용
-            "target": cond.dept_name,                            # <-- Target 표시용
-            "risk": cond.risk_level,                             # <-- Risk 표시용
-            "period": f"{cond.year} - {cond.semester}",          # <-- Period 표시용 (예: "2030 - 2학기")
-            "conditions": {                                      # <-- 원본 조건도 백업용으로 전달 (필요시 프론트 사용)
-                "year": cond.year,
-                "semester": cond.semester,
-                "dept_name": cond.dept_name,
-                "category": cond.category,
-                "risk_level": cond.risk_level
-            },
-            "section_1_time_series": time_series,
-            "section_2_strategic_guide": ai_strategic_guide,
-            "section_3_recommendations": recommendations,
-            "section_4_algorithm_guide": algorithm_guide
+    return {
+        "time_series": time_series,
+        "recommendations": recommendations,
+        "has_failures": not filtered_df.empty,
+        "peak_month": peak_month,
+        "final_rop_month": final_rop_month,
+        "earliest_order_date": earliest_order_date,
+        "total_base_qty_all": total_base_qty_all,
+        "total_safety_stock_all": total_safety_stock_all,
+    }
+
+
+def compute_forecast_batch(conds: List[PredictionConditions], artifacts: ForecastArtifacts) -> List[Optional[dict]]:
+    """
+    여러 조건의 예측 연산을 한 번에 수행한다 (조건 순서대로 결과 반환, 대상 자산이 없으면 None).
+    대상 자산 합집합에 대해 파생변수/총수명 예측/고장 예상일을 한 번만 계산하고,
+    월별 이력은 범위별 캐시 또는 단일 groupby로 만들고, 월별 수요는 모든 범위를 함께 재귀 예측한다.
+    """
+    scope_positions = [artifacts.scope_index.positions(cond.dept_name, cond.category) for cond in conds]
+    results: List[Optional[dict]] = [None] * len(conds)
+    if not any(len(positions) for positions in scope_positions):
+        return results
+
+    with metrics.timer("stage_duration_seconds", stage="forecast_batch_filter"):
+        union_positions = np.unique(np.concatenate(scope_positions))
+        union_df = add_derived_features(artifacts.df.iloc[union_positions].copy())
+    with metrics.timer("stage_duration_seconds", stage="forecast_batch_rf_predict"):
+        union_df = add_failure_estimates(union_df, predict_asset_life(union_df, union_positions, artifacts), datetime.now())
+
+    with metrics.timer("stage_duration_seconds", stage="forecast_batch_monthly"):
+        monthly_forecasts = forecast_monthly_demand_batch(
+            get_scope_histories(conds, artifacts),
+            [get_semester_date_range(int(cond.year), cond.semester) for cond in conds],
+            artifacts,
+        )
+
+    with metrics.timer("stage_duration_seconds", stage="forecast_batch_summarize"):
+        for idx, (cond, positions) in enumerate(zip(conds, scope_positions)):
+            if not len(positions):
+                continue
+            # 범위별 행 위치를 합집합 안의 위치로 바꿔 원본 행 순서 그대로 잘라낸다.
+            target_df = union_df.iloc[np.searchsorted(union_positions, positions)]
+            results[idx] = summarize_scope_forecast(cond, target_df, monthly_forecasts[idx])
+    return results
+
+
+async def build_strategic_guide(req: PredictionRequest, computed: dict, use_llm: bool = True) -> tuple:
+    """
+    구역 2 (AI 전략 가이드): 연산 결과를 바탕으로 LLM 요약 코멘트와 안내 문구를 만든다.
+    (가이드, LLM 코멘트를 기본 문구로 대체했는지 여부)를 반환한다. 대체한 결과는 예측 결과 캐시에 넣지 않는다.
+    """
+    cond = req.conditions
+    recommendations = computed["recommendations"]
+    total_base_qty_all = computed["total_base_qty_all"]
+    total_safety_stock_all = computed["total_safety_stock_all"]
+    earliest_order_date = computed["earliest_order_date"]
+
+    if computed["has_failures"]:
+        total_qty_all = sum(r['quantity'] for r in recommendations)
+        total_budget_all = sum(r['estimated_budget'] for r in recommendations)
+
+        target_item_name = cond.category if cond.category and cond.category != "전체" else "전체 품목"
+        peak_month = computed["peak_month"] or computed["final_rop_month"]
+
+        # LLM 호출을 먼저 시작해 두고, 응답을 기다리는 동안 나머지 안내 문구를 만든다.
+        guide_task = None
+        if use_llm:
+            guide_task = asyncio.ensure_future(
+                get_llm_ai_guide(req.prompt, target_item_name, total_qty_all, earliest_order_date, peak_month)
+            )
+
+        # Risk Level 표기 맵핑 조정 반영
+        service_level_map = {"Low": "50% 수준", "Medium": "90% 수준", "High": "95% 이상 안정"}
+        sl_text = service_level_map.get(cond.risk_level, "90% 수준")
+
+        budget_in_thousands = total_budget_all // 1000
+
+        ai_guide_data = await guide_task if guide_task is not None else None
+        fallback_used = use_llm and ai_guide_data is None
+        if ai_guide_data is None:
+            ai_guide_data = default_ai_guide(peak_month)
+
+        ai_strategic_guide = {
+            "ai_summary_comment": ai_guide_data.get("ai_summary_comment", ""),
+            "smart_forecasting": f"분석 기간 내 발생할 것으로 예상되는 순수 고장 예상 수량({total_base_qty_all}개)에, 예상치 못한 장비 부족으로 인한 수업 결손을 방지하기 위한 안전 재고({total_safety_stock_all}개)를 더하여 최종 권장 발주 수량을 산출했습니다. (설정된 {sl_text} 서비스 수준 기준, 총 {total_qty_all}대의 필요 수량 도출)",
+            "time_to_procure": f"물품 발주부터 실제 실습실 설치까지 소요되는 리드 타임(Lead Time)을 역산하여 산출한 결과입니다. 수업 운영에 차질이 없도록 늦어도 {earliest_order_date} 이전까지 발주 절차를 진행하시는 것이 가장 적합합니다.",
+            "budget_guide": f"해당 수량 조달 및 설치를 위해 약 {budget_in_thousands:,}천 원의 예산 확보를 권고합니다."
         }
-        
-        predictions_db[forecastId] = {
-            "title": req.prompt[:15] + "..." if len(req.prompt) > 15 else req.prompt,
-            "prompt": req.prompt,
-            "created_at": created_at,
-            "data": final_result
+    else:
+        fallback_used = False
+        ai_strategic_guide = {
+            "ai_summary_comment": "선택하신 기간 내 교체가 필요한 노후 장비가 발견되지 않았습니다.",
+            "smart_forecasting": "고장 예상 수량 및 필요 안전 재고가 0대로 도출되었습니다.",
+            "time_to_procure": "현재 양호한 상태를 유지 중이므로 당장의 발주 절차는 필요하지 않습니다.",
+            "budget_guide": "해당 기간 내 추가 조달로 요구되는 예산은 없습니다."
         }
+    return ai_strategic_guide, fallback_used
+
+
+EMPTY_FORECAST_SECTIONS = {
+    "section_1_time_series": [],
+    "section_2_strategic_guide": {},
+    "section_3_recommendations": [],
+    "section_4_algorithm_guide": {}
+}
+
+
+def build_forecast_sections(computed: dict, ai_strategic_guide: dict) -> dict:
+    # -------------------------------------------------------------------
+    # [구역 4] AI 분석 알고리즘 가이드
+    # -------------------------------------------------------------------
+    algorithm_guide = {
+        "formula_1": "적정 권장 수량 = 고장 예상 수량 + 안전 재고 (갑작스러운 고장이나 수급 불안정 시에도 수업 중단 없이 운영 가능한 최소 물량)",
+        "formula_2": "발주 시점(ROP) = (월 별 평균 수요량 X 리드 타임) + 안전 재고",
+        "formula_3": "잔여 수명(RUL): 장비의 상태 기록과 부품별 내구연한을 딥러닝 모델로 분석하여 예측한 남은 가동 가능 시간"
+    }
+
+    return {
+        "section_1_time_series": computed["time_series"],
+        "section_2_strategic_guide": ai_strategic_guide,
+        "section_3_recommendations": computed["recommendations"],
+        "section_4_algorithm_guide": algorithm_guide
+    }
+
 
-        return final_result
+@app.post("/api/ai/forecast")
+async def predict_analysis(req: PredictionRequest):
+    artifacts = ensure_forecast_ready()
+    if artifacts is None or not artifacts.available:
+        return {"status": "error", "message": "모델이나 데이터가 없습니다."}
+        
+    # 수정 포인트: 분석 조건 필수 입력 방어 코드 추가
+    cond = req.conditions
+    if not cond.year or not cond.semester or not cond.dept_name:
+        raise HTTPException(status_code=400, detail="분석조건(운용부서, 년도, 학기)을 필수로 입력해주세요.")
 
+    # 같은 조건의 최근 결과가 있으면 필터링/모델 예측/LLM 호출을 모두 건너뛰고 새 기록으로만 저장한다.
+    cache_key = build_forecast_cache_key(req, artifacts)
+    cached_sections = forecast_cache.get(cache_key)
+    if cached_sections is not None:
+        return await asyncio.to_thread(save_forecast_result, req, copy.deepcopy(cached_sections))
+
+    try:
+        # 판다스/모델 연산은 작업 풀에서 실행하고, 이벤트 루프에서는 LLM 호출과 응답 조립만 한다.
+        with metrics.timer("stage_duration_seconds", stage="forecast_compute"):
+            computed = await forecast_compute_pool.run(compute_forecast, cond, artifacts)
+        if computed is None:
+            return {"status": "success", "data": copy.deepcopy(EMPTY_FORECAST_SECTIONS)}
+
+        ai_strategic_guide, fallback_used = await build_strategic_guide(req, computed)
+        sections = build_forecast_sections(computed, ai_strategic_guide)
+        if not fallback_used:
+            forecast_cache.set(cache_key, sections)
+
+        return await asyncio.to_thread(save_forecast_result, req, copy.deepcopy(sections))
+
+    except ComputePoolSaturated:
+        raise HTTPException(
+            status_code=503,
+            detail="예측 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(FORECAST_RETRY_AFTER)},
+        )
+    except Exception as e:
+        print(f"서버 에러 발생: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"분석 중 오류가 발생했습니다: {str(e)}")
+
+
+@app.post("/api/ai/forecast/batch")
+async def predict_analysis_batch(req: BatchPredictionRequest):
+    """
+    여러 부서/분류 조건의 예측을 한 번에 수행한다.
+    연산은 작업 풀에서 한 번의 배치 작업으로 처리하고, LLM 가이드는 include_guide일 때만 조건별로 동시에 호출한다.
+    결과는 save_history일 때만 예측 기록에 저장한다 (한 번의 요청으로 기록이 최대 배치 크기만큼 쌓이지 않도록).
+    """
+    artifacts = ensure_forecast_ready()
+    if artifacts is None or not artifacts.available:
+        return {"status": "error", "message": "모델이나 데이터가 없습니다."}
+
+    if not req.conditions:
+        raise HTTPException(status_code=400, detail="분석조건 목록이 비어 있습니다.")
+    if len(req.conditions) > FORECAST_BATCH_MAX_SIZE:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {FORECAST_BATCH_MAX_SIZE}개 조건까지 분석할 수 있습니다.")
+    for idx, cond in enumerate(req.conditions):
+        if not cond.year or not cond.semester or not cond.dept_name:
+            raise HTTPException(status_code=400, detail=f"{idx + 1}번째 분석조건(운용부서, 년도, 학기)을 필수로 입력해주세요.")
+
+    item_reqs = [PredictionRequest(prompt=req.prompt, conditions=cond) for cond in req.conditions]
+    results = [None] * len(item_reqs)
+    finish_result = save_forecast_result if req.save_history else build_forecast_result
+
+    # LLM 가이드를 포함하는 결과만 단건 예측과 같은 캐시를 공유한다.
+    cache_keys = [build_forecast_cache_key(item, artifacts) for item in item_reqs] if req.include_guide else []
+    pending = []
+    for idx, item in enumerate(item_reqs):
+        cached_sections = forecast_cache.get(cache_keys[idx]) if req.include_guide else None
+        if cached_sections is not None:
+            results[idx] = await asyncio.to_thread(finish_result, item, copy.deepcopy(cached_sections))
+        else:
+            pending.append(idx)
+
+    try:
+        if pending:
+            with metrics.timer("stage_duration_seconds", stage="forecast_batch_compute"):
+                computed_list = await forecast_compute_pool.run(
+                    compute_forecast_batch, [item_reqs[idx].conditions for idx in pending], artifacts
+                )
+            guide_targets = [(idx, computed) for idx, computed in zip(pending, computed_list) if computed is not None]
+            guides = await asyncio.gather(*(
+                build_strategic_guide(item_reqs[idx], computed, use_llm=req.include_guide)
+                for idx, computed in guide_targets
+            ))
+            for (idx, computed), (ai_strategic_guide, fallback_used) in zip(guide_targets, guides):
+                sections = build_forecast_sections(computed, ai_strategic_guide)
+                if req.include_guide and not fallback_used:
+                    forecast_cache.set(cache_keys[idx], sections)
+                results[idx] = await asyncio.to_thread(finish_result, item_reqs[idx], copy.deepcopy(sections))
+
+        data = []
+        for item, result in zip(item_reqs, results):
+            if result is None:
+                # 대상 자산이 없는 조건은 단건 예측과 같은 빈 구역을 돌려준다.
+                result = {"conditions": item.conditions.model_dump(), **copy.deepcopy(EMPTY_FORECAST_SECTIONS)}
+            data.append(result)
+        return {"status": "success", "data": data}
+
+    except ComputePoolSaturated:
+        raise HTTPException(
+            status_code=503,
+            detail="예측 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(FORECAST_RETRY_AFTER)},
+        )
     except Exception as e:
         print(f"서버 에러 발생: {str(e)}")
         raise HTTPException(status_code=500, detail=f"분석 중 오류가 발생했습니다: {str(e)}")
@@ -722,38 +1656,83 @@ async def predict_analysis(req: PredictionRequest):
 # ==========================================
 
 @app.get("/api/ai/forecast")
-async def get_forecast_history():
+def get_forecast_history(offset: int = Query(0, ge=0), limit: Optional[int] = Query(None, ge=1, le=1000)):
     history_list = []
-    for hid, info in reversed(predictions_db.items()):
+    for info in session_store.list_forecasts(offset=offset, limit=limit):
         history_list.append({
-            "forecastId": hid,
-            "title": info.get("title", info["prompt"]), 
+            "forecastId": info["forecastId"],
+            "title": info.get("title") or info["prompt"], 
             "prompt": info["prompt"],
             "created_at": info["created_at"]
         })
     return {"status": "success", "data": history_list}
 
 @app.get("/api/ai/forecast/contents/{forecastId}")
-async def get_forecast_contents(forecastId: str):
-    if forecastId not in predictions_db:
+def get_forecast_contents(forecastId: str):
+    record = session_store.get_forecast(forecastId)
+    if record is None:
         raise HTTPException(status_code=404, detail="기록을 찾을 수 없습니다.")
-    return predictions_db[forecastId]["data"]
+    return record["data"]
 
 @app.delete("/api/ai/forecast")
-async def delete_forecast_history(forecastId: str):
-    if forecastId in predictions_db:
-        del predictions_db[forecastId]
+def delete_forecast_history(forecastId: str):
+    if session_store.delete_forecast(forecastId):
         return {"status": "success", "message": "기록이 삭제되었습니다."}
     raise HTTPException(status_code=404, detail="기록을 찾을 수 없습니다.")
 
 @app.put("/api/ai/forecast/{forecastId}")
-async def rename_forecast_history(forecastId: str, req: ForecastRenameRequest):
-    if forecastId not in predictions_db:
+def rename_forecast_history(forecastId: str, req: ForecastRenameRequest):
+    if not session_store.rename_forecast(forecastId, req.new_title):
         raise HTTPException(status_code=404, detail="기록을 찾을 수 없습니다.")
     
-    predictions_db[forecastId]["title"] = req.new_title
     return {
         "status": "success", 
         "message": "예측 기록 이름이 변경되었습니다.", 
         "data": {"forecastId": forecastId, "new_title": req.new_title}
     }
+
+
+# ==========================================
+# [6] 서버 상태 확인 API
+# ==========================================
+
+@app.get("/api/ai/ready")
+async def readiness():
+    """예측 경로 준비 여부 (백그라운드 로딩 중이면 503, 로딩이 끝나면 200 + 예측 가능 여부)"""
+    ready = forecast_ready.is_set()
+    artifacts = forecast_artifacts
+    body = {
+        "status": "ready" if ready else "loading",
+        "forecast_available": ready and artifacts is not None and artifacts.available,
+        "monthly_model_available": artifacts is not None and artifacts.monthly_model is not None,
+        "rul_table_ready": artifacts is not None and artifacts.rul_table_ready,
+        "artifacts": artifacts.describe() if artifacts is not None else None,
+        "warmup": forecast_warmup_status,
+        "reload": {key: value for key, value in forecast_reload_status.items() if key != "rejected_fingerprint"},
+    }
+    return JSONResponse(content=body, status_code=200 if ready else 503)
+
+
+@app.post("/api/ai/admin/forecast/reload")
+async def reload_forecast_model(force: bool = Query(False), x_admin_token: Optional[str] = Header(None)):
+    """
+    새 모델/데이터 파일을 다시 읽어 예측 묶음을 교체한다 (force면 파일이 바뀌지 않았어도 다시 로딩).
+    로딩/준비는 작업 스레드에서 하므로 처리 중인 예측 요청은 이전 묶음으로 끝난다.
+    """
+    # 토큰이 설정되지 않은 서버에서는 API 자체를 노출하지 않는다.
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 올바르지 않습니다.")
+    ensure_forecast_ready()
+
+    result = await asyncio.to_thread(reload_forecast_artifacts, force)
+    if result.get("reason") == "busy":
+        raise HTTPException(status_code=409, detail="다른 모델 교체 작업이 진행 중입니다.")
+    return {"status": "success", "data": result}
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """단계별 소요 시간(p50/p95/p99), 요청 수, 캐시 적중, LLM 토큰 사용량 (Prometheus 텍스트 형식)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
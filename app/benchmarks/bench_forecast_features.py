@@ -0,0 +1,111 @@
+"""
+bench_forecast_features.py
+- /api/ai/forecast 파생변수 계산의 기존 행 단위 구현(apply + lambda)과 배열 연산 구현 비교
+- 합성 부서 데이터(기본 5만 건)로 두 구현의 결과가 같은지 확인한 뒤 각각의 소요 시간을 측정한다.
+  (결과 동일성은 app/tests/test_forecast_features.py에서도 경계값 위주로 검사한다)
+
+실행: python app/benchmarks/bench_forecast_features.py --rows 50000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.forecast_features import add_derived_features, failure_dates, get_lead_time_info
+
+
+def _make_department(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    prices = rng.choice([1_500_000, 20_000_000, 35_000_000, 50_000_000, 80_000_000, np.nan], rows)
+    return pd.DataFrame(
+        {
+            "취득금액": prices,
+            "가격민감도": rng.random(rows),
+            "RUL_개월": rng.uniform(0.5, 120.0, rows),
+        }
+    )
+
+
+def _legacy(target_df: pd.DataFrame, now: datetime) -> pd.DataFrame:
+    target_df['리드타임등급'], target_df['등급점수'], target_df['sqrt_L'], target_df['리드타임_일'] = zip(*target_df['취득금액'].apply(get_lead_time_info))
+    target_df['장비중요도'] = (target_df['가격민감도'] * 100 * 0.5) + (target_df['등급점수'] * 0.5)
+    target_df['고장예상일'] = target_df['RUL_개월'].apply(lambda x: now + timedelta(days=float(x) * 30.4375))
+    target_df['고장예상월'] = target_df['고장예상일'].apply(lambda x: x.month)
+    return target_df
+
+
+def _vectorized(target_df: pd.DataFrame, now: datetime) -> pd.DataFrame:
+    target_df = add_derived_features(target_df)
+    target_df['고장예상일'] = failure_dates(target_df['RUL_개월'], now)
+    target_df['고장예상월'] = target_df['고장예상일'].dt.month
+    return target_df
+
+
+def _time(fn, frame: pd.DataFrame, now: datetime, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        working = frame.copy()
+        started = time.perf_counter()
+        fn(working, now)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare row-wise and vectorized forecast feature computation."
+    )
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    frame = _make_department(args.rows, args.seed)
+    now = datetime.now()
+
+    legacy_result = _legacy(frame.copy(), now)
+    vectorized_result = _vectorized(frame.copy(), now)
+    pd.testing.assert_frame_equal(
+        legacy_result,
+        vectorized_result,
+        check_dtype=False,
+        check_exact=True,
+    )
+
+    legacy_timings = _time(_legacy, frame, now, args.repeat)
+    vectorized_timings = _time(_vectorized, frame, now, args.repeat)
+    legacy_median = statistics.median(legacy_timings)
+    vectorized_median = statistics.median(vectorized_timings)
+
+    print(
+        json.dumps(
+            {
+                "rows": args.rows,
+                "repeat": args.repeat,
+                "outputs_identical": True,
+                "legacy_median_ms": round(legacy_median * 1000, 2),
+                "vectorized_median_ms": round(vectorized_median * 1000, 2),
+                "speedup": round(legacy_median / vectorized_median, 1),
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,472 @@
+"""
+load_test.py
+- API 서버(app/ai_server.py) 부하 테스트
+- OpenAI 호환 가짜 LLM 서버(응답 지연/토큰 생성 속도 설정 가능)를 로컬에 띄우고, OPENAI_BASE_URL을 그 주소로 지정해 API 서버를 띄운다.
+- 쓰레드 생성 / 채팅 / 채팅 스트림 / 수요 예측 / 이력 조회 요청을 가중치 비율대로 섞어 동시성 단계별로 일정 시간 보낸 뒤,
+  단계별 처리량(RPS), 지연 시간 p50/p95/p99, 오류율을 요청 종류별로 JSON으로 출력한다 (커밋 간 비교용).
+- 예측 조건(부서/물품분류)은 서버와 같은 학습용 CSV(AI_DATA_PATH)에서 뽑는다.
+
+실행: python app/benchmarks/load_test.py --concurrency 1 8 32 --duration 30 --output load_test.json
+      python app/benchmarks/load_test.py --llm-latency-ms 800 --llm-tokens-per-sec 40 --workers 4
+      python app/benchmarks/load_test.py --base-url http://127.0.0.1:8000   # 이미 떠 있는 서버 대상 (가짜 LLM/서버 기동 생략)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+DEFAULT_MIX = "thread=1,chat=3,chat_stream=2,forecast=3,history=2"
+DEFAULT_DATA_PATH = PROJECT_ROOT / "dataset" / "create_data" / "data_ml" / "phase4_training_data.csv"
+SEMESTERS = ["1학기", "2학기", "여름", "겨울", "연간"]
+RISK_LEVELS = ["High", "Medium", "Low"]
+CHAT_QUERIES = [
+    "물품 취득 등록은 어떻게 하나요?",
+    "불용 신청 절차를 알려줘",
+    "반납 처리는 어디서 하나요?",
+    "12345번 물품 상태 알려줘",
+    "물품 이동 시 필요한 서류가 뭐야?",
+    "오늘 점심 메뉴 추천해줘",
+]
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+# ==========================================
+# 가짜 LLM 서버 (OpenAI Chat Completions 호환)
+# ==========================================
+
+def build_fake_llm_app(latency_ms: float, tokens_per_sec: float, completion_tokens: int):
+    """첫 토큰까지 latency_ms, 이후 tokens_per_sec 속도로 completion_tokens개를 생성하는 것처럼 응답한다."""
+    fake_app = FastAPI()
+    token_interval = 1.0 / tokens_per_sec if tokens_per_sec > 0 else 0.0
+
+    def estimate_prompt_tokens(messages: list) -> int:
+        return sum(len(str(m.get("content") or "")) for m in messages) // 4 + 1
+
+    def usage(prompt_tokens: int) -> dict:
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    @fake_app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        model = body.get("model", "fake")
+        prompt_tokens = estimate_prompt_tokens(body.get("messages", []))
+
+        if (body.get("response_format") or {}).get("type") == "json_object":
+            content = json.dumps({"ai_summary_comment": "부하 테스트용 요약 코멘트입니다."}, ensure_ascii=False)
+        else:
+            content = "부하 " * completion_tokens
+
+        if not body.get("stream"):
+            await asyncio.sleep(latency_ms / 1000 + completion_tokens * token_interval)
+            return JSONResponse({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage(prompt_tokens),
+            })
+
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+        def chunk(choices: list, **extra) -> str:
+            payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model, "choices": choices, **extra}
+            return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+        async def event_stream():
+            await asyncio.sleep(latency_ms / 1000)
+            yield chunk([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+            for _ in range(completion_tokens):
+                if token_interval:
+                    await asyncio.sleep(token_interval)
+                yield chunk([{"index": 0, "delta": {"content": "부하 "}, "finish_reason": None}])
+            yield chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+            if include_usage:
+                yield chunk([], usage=usage(prompt_tokens))
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+    return fake_app
+
+
+def serve_fake_llm(args: argparse.Namespace) -> None:
+    import uvicorn
+
+    fake_app = build_fake_llm_app(args.llm_latency_ms, args.llm_tokens_per_sec, args.llm_completion_tokens)
+    uvicorn.run(fake_app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+# ==========================================
+# 프로세스 기동 / 준비 대기
+# ==========================================
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_process(cmd: List[str], env: dict, log_path: Path) -> subprocess.Popen:
+    log_file = open(log_path, "wb")
+    return subprocess.Popen(cmd, cwd=PROJECT_ROOT, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+
+
+def stop_process(proc: Optional[subprocess.Popen]) -> None:
+    if proc is None or proc.poll() is not None:
+        return
+    proc.terminate()
+    try:
+        proc.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def wait_until_ready(url: str, proc: subprocess.Popen, timeout: float, log_path: Path, consecutive: int = 1) -> None:
+    """url이 연속 consecutive번 200을 돌려줄 때까지 기다린다 (워커가 여러 개면 각 워커가 준비될 때까지)."""
+    deadline = time.monotonic() + timeout
+    streak = 0
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"프로세스가 종료됨 (exit {proc.returncode}), 로그: {log_path}")
+        try:
+            streak = streak + 1 if httpx.get(url, timeout=2.0).status_code == 200 else 0
+        except httpx.HTTPError:
+            streak = 0
+        if streak >= consecutive:
+            return
+        time.sleep(0.2)
+    raise RuntimeError(f"{timeout:.0f}초 안에 준비되지 않음: {url}, 로그: {log_path}")
+
+
+# ==========================================
+# 요청 종류별 시나리오
+# ==========================================
+
+def load_forecast_conditions(data_path: Path, limit: int, seed: int) -> List[dict]:
+    """학습용 CSV에서 (운용부서, 물품분류) 조합을 뽑아 예측 조건 목록을 만든다."""
+    columns = ["운용부서명", "물품분류명"]
+    try:
+        try:
+            frame = pd.read_csv(data_path, usecols=columns, encoding="utf-8")
+        except UnicodeDecodeError:
+            frame = pd.read_csv(data_path, usecols=columns, encoding="cp949")
+    except (OSError, ValueError) as e:
+        print(f"⚠️ 예측 조건용 데이터를 읽지 못함 ({data_path}): {e}", file=sys.stderr)
+        return []
+
+    pairs = list(frame.dropna().drop_duplicates().itertuples(index=False))
+    rng = random.Random(seed)
+    rng.shuffle(pairs)
+    this_year = datetime.now().year
+    return [
+        {
+            "year": rng.choice([this_year, this_year + 1]),
+            "semester": rng.choice(SEMESTERS),
+            "dept_name": dept,
+            "category": rng.choice([category, None]),
+            "risk_level": rng.choice(RISK_LEVELS),
+        }
+        for dept, category in pairs[:limit]
+    ]
+
+
+class Scenario:
+    def __init__(self, client: httpx.AsyncClient, forecast_conditions: List[dict], max_threads: int = 200):
+        self.client = client
+        self.forecast_conditions = forecast_conditions
+        self.thread_ids: List[str] = []
+        self.max_threads = max_threads
+
+    def remember_thread(self, thread_id: str) -> None:
+        self.thread_ids.append(thread_id)
+        if len(self.thread_ids) > self.max_threads:
+            del self.thread_ids[0]
+
+    async def thread_id(self, rng: random.Random) -> str:
+        if not self.thread_ids:
+            await self.thread(rng)
+        return rng.choice(self.thread_ids)
+
+    @staticmethod
+    def check(resp: httpx.Response) -> int:
+        """HTTP 상태 코드를 반환하되, 200이라도 본문이 status=error면 오류로 본다 (0)."""
+        if resp.status_code >= 400:
+            return resp.status_code
+        if resp.json().get("status") == "error":
+            return 0
+        return resp.status_code
+
+    async def thread(self, rng: random.Random) -> int:
+        resp = await self.client.post("/api/ai/chat/threads")
+        status = self.check(resp)
+        if status == 200:
+            self.remember_thread(resp.json()["data"]["threadId"])
+        return status
+
+    async def chat(self, rng: random.Random) -> int:
+        body = {"threadId": await self.thread_id(rng), "query": rng.choice(CHAT_QUERIES)}
+        return self.check(await self.client.post("/api/ai/chat", json=body))
+
+    async def chat_stream(self, rng: random.Random) -> int:
+        body = {"threadId": await self.thread_id(rng), "query": rng.choice(CHAT_QUERIES)}
+        async with self.client.stream("POST", "/api/ai/chat/stream", json=body) as resp:
+            if resp.status_code >= 400:
+                return resp.status_code
+            last_event = None
+            async for line in resp.aiter_lines():
+                if line.startswith("event:"):
+                    last_event = line.split(":", 1)[1].strip()
+            return resp.status_code if last_event == "done" else 0
+
+    async def forecast(self, rng: random.Random) -> int:
+        body = {"prompt": "다음 학기 교체 수요를 알려줘", "conditions": rng.choice(self.forecast_conditions)}
+        return self.check(await self.client.post("/api/ai/forecast", json=body))
+
+    async def history(self, rng: random.Random) -> int:
+        choice = rng.randrange(3)
+        if choice == 0:
+            resp = await self.client.get("/api/ai/forecast", params={"limit": 20})
+        elif choice == 1:
+            resp = await self.client.get("/api/ai/chat/threads", params={"limit": 20})
+        else:
+            resp = await self.client.get(f"/api/ai/chat/messages/{await self.thread_id(rng)}/search")
+        return self.check(resp)
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if not hasattr(Scenario, name) or name in ("check", "thread_id", "remember_thread"):
+            raise argparse.ArgumentTypeError(f"알 수 없는 요청 종류: {name}")
+        mix[name] = float(weight or 1)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+# ==========================================
+# 부하 발생 / 집계
+# ==========================================
+
+def summarize(samples: List[tuple], elapsed: float) -> dict:
+    """samples: (지연 시간(초), 상태 코드) 목록. 상태 코드 0은 응답 본문 오류, -1은 예외(연결 실패/타임아웃)."""
+    latencies = np.asarray([latency for latency, _ in samples], dtype=np.float64)
+    statuses: Dict[str, int] = {}
+    errors = 0
+    for _, status in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+        errors += not (200 <= status < 300)
+
+    result = {
+        "requests": len(samples),
+        "rps": round(len(samples) / elapsed, 3) if elapsed > 0 else 0.0,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "status_counts": statuses,
+    }
+    if len(latencies):
+        for q, value in zip(QUANTILES, np.quantile(latencies, QUANTILES)):
+            result[f"p{int(q * 100)}_ms"] = round(float(value) * 1000, 2)
+        result["mean_ms"] = round(float(latencies.mean()) * 1000, 2)
+    return result
+
+
+async def run_level(scenario: Scenario, mix: Dict[str, float], concurrency: int, duration: float, warmup: float, seed: int) -> dict:
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples: Dict[str, List[tuple]] = {name: [] for name in names}
+    started = time.perf_counter()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+
+    async def worker(worker_id: int) -> None:
+        rng = random.Random(seed * 1000 + worker_id)
+        while True:
+            name = rng.choices(names, weights)[0]
+            request_started = time.perf_counter()
+            if request_started >= stop_at:
+                return
+            try:
+                status = await getattr(scenario, name)(rng)
+            except Exception:
+                status = -1
+            if request_started >= measure_from:
+                samples[name].append((time.perf_counter() - request_started, status))
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    # 측정 구간에 시작한 요청이 끝날 때까지 기다린 시간까지 포함해 처리량을 계산한다.
+    elapsed = time.perf_counter() - measure_from
+
+    overall = summarize([sample for series in samples.values() for sample in series], elapsed)
+    overall["concurrency"] = concurrency
+    overall["duration_s"] = round(elapsed, 3)
+    overall["operations"] = {name: summarize(series, elapsed) for name, series in samples.items()}
+    return overall
+
+
+async def run_load(base_url: str, args: argparse.Namespace, mix: Dict[str, float], forecast_conditions: List[dict]) -> List[dict]:
+    limits = httpx.Limits(max_connections=max(args.concurrency) * 2, max_keepalive_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.request_timeout, limits=limits) as client:
+        scenario = Scenario(client, forecast_conditions)
+        levels = []
+        for concurrency in args.concurrency:
+            print(f"🚀 동시성 {concurrency}: {args.warmup:.0f}s 예열 + {args.duration:.0f}s 측정", file=sys.stderr)
+            level = await run_level(scenario, mix, concurrency, args.duration, args.warmup, args.seed)
+            print(
+                f"   {level['rps']} req/s, p50 {level.get('p50_ms')}ms, p95 {level.get('p95_ms')}ms, "
+                f"p99 {level.get('p99_ms')}ms, 오류율 {level['error_rate']}",
+                file=sys.stderr,
+            )
+            levels.append(level)
+        return levels
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Load-test the AI API server against a local fake OpenAI-compatible server."
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="concurrency levels to run in order")
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds per level")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds before each level")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"operation weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0, help="fake LLM time to first token")
+    parser.add_argument("--llm-tokens-per-sec", type=float, default=50.0, help="fake LLM generation rate (0 = instant)")
+    parser.add_argument("--llm-completion-tokens", type=int, default=40, help="fake LLM tokens per completion")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the API server")
+    parser.add_argument("--base-url", default=None, help="target an already running API server instead of booting one")
+    parser.add_argument("--data-path", type=Path, default=Path(os.getenv("AI_DATA_PATH", DEFAULT_DATA_PATH)), help="training CSV used to sample forecast conditions")
+    parser.add_argument("--forecast-conditions", type=int, default=50, help="number of distinct forecast conditions to replay")
+    parser.add_argument("--request-timeout", type=float, default=60.0)
+    parser.add_argument("--boot-timeout", type=float, default=300.0, help="seconds to wait for /api/ai/ready")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None, help="write the JSON report to this file")
+    parser.add_argument("--serve-fake-llm", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_fake_llm:
+        serve_fake_llm(args)
+        return
+
+    mix = dict(args.mix)
+    forecast_conditions = load_forecast_conditions(args.data_path, args.forecast_conditions, args.seed) if "forecast" in mix else []
+    if "forecast" in mix and not forecast_conditions:
+        print("⚠️ 예측 조건이 없어 forecast 요청을 제외합니다.", file=sys.stderr)
+        mix.pop("forecast")
+    if not mix:
+        parser.error("실행할 요청 종류가 없습니다.")
+
+    llm_proc = server_proc = None
+    with tempfile.TemporaryDirectory(prefix="ai_load_test_") as tmp:
+        tmp_dir = Path(tmp)
+        try:
+            base_url = args.base_url
+            if base_url is None:
+                llm_port, server_port = free_port(), free_port()
+                llm_log, server_log = tmp_dir / "fake_llm.log", tmp_dir / "ai_server.log"
+                llm_proc = start_process(
+                    [
+                        sys.executable, __file__, "--serve-fake-llm", "--port", str(llm_port),
+                        "--llm-latency-ms", str(args.llm_latency_ms),
+                        "--llm-tokens-per-sec", str(args.llm_tokens_per_sec),
+                        "--llm-completion-tokens", str(args.llm_completion_tokens),
+                    ],
+                    os.environ.copy(),
+                    llm_log,
+                )
+                server_env = {
+                    **os.environ,
+                    "OPENAI_API_KEY": "load-test",
+                    "OPENAI_BASE_URL": f"http://127.0.0.1:{llm_port}/v1",
+                    # 이전 실행의 대화/예측 기록이 결과에 섞이지 않도록 임시 세션 DB를 쓴다.
+                    "AI_SESSION_DB_PATH": str(tmp_dir / "ai_sessions.sqlite3"),
+                    "AI_ARTIFACT_WATCH_INTERVAL": "0",
+                    "AI_DATA_PATH": str(args.data_path),
+                }
+                server_proc = start_process(
+                    [
+                        sys.executable, "-m", "uvicorn", "app.ai_server:app",
+                        "--host", "127.0.0.1", "--port", str(server_port),
+                        "--workers", str(args.workers), "--log-level", "warning",
+                    ],
+                    server_env,
+                    server_log,
+                )
+                base_url = f"http://127.0.0.1:{server_port}"
+                wait_until_ready(f"http://127.0.0.1:{llm_port}/docs", llm_proc, 30.0, llm_log)
+                booted = time.perf_counter()
+                wait_until_ready(f"{base_url}/api/ai/ready", server_proc, args.boot_timeout, server_log, consecutive=args.workers * 2)
+                print(f"✅ API 서버 준비 완료 ({time.perf_counter() - booted:.1f}s)", file=sys.stderr)
+
+            levels = asyncio.run(run_load(base_url, args, mix, forecast_conditions))
+        finally:
+            stop_process(server_proc)
+            stop_process(llm_proc)
+
+    report = {
+        "benchmark": "load_test",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "target": args.base_url or "local",
+        "config": {
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "mix": mix,
+            "workers": args.workers if args.base_url is None else None,
+            "llm_latency_ms": args.llm_latency_ms,
+            "llm_tokens_per_sec": args.llm_tokens_per_sec,
+            "llm_completion_tokens": args.llm_completion_tokens,
+            "forecast_conditions": len(forecast_conditions),
+            "seed": args.seed,
+        },
+        "levels": levels,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+cache_utils.py
+- 서버 내부 결과 캐시용 LRU + TTL 캐시
+- 항목 수 상한을 넘으면 가장 오래 사용되지 않은 항목부터 버리고, TTL이 지난 항목은 조회 시점에 만료시킨다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUTTLCache:
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max(0, max_size)
+        self.ttl_seconds = ttl_seconds
+        self._items: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (만료 시각(monotonic), 값)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._items[key]
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.max_size == 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def keys(self) -> list:
+        """현재 보관 중인 키 목록 (오래 사용되지 않은 순서, 만료 여부는 확인하지 않는다)"""
+        with self._lock:
+            return list(self._items.keys())
+
+    def items(self) -> list:
+        """만료되지 않은 (키, 값) 목록. 사용 순서와 적중 통계는 바꾸지 않고, 만료된 항목은 이때 버린다."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (expires_at, _) in self._items.items() if expires_at <= now]
+            for key in expired:
+                del self._items[key]
+            return [(key, value) for key, (_, value) in self._items.items()]
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,129 @@
+"""
+chat_history.py
+- /api/ai/chat에서 LLM에 보낼 대화 이력 구성
+- 최근 대화는 토큰 예산 안에서 원문 그대로 보내고, 예산 밖으로 밀려난 오래된 대화는
+  쓰레드별 누적 요약(rolling summary) 한 덩어리로 압축한다.
+- 요약은 창(window)이 앞으로 밀려날 때에만 다시 계산하고, 그 외에는 저장된 요약을 재사용한다.
+- 요약 LLM 호출이 첫 응답 토큰을 늦추지 않도록, 답변 전에는 저장된 요약으로 창만 만들고(build)
+  요약 갱신(advance_summary)은 답변이 끝난 뒤 백그라운드에서 한다.
+"""
+
+import logging
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken이 없으면 글자 수 기반 근사치를 사용한다.
+    tiktoken = None
+
+
+logger = logging.getLogger(__name__)
+
+SummarizeFn = Callable[[str, List[dict]], Awaitable[str]]
+
+
+def _load_encoder():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")  # gpt-4o 계열 토크나이저
+    except Exception as e:
+        logger.warning(f"tiktoken 인코더 로딩 실패, 근사치로 대체: {e}")
+        return None
+
+
+# 인코더 파일은 최초 사용 시 내려받을 수 있으므로 import 시점이 아니라 처음 셀 때 로딩한다.
+_ENCODER = None
+_ENCODER_LOADED = False
+
+
+def count_tokens(text: str) -> int:
+    global _ENCODER, _ENCODER_LOADED
+    if not text:
+        return 0
+    if not _ENCODER_LOADED:
+        _ENCODER = _load_encoder()
+        _ENCODER_LOADED = True
+    if _ENCODER is not None:
+        return len(_ENCODER.encode(text, disallowed_special=()))
+    # 한국어는 대략 2글자당 1토큰 수준이므로 보수적으로 근사한다.
+    return len(text) // 2 + 1
+
+
+def fallback_summary(previous_summary: str, messages: List[dict], max_chars: int) -> str:
+    """LLM 요약이 실패했을 때 쓰는 추출식 요약 (각 발화 앞부분만 이어 붙인다)."""
+    lines = [previous_summary] if previous_summary else []
+    for msg in messages:
+        role = "사용자" if msg.get("role") == "user" else "AI"
+        lines.append(f"- {role}: {str(msg.get('content', ''))[:120]}")
+    text = "\n".join(lines)
+    # 오래된 내용부터 잘라 최근 요약이 남도록 한다.
+    return text[-max_chars:]
+
+
+class ConversationWindow:
+    """
+    토큰 예산 기반 대화 창.
+
+    - token_budget: 원문 그대로 보낼 최근 메시지들의 토큰 합 상한 (시스템 프롬프트 제외)
+    - max_messages: 원문 그대로 보낼 최근 메시지 개수 상한
+    - summary_step: 창이 밀려날 때 한 번에 요약으로 넘길 최소 메시지 수 (요약 재계산 빈도 조절)
+    """
+
+    def __init__(self, token_budget: int, max_messages: int, summary_step: int, summary_max_tokens: int):
+        self.token_budget = token_budget
+        self.max_messages = max(1, max_messages)
+        self.summary_step = max(1, summary_step)
+        self.summary_max_tokens = summary_max_tokens
+
+    def window_start(self, messages: List[dict]) -> int:
+        """예산 안에 들어가는 가장 오래된 메시지 인덱스. 마지막 메시지(현재 질문)는 항상 포함한다."""
+        start = len(messages)
+        used = 0
+        while start > 0 and len(messages) - start < self.max_messages:
+            tokens = count_tokens(str(messages[start - 1].get("content", "")))
+            if used + tokens > self.token_budget and start < len(messages):
+                break
+            used += tokens
+            start -= 1
+        return start
+
+    def build(self, messages: List[dict], summarized_upto: int) -> List[dict]:
+        """
+        LLM에 보낼 원문 메시지 목록 (저장된 요약 이후의 메시지).
+        요약 갱신이 아직 끝나지 않아 창 밖으로 밀려난 메시지가 있어도 버리지 않고 원문으로 보낸다.
+        """
+        summarized_upto = min(max(0, summarized_upto), len(messages))
+        return [
+            {"role": msg["role"], "content": msg["content"]}
+            for msg in messages[summarized_upto:]
+        ]
+
+    async def advance_summary(
+        self,
+        messages: List[dict],
+        summary: str,
+        summarized_upto: int,
+        summarize: Optional[SummarizeFn] = None,
+    ) -> Tuple[str, int]:
+        """
+        (요약, 요약에 포함된 메시지 수)를 반환한다.
+        요약 범위가 바뀌지 않았으면 summarize를 호출하지 않는다.
+        """
+        summarized_upto = min(max(0, summarized_upto), len(messages))
+        needed = self.window_start(messages)
+        if needed <= summarized_upto:
+            return summary, summarized_upto
+
+        # 창이 밀려난 경우에만 요약을 갱신한다. 한 번에 summary_step 이상 밀어서 매 턴 재계산을 피한다.
+        new_upto = min(max(needed, summarized_upto + self.summary_step), len(messages) - 1)
+        evicted = messages[summarized_upto:new_upto]
+        max_chars = self.summary_max_tokens * 2
+        try:
+            if summarize is None:
+                raise RuntimeError("summarizer not configured")
+            summary = (await summarize(summary, evicted)).strip()[:max_chars]
+        except Exception as e:
+            logger.warning(f"대화 요약 실패, 추출식 요약으로 대체: {e}")
+            summary = fallback_summary(summary, evicted, max_chars)
+        return summary, new_upto
@@ -0,0 +1,54 @@
+"""
+compute_pool.py
+- /api/ai/forecast의 CPU 연산(pandas 필터링, 모델 예측, 월별 재귀 예측)을 이벤트 루프 밖에서 실행하는 작업 풀
+- 실행 중 + 대기 중인 작업 수에 상한을 두어, 포화 상태에서는 대기열에 계속 쌓는 대신 즉시 거절한다.
+  (호출 측에서 503 + Retry-After로 응답)
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class ComputePoolSaturated(Exception):
+    """실행 중 + 대기 중인 작업이 상한에 도달해 새 작업을 받을 수 없음"""
+
+
+class BoundedComputePool:
+    def __init__(self, max_workers: int, max_queue: int, thread_name_prefix: str = "compute"):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                raise ComputePoolSaturated(f"compute pool saturated ({self._in_flight}/{self.capacity})")
+            self._in_flight += 1
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # 요청이 취소되어도 이미 시작된 작업이 끝날 때까지 자리를 차지하므로 완료 시점에 반납한다.
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
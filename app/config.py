@@ -74,6 +74,64 @@ RERANK_TOP_N = 10
 RERANK_DEBUG = False
 
 
+# ===============================
+# 🧭 RAG 전처리 (도구 판단 / 질문 분류 / 질의 정제)
+# ===============================
+
+# True면 세 단계를 JSON 스키마 응답 LLM 호출 1번으로 처리
+# (응답 파싱 실패 시 기존 3회 호출 경로로 전환)
+USE_STRUCTURED_FRONT_END = False
+
+
+# ===============================
+# 🏷️ 로컬 질문 분류기 (classify_question LLM 호출 생략)
+# ===============================
+
+# True면 도메인 용어 + 로컬 모델(TF-IDF + 로지스틱 회귀)로 먼저 분류하고, 애매한 경우에만 LLM으로 분류
+# 운영 로그로 검증 전까지 끈다. 켜기 전에 `python -m rag.query_classifier`로 평가용 질문 기준 정밀도/재현율을 확인한다.
+USE_LOCAL_QUESTION_CLASSIFIER = False
+
+# 로컬 NEED_RAG 확률이 이 값 이상이면 LLM 없이 NEED_RAG
+LOCAL_CLASSIFIER_NEED_RAG_THRESHOLD = 0.85
+
+# 로컬 NEED_RAG 확률이 이 값 이하이면 LLM 없이 NO_RAG
+# (업무 질문을 NO_RAG로 잘못 보내는 쪽이 더 위험하므로 더 엄격하게 둔다)
+LOCAL_CLASSIFIER_NO_RAG_THRESHOLD = 0.15
+
+
+# ===============================
+# 🗃️ 시맨틱 답변 캐시 (run_rag_chain 앞단)
+# ===============================
+
+# True면 질문 임베딩이 이전 질문과 충분히 비슷할 때 저장된 답변/출처를 바로 반환
+# (유사도 임계값을 실제 질문 로그로 검증하기 전까지 기본값은 끔)
+USE_SEMANTIC_ANSWER_CACHE = False
+
+# 질문 임베딩 코사인 유사도가 이 값 이상이어야 같은 질문으로 본다
+SEMANTIC_CACHE_SIMILARITY_THRESHOLD = 0.95
+
+# 보관할 최대 답변 수 (넘으면 가장 오래 사용되지 않은 답변부터 삭제)
+SEMANTIC_CACHE_MAX_SIZE = 512
+
+# 답변 보관 시간(초)
+SEMANTIC_CACHE_TTL_SECONDS = 60 * 60 * 24
+
+
+# ===============================
+# 🧷 질문 분류 / 질의 정제 결과 캐시
+# ===============================
+
+# True면 같은 질문(정규화 기준)의 classify_question / refine_query 결과를 재사용
+# (프롬프트나 모델이 바뀌면 키가 달라져 이전 결과는 쓰지 않음)
+USE_STAGE_RESULT_CACHE = True
+
+# 단계별 결과를 합쳐 보관할 최대 건수
+STAGE_RESULT_CACHE_MAX_SIZE = 2048
+
+# None이면 메모리에만 보관, 파일 경로(예: "runtime/rag_stage_cache.sqlite3")를 지정하면 SQLite에도 저장해 재시작 후에도 재사용
+STAGE_RESULT_CACHE_DB_PATH = None
+
+
 # ===============================
 # 🗣️ 프롬프트 관련 설정
 # ===============================
@@ -0,0 +1,119 @@
+"""
+dataset_snapshot.py
+- 학습용 CSV(phase4_training_data.csv)의 컬럼별 NumPy 스냅샷 캐시
+- 서버를 띄울 때마다 대용량 CSV를 파싱(utf-8 실패 시 cp949로 전체 재시도)하지 않도록,
+  한 번 읽은 결과를 컬럼별 .npy 파일로 저장해 두고 CSV가 바뀐 경우(경로/수정 시간/크기)에만 다시 만든다.
+- 숫자/불리언 컬럼은 그대로, 문자열 컬럼은 범주 코드(.npy) + 범주 목록으로 저장한다.
+  mmap=True로 읽으면 컬럼 배열이 읽기 전용 메모리 매핑이 되어, 여러 워커 프로세스가 같은 물리 페이지를 공유한다.
+  (문자열 컬럼은 category dtype으로 돌아온다)
+"""
+
+import logging
+import os
+import pickle
+import shutil
+import time
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.rul_table import artifact_version
+
+
+# 스냅샷 저장 형식이 바뀌면 올려서 이전 스냅샷을 다시 만들게 한다.
+SNAPSHOT_FORMAT = "npy1"
+
+logger = logging.getLogger(__name__)
+
+
+def read_training_csv(csv_path: Path) -> pd.DataFrame:
+    try:
+        return pd.read_csv(csv_path, encoding="utf-8")
+    except UnicodeDecodeError:
+        return pd.read_csv(csv_path, encoding="cp949")
+
+
+def _write_snapshot(frame: pd.DataFrame, path: Path) -> None:
+    """컬럼별 .npy와 meta.pkl(컬럼 순서/종류/범주 목록)을 임시 폴더에 쓴 뒤 폴더 이름을 바꿔 한 번에 반영한다."""
+    tmp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir(parents=True)
+
+    columns = []
+    for idx, name in enumerate(frame.columns):
+        values = frame[name]
+        if values.dtype.kind in "biuf" and not isinstance(values.dtype, pd.api.extensions.ExtensionDtype):
+            np.save(tmp_path / f"col_{idx}.npy", values.to_numpy(), allow_pickle=False)
+            columns.append({"name": name, "kind": "array"})
+        else:
+            categorical = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype("category")
+            np.save(tmp_path / f"col_{idx}.npy", categorical.cat.codes.to_numpy(), allow_pickle=False)
+            columns.append({"name": name, "kind": "category", "dtype": categorical.dtype})
+
+    with open(tmp_path / "meta.pkl", "wb") as f:
+        pickle.dump({"columns": columns, "n_rows": len(frame)}, f)
+
+    try:
+        tmp_path.replace(path)
+    except OSError:
+        # 다른 워커가 같은 스냅샷을 먼저 만들었으면 그것을 사용한다.
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        if not path.exists():
+            raise
+
+
+def _read_snapshot(path: Path, mmap: bool) -> pd.DataFrame:
+    with open(path / "meta.pkl", "rb") as f:
+        meta = pickle.load(f)
+    # 빈 배열은 메모리 매핑할 수 없으므로 그대로 읽는다.
+    mmap_mode = "r" if mmap and meta["n_rows"] > 0 else None
+
+    data = {}
+    for idx, column in enumerate(meta["columns"]):
+        values = np.load(path / f"col_{idx}.npy", mmap_mode=mmap_mode, allow_pickle=False)
+        if column["kind"] == "category":
+            values = pd.Categorical.from_codes(values, dtype=column["dtype"], validate=False)
+        data[column["name"]] = values
+    # copy=False: 컬럼 배열을 하나의 블록으로 합치며 복사하지 않고 매핑된 배열을 그대로 쓴다.
+    return pd.DataFrame(data, columns=[column["name"] for column in meta["columns"]], copy=False)
+
+
+def load_dataset(csv_path: Path, snapshot_dir: Path, mmap: bool = True) -> Tuple[pd.DataFrame, str]:
+    """
+    (데이터프레임, 읽은 경로 종류 'snapshot' | 'csv')를 반환한다.
+    CSV를 파싱한 경우에도 스냅샷을 저장한 뒤 스냅샷에서 다시 읽어, 모든 워커가 같은 형태/같은 매핑을 사용하게 한다.
+    스냅샷 읽기/쓰기 실패는 CSV 결과로 대체하고 경고만 남긴다.
+    """
+    csv_path = Path(csv_path)
+    version = artifact_version([csv_path], extra=[SNAPSHOT_FORMAT])
+    snapshot_path = Path(snapshot_dir) / f"{csv_path.stem}_{version}"
+
+    if snapshot_path.exists():
+        try:
+            return _read_snapshot(snapshot_path, mmap), "snapshot"
+        except Exception as e:
+            logger.warning(f"데이터 스냅샷 읽기 실패, CSV로 대체: {e}")
+
+    started = time.perf_counter()
+    frame = read_training_csv(csv_path)
+    logger.info(f"학습용 CSV 파싱 완료: {len(frame)}건, {time.perf_counter() - started:.2f}s")
+
+    try:
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        if not snapshot_path.exists():
+            _write_snapshot(frame, snapshot_path)
+        # 이전 버전 CSV(또는 이전 형식)의 스냅샷은 정리한다. 다른 워커가 쓰는 중인 임시 폴더는 건드리지 않는다.
+        for old in snapshot_path.parent.glob(f"{csv_path.stem}_*"):
+            if old.name.startswith(snapshot_path.name) or ".tmp-" in old.name:
+                continue
+            if old.is_dir():
+                shutil.rmtree(old, ignore_errors=True)
+            else:
+                old.unlink(missing_ok=True)
+        frame = _read_snapshot(snapshot_path, mmap)
+    except Exception as e:
+        logger.warning(f"데이터 스냅샷 저장 실패: {e}")
+
+    return frame, "csv"
@@ -0,0 +1,72 @@
+"""
+forecast_artifacts.py
+- /api/ai/forecast가 사용하는 모델/데이터 묶음 (자산 수명 모델, 월별 수요 모델, feature 순서, 학습 데이터, 색인, RUL 테이블)
+- 새 모델/데이터는 요청 경로 밖에서 새 묶음으로 로딩/준비한 뒤 전역 참조 하나만 바꿔 교체한다.
+  요청은 시작 시점의 묶음 참조를 끝까지 사용하므로, 처리 중인 요청은 이전 버전으로 끝나고 이후 요청부터 새 버전을 쓴다.
+"""
+
+from pathlib import Path
+from typing import Any, List, Optional
+
+from app.rul_table import RULTable, artifact_version
+
+
+class ForecastArtifacts:
+    def __init__(
+        self,
+        rf_model: Any,
+        model_meta: dict,
+        model_features: List[str],
+        model_path: Path,
+        monthly_model: Any,
+        monthly_features: List[str],
+        monthly_model_path: Optional[Path],
+        df: Any,
+        scope_index: Any,
+        csv_path: Path,
+        data_source: Optional[str] = None,
+        source_fingerprint: Optional[str] = None,
+    ):
+        self.rf_model = rf_model
+        self.model_meta = model_meta
+        self.model_features = list(model_features)
+        self.model_path = model_path
+        self.monthly_model = monthly_model
+        self.monthly_features = list(monthly_features)
+        self.monthly_model_path = monthly_model_path
+        self.df = df
+        self.scope_index = scope_index
+        self.csv_path = csv_path
+        self.data_source = data_source
+        # 로딩 직전에 확인한 원본 파일 지문 (변경 감지용)
+        self.source_fingerprint = source_fingerprint
+
+        self.rul_table_version = None
+        self.version = None
+        if rf_model is not None and df is not None:
+            # 자산별 예측 총수명 테이블 버전 (모델 파일 + 데이터 파일 + feature 순서)
+            self.rul_table_version = artifact_version([model_path, csv_path], extra=self.model_features)
+            # 예측 결과/월별 이력 캐시 키용 버전 (월별 수요 모델까지 포함)
+            self.version = artifact_version(
+                [model_path, csv_path, monthly_model_path],
+                extra=[*self.model_features, *self.monthly_features],
+            )
+        self.rul_table: Optional[RULTable] = None
+
+    @property
+    def available(self) -> bool:
+        return self.rf_model is not None and self.df is not None and self.scope_index is not None
+
+    @property
+    def rul_table_ready(self) -> bool:
+        current_rul_table = self.rul_table
+        return current_rul_table is not None and current_rul_table.version == self.rul_table_version
+
+    def describe(self) -> dict:
+        return {
+            "version": self.version,
+            "model_path": str(self.model_path),
+            "monthly_model_path": str(self.monthly_model_path) if self.monthly_model_path else None,
+            "data_source": self.data_source,
+            "rows": len(self.df) if self.df is not None else 0,
+        }
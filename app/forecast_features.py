@@ -0,0 +1,68 @@
+"""
+forecast_features.py
+- /api/ai/forecast의 자산별 파생변수 계산 (리드타임 등급, 장비중요도, 고장 예상일/월)
+- 행 단위 apply/lambda 대신 배열 연산으로 계산한다.
+  (취득금액 구간은 searchsorted, 고장 예상일은 timedelta 배열 연산)
+"""
+
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+# 취득금액 구간별 (리드타임등급, 등급점수, sqrt_L, 리드타임_일)
+# 0: 2천만 원 이하 / 1: 2천만 원 초과 ~ 5천만 원 미만 / 2: 5천만 원 이상 (금액 결측 포함)
+LEAD_TIME_GRADE_SCORES = np.array([20.0, 60.0, 100.0])
+LEAD_TIME_SQRT_L = np.array([0.48, 0.81, 1.12])
+LEAD_TIME_DAYS = np.array([7, 20, 38], dtype=np.int64)
+
+# searchsorted(side="right") 경계: 2천만 원은 0등급, 5천만 원은 2등급에 들어가도록 첫 경계를 바로 위 실수로 둔다.
+# NaN은 정렬상 가장 뒤로 가므로 2등급이 된다.
+LEAD_TIME_PRICE_BINS = np.array([np.nextafter(20000000.0, np.inf), 50000000.0])
+
+DAYS_PER_MONTH = 30.4375
+
+
+def get_lead_time_info(price: float):
+    """단건 리드타임 정보 (리드타임등급, 등급점수, sqrt_L, 리드타임_일)"""
+    if price <= 20000000:
+        return 0, 20.0, 0.48, 7
+    elif price < 50000000:
+        return 1, 60.0, 0.81, 20
+    else:
+        return 2, 100.0, 1.12, 38
+
+
+def lead_time_grades(prices: pd.Series) -> np.ndarray:
+    values = pd.to_numeric(prices, errors="coerce").to_numpy(dtype=np.float64)
+    return np.searchsorted(LEAD_TIME_PRICE_BINS, values, side="right").astype(np.int64)
+
+
+def add_derived_features(target_df: pd.DataFrame) -> pd.DataFrame:
+    """취득금액 기반 리드타임 등급과 장비중요도 파생변수를 계산한다."""
+    if '취득금액' in target_df.columns:
+        grades = lead_time_grades(target_df['취득금액'])
+        target_df['리드타임등급'] = grades
+        target_df['등급점수'] = LEAD_TIME_GRADE_SCORES[grades]
+        target_df['sqrt_L'] = LEAD_TIME_SQRT_L[grades]
+        target_df['리드타임_일'] = LEAD_TIME_DAYS[grades]
+        if '가격민감도' in target_df.columns:
+            target_df['장비중요도'] = (target_df['가격민감도'] * 100 * 0.5) + (target_df['등급점수'] * 0.5)
+    return target_df
+
+
+def failure_dates(rul_months: pd.Series, now: Optional[datetime] = None) -> pd.Series:
+    """잔여 수명(개월)을 기준 시각에 더한 고장 예상일 (datetime.timedelta와 같게 마이크로초 단위로 반올림)"""
+    base = np.datetime64(now if now is not None else datetime.now(), "us")
+    days = rul_months.to_numpy(dtype=np.float64) * DAYS_PER_MONTH
+    # timedelta(days=x)와 같은 순서(정수 일 -> 소수 일의 마이크로초 -> 남은 소수 반올림)로 계산해야 1us도 어긋나지 않는다.
+    day_frac, whole_days = np.modf(days)
+    micro_frac, whole_micros = np.modf(day_frac * 86_400_000_000.0)
+    micros = whole_days.astype(np.int64) * 86_400_000_000 + whole_micros.astype(np.int64)
+    # 정확히 0.5us인 경우 전체 값 기준 짝수 쪽으로 반올림한다 (round-half-even).
+    is_odd = micros % 2
+    rounded = np.where(np.abs(micro_frac) == 0.5, 2.0 * np.round((micro_frac + is_odd) * 0.5) - is_odd, np.round(micro_frac))
+    micros += rounded.astype(np.int64)
+    return pd.Series(base + micros.astype("timedelta64[us]"), index=rul_months.index)
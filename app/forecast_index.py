@@ -0,0 +1,66 @@
+"""
+forecast_index.py
+- /api/ai/forecast의 분석 대상(운용부서 / 물품분류 / 학습데이터여부) 행 위치 색인
+- 매 요청마다 전체 학습 데이터에 부서/분류 조건 마스크를 두 번씩 만드는 대신,
+  데이터 로딩 시점에 (부서, 분류, 학습데이터 여부) 조합별 행 위치를 한 번만 묶어 두고
+  요청 시에는 dict 조회 + iloc 슬라이싱만 수행한다.
+"""
+
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+DEPT_COL = "운용부서명"
+CATEGORY_COL = "물품분류명"
+TRAINABLE_COL = "학습데이터여부"
+
+_EMPTY_POSITIONS = np.array([], dtype=np.intp)
+
+
+def normalize_category(category: Optional[str]) -> Optional[str]:
+    """빈 값과 '전체'는 분류 조건 없음(None)으로 취급한다."""
+    if not category or category == "전체":
+        return None
+    return category
+
+
+class ScopeIndex:
+    """
+    (부서, 분류 또는 None, 학습데이터 여부 또는 None) -> 원본 행 위치 배열.
+    행 위치는 원본 데이터프레임의 순서를 그대로 유지하므로 마스크 필터링 결과와 동일한 행 순서를 돌려준다.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._positions: Dict[Tuple[Hashable, Optional[Hashable], Optional[bool]], np.ndarray] = {}
+        if df is None or df.empty or DEPT_COL not in df.columns:
+            return
+
+        dept = df[DEPT_COL]
+        category = df[CATEGORY_COL] if CATEGORY_COL in df.columns else None
+        if TRAINABLE_COL in df.columns:
+            trainable = df[TRAINABLE_COL].eq("Y").rename(TRAINABLE_COL)
+        else:
+            trainable = pd.Series(False, index=df.index, name=TRAINABLE_COL)
+
+        # groupby.indices는 그룹별 행 위치를 오름차순(원본 순서)으로 돌려준다.
+        # 스냅샷의 문자열 컬럼은 category dtype이므로, 데이터에 없는 (부서, 분류) 조합까지 만들지 않도록 observed=True로 묶는다.
+        for key, positions in dept.groupby(dept, sort=False, observed=True).indices.items():
+            self._positions[(key, None, None)] = positions
+        for (dept_key, flag), positions in dept.groupby([dept, trainable], sort=False, observed=True).indices.items():
+            self._positions[(dept_key, None, bool(flag))] = positions
+        if category is not None:
+            for (dept_key, cat_key), positions in dept.groupby([dept, category], sort=False, observed=True).indices.items():
+                self._positions[(dept_key, cat_key, None)] = positions
+            for (dept_key, cat_key, flag), positions in dept.groupby([dept, category, trainable], sort=False, observed=True).indices.items():
+                self._positions[(dept_key, cat_key, bool(flag))] = positions
+
+    def positions(self, dept_name: str, category: Optional[str] = None, trainable_only: bool = False) -> np.ndarray:
+        key = (dept_name, normalize_category(category), True if trainable_only else None)
+        return self._positions.get(key, _EMPTY_POSITIONS)
+
+    def select(self, dept_name: str, category: Optional[str] = None, trainable_only: bool = False) -> pd.DataFrame:
+        """마스크 필터링(df[(부서 == dept) & (분류 == category) & (학습데이터여부 == 'Y')])과 같은 결과를 돌려준다."""
+        return self.df.iloc[self.positions(dept_name, category, trainable_only)]
@@ -0,0 +1,126 @@
+"""
+keyword_matcher.py
+- /api/ai/chat의 매뉴얼 챕터 라우팅 / 바로가기 버튼 키워드 매칭
+- 모든 키워드 테이블을 서버 시작 시 하나의 Aho-Corasick 오토마톤으로 컴파일하여
+  텍스트를 한 번만 훑으면서 매칭된 라우트와 버튼을 모두 찾는다.
+- 키워드 테이블은 app/chat_keywords.json에서 읽는다 (AI_CHAT_KEYWORDS_PATH로 변경 가능).
+"""
+
+import json
+import os
+from collections import deque
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+
+CHAT_KEYWORDS_PATH = Path(os.getenv("AI_CHAT_KEYWORDS_PATH", Path(__file__).resolve().with_name("chat_keywords.json")))
+
+ROUTE = "route"
+BUTTON = "button"
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick 다중 패턴 매처.
+    패턴 수와 무관하게 텍스트 길이에 선형인 1회 순회로 매칭된 태그 집합을 반환한다.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Hashable]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[Hashable]] = [set()]
+
+        for keyword, tag in patterns:
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                    self._goto[state][ch] = next_state
+                state = next_state
+            self._out[state].add(tag)
+
+        self._build_failure_links()
+        # 순회 중 집합 연산을 줄이기 위해 출력은 불변 집합으로 고정한다.
+        self._out_frozen = [frozenset(tags) for tags in self._out]
+
+    def _build_failure_links(self) -> None:
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                # 실패 링크 상태의 출력까지 합쳐 두면 순회 시 링크를 따라갈 필요가 없다.
+                self._out[child] |= self._out[self._fail[child]]
+
+    def find_tags(self, text: str) -> Set[Hashable]:
+        goto = self._goto
+        fail = self._fail
+        out = self._out_frozen
+
+        found: Set[Hashable] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+
+class ChatKeywordRouter:
+    """매뉴얼 챕터 라우팅 테이블과 바로가기 버튼 테이블을 하나의 매처로 묶는다."""
+
+    def __init__(self, routes: List[dict], action_buttons: List[dict]):
+        self.routes = routes
+        self.action_buttons = action_buttons
+
+        patterns = []
+        for idx, route in enumerate(routes):
+            patterns.extend((kw, (ROUTE, idx)) for kw in route.get("keywords", []))
+        for idx, button in enumerate(action_buttons):
+            patterns.extend((kw, (BUTTON, idx)) for kw in button.get("keywords", []))
+        self.matcher = KeywordMatcher(patterns)
+
+    @classmethod
+    def from_file(cls, path: Path = CHAT_KEYWORDS_PATH) -> "ChatKeywordRouter":
+        with open(path, "r", encoding="utf-8") as f:
+            tables = json.load(f)
+        return cls(tables.get("routes", []), tables.get("action_buttons", []))
+
+    def match(self, text: str) -> Tuple[List[int], List[int]]:
+        """텍스트를 한 번 순회하여 (매칭된 라우트 인덱스, 매칭된 버튼 인덱스)를 테이블 순서대로 반환한다."""
+        tags = self.matcher.find_tags(text)
+        route_ids = sorted(idx for kind, idx in tags if kind == ROUTE)
+        button_ids = sorted(idx for kind, idx in tags if kind == BUTTON)
+        return route_ids, button_ids
+
+    def select_manual(self, query: str) -> Optional[str]:
+        """공백을 제거한 질문에서 테이블 우선순위가 가장 높은 매뉴얼 챕터를 고른다."""
+        route_ids, _ = self.match(query.replace(" ", ""))
+        if not route_ids:
+            return None
+        return self.routes[route_ids[0]]["target"]
+
+    def build_action_buttons(self, text: str) -> List[dict]:
+        _, button_ids = self.match(text)
+        # 같은 목적지의 버튼이 여러 개 달리는 것 방지
+        unique_buttons = {}
+        for idx in button_ids:
+            button = self.action_buttons[idx]
+            unique_buttons[button["label"]] = {"label": button["label"], "url": button["url"]}
+        return list(unique_buttons.values())
@@ -5,8 +5,9 @@ from dotenv import load_dotenv                      # 환경 변수 로드
 from langchain_openai import ChatOpenAI             # LLM
 from ingestion.embedder import get_embedding_model  # 임베딩
 from vectorstore.chroma_store import load_chroma_db # DB 로드
-from rag.chain import run_rag_chain                 # RAG 체인
-from app.config import VECTOR_DB_PATH, LLM_MODEL_NAME, LLM_TEMPERATURE
+from rag.chain import run_rag_chain_concurrent      # RAG 체인 (Router/분류/질의 정제 동시 실행)
+from rag.query_classifier import get_local_classifier  # 로컬 질문 분류기
+from app.config import VECTOR_DB_PATH, LLM_MODEL_NAME, LLM_TEMPERATURE, USE_LOCAL_QUESTION_CLASSIFIER
 
 # ==========================================
 # 🔇 Windows 한글 깨짐 방지용 출력 인코딩 설정
@@ -37,6 +38,10 @@ def main():
         print("❌ DB 연결 실패")
         return
 
+    # 로컬 질문 분류기는 첫 질문을 기다리게 하지 않도록 기동 시 미리 학습한다.
+    if USE_LOCAL_QUESTION_CLASSIFIER:
+        get_local_classifier()
+
     llm = ChatOpenAI(
     model=LLM_MODEL_NAME,
     temperature=LLM_TEMPERATURE
@@ -63,7 +68,7 @@ def main():
         # answer = run_rag_chain(llm, vectordb, user_input)
 
         # RAG 실행 (정확한 인자 순서)
-        answer = run_rag_chain(
+        answer = run_rag_chain_concurrent(
             llm=llm,
             vectordb=vectordb,
             user_query=user_input
@@ -0,0 +1,83 @@
+"""
+manual_cache.py
+- /api/ai/chat에서 시스템 프롬프트에 넣을 매뉴얼 챕터 캐시
+- 서버 시작 시 8개 챕터를 한 번에 읽어 직렬화된 문자열로 보관하고,
+  파일 수정 시간(mtime) 또는 크기가 바뀐 경우에만 다시 읽는다 (rag/faq_service.py와 같은 Hot-Reloading 방식).
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+# 경로 설정 (dataset/input/manual_chapterN.json)
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+MANUAL_DIR = Path(os.getenv("AI_MANUAL_DIR", PROJECT_ROOT / "dataset" / "input"))
+MANUAL_FILES = [f"manual_chapter{i}.json" for i in range(1, 9)]
+
+# mtime 확인(stat) 자체도 디스크 접근이므로 요청마다 하지 않고 일정 간격으로만 수행한다.
+MANUAL_RELOAD_CHECK_INTERVAL = float(os.getenv("AI_MANUAL_RELOAD_CHECK_INTERVAL", "5.0"))
+
+
+# 캐싱 및 상태 관리 변수
+_MANUAL_CACHE: Dict[str, str] = {}        # 파일명 -> json.dumps 결과 문자열
+_MANUAL_STATS: Dict[str, Optional[Tuple[int, int]]] = {}  # 파일명 -> 마지막으로 읽은 파일의 (mtime_ns, 크기)
+_LAST_CHECKED: Dict[str, float] = {}      # 파일명 -> 마지막 mtime 확인 시각 (monotonic)
+
+
+def _refresh_manual(file_name: str) -> None:
+    """
+    파일 변경 여부를 확인하고(Hot-Reloading), 바뀐 경우에만 다시 직렬화한다.
+    """
+    path = MANUAL_DIR / file_name
+    _LAST_CHECKED[file_name] = time.monotonic()
+
+    if not path.exists():
+        if file_name in _MANUAL_CACHE or file_name not in _MANUAL_STATS:
+            logger.warning(f"매뉴얼 파일 없음: {path}")
+        _MANUAL_CACHE.pop(file_name, None)
+        # 파일이 다시 생성되면 반드시 재로딩되도록 파일 정보를 초기화한다.
+        _MANUAL_STATS[file_name] = None
+        return
+
+    try:
+        stat = path.stat()
+        # 수정 시간 해상도 안에서 다시 쓴 경우도 잡도록 크기까지 비교한다.
+        current_stat = (stat.st_mtime_ns, stat.st_size)
+        if file_name in _MANUAL_CACHE and current_stat == _MANUAL_STATS.get(file_name):
+            return
+
+        with path.open("r", encoding="utf-8") as f:
+            _MANUAL_CACHE[file_name] = json.dumps(json.load(f), ensure_ascii=False)
+        _MANUAL_STATS[file_name] = current_stat
+        logger.info(f"매뉴얼 캐시 갱신 완료: {file_name}")
+
+    except json.JSONDecodeError as e:
+        # 파싱 실패 시 직전 캐시를 유지한다.
+        logger.error(f"매뉴얼 JSON 파싱 실패 ({file_name}): {e}")
+    except Exception as e:
+        logger.exception(f"매뉴얼 로드 중 예상치 못한 오류 발생 ({file_name}): {e}")
+
+
+def preload_manuals() -> int:
+    """서버 시작 시 전체 챕터를 미리 읽어둔다. 로드된 챕터 수를 반환한다."""
+    for file_name in MANUAL_FILES:
+        _refresh_manual(file_name)
+    return len(_MANUAL_CACHE)
+
+
+def get_manual_content(file_name: str) -> str:
+    """
+    직렬화된 매뉴얼 문자열을 반환한다.
+    확인 간격이 지나지 않았다면 디스크를 보지 않고 메모리 캐시만 사용한다.
+    """
+    last_checked = _LAST_CHECKED.get(file_name)
+    if last_checked is None or time.monotonic() - last_checked >= MANUAL_RELOAD_CHECK_INTERVAL:
+        _refresh_manual(file_name)
+    return _MANUAL_CACHE.get(file_name, "")
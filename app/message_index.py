@@ -0,0 +1,70 @@
+"""
+message_index.py
+- 전체 쓰레드 메시지 검색(/api/ai/chat/messages/search)용 역색인
+- 한국어는 띄어쓰기/조사 때문에 단어 단위 색인이 잘 맞지 않으므로 글자 n-gram(1, 2글자) 단위로 색인한다.
+- 검색어의 n-gram 후보를 교집합으로 좁힌 뒤, 후보에 대해서만 부분 문자열 일치를 확인한다.
+"""
+
+import threading
+from typing import Dict, Hashable, Iterable, List, Set
+
+
+def message_ngrams(text: str) -> Set[str]:
+    """소문자 기준 1글자 + 2글자 n-gram 집합"""
+    lowered = (text or "").lower()
+    grams = set(lowered)
+    grams.update(lowered[i:i + 2] for i in range(len(lowered) - 1))
+    return grams
+
+
+def query_ngrams(keyword: str) -> Set[str]:
+    """검색어 하나를 찾기 위해 모두 포함되어야 하는 n-gram (2글자 이상이면 2-gram만 사용)"""
+    lowered = keyword.lower()
+    if len(lowered) <= 1:
+        return set(lowered)
+    return {lowered[i:i + 2] for i in range(len(lowered) - 1)}
+
+
+class MessageIndex:
+    """메시지 키(예: (threadId, 순번))를 n-gram 포스팅 리스트로 관리하는 인메모리 역색인."""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: Hashable, text: str) -> None:
+        with self._lock:
+            for gram in message_ngrams(text):
+                self._postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key: Hashable, text: str) -> None:
+        with self._lock:
+            for gram in message_ngrams(text):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    continue
+                posting.discard(key)
+                if not posting:
+                    del self._postings[gram]
+
+    def remove_many(self, items: Iterable[tuple]) -> None:
+        for key, text in items:
+            self.remove(key, text)
+
+    def candidates(self, keyword: str) -> List[Hashable]:
+        """검색어의 모든 n-gram을 포함하는 메시지 키 (부분 문자열 검증 전 후보)"""
+        grams = query_ngrams(keyword)
+        if not grams:
+            return []
+        with self._lock:
+            postings = [self._postings.get(gram) for gram in grams]
+            if any(posting is None for posting in postings):
+                return []
+            # 가장 짧은 포스팅 리스트부터 교집합을 구해 비교 횟수를 줄인다.
+            postings.sort(key=len)
+            result = set(postings[0])
+            for posting in postings[1:]:
+                result &= posting
+                if not result:
+                    break
+        return list(result)
@@ -0,0 +1,162 @@
+"""
+metrics.py
+- API 서버 단계별 소요 시간 / 처리량 지표 (Prometheus 텍스트 형식으로 /metrics에서 노출)
+- 단계별 소요 시간은 최근 window개 표본만 담는 고정 크기 링 버퍼에 쌓고, p50/p95/p99는 수집(scrape) 시점에만 계산한다.
+  요청 경로에서는 잠금 + 배열 한 칸 쓰기 + 합계 갱신만 하므로 부하가 거의 없다.
+- 캐시 적중 수, 작업 풀 사용량처럼 이미 다른 객체가 세고 있는 값은 수집 시점에 함수로 읽어 온다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: dict) -> LabelKey:
+    return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(label_key: LabelKey) -> str:
+    if not label_key:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in label_key) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value != value:
+        return "NaN"
+    return repr(float(value))
+
+
+class LatencyReservoir:
+    """최근 window개 표본(초)과 누적 개수/합계"""
+
+    def __init__(self, window: int):
+        self._samples = [0.0] * max(1, window)
+        self._next = 0
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self._samples[self._next] = seconds
+        self._next = (self._next + 1) % len(self._samples)
+        self.count += 1
+        self.total += seconds
+
+    def quantiles(self) -> List[float]:
+        filled = self._samples[:min(self.count, len(self._samples))]
+        if not len(filled):
+            return [float("nan")] * len(QUANTILES)
+        return [float(v) for v in np.quantile(np.asarray(filled, dtype=np.float64), QUANTILES)]
+
+
+class MetricsRegistry:
+    def __init__(self, namespace: str = "ai_server", window: int = 1024):
+        self.namespace = namespace
+        self.window = window
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Dict[LabelKey, LatencyReservoir]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._functions: Dict[str, Tuple[str, Dict[LabelKey, Callable[[], float]]]] = {}
+        self._help: Dict[str, str] = {}
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    # ------------------------------------------
+    # 요청 경로에서 호출하는 기록 함수
+    # ------------------------------------------
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            reservoir = self._latencies.setdefault(name, {}).get(key)
+            if reservoir is None:
+                reservoir = self._latencies[name][key] = LatencyReservoir(self.window)
+            reservoir.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def add_gauge(self, name: str, delta: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + delta
+
+    # ------------------------------------------
+    # 수집 시점에 값을 읽어 오는 지표
+    # ------------------------------------------
+    def register_function(self, name: str, metric_type: str, fn: Callable[[], float], **labels) -> None:
+        """metric_type은 'counter' 또는 'gauge'"""
+        with self._lock:
+            _, series = self._functions.setdefault(name, (metric_type, {}))
+            series[_label_key(labels)] = fn
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식(0.0.4)으로 모든 지표를 만든다."""
+        with self._lock:
+            latencies = {
+                name: [(key, reservoir.quantiles(), reservoir.total, reservoir.count) for key, reservoir in series.items()]
+                for name, series in self._latencies.items()
+            }
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+            functions = {name: (metric_type, dict(series)) for name, (metric_type, series) in self._functions.items()}
+
+        lines: List[str] = []
+
+        def header(name: str, metric_type: str) -> str:
+            full_name = f"{self.namespace}_{name}"
+            if name in self._help:
+                lines.append(f"# HELP {full_name} {self._help[name]}")
+            lines.append(f"# TYPE {full_name} {metric_type}")
+            return full_name
+
+        for name in sorted(latencies):
+            full_name = header(name, "summary")
+            for key, quantile_values, total, count in sorted(latencies[name], key=lambda item: item[0]):
+                for q, value in zip(QUANTILES, quantile_values):
+                    lines.append(f"{full_name}{_format_labels(key + (('quantile', str(q)),))} {_format_value(value)}")
+                lines.append(f"{full_name}_sum{_format_labels(key)} {_format_value(total)}")
+                lines.append(f"{full_name}_count{_format_labels(key)} {count}")
+
+        for metric_type, table in (("counter", counters), ("gauge", gauges)):
+            for name in sorted(table):
+                full_name = header(name, metric_type)
+                for key, value in sorted(table[name].items()):
+                    lines.append(f"{full_name}{_format_labels(key)} {_format_value(value)}")
+
+        for name in sorted(functions):
+            metric_type, series = functions[name]
+            full_name = header(name, metric_type)
+            for key, fn in sorted(series.items(), key=lambda item: item[0]):
+                try:
+                    value = float(fn())
+                except Exception:
+                    value = float("nan")
+                lines.append(f"{full_name}{_format_labels(key)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,66 @@
+"""
+model_mmap.py
+- 여러 uvicorn 워커가 같은 joblib 모델을 읽을 때 모델 안의 numpy 배열을 메모리 매핑으로 공유하기 위한 로더
+- joblib.load(mmap_mode='r')는 비압축으로 저장된 파일에서만 배열을 매핑할 수 있으므로,
+  원본(압축 여부 무관)을 한 번 읽어 비압축 사본({stem}_{버전}.joblib)으로 저장해 두고 이후에는 사본을 매핑해서 읽는다.
+- sklearn 결정 트리(RandomForest/ExtraTrees/GradientBoosting)는 역직렬화 시 노드 배열을 자체 버퍼로 복사하므로 공유되지 않는다.
+  이런 모델은 사본을 만들지 않고 원본을 그대로 읽는다 (사본 저장 비용과 디스크만 늘어나므로).
+  배열을 그대로 보관하는 모델(HistGradientBoosting, 선형 모델 등)에서만 사본을 만들어 워커 간 페이지를 공유한다.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+import joblib
+import numpy as np
+from sklearn.tree import BaseDecisionTree
+
+from app.rul_table import artifact_version
+
+
+logger = logging.getLogger(__name__)
+
+
+def has_tree_nodes(model: Any) -> bool:
+    """모델(파이프라인/앙상블 포함)에 sklearn 결정 트리가 들어 있는지 (트리 노드 배열은 메모리 매핑으로 공유되지 않는다)."""
+    if isinstance(model, BaseDecisionTree):
+        return True
+    steps = getattr(model, "steps", None)
+    if steps is not None:
+        return any(has_tree_nodes(step) for _, step in steps)
+    estimators = getattr(model, "estimators_", None)
+    if estimators is None:
+        return False
+    return any(has_tree_nodes(estimator) for estimator in np.ravel(np.asarray(estimators, dtype=object)))
+
+
+def load_model(model_path: Path, cache_dir: Optional[Path] = None) -> Any:
+    """
+    cache_dir가 있으면 비압축 사본을 mmap_mode='r'로 읽고, 없으면 원본을 그대로 읽는다.
+    트리 모델은 사본을 만들지 않으므로 사본이 없을 때 원본을 한 번 읽어 종류를 확인한다.
+    """
+    model_path = Path(model_path)
+    if cache_dir is None:
+        return joblib.load(model_path)
+
+    mmap_path = Path(cache_dir) / f"{model_path.stem}_{artifact_version([model_path])}.joblib"
+    if not mmap_path.exists():
+        model = joblib.load(model_path)
+        if has_tree_nodes(model):
+            return model
+        try:
+            mmap_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = mmap_path.with_name(f".{mmap_path.name}.{os.getpid()}.tmp")
+            joblib.dump(model, tmp_path)
+            tmp_path.replace(mmap_path)
+            # 같은 이름 모델의 이전 버전 사본은 정리한다 (이미 매핑한 프로세스는 계속 읽을 수 있다).
+            for old in mmap_path.parent.glob(f"{model_path.stem}_*.joblib"):
+                if old != mmap_path:
+                    old.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"모델 메모리 매핑용 사본 저장 실패, 원본 사용: {e}")
+            return model
+
+    return joblib.load(mmap_path, mmap_mode="r")
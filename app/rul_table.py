@@ -0,0 +1,104 @@
+"""
+rul_table.py
+- /api/ai/forecast용 자산별 예측 총수명(예측수명_월) 사전 계산 테이블
+- 예측 총수명은 정적인 자산 특성과 로딩된 모델에만 의존하므로, (모델 파일, 데이터 파일) 버전마다
+  전체 자산을 한 번만 배치 예측해 원본 행 순서의 float 배열로 보관한다.
+- 요청 시에는 행 위치로 배열을 슬라이싱하고, 시간에 따라 변하는 운용연차 차감(RUL)만 계산한다.
+- 계산 결과는 app/runtime/rul_tables/ 아래 .npy 파일로 저장해 재시작 시 재사용한다.
+  mmap=True면 저장된 파일을 읽기 전용 메모리 매핑으로 읽어 여러 워커 프로세스가 같은 물리 페이지를 공유한다.
+"""
+
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+def artifact_version(paths: Iterable[Optional[Path]], extra: Iterable[str] = ()) -> str:
+    """파일 경로 + 수정 시간 + 크기(와 feature 목록 등 추가 정보)로 만든 짧은 버전 해시"""
+    digest = hashlib.sha1()
+    for path in paths:
+        if path is None:
+            digest.update(b"<none>")
+            continue
+        path = Path(path)
+        try:
+            stat = path.stat()
+            digest.update(f"{path.resolve()}|{stat.st_mtime_ns}|{stat.st_size}".encode("utf-8"))
+        except OSError:
+            digest.update(f"{path}|missing".encode("utf-8"))
+    for item in extra:
+        digest.update(str(item).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class RULTable:
+    """원본 데이터프레임 행 순서와 같은 순서의 예측 총수명(개월) 배열"""
+
+    def __init__(self, version: str, predicted_life: np.ndarray):
+        self.version = version
+        self.predicted_life = np.ascontiguousarray(predicted_life, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.predicted_life)
+
+    def take(self, positions: np.ndarray) -> np.ndarray:
+        return self.predicted_life[positions]
+
+
+def load_or_build_rul_table(
+    version: str,
+    n_rows: int,
+    score_fn: Callable[[], np.ndarray],
+    cache_dir: Optional[Path] = None,
+    mmap: bool = False,
+) -> RULTable:
+    """
+    같은 버전의 저장된 테이블이 있으면 읽고, 없으면 score_fn으로 전체 자산을 배치 예측해 저장한다.
+    저장 실패는 서비스에 영향이 없으므로 경고만 남긴다.
+    """
+    cache_path = Path(cache_dir) / f"rul_{version}.npy" if cache_dir is not None else None
+    # 빈 배열은 메모리 매핑할 수 없으므로 그대로 읽는다.
+    mmap_mode = "r" if mmap and n_rows > 0 else None
+
+    if cache_path is not None and cache_path.exists():
+        try:
+            cached = np.load(cache_path, mmap_mode=mmap_mode, allow_pickle=False)
+            if cached.shape == (n_rows,):
+                logger.info(f"RUL 테이블 캐시 사용: {cache_path}")
+                return RULTable(version, cached)
+            logger.warning(f"RUL 테이블 캐시 크기 불일치, 다시 계산: {cache_path}")
+        except Exception as e:
+            logger.warning(f"RUL 테이블 캐시 읽기 실패, 다시 계산: {e}")
+
+    started = time.perf_counter()
+    predicted_life = np.asarray(score_fn(), dtype=np.float64)
+    if predicted_life.shape != (n_rows,):
+        raise ValueError(f"RUL 배치 예측 결과 크기 불일치: {predicted_life.shape} != ({n_rows},)")
+    logger.info(f"RUL 테이블 배치 예측 완료: {n_rows}건, {time.perf_counter() - started:.2f}s")
+
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # 여러 워커가 동시에 저장해도 겹치지 않고, 아래 정리 대상(rul_*.npy)에도 걸리지 않는 임시 이름
+            tmp_path = cache_path.with_name(f".{cache_path.stem}.{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                np.save(f, predicted_life, allow_pickle=False)
+            tmp_path.replace(cache_path)
+            # 이전 버전 테이블은 더 이상 쓰이지 않으므로 정리한다.
+            for old in cache_path.parent.glob("rul_*.npy"):
+                if old != cache_path:
+                    old.unlink(missing_ok=True)
+            if mmap_mode is not None:
+                return RULTable(version, np.load(cache_path, mmap_mode=mmap_mode, allow_pickle=False))
+        except OSError as e:
+            logger.warning(f"RUL 테이블 저장 실패: {e}")
+
+    return RULTable(version, predicted_life)
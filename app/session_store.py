@@ -0,0 +1,517 @@
+"""
+session_store.py
+- 챗봇 쓰레드(세션) / 예측 기록 저장소
+- memory: 프로세스 내부 dict 기반 (개발/단일 워커용)
+- sqlite: 로컬 SQLite(WAL) 기반 (재시작 후에도 유지, 여러 uvicorn 워커가 공유)
+- 두 구현 모두 오래 사용하지 않은 쓰레드를 LRU 방식으로 정리하여 메모리/디스크 사용량을 일정하게 유지한다.
+"""
+
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.message_index import MessageIndex, message_ngrams, query_ngrams
+
+
+DEFAULT_MAX_THREADS = 10000
+DEFAULT_MAX_FORECASTS = 5000
+DEFAULT_THREAD_IDLE_TTL = 60 * 60 * 24 * 30  # 30일 동안 접근이 없으면 정리
+
+
+def _py_lower(text: Optional[str]) -> Optional[str]:
+    return text.lower() if text is not None else None
+
+
+class InMemorySessionStore:
+    """기존 sessions_db / predictions_db dict와 같은 동작에 LRU 상한만 추가한 구현."""
+
+    def __init__(
+        self,
+        max_threads: int = DEFAULT_MAX_THREADS,
+        max_forecasts: int = DEFAULT_MAX_FORECASTS,
+        thread_idle_ttl: float = DEFAULT_THREAD_IDLE_TTL,
+    ):
+        self.max_threads = max_threads
+        self.max_forecasts = max_forecasts
+        self.thread_idle_ttl = thread_idle_ttl
+        self._threads: Dict[str, dict] = {}                 # 생성 순서 유지 (목록 조회용)
+        self._thread_lru: "OrderedDict[str, float]" = OrderedDict()  # 접근 순서 (정리용)
+        self._forecasts: "OrderedDict[str, dict]" = OrderedDict()
+        self._thread_seq: Dict[str, int] = {}                # 검색 결과 정렬용 쓰레드 생성 순번
+        self._seq_counter = itertools.count()
+        self._index = MessageIndex()
+        self._lock = threading.RLock()
+
+    # --- 쓰레드 ---
+    def _drop_thread(self, thread_id: str) -> None:
+        data = self._threads.pop(thread_id, None)
+        self._thread_lru.pop(thread_id, None)
+        self._thread_seq.pop(thread_id, None)
+        if data is not None:
+            self._index.remove_many(
+                ((thread_id, idx), msg["content"]) for idx, msg in enumerate(data["messages"])
+            )
+
+    def _touch(self, thread_id: str) -> None:
+        self._thread_lru[thread_id] = time.time()
+        self._thread_lru.move_to_end(thread_id)
+
+    def _evict_threads(self) -> int:
+        expire_before = time.time() - self.thread_idle_ttl
+        evicted = 0
+        while self._thread_lru:
+            oldest_id, last_access = next(iter(self._thread_lru.items()))
+            if len(self._thread_lru) <= self.max_threads and last_access >= expire_before:
+                break
+            self._drop_thread(oldest_id)
+            evicted += 1
+        return evicted
+
+    def evict_idle_threads(self) -> int:
+        """유휴 시간(thread_idle_ttl)을 넘긴 쓰레드를 정리하고 정리한 개수를 반환한다 (서버의 주기 작업에서 호출)."""
+        with self._lock:
+            return self._evict_threads()
+
+    def ensure_thread(self, thread_id: str, title: str = "새 채팅") -> bool:
+        """쓰레드가 없으면 만든다. 새로 만든 경우 True."""
+        with self._lock:
+            if thread_id in self._threads:
+                self._touch(thread_id)
+                return False
+            self._threads[thread_id] = {"title": title, "messages": [], "summary": "", "summary_upto": 0}
+            self._thread_seq[thread_id] = next(self._seq_counter)
+            self._touch(thread_id)
+            self._evict_threads()
+            return True
+
+    def has_thread(self, thread_id: str) -> bool:
+        return thread_id in self._threads
+
+    def list_threads(self, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        with self._lock:
+            items = list(self._threads.items())
+        end = None if limit is None else offset + limit
+        return [{"threadId": tid, "title": data["title"]} for tid, data in items[offset:end]]
+
+    def rename_thread(self, thread_id: str, title: str) -> bool:
+        with self._lock:
+            if thread_id not in self._threads:
+                return False
+            self._threads[thread_id]["title"] = title
+            self._touch(thread_id)
+            return True
+
+    def delete_thread(self, thread_id: str) -> bool:
+        with self._lock:
+            if thread_id not in self._threads:
+                return False
+            self._drop_thread(thread_id)
+            return True
+
+    def get_messages(self, thread_id: str) -> List[dict]:
+        with self._lock:
+            if thread_id not in self._threads:
+                return []
+            self._touch(thread_id)
+            return list(self._threads[thread_id]["messages"])
+
+    def append_message(self, thread_id: str, role: str, content: str, created_at: str) -> None:
+        with self._lock:
+            self.ensure_thread(thread_id)
+            messages = self._threads[thread_id]["messages"]
+            messages.append({"role": role, "content": content, "created_at": created_at})
+            self._index.add((thread_id, len(messages) - 1), content)
+
+    def get_summary(self, thread_id: str) -> Tuple[str, int]:
+        """(누적 요약, 요약에 포함된 앞쪽 메시지 수)"""
+        data = self._threads.get(thread_id)
+        if data is None:
+            return "", 0
+        return data.get("summary", ""), data.get("summary_upto", 0)
+
+    def set_summary(self, thread_id: str, summary: str, summary_upto: int) -> None:
+        with self._lock:
+            if thread_id in self._threads:
+                self._threads[thread_id]["summary"] = summary
+                self._threads[thread_id]["summary_upto"] = summary_upto
+
+    def list_all_messages(self, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        """전체 쓰레드 메시지를 쓰레드 생성 순서 -> 메시지 순서로 반환한다."""
+        result = []
+        end = None if limit is None else offset + limit
+        with self._lock:
+            position = 0
+            for tid, data in self._threads.items():
+                for msg in data["messages"]:
+                    if end is not None and position >= end:
+                        return result
+                    if position >= offset:
+                        result.append({"threadId": tid, **msg})
+                    position += 1
+        return result
+
+    def search_messages(self, keyword: str, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        """역색인으로 후보를 좁힌 뒤 대소문자 무시 부분 문자열 일치를 확인한다."""
+        lowered = keyword.lower()
+        with self._lock:
+            candidates = self._index.candidates(keyword)
+            candidates.sort(key=lambda key: (self._thread_seq.get(key[0], -1), key[1]))
+            matched = []
+            end = None if limit is None else offset + limit
+            for tid, idx in candidates:
+                msg = self._threads[tid]["messages"][idx]
+                if lowered not in msg["content"].lower():
+                    continue
+                matched.append({"threadId": tid, **msg})
+                if end is not None and len(matched) >= end:
+                    break
+        return matched[offset:end]
+
+    # --- 예측 기록 ---
+    def save_forecast(self, forecast_id: str, record: dict) -> None:
+        with self._lock:
+            self._forecasts[forecast_id] = record
+            while len(self._forecasts) > self.max_forecasts:
+                self._forecasts.popitem(last=False)
+
+    def list_forecasts(self, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        """최신 기록부터 반환한다."""
+        with self._lock:
+            items = list(reversed(self._forecasts.items()))
+        end = None if limit is None else offset + limit
+        return [
+            {
+                "forecastId": fid,
+                "title": info.get("title"),
+                "prompt": info.get("prompt"),
+                "created_at": info.get("created_at"),
+            }
+            for fid, info in items[offset:end]
+        ]
+
+    def get_forecast(self, forecast_id: str) -> Optional[dict]:
+        return self._forecasts.get(forecast_id)
+
+    def rename_forecast(self, forecast_id: str, title: str) -> bool:
+        with self._lock:
+            if forecast_id not in self._forecasts:
+                return False
+            self._forecasts[forecast_id]["title"] = title
+            return True
+
+    def delete_forecast(self, forecast_id: str) -> bool:
+        with self._lock:
+            return self._forecasts.pop(forecast_id, None) is not None
+
+
+class SQLiteSessionStore:
+    """
+    로컬 SQLite(WAL) 기반 저장소.
+    WAL 모드에서는 읽기와 쓰기가 서로 막지 않으므로 여러 워커 프로세스가 같은 파일을 공유할 수 있다.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_threads: int = DEFAULT_MAX_THREADS,
+        max_forecasts: int = DEFAULT_MAX_FORECASTS,
+        thread_idle_ttl: float = DEFAULT_THREAD_IDLE_TTL,
+    ):
+        self.db_path = Path(db_path)
+        self.max_threads = max_threads
+        self.max_forecasts = max_forecasts
+        self.thread_idle_ttl = thread_idle_ttl
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30.0, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        # SQLite 내장 lower()는 ASCII만 변환하므로 검색의 대소문자 무시 비교에는 파이썬 str.lower()를 등록해 쓴다.
+        self._conn.create_function("py_lower", 1, _py_lower, deterministic=True)
+        self._lock = threading.RLock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS threads (
+                    thread_id    TEXT PRIMARY KEY,
+                    title        TEXT NOT NULL,
+                    last_access  REAL NOT NULL,
+                    summary      TEXT NOT NULL DEFAULT '',
+                    summary_upto INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS idx_threads_last_access ON threads(last_access);
+
+                CREATE TABLE IF NOT EXISTS messages (
+                    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+                    thread_id  TEXT NOT NULL REFERENCES threads(thread_id) ON DELETE CASCADE,
+                    role       TEXT NOT NULL,
+                    content    TEXT NOT NULL,
+                    created_at TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_messages_thread ON messages(thread_id, id);
+
+                -- 메시지 검색용 글자 n-gram 역색인 (message_index.message_ngrams 기준)
+                CREATE TABLE IF NOT EXISTS message_grams (
+                    gram       TEXT NOT NULL,
+                    message_id INTEGER NOT NULL REFERENCES messages(id) ON DELETE CASCADE,
+                    PRIMARY KEY (gram, message_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_message_grams_message ON message_grams(message_id);
+
+                CREATE TABLE IF NOT EXISTS forecasts (
+                    seq         INTEGER PRIMARY KEY AUTOINCREMENT,
+                    forecast_id TEXT NOT NULL UNIQUE,
+                    title       TEXT,
+                    prompt      TEXT,
+                    created_at  TEXT,
+                    data        TEXT NOT NULL
+                );
+                """
+            )
+            # 요약 컬럼이 없던 기존 DB 파일 마이그레이션
+            thread_columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(threads)")}
+            if "summary" not in thread_columns:
+                self._conn.execute("ALTER TABLE threads ADD COLUMN summary TEXT NOT NULL DEFAULT ''")
+            if "summary_upto" not in thread_columns:
+                self._conn.execute("ALTER TABLE threads ADD COLUMN summary_upto INTEGER NOT NULL DEFAULT 0")
+            self._backfill_message_grams()
+
+    def _backfill_message_grams(self) -> None:
+        """역색인이 없던 기존 DB 파일의 메시지를 한 번만 색인한다."""
+        has_grams = self._conn.execute("SELECT 1 FROM message_grams LIMIT 1").fetchone()
+        has_messages = self._conn.execute("SELECT 1 FROM messages LIMIT 1").fetchone()
+        if has_grams or not has_messages:
+            return
+        rows = self._conn.execute("SELECT id, content FROM messages").fetchall()
+        self._conn.execute("BEGIN")
+        for row in rows:
+            self._insert_grams(row["id"], row["content"])
+        self._conn.execute("COMMIT")
+
+    def _insert_grams(self, message_id: int, content: str) -> None:
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO message_grams (gram, message_id) VALUES (?, ?)",
+            [(gram, message_id) for gram in message_ngrams(content)],
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # --- 쓰레드 ---
+    def _evict_threads(self) -> int:
+        expire_before = time.time() - self.thread_idle_ttl
+        evicted = self._conn.execute("DELETE FROM threads WHERE last_access < ?", (expire_before,)).rowcount
+        excess = self._conn.execute("SELECT COUNT(*) FROM threads").fetchone()[0] - self.max_threads
+        if excess > 0:
+            evicted += self._conn.execute(
+                "DELETE FROM threads WHERE thread_id IN "
+                "(SELECT thread_id FROM threads ORDER BY last_access ASC LIMIT ?)",
+                (excess,),
+            ).rowcount
+        return evicted
+
+    def evict_idle_threads(self) -> int:
+        with self._lock:
+            return self._evict_threads()
+
+    def ensure_thread(self, thread_id: str, title: str = "새 채팅") -> bool:
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO threads (thread_id, title, last_access) VALUES (?, ?, ?)",
+                (thread_id, title, time.time()),
+            )
+            if cur.rowcount:
+                self._evict_threads()
+                return True
+            self._conn.execute("UPDATE threads SET last_access = ? WHERE thread_id = ?", (time.time(), thread_id))
+            return False
+
+    def has_thread(self, thread_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM threads WHERE thread_id = ?", (thread_id,)).fetchone()
+        return row is not None
+
+    def list_threads(self, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT thread_id, title FROM threads ORDER BY rowid LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset),
+            ).fetchall()
+        return [{"threadId": row["thread_id"], "title": row["title"]} for row in rows]
+
+    def rename_thread(self, thread_id: str, title: str) -> bool:
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE threads SET title = ?, last_access = ? WHERE thread_id = ?",
+                (title, time.time(), thread_id),
+            )
+        return cur.rowcount > 0
+
+    def delete_thread(self, thread_id: str) -> bool:
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM threads WHERE thread_id = ?", (thread_id,))
+        return cur.rowcount > 0
+
+    def get_messages(self, thread_id: str) -> List[dict]:
+        with self._lock:
+            self._conn.execute("UPDATE threads SET last_access = ? WHERE thread_id = ?", (time.time(), thread_id))
+            rows = self._conn.execute(
+                "SELECT role, content, created_at FROM messages WHERE thread_id = ? ORDER BY id",
+                (thread_id,),
+            ).fetchall()
+        return [{"role": row["role"], "content": row["content"], "created_at": row["created_at"]} for row in rows]
+
+    def append_message(self, thread_id: str, role: str, content: str, created_at: str) -> None:
+        with self._lock:
+            self.ensure_thread(thread_id)
+            self._conn.execute("BEGIN")
+            try:
+                cur = self._conn.execute(
+                    "INSERT INTO messages (thread_id, role, content, created_at) VALUES (?, ?, ?, ?)",
+                    (thread_id, role, content, created_at),
+                )
+                self._insert_grams(cur.lastrowid, content)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get_summary(self, thread_id: str) -> Tuple[str, int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, summary_upto FROM threads WHERE thread_id = ?", (thread_id,)
+            ).fetchone()
+        if row is None:
+            return "", 0
+        return row["summary"], row["summary_upto"]
+
+    def set_summary(self, thread_id: str, summary: str, summary_upto: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE threads SET summary = ?, summary_upto = ? WHERE thread_id = ?",
+                (summary, summary_upto, thread_id),
+            )
+
+    @staticmethod
+    def _message_rows_to_dicts(rows) -> List[dict]:
+        return [
+            {
+                "threadId": row["thread_id"],
+                "role": row["role"],
+                "content": row["content"],
+                "created_at": row["created_at"],
+            }
+            for row in rows
+        ]
+
+    def list_all_messages(self, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT m.thread_id, m.role, m.content, m.created_at FROM messages m "
+                "JOIN threads t ON t.thread_id = m.thread_id ORDER BY t.rowid, m.id LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset),
+            ).fetchall()
+        return self._message_rows_to_dicts(rows)
+
+    def search_messages(self, keyword: str, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        grams = sorted(query_ngrams(keyword))
+        if not grams:
+            return []
+        placeholders = ", ".join("?" for _ in grams)
+        # 후보 좁히기 / 부분 문자열 검증 / 정렬 / 페이지 자르기를 모두 SQL에서 처리해 요청한 페이지만 읽어 온다.
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT m.thread_id, m.role, m.content, m.created_at FROM messages m "
+                "JOIN threads t ON t.thread_id = m.thread_id "
+                "WHERE m.id IN ("
+                f"  SELECT message_id FROM message_grams WHERE gram IN ({placeholders}) "
+                "  GROUP BY message_id HAVING COUNT(*) = ?"
+                ") AND instr(py_lower(m.content), ?) > 0 "
+                "ORDER BY t.rowid, m.id LIMIT ? OFFSET ?",
+                (*grams, len(grams), keyword.lower(), -1 if limit is None else limit, offset),
+            ).fetchall()
+        return self._message_rows_to_dicts(rows)
+
+    # --- 예측 기록 ---
+    def save_forecast(self, forecast_id: str, record: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO forecasts (forecast_id, title, prompt, created_at, data) VALUES (?, ?, ?, ?, ?)",
+                (
+                    forecast_id,
+                    record.get("title"),
+                    record.get("prompt"),
+                    record.get("created_at"),
+                    json.dumps(record.get("data"), ensure_ascii=False),
+                ),
+            )
+            self._conn.execute(
+                "DELETE FROM forecasts WHERE seq <= "
+                "(SELECT seq FROM forecasts ORDER BY seq DESC LIMIT 1 OFFSET ?)",
+                (self.max_forecasts,),
+            )
+
+    def list_forecasts(self, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT forecast_id, title, prompt, created_at FROM forecasts ORDER BY seq DESC LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset),
+            ).fetchall()
+        return [
+            {
+                "forecastId": row["forecast_id"],
+                "title": row["title"],
+                "prompt": row["prompt"],
+                "created_at": row["created_at"],
+            }
+            for row in rows
+        ]
+
+    def get_forecast(self, forecast_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, prompt, created_at, data FROM forecasts WHERE forecast_id = ?",
+                (forecast_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "title": row["title"],
+            "prompt": row["prompt"],
+            "created_at": row["created_at"],
+            "data": json.loads(row["data"]),
+        }
+
+    def rename_forecast(self, forecast_id: str, title: str) -> bool:
+        with self._lock:
+            cur = self._conn.execute("UPDATE forecasts SET title = ? WHERE forecast_id = ?", (title, forecast_id))
+        return cur.rowcount > 0
+
+    def delete_forecast(self, forecast_id: str) -> bool:
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM forecasts WHERE forecast_id = ?", (forecast_id,))
+        return cur.rowcount > 0
+
+
+def create_session_store(
+    backend: str,
+    db_path: Path,
+    max_threads: int = DEFAULT_MAX_THREADS,
+    max_forecasts: int = DEFAULT_MAX_FORECASTS,
+    thread_idle_ttl: float = DEFAULT_THREAD_IDLE_TTL,
+):
+    """AI_SESSION_STORE 설정값(memory / sqlite)에 맞는 저장소를 만든다."""
+    backend = (backend or "sqlite").lower()
+    if backend == "memory":
+        return InMemorySessionStore(max_threads, max_forecasts, thread_idle_ttl)
+    if backend == "sqlite":
+        return SQLiteSessionStore(db_path, max_threads, max_forecasts, thread_idle_ttl)
+    raise ValueError(f"Unknown session store backend: {backend}")
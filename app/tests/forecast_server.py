@@ -0,0 +1,152 @@
+"""
+forecast_server.py
+- 서버(app.ai_server) 수준 테스트용 공통 준비 코드
+- 임시 디렉터리에 작은 합성 학습 데이터/자산 수명 모델/월별 수요 모델을 만들고,
+  그 경로를 환경 변수로 지정한 뒤 서버 모듈을 한 번만 import해 예측 묶음을 동기적으로 준비한다.
+- TestClient는 with 블록 없이 사용한다 (기동 이벤트의 백그라운드 로딩이 테스트 중에 묶음을 바꾸지 않도록).
+"""
+
+import atexit
+import importlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import types
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+LIFE_FEATURES = [
+    '내용연수', '취득금액', '부서가혹도', '가격민감도', '장비중요도',
+    'G2B목록명_Code', '물품분류명_Code', '운용부서코드_Code', '캠퍼스_Code'
+]
+MONTHLY_FEATURES = [
+    "trend", "month", "month_sin", "month_cos", "lag_1", "lag_2", "lag_3",
+    "lag_6", "lag_12", "rolling_mean_3", "rolling_mean_6", "rolling_std_6",
+]
+DEPARTMENTS = [f"부서{i}" for i in range(8)]
+CATEGORIES = ["노트북컴퓨터", "데스크톱컴퓨터", "액정모니터", "레이저프린터"]
+MONTHLY_RUN_NAME = "20260101_000000_stage3_monthly_model_search"
+# 고장 예상일은 현재 시각 기준이므로 분석 기간 내 고장 예상 장비가 있도록 내년을 분석 연도로 쓴다.
+FORECAST_YEAR = datetime.now().year + 1
+
+_server = None
+_fixture_paths = {}
+
+
+def make_training_frame(n_rows: int = 3000, seed: int = 0) -> pd.DataFrame:
+    """phase4_training_data.csv와 같은 컬럼 구성의 합성 학습 데이터"""
+    rng = np.random.default_rng(seed)
+    acquired = pd.Timestamp("2014-01-01") + pd.to_timedelta(rng.integers(0, 3650, n_rows), unit="D")
+    life_years = rng.uniform(3, 10, n_rows)
+    trainable = np.where(rng.random(n_rows) < 0.6, "Y", "N")
+    disused = np.where(
+        trainable == "Y",
+        (acquired + pd.to_timedelta((life_years * 365.25).astype(int), unit="D")).strftime("%Y-%m-%d"),
+        None,
+    )
+    frame = pd.DataFrame({
+        "운용부서명": rng.choice(DEPARTMENTS, n_rows),
+        "물품분류명": rng.choice(CATEGORIES, n_rows),
+        "학습데이터여부": trainable,
+        "취득금액": rng.choice([1e6, 2e7, 3e7, 5e7, 8e7, np.nan], n_rows, p=[.4, .1, .2, .1, .15, .05]),
+        "가격민감도": rng.random(n_rows),
+        "운용연차": rng.uniform(0, 8, n_rows).round(2),
+        "취득일자": acquired.strftime("%Y-%m-%d"),
+        "불용일자": disused,
+        "실제수명": life_years.round(2),
+        "내용연수": rng.choice([5, 6, 8], n_rows),
+        "부서가혹도": rng.random(n_rows),
+        "장비중요도": rng.random(n_rows) * 100,
+    })
+    frame["G2B목록명_Code"] = rng.integers(0, 20, n_rows)
+    frame["물품분류명_Code"] = frame["물품분류명"].astype("category").cat.codes
+    frame["운용부서코드_Code"] = frame["운용부서명"].astype("category").cat.codes
+    frame["캠퍼스_Code"] = 0
+    return frame
+
+
+def write_forecast_fixture(root: Path, n_rows: int = 3000) -> dict:
+    """학습 데이터 CSV, 자산 수명 모델(+메타), 월별 수요 모델 실행 폴더를 root 아래에 만든다."""
+    root = Path(root)
+    frame = make_training_frame(n_rows)
+    csv_path = root / "data" / "phase4_training_data.csv"
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    frame.to_csv(csv_path, index=False, encoding="utf-8")
+
+    features = frame[LIFE_FEATURES].fillna(0)
+    life_model = RandomForestRegressor(n_estimators=10, max_depth=6, random_state=0, n_jobs=1)
+    life_model.fit(features, frame["실제수명"] * 12)
+    model_path = root / "model" / "model.pkl"
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(life_model, model_path)
+    with open(model_path.with_name("model_meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"features": LIFE_FEATURES}, f)
+
+    rng = np.random.default_rng(1)
+    monthly_x = pd.DataFrame(rng.random((300, len(MONTHLY_FEATURES))) * 10, columns=MONTHLY_FEATURES)
+    monthly_model = RandomForestRegressor(n_estimators=10, max_depth=5, random_state=0, n_jobs=1)
+    monthly_model.fit(monthly_x, monthly_x["lag_1"] * 0.5 + monthly_x["lag_12"] * 0.4)
+    runs_dir = root / "runs"
+    run_dir = runs_dir / MONTHLY_RUN_NAME
+    run_dir.mkdir(parents=True, exist_ok=True)
+    joblib.dump(monthly_model, run_dir / "monthly_demand_model.pkl")
+    with open(run_dir / "monthly_model_meta.json", "w", encoding="utf-8") as f:
+        json.dump({"features": MONTHLY_FEATURES}, f)
+
+    return {"csv_path": csv_path, "model_path": model_path, "runs_dir": runs_dir}
+
+
+def fake_completion(content: dict):
+    """create_chat_completion 대체용 응답 객체 (choices[0].message.content만 사용)"""
+    message = types.SimpleNamespace(content=json.dumps(content, ensure_ascii=False))
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=None)
+
+
+def load_forecast_server():
+    """
+    합성 모델/데이터를 바라보는 app.ai_server 모듈 (프로세스당 한 번만 준비).
+    예측 묶음과 RUL 테이블은 반환 전에 동기적으로 준비해 둔다.
+    """
+    global _server
+    if _server is not None:
+        return _server
+
+    root = Path(tempfile.mkdtemp(prefix="ai_server_test_"))
+    atexit.register(shutil.rmtree, root, True)
+    paths = write_forecast_fixture(root)
+    os.environ.update({
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "test-key",
+        "AI_MODEL_PATH": str(paths["model_path"]),
+        "AI_DATA_PATH": str(paths["csv_path"]),
+        "AI_SESSION_STORE": "memory",
+        "AI_DATA_SNAPSHOT_DIR": str(root / "runtime" / "data_snapshots"),
+        "AI_RUL_TABLE_DIR": str(root / "runtime" / "rul_tables"),
+        "AI_MODEL_MMAP_DIR": str(root / "runtime" / "model_mmap"),
+        "AI_ARTIFACT_WATCH_INTERVAL": "0",
+        "AI_SESSION_EVICT_INTERVAL": "0",
+        "AI_ADMIN_TOKEN": "",
+    })
+    server = importlib.import_module("app.ai_server")
+    server.RUNS_DIR = paths["runs_dir"]
+    _fixture_paths.update(paths, root=root)
+    server.warm_up_forecast_artifacts()
+    _server = server
+    return server
+
+
+def fixture_paths() -> dict:
+    """load_forecast_server가 만든 합성 파일 위치 (root, csv_path, model_path, runs_dir)"""
+    load_forecast_server()
+    return dict(_fixture_paths)
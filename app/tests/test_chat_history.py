@@ -0,0 +1,163 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from app import chat_history
+from app.chat_history import ConversationWindow, count_tokens, fallback_summary
+
+
+def _messages(count: int, chars: int = 18) -> list:
+    # 근사 토큰 수: 18글자 -> 18 // 2 + 1 = 10토큰
+    return [
+        {"role": "user" if idx % 2 == 0 else "assistant", "content": f"{idx:02d}" + "가" * (chars - 2), "created_at": ""}
+        for idx in range(count)
+    ]
+
+
+class _ApproximateTokens(unittest.TestCase):
+    """tiktoken 인코더 대신 글자 수 근사치로 토큰을 세도록 고정한다 (네트워크/설치 여부와 무관하게)."""
+
+    def setUp(self):
+        patcher = patch.multiple(chat_history, _ENCODER=None, _ENCODER_LOADED=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestWindowStart(_ApproximateTokens):
+    def test_keeps_recent_messages_within_token_budget(self):
+        window = ConversationWindow(token_budget=35, max_messages=20, summary_step=1, summary_max_tokens=100)
+
+        self.assertEqual(window.window_start(_messages(6)), 3)
+
+    def test_caps_number_of_messages(self):
+        window = ConversationWindow(token_budget=1000, max_messages=4, summary_step=1, summary_max_tokens=100)
+
+        self.assertEqual(window.window_start(_messages(6)), 2)
+
+    def test_always_keeps_last_message_even_over_budget(self):
+        window = ConversationWindow(token_budget=5, max_messages=20, summary_step=1, summary_max_tokens=100)
+
+        self.assertEqual(window.window_start(_messages(3)), 2)
+
+
+class TestBuild(_ApproximateTokens):
+    def test_sends_every_message_after_stored_summary(self):
+        window = ConversationWindow(token_budget=15, max_messages=20, summary_step=1, summary_max_tokens=100)
+        messages = _messages(6)
+
+        built = window.build(messages, summarized_upto=2)
+
+        # 요약이 아직 갱신되지 않았으면 예산을 넘더라도 요약되지 않은 메시지를 버리지 않는다.
+        self.assertEqual([msg["content"] for msg in built], [msg["content"] for msg in messages[2:]])
+        self.assertEqual(set(built[0]), {"role", "content"})
+
+    def test_clamps_out_of_range_summary_position(self):
+        window = ConversationWindow(token_budget=15, max_messages=20, summary_step=1, summary_max_tokens=100)
+
+        self.assertEqual(len(window.build(_messages(3), summarized_upto=-1)), 3)
+        self.assertEqual(window.build(_messages(3), summarized_upto=10), [])
+
+
+class TestAdvanceSummary(_ApproximateTokens):
+    def test_does_not_summarize_while_window_fits(self):
+        window = ConversationWindow(token_budget=1000, max_messages=20, summary_step=2, summary_max_tokens=100)
+        summarize = AsyncMock(return_value="새 요약")
+
+        result = asyncio.run(window.advance_summary(_messages(4), "기존 요약", 0, summarize))
+
+        self.assertEqual(result, ("기존 요약", 0))
+        summarize.assert_not_awaited()
+
+    def test_summarizes_evicted_messages_with_previous_summary(self):
+        window = ConversationWindow(token_budget=35, max_messages=20, summary_step=1, summary_max_tokens=100)
+        messages = _messages(6)
+        summarize = AsyncMock(return_value="  새 요약  ")
+
+        summary, upto = asyncio.run(window.advance_summary(messages, "기존 요약", 1, summarize))
+
+        self.assertEqual((summary, upto), ("새 요약", 3))
+        summarize.assert_awaited_once_with("기존 요약", messages[1:3])
+
+    def test_summary_step_moves_window_by_at_least_step_messages(self):
+        window = ConversationWindow(token_budget=35, max_messages=20, summary_step=4, summary_max_tokens=100)
+        messages = _messages(8)
+        summarize = AsyncMock(return_value="요약")
+
+        _, upto = asyncio.run(window.advance_summary(messages, "", 0, summarize))
+
+        # 예산 기준으로 5개가 밀려나면 5개를 요약한다.
+        self.assertEqual(upto, 5)
+        # 예산 기준으로는 1개만 밀려나도 summary_step(4)만큼 요약한다 (마지막 메시지는 제외).
+        _, upto = asyncio.run(window.advance_summary(_messages(9), "", 5, summarize))
+        self.assertEqual(upto, 8)
+
+    def test_never_summarizes_latest_message(self):
+        window = ConversationWindow(token_budget=35, max_messages=20, summary_step=10, summary_max_tokens=100)
+        messages = _messages(6)
+        summarize = AsyncMock(return_value="요약")
+
+        _, upto = asyncio.run(window.advance_summary(messages, "", 0, summarize))
+
+        self.assertEqual(upto, 5)
+        self.assertEqual(summarize.await_args.args[1], messages[:5])
+
+    def test_falls_back_to_extractive_summary_when_llm_fails(self):
+        window = ConversationWindow(token_budget=35, max_messages=20, summary_step=1, summary_max_tokens=100)
+        messages = _messages(6)
+        summarize = AsyncMock(side_effect=RuntimeError("timeout"))
+
+        summary, upto = asyncio.run(window.advance_summary(messages, "기존 요약", 0, summarize))
+
+        self.assertEqual(upto, 3)
+        self.assertEqual(summary, fallback_summary("기존 요약", messages[:3], 200))
+        self.assertTrue(summary.startswith("기존 요약\n- 사용자: 00"))
+
+    def test_summary_is_truncated_to_max_tokens(self):
+        window = ConversationWindow(token_budget=35, max_messages=20, summary_step=1, summary_max_tokens=5)
+
+        summary, _ = asyncio.run(window.advance_summary(_messages(6), "", 0, AsyncMock(return_value="가" * 50)))
+
+        self.assertEqual(len(summary), 10)
+
+
+class TestCountTokens(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.multiple(chat_history, _ENCODER=None, _ENCODER_LOADED=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_falls_back_to_character_estimate_without_tiktoken(self):
+        with patch.object(chat_history, "tiktoken", None):
+            self.assertEqual(count_tokens("가" * 10), 6)
+            self.assertEqual(count_tokens(""), 0)
+
+    def test_falls_back_when_encoder_cannot_be_loaded(self):
+        fake_tiktoken = MagicMock()
+        fake_tiktoken.get_encoding.side_effect = OSError("offline")
+        with patch.object(chat_history, "tiktoken", fake_tiktoken):
+            self.assertEqual(count_tokens("가" * 10), 6)
+            self.assertEqual(count_tokens("가" * 4), 3)
+
+        # 로딩 실패도 한 번만 시도한다.
+        fake_tiktoken.get_encoding.assert_called_once_with("o200k_base")
+
+    def test_uses_tiktoken_encoder_when_available(self):
+        encoder = MagicMock()
+        encoder.encode.return_value = [1, 2, 3]
+        fake_tiktoken = MagicMock()
+        fake_tiktoken.get_encoding.return_value = encoder
+        with patch.object(chat_history, "tiktoken", fake_tiktoken):
+            self.assertEqual(count_tokens("안녕하세요"), 3)
+
+        encoder.encode.assert_called_once_with("안녕하세요", disallowed_special=())
+
+
+if __name__ == "__main__":
+    unittest.main()
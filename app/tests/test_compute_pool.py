@@ -0,0 +1,148 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from app.compute_pool import BoundedComputePool, ComputePoolSaturated
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class _PoolCase(unittest.TestCase):
+    def make_pool(self, max_workers: int, max_queue: int) -> BoundedComputePool:
+        pool = BoundedComputePool(max_workers, max_queue, thread_name_prefix="test-compute")
+        self.addCleanup(pool.shutdown)
+        return pool
+
+    def occupy(self, pool: BoundedComputePool, release: threading.Event, count: int) -> None:
+        """release가 설정될 때까지 끝나지 않는 작업 count개로 풀을 채운다 (별도 스레드의 이벤트 루프에서 대기)."""
+
+        async def hold():
+            await asyncio.gather(*(pool.run(release.wait) for _ in range(count)))
+
+        holder = threading.Thread(target=asyncio.run, args=(hold(),), daemon=True)
+        holder.start()
+        self.addCleanup(holder.join, 5)
+        self.addCleanup(release.set)
+        self.assertTrue(_wait_for(lambda: pool.in_flight == count))
+
+
+class TestBoundedComputePool(_PoolCase):
+    def test_capacity_is_workers_plus_queue(self):
+        self.assertEqual(self.make_pool(2, 3).capacity, 5)
+        # 작업 스레드는 최소 1개, 대기열은 0 이상으로 보정한다.
+        self.assertEqual(self.make_pool(0, -1).capacity, 1)
+
+    def test_returns_result_and_releases_slot(self):
+        pool = self.make_pool(1, 0)
+
+        self.assertEqual(asyncio.run(pool.run(sum, [1, 2, 3])), 6)
+        self.assertEqual(pool.in_flight, 0)
+
+    def test_submission_past_capacity_is_rejected(self):
+        pool = self.make_pool(1, 1)
+        release = threading.Event()
+        self.occupy(pool, release, 2)
+
+        with self.assertRaises(ComputePoolSaturated):
+            asyncio.run(pool.run(sum, [1]))
+        # 거절된 작업은 자리를 차지하지 않는다.
+        self.assertEqual(pool.in_flight, 2)
+
+        release.set()
+        self.assertTrue(_wait_for(lambda: pool.in_flight == 0))
+        self.assertEqual(asyncio.run(pool.run(sum, [1])), 1)
+
+    def test_in_flight_returns_to_zero_after_exception(self):
+        pool = self.make_pool(1, 0)
+
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            asyncio.run(pool.run(fail))
+        self.assertEqual(pool.in_flight, 0)
+        self.assertEqual(asyncio.run(pool.run(sum, [2])), 2)
+
+    def test_cancelled_request_keeps_slot_until_worker_finishes(self):
+        pool = self.make_pool(1, 0)
+        started = threading.Event()
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def work():
+            started.set()
+            release.wait(5)
+            return "done"
+
+        async def cancel_while_running():
+            task = asyncio.create_task(pool.run(work))
+            await asyncio.to_thread(started.wait, 5)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # 요청은 취소됐지만 작업 스레드는 아직 실행 중이므로 자리를 반납하지 않는다.
+            self.assertEqual(pool.in_flight, 1)
+            with self.assertRaises(ComputePoolSaturated):
+                await pool.run(sum, [1])
+
+        asyncio.run(cancel_while_running())
+        self.assertEqual(pool.in_flight, 1)
+
+        release.set()
+        self.assertTrue(_wait_for(lambda: pool.in_flight == 0))
+
+
+class TestForecastEndpointsWhenSaturated(_PoolCase):
+    @classmethod
+    def setUpClass(cls):
+        from fastapi.testclient import TestClient
+        from app.tests.forecast_server import load_forecast_server
+
+        cls.server = load_forecast_server()
+        cls.client = TestClient(cls.server.app)
+
+    def setUp(self):
+        self.server.forecast_cache.clear()
+        pool = self.make_pool(1, 0)
+        patcher = patch.object(self.server, "forecast_compute_pool", pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.occupy(pool, threading.Event(), 1)
+
+    def _conditions(self):
+        return {"year": 2027, "semester": "2학기", "dept_name": "부서1", "risk_level": "Medium"}
+
+    def test_forecast_returns_503_with_retry_after(self):
+        resp = self.client.post("/api/ai/forecast", json={"prompt": "예측", "conditions": self._conditions()})
+
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp.headers["Retry-After"], str(self.server.FORECAST_RETRY_AFTER))
+
+    def test_batch_returns_503_with_retry_after(self):
+        resp = self.client.post(
+            "/api/ai/forecast/batch",
+            json={"prompt": "예측", "conditions": [self._conditions()], "include_guide": False},
+        )
+
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp.headers["Retry-After"], str(self.server.FORECAST_RETRY_AFTER))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from app.dataset_snapshot import _read_snapshot, _write_snapshot, load_dataset, read_training_csv
+
+
+def _expected_from_csv(csv_path: Path) -> pd.DataFrame:
+    """스냅샷은 숫자/불리언 컬럼을 그대로, 그 외 컬럼을 category dtype으로 돌려준다."""
+    frame = read_training_csv(csv_path)
+    for name in frame.columns:
+        dtype = frame[name].dtype
+        if dtype.kind not in "biuf" or isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            frame[name] = frame[name].astype("category")
+    return frame
+
+
+def _assert_frame_equal(actual: pd.DataFrame, expected: pd.DataFrame) -> None:
+    # mmap으로 읽은 컬럼은 np.memmap이라 assert_frame_equal의 배열 클래스 비교를 통과하지 못하므로 일반 배열로 바꿔 비교한다.
+    data = {}
+    for name in actual.columns:
+        values = actual[name]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            data[name] = pd.Categorical.from_codes(np.array(values.cat.codes), dtype=values.dtype)
+        else:
+            data[name] = np.array(values.to_numpy())
+    pd.testing.assert_frame_equal(pd.DataFrame(data, columns=actual.columns), expected)
+
+
+class TestDatasetSnapshot(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        self.snapshot_dir = self.root / "snapshots"
+        self.csv_path = self.root / "phase4_training_data.csv"
+        pd.DataFrame({
+            "물품고유번호": ["A-001", "A-002", "A-003", "A-004"],
+            "운용부서": ["전자공학과", None, "전자공학과", "기계공학과"],
+            "취득금액": [1200000, 350000, 980000, 15000],
+            "실제수명": [5.5, np.nan, 7.25, 3.0],
+            "학습데이터여부": ["Y", "N", "Y", "Y"],
+            "불용일자": ["2023-03-01", None, None, "2021-12-31"],
+            "공용장비여부": [True, False, True, False],
+        }).to_csv(self.csv_path, index=False, encoding="utf-8")
+
+    def test_csv_round_trip_restores_values_and_category_dtypes(self):
+        for mmap in (True, False):
+            with self.subTest(mmap=mmap):
+                first, first_source = load_dataset(self.csv_path, self.snapshot_dir, mmap=mmap)
+                second, second_source = load_dataset(self.csv_path, self.snapshot_dir, mmap=mmap)
+
+                expected = _expected_from_csv(self.csv_path)
+                _assert_frame_equal(first, expected)
+                _assert_frame_equal(second, expected)
+                self.assertEqual(second_source, "snapshot")
+                self.assertIsInstance(second["운용부서"].dtype, pd.CategoricalDtype)
+                self.assertTrue(second["운용부서"].isna().iloc[1])
+                self.assertEqual(second["취득금액"].dtype, np.int64)
+
+        self.assertEqual(first_source, "snapshot")
+
+    def test_existing_categorical_keeps_categories_and_order(self):
+        frame = pd.DataFrame({
+            "등급": pd.Categorical(["중", "상", None, "중"], categories=["하", "중", "상"], ordered=True),
+            "수량": [1, 2, 3, 4],
+        })
+        path = self.root / "snapshot"
+
+        _write_snapshot(frame, path)
+        restored = _read_snapshot(path, mmap=True)
+
+        _assert_frame_equal(restored, frame)
+        self.assertEqual(list(restored["등급"].cat.categories), ["하", "중", "상"])
+        self.assertTrue(restored["등급"].cat.ordered)
+
+    def test_empty_frame_round_trip(self):
+        frame = pd.DataFrame({
+            "이름": pd.Series([], dtype="category"),
+            "값": pd.Series([], dtype=np.float64),
+        })
+        path = self.root / "empty"
+
+        _write_snapshot(frame, path)
+
+        _assert_frame_equal(_read_snapshot(path, mmap=True), frame)
+
+    def test_changed_csv_rebuilds_snapshot_and_removes_old_one(self):
+        load_dataset(self.csv_path, self.snapshot_dir)
+        old_snapshots = set(self.snapshot_dir.iterdir())
+
+        frame = pd.read_csv(self.csv_path)
+        frame.loc[0, "운용부서"] = "화학과"
+        frame.to_csv(self.csv_path, index=False, encoding="utf-8")
+        os.utime(self.csv_path, ns=(1, 1))
+        reloaded, source = load_dataset(self.csv_path, self.snapshot_dir)
+
+        self.assertEqual(source, "csv")
+        self.assertEqual(reloaded.loc[0, "운용부서"], "화학과")
+        self.assertTrue(old_snapshots.isdisjoint(self.snapshot_dir.iterdir()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import sys
+import unittest
+from unittest.mock import AsyncMock, patch
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from fastapi.testclient import TestClient
+
+from app.tests.forecast_server import FORECAST_YEAR, fake_completion, load_forecast_server
+
+
+SECTIONS = ["section_1_time_series", "section_2_strategic_guide", "section_3_recommendations", "section_4_algorithm_guide"]
+
+CONDITIONS = [
+    {"year": FORECAST_YEAR, "semester": "2학기", "dept_name": "부서1", "risk_level": "Medium"},
+    {"year": FORECAST_YEAR, "semester": "1학기", "dept_name": "부서2", "category": "노트북컴퓨터", "risk_level": "High"},
+    {"year": FORECAST_YEAR, "semester": "겨울", "dept_name": "부서3", "category": "전체", "risk_level": "Low"},
+    {"year": FORECAST_YEAR + 1, "semester": "여름", "dept_name": "부서1", "category": "액정모니터"},
+]
+
+
+class TestForecastBatch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = load_forecast_server()
+        cls.client = TestClient(cls.server.app)
+
+    def setUp(self):
+        s = self.server
+        s.forecast_cache.clear()
+        s.guide_cache.clear()
+        self.llm = AsyncMock(return_value=fake_completion({"ai_summary_comment": "가이드"}))
+        patcher = patch.object(s, "create_chat_completion", self.llm)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def single(self, conditions: dict) -> dict:
+        resp = self.client.post("/api/ai/forecast", json={"prompt": "다음 학기 예측", "conditions": conditions})
+        self.assertEqual(resp.status_code, 200)
+        body = resp.json()
+        return body.get("data", body)
+
+    def batch(self, conditions: list, **options) -> dict:
+        resp = self.client.post("/api/ai/forecast/batch", json={"prompt": "다음 학기 예측", "conditions": conditions, **options})
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()
+
+    def forecast_count(self) -> int:
+        return len(self.server.session_store.list_forecasts())
+
+    def test_each_result_equals_single_department_response(self):
+        singles = [self.single(cond) for cond in CONDITIONS]
+        # 단건 결과가 캐시에서 재사용되지 않도록 비우고 배치 연산 결과를 비교한다.
+        self.server.forecast_cache.clear()
+
+        results = self.batch(CONDITIONS)["data"]
+
+        self.assertEqual(len(results), len(CONDITIONS))
+        for cond, single, result in zip(CONDITIONS, singles, results):
+            with self.subTest(cond=cond):
+                for section in SECTIONS:
+                    self.assertEqual(result[section], single[section])
+                self.assertEqual(result["conditions"]["dept_name"], cond["dept_name"])
+        self.assertTrue(any(item["quantity"] for item in results[0]["section_1_time_series"]))
+
+    def test_guide_can_be_skipped(self):
+        results = self.batch(CONDITIONS[:2], include_guide=False)["data"]
+
+        self.llm.assert_not_awaited()
+        self.assertIn("월 전후로 노후 장비 처분이 예측됩니다", results[0]["section_2_strategic_guide"]["ai_summary_comment"])
+        # 기본 문구를 쓴 결과는 단건 예측과 공유하는 캐시에 넣지 않는다.
+        self.assertEqual(len(self.server.forecast_cache), 0)
+
+    def test_department_without_assets_does_not_fail_batch(self):
+        conditions = [
+            CONDITIONS[0],
+            {"year": FORECAST_YEAR, "semester": "2학기", "dept_name": "없는부서"},
+            {"year": FORECAST_YEAR, "semester": "2학기", "dept_name": "부서2", "category": "없는분류"},
+            CONDITIONS[1],
+        ]
+
+        results = self.batch(conditions)["data"]
+
+        self.assertEqual(len(results), 4)
+        for idx in (1, 2):
+            self.assertEqual(results[idx]["conditions"]["dept_name"], conditions[idx]["dept_name"])
+            self.assertEqual(results[idx]["section_1_time_series"], [])
+            self.assertEqual(results[idx]["section_2_strategic_guide"], {})
+        self.assertEqual(len(results[0]["section_1_time_series"]), 12)
+        self.assertEqual(len(results[3]["section_1_time_series"]), 12)
+
+    def test_invalid_request_is_rejected(self):
+        resp = self.client.post("/api/ai/forecast/batch", json={"conditions": [CONDITIONS[0], {"year": FORECAST_YEAR}]})
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("2번째", resp.json()["detail"])
+
+        resp = self.client.post("/api/ai/forecast/batch", json={"conditions": []})
+        self.assertEqual(resp.status_code, 400)
+
+        with patch.object(self.server, "FORECAST_BATCH_MAX_SIZE", 2):
+            resp = self.client.post("/api/ai/forecast/batch", json={"conditions": CONDITIONS[:3]})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_history_is_not_saved_by_default(self):
+        before = self.forecast_count()
+
+        results = self.batch(CONDITIONS)["data"]
+
+        self.assertEqual(self.forecast_count(), before)
+        self.assertTrue(all(result.get("forecastId") is None for result in results))
+
+    def test_history_is_saved_when_requested(self):
+        before = self.forecast_count()
+
+        results = self.batch(CONDITIONS[:2], save_history=True)["data"]
+
+        self.assertEqual(self.forecast_count(), before + 2)
+        for result in results:
+            self.assertEqual(self.server.session_store.get_forecast(result["forecastId"])["data"], result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import copy
+import os
+import sys
+import types
+import unittest
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from fastapi.testclient import TestClient
+
+from app.tests.forecast_server import fake_completion, load_forecast_server
+
+
+class _FixedDatetime(datetime):
+    current = datetime(2026, 10, 18, 9, 30)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+def _request(server, prompt: str = "다음 학기 예측", **conditions):
+    fields = {"year": 2027, "semester": "2학기", "dept_name": "부서1", "risk_level": "Medium", **conditions}
+    return server.PredictionRequest(prompt=prompt, conditions=server.PredictionConditions(**fields))
+
+
+class TestBuildForecastCacheKey(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = load_forecast_server()
+        cls.artifacts = types.SimpleNamespace(version="v1")
+
+    def key(self, req, artifacts=None):
+        with patch.object(self.server, "datetime", _FixedDatetime):
+            return self.server.build_forecast_cache_key(req, artifacts or self.artifacts)
+
+    def test_department_is_part_of_key(self):
+        # 부서가 키에서 빠지면 다른 부서의 예측 결과가 그대로 재사용된다.
+        s = self.server
+        self.assertNotEqual(self.key(_request(s, dept_name="부서1")), self.key(_request(s, dept_name="부서2")))
+        self.assertEqual(self.key(_request(s, dept_name="부서1")), self.key(_request(s, dept_name=" 부서1 ")))
+
+    def test_equivalent_conditions_share_a_key(self):
+        s = self.server
+        base = self.key(_request(s))
+
+        self.assertEqual(self.key(_request(s, semester="2")), base)
+        self.assertEqual(self.key(_request(s, category="전체")), base)
+        self.assertEqual(self.key(_request(s, category="  ")), base)
+        self.assertEqual(self.key(_request(s, campus="다른 캠퍼스")), base)
+        self.assertEqual(self.key(_request(s, prompt="  다음  학기\n예측 ")), base)
+
+        self.assertNotEqual(self.key(_request(s, category="노트북컴퓨터")), base)
+        self.assertNotEqual(self.key(_request(s, semester="1학기")), base)
+        self.assertNotEqual(self.key(_request(s, year=2028)), base)
+        self.assertNotEqual(self.key(_request(s, risk_level="High")), base)
+        self.assertNotEqual(self.key(_request(s, prompt="다른 질문")), base)
+
+    def test_date_is_part_of_key(self):
+        # 고장 예상일이 현재 시각 기준이므로 날짜가 바뀌면 같은 조건도 다시 계산한다.
+        req = _request(self.server)
+        today = self.key(req)
+        with patch.object(_FixedDatetime, "current", datetime(2026, 10, 18, 23, 59)):
+            self.assertEqual(self.key(req), today)
+        with patch.object(_FixedDatetime, "current", datetime(2026, 10, 19, 0, 1)):
+            tomorrow = self.key(req)
+
+        self.assertNotEqual(tomorrow, today)
+        self.assertIn("2026-10-18", today)
+        self.assertIn("2026-10-19", tomorrow)
+
+    def test_artifact_version_is_part_of_key(self):
+        req = _request(self.server)
+
+        self.assertNotEqual(self.key(req), self.key(req, types.SimpleNamespace(version="v2")))
+
+
+class TestForecastCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = load_forecast_server()
+        cls.client = TestClient(cls.server.app)
+
+    def setUp(self):
+        s = self.server
+        s.forecast_cache.clear()
+        self.compute_calls = []
+        original_compute = s.compute_forecast
+
+        def compute(cond, artifacts):
+            self.compute_calls.append(artifacts.version)
+            return original_compute(cond, artifacts)
+
+        for patcher in (
+            patch.object(s, "compute_forecast", compute),
+            patch.object(s, "forecast_artifacts", s.forecast_artifacts),
+            patch.object(s, "create_chat_completion", AsyncMock(return_value=fake_completion({"ai_summary_comment": "가이드"}))),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def forecast(self):
+        resp = self.client.post("/api/ai/forecast", json={
+            "prompt": "다음 학기 예측",
+            "conditions": {"year": 2027, "semester": "2학기", "dept_name": "부서1", "risk_level": "Medium"},
+        })
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()
+
+    def test_repeated_request_is_served_from_cache(self):
+        first = self.forecast()
+        hits = self.server.forecast_cache.hits
+        second = self.forecast()
+
+        self.assertEqual(len(self.compute_calls), 1)
+        self.assertEqual(self.server.forecast_cache.hits, hits + 1)
+        self.assertNotEqual(first["forecastId"], second["forecastId"])
+        self.assertEqual(first["section_1_time_series"], second["section_1_time_series"])
+
+    def test_entries_do_not_survive_artifact_version_change(self):
+        s = self.server
+        self.forecast()
+        swapped = copy.copy(s.forecast_artifacts)
+        swapped.version = "next-version"
+
+        with patch.object(s, "forecast_artifacts", swapped):
+            self.forecast()
+            self.forecast()
+
+        self.assertEqual(self.compute_calls, [s.forecast_artifacts.version, "next-version"])
+
+    def test_saved_results_cannot_mutate_cached_sections(self):
+        s = self.server
+        saved_sections = []
+        original_save = s.save_forecast_result
+
+        def save(req, sections):
+            saved_sections.append(sections)
+            return original_save(req, sections)
+
+        with patch.object(s, "save_forecast_result", save):
+            first = self.forecast()
+            # 저장/응답 경로에서 결과를 고쳐도 캐시에 들어 있는 구역은 바뀌지 않아야 한다 (미스/적중 모두).
+            saved_sections[0]["section_1_time_series"].clear()
+            saved_sections[0]["section_2_strategic_guide"]["ai_summary_comment"] = "변경됨"
+            second = self.forecast()
+            saved_sections[1]["section_3_recommendations"].append({"quantity": 999})
+            third = self.forecast()
+
+        self.assertEqual(len(self.compute_calls), 1)
+        for result in (second, third):
+            self.assertEqual(result["section_1_time_series"], first["section_1_time_series"])
+            self.assertEqual(result["section_2_strategic_guide"], first["section_2_strategic_guide"])
+            self.assertEqual(result["section_3_recommendations"], first["section_3_recommendations"])
+        self.assertEqual(len(first["section_1_time_series"]), 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from app.forecast_features import add_derived_features, failure_dates, get_lead_time_info, lead_time_grades
+
+
+# 등급 경계(2천만 원 이하 / 5천만 원 미만 / 그 이상)와 그 바로 옆 값, 결측/0/음수/매우 큰 값
+BOUNDARY_PRICES = [
+    20000000.0, np.nextafter(20000000.0, np.inf), np.nextafter(20000000.0, -np.inf),
+    50000000.0, np.nextafter(50000000.0, -np.inf), np.nextafter(50000000.0, np.inf),
+    np.nan, 0.0, -5.0, 1e12, 20000001.0, 49999999.0,
+]
+
+
+def _legacy_derived_features(target_df: pd.DataFrame) -> pd.DataFrame:
+    """배열 연산으로 바꾸기 전의 행 단위 구현 (비교 기준)"""
+    target_df['리드타임등급'], target_df['등급점수'], target_df['sqrt_L'], target_df['리드타임_일'] = zip(*target_df['취득금액'].apply(get_lead_time_info))
+    target_df['장비중요도'] = (target_df['가격민감도'] * 100 * 0.5) + (target_df['등급점수'] * 0.5)
+    return target_df
+
+
+def _legacy_failure_dates(rul_months: pd.Series, now: datetime) -> pd.Series:
+    return rul_months.apply(lambda x: now + timedelta(days=float(x) * 30.4375))
+
+
+class TestLeadTimeGrades(unittest.TestCase):
+    def test_boundaries_match_row_wise_rules(self):
+        grades = lead_time_grades(pd.Series(BOUNDARY_PRICES))
+
+        self.assertEqual(grades.tolist(), [get_lead_time_info(price)[0] for price in BOUNDARY_PRICES])
+        self.assertEqual(grades[:6].tolist(), [0, 1, 0, 2, 1, 2])
+
+    def test_non_numeric_prices_are_treated_as_missing(self):
+        grades = lead_time_grades(pd.Series(["abc", None, "30000000"], dtype=object))
+
+        self.assertEqual(grades.tolist(), [2, 2, 1])
+
+    def test_derived_features_equal_row_wise_implementation(self):
+        rng = np.random.default_rng(7)
+        prices = np.concatenate([BOUNDARY_PRICES, rng.choice(BOUNDARY_PRICES, 500), rng.uniform(0, 1e8, 5000)])
+        frame = pd.DataFrame({"취득금액": prices, "가격민감도": rng.random(len(prices))}, index=rng.permutation(len(prices)))
+
+        expected = _legacy_derived_features(frame.copy())
+        actual = add_derived_features(frame.copy())
+
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False, check_exact=True)
+
+    def test_frame_without_price_is_unchanged(self):
+        frame = pd.DataFrame({"가격민감도": [0.5]})
+
+        pd.testing.assert_frame_equal(add_derived_features(frame.copy()), frame)
+
+
+class TestFailureDates(unittest.TestCase):
+    NOW = datetime(2026, 10, 18, 9, 30, 15, 123457)
+
+    def test_equal_to_timedelta_to_the_microsecond(self):
+        rng = np.random.default_rng(11)
+        rul = pd.Series(np.concatenate([
+            rng.uniform(0.5, 200.0, 20000),
+            # 마이크로초 반올림 경계에 걸리기 쉬운 값과 정수 개월
+            [0.5, 1 / 3, 2 / 3, 123.456789123, 1.0, 12.0, 1e-9, 0.5 + 1e-12],
+        ]), index=rng.permutation(20008))
+
+        expected = _legacy_failure_dates(rul, self.NOW)
+        actual = failure_dates(rul, self.NOW)
+
+        self.assertTrue(actual.index.equals(rul.index))
+        self.assertEqual(((expected - actual).abs() > pd.Timedelta(0)).sum(), 0)
+        self.assertEqual(actual.dt.month.tolist(), [dt.month for dt in expected])
+
+    def test_uses_current_time_by_default(self):
+        before = datetime.now()
+        actual = failure_dates(pd.Series([1.0]))
+        after = datetime.now()
+
+        self.assertTrue(before + timedelta(days=30.4375) <= actual.iloc[0] <= after + timedelta(days=30.4375))
+
+
+if __name__ == "__main__":
+    unittest.main()
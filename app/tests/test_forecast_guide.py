@@ -0,0 +1,160 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import httpx
+
+from app.tests.forecast_server import FORECAST_YEAR, fake_completion, load_forecast_server
+
+
+DEADLINE = 0.05
+GUIDE_ARGS = ("다음 학기 예측", "전체 품목", 12, "2027-08-12", 10)
+
+
+class _StubLLM:
+    """마감 시간보다 오래 걸리거나 실패하는 create_chat_completion 대체 함수"""
+
+    def __init__(self, delay: float = 0.0, error: Exception = None, comment: str = "LLM 가이드"):
+        self.delay = delay
+        self.error = error
+        self.comment = comment
+        self.calls = 0
+
+    async def __call__(self, purpose, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return fake_completion({"ai_summary_comment": self.comment})
+
+
+class _GuideCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = load_forecast_server()
+
+    def setUp(self):
+        s = self.server
+        s.guide_cache.clear()
+        s.guide_tasks.clear()
+        s.forecast_cache.clear()
+        patcher = patch.object(s, "FORECAST_GUIDE_DEADLINE", DEADLINE)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def use_llm(self, stub: _StubLLM) -> _StubLLM:
+        patcher = patch.object(self.server, "create_chat_completion", stub)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return stub
+
+
+class TestGetLLMAIGuide(_GuideCase):
+    def test_slow_llm_returns_none_and_still_fills_cache(self):
+        s = self.server
+        stub = self.use_llm(_StubLLM(delay=DEADLINE * 4))
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            first = await s.get_llm_ai_guide(*GUIDE_ARGS)
+            elapsed = loop.time() - started
+            self.assertEqual(len(s.guide_cache), 0)
+
+            # 마감 시간이 지나도 호출은 취소되지 않고 끝까지 진행되어 캐시를 채운다.
+            await asyncio.wait_for(asyncio.gather(*s.guide_tasks.values()), 2)
+            second = await s.get_llm_ai_guide(" 다음  학기 예측", *GUIDE_ARGS[1:])
+            return first, elapsed, second
+
+        first, elapsed, second = asyncio.run(scenario())
+
+        self.assertIsNone(first)
+        self.assertLess(elapsed, DEADLINE * 3)
+        self.assertEqual(second, {"ai_summary_comment": "LLM 가이드"})
+        self.assertEqual(stub.calls, 1)
+        self.assertEqual(s.guide_tasks, {})
+
+    def test_concurrent_requests_share_one_call(self):
+        s = self.server
+        stub = self.use_llm(_StubLLM(delay=DEADLINE / 5))
+
+        async def scenario():
+            return await asyncio.gather(*(s.get_llm_ai_guide(*GUIDE_ARGS) for _ in range(3)))
+
+        results = asyncio.run(scenario())
+
+        self.assertEqual(results, [{"ai_summary_comment": "LLM 가이드"}] * 3)
+        self.assertEqual(stub.calls, 1)
+        # 호출자마다 사본을 받으므로 한 호출자의 수정이 캐시나 다른 호출자에게 번지지 않는다.
+        results[0]["ai_summary_comment"] = "변경됨"
+        self.assertEqual(results[1]["ai_summary_comment"], "LLM 가이드")
+        self.assertEqual(asyncio.run(s.get_llm_ai_guide(*GUIDE_ARGS)), {"ai_summary_comment": "LLM 가이드"})
+
+    def test_failed_generation_is_not_cached(self):
+        s = self.server
+        stub = self.use_llm(_StubLLM(error=RuntimeError("rate limited")))
+
+        self.assertIsNone(asyncio.run(s.get_llm_ai_guide(*GUIDE_ARGS)))
+        self.assertEqual(len(s.guide_cache), 0)
+        self.assertEqual(s.guide_tasks, {})
+
+        stub.error = None
+        self.assertEqual(asyncio.run(s.get_llm_ai_guide(*GUIDE_ARGS)), {"ai_summary_comment": "LLM 가이드"})
+        self.assertEqual(stub.calls, 2)
+
+    def test_generation_failing_after_deadline_is_not_cached(self):
+        s = self.server
+        stub = self.use_llm(_StubLLM(delay=DEADLINE * 3, error=TimeoutError("upstream timeout")))
+
+        async def scenario():
+            first = await s.get_llm_ai_guide(*GUIDE_ARGS)
+            await asyncio.gather(*s.guide_tasks.values(), return_exceptions=True)
+            return first
+
+        self.assertIsNone(asyncio.run(scenario()))
+        self.assertEqual(len(s.guide_cache), 0)
+        self.assertEqual(s.guide_tasks, {})
+        self.assertEqual(stub.calls, 1)
+
+
+class TestForecastGuideDeadline(_GuideCase):
+    def post_forecast(self, client):
+        return client.post("/api/ai/forecast", json={
+            "prompt": "다음 학기 예측",
+            "conditions": {"year": FORECAST_YEAR, "semester": "2학기", "dept_name": "부서1", "risk_level": "Medium"},
+        })
+
+    def test_forecast_uses_default_guide_then_cached_llm_guide(self):
+        s = self.server
+        stub = self.use_llm(_StubLLM(delay=DEADLINE * 4))
+
+        async def scenario():
+            # 같은 이벤트 루프에서 요청을 이어 보내야 마감 후에도 진행 중인 LLM 호출이 끝까지 실행된다.
+            transport = httpx.ASGITransport(app=s.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                first = await self.post_forecast(client)
+                self.assertEqual(len(s.forecast_cache), 0)
+                await asyncio.wait_for(asyncio.gather(*s.guide_tasks.values()), 2)
+                second = await self.post_forecast(client)
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("월 전후로 노후 장비 처분이 예측됩니다", first.json()["section_2_strategic_guide"]["ai_summary_comment"])
+        self.assertEqual(second.json()["section_2_strategic_guide"]["ai_summary_comment"], "LLM 가이드")
+        self.assertEqual(second.json()["section_1_time_series"], first.json()["section_1_time_series"])
+        self.assertEqual(stub.calls, 1)
+        # 기본 문구로 대체한 결과는 예측 결과 캐시에 넣지 않고, LLM 가이드를 받은 결과만 넣는다.
+        self.assertEqual(len(s.forecast_cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
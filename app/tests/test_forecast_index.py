@@ -0,0 +1,141 @@
+import itertools
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from app.dataset_snapshot import load_dataset
+from app.forecast_index import ScopeIndex, normalize_category
+
+
+DEPARTMENTS = ["전자공학과", "기계공학과", "행정팀", "도서관"]
+CATEGORIES = ["노트북컴퓨터", "액정모니터", "레이저프린터"]
+QUERY_DEPARTMENTS = DEPARTMENTS + ["없는부서", "", None]
+QUERY_CATEGORIES = [None, "", "전체"] + CATEGORIES + ["없는분류"]
+
+
+def legacy_select(df: pd.DataFrame, dept_name, category, trainable_only: bool) -> pd.DataFrame:
+    """색인으로 바꾸기 전 ai_server.py의 마스크 필터링 (비교 기준)"""
+    mask = df["운용부서명"] == dept_name
+    if category and category != "전체":
+        mask &= df["물품분류명"] == category
+    if trainable_only:
+        mask &= df["학습데이터여부"] == "Y"
+    return df[mask]
+
+
+def make_frame(n_rows: int = 600, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dept = rng.choice(DEPARTMENTS, n_rows).astype(object)
+    dept[rng.random(n_rows) < 0.05] = np.nan
+    category = rng.choice(CATEGORIES, n_rows).astype(object)
+    category[rng.random(n_rows) < 0.05] = np.nan
+    trainable = rng.choice(["Y", "N"], n_rows).astype(object)
+    trainable[rng.random(n_rows) < 0.05] = np.nan
+    frame = pd.DataFrame({
+        "운용부서명": dept,
+        "물품분류명": category,
+        "학습데이터여부": trainable,
+        "취득금액": rng.uniform(0, 1e8, n_rows),
+    })
+    # 원본 순서와 다른 라벨을 붙여 행 위치/라벨 혼동을 잡아낸다.
+    frame.index = rng.permutation(n_rows) * 10
+    return frame
+
+
+class _ScopeIndexCases:
+    def make_frame(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def test_select_matches_boolean_mask_rows_and_order(self):
+        frame = self.make_frame()
+        index = ScopeIndex(frame)
+
+        for dept_name, category, trainable_only in itertools.product(QUERY_DEPARTMENTS, QUERY_CATEGORIES, (False, True)):
+            with self.subTest(dept=dept_name, category=category, trainable_only=trainable_only):
+                expected = legacy_select(frame, dept_name, category, trainable_only)
+                selected = index.select(dept_name, category, trainable_only)
+                self.assertTrue(selected.index.equals(expected.index))
+                self.assertEqual(
+                    index.positions(dept_name, category, trainable_only).tolist(),
+                    frame.index.get_indexer(expected.index).tolist(),
+                )
+
+    def test_every_non_missing_row_is_reachable(self):
+        frame = self.make_frame()
+        index = ScopeIndex(frame)
+
+        total = sum(len(index.positions(dept)) for dept in DEPARTMENTS)
+
+        self.assertEqual(total, int(frame["운용부서명"].notna().sum()))
+
+
+class TestScopeIndexObjectFrame(_ScopeIndexCases, unittest.TestCase):
+    def make_frame(self):
+        return make_frame()
+
+
+class TestScopeIndexCategoryFrame(_ScopeIndexCases, unittest.TestCase):
+    """데이터에 없는 범주(부서/분류)가 포함된 category dtype 프레임"""
+
+    def make_frame(self):
+        frame = make_frame()
+        frame["운용부서명"] = pd.Categorical(frame["운용부서명"], categories=DEPARTMENTS + ["폐지된부서"])
+        frame["물품분류명"] = pd.Categorical(frame["물품분류명"], categories=CATEGORIES + ["단종분류"])
+        frame["학습데이터여부"] = frame["학습데이터여부"].astype("category")
+        return frame
+
+    def test_unobserved_categories_are_not_indexed(self):
+        index = ScopeIndex(self.make_frame())
+
+        self.assertEqual(len(index.positions("폐지된부서")), 0)
+        self.assertEqual(len(index.positions("전자공학과", "단종분류")), 0)
+        self.assertFalse(any(key[0] == "폐지된부서" or key[1] == "단종분류" for key in index._positions))
+
+
+class TestScopeIndexSnapshotFrame(_ScopeIndexCases, unittest.TestCase):
+    """학습용 CSV 스냅샷(문자열 컬럼 -> category dtype, 메모리 매핑)에서 읽은 프레임"""
+
+    def make_frame(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        csv_path = Path(tmp.name) / "phase4_training_data.csv"
+        make_frame().reset_index(drop=True).to_csv(csv_path, index=False, encoding="utf-8")
+        load_dataset(csv_path, Path(tmp.name) / "snapshots", mmap=True)
+        frame, source = load_dataset(csv_path, Path(tmp.name) / "snapshots", mmap=True)
+        self.assertEqual(source, "snapshot")
+        self.assertIsInstance(frame["운용부서명"].dtype, pd.CategoricalDtype)
+        return frame
+
+
+class TestScopeIndexEdgeCases(unittest.TestCase):
+    def test_normalize_category(self):
+        self.assertIsNone(normalize_category(None))
+        self.assertIsNone(normalize_category(""))
+        self.assertIsNone(normalize_category("전체"))
+        self.assertEqual(normalize_category("노트북컴퓨터"), "노트북컴퓨터")
+
+    def test_frame_without_category_or_trainable_columns(self):
+        frame = pd.DataFrame({"운용부서명": ["a", "b", "a"]})
+        index = ScopeIndex(frame)
+
+        self.assertEqual(index.positions("a").tolist(), [0, 2])
+        self.assertEqual(index.positions("a", "노트북컴퓨터").tolist(), [])
+        self.assertEqual(index.positions("a", trainable_only=True).tolist(), [])
+
+    def test_empty_or_missing_frame(self):
+        for frame in (None, pd.DataFrame(), pd.DataFrame({"물품분류명": ["x"]})):
+            self.assertEqual(len(ScopeIndex(frame).positions("a")), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from fastapi.testclient import TestClient
+
+from app.tests.forecast_server import fake_completion, fixture_paths, load_forecast_server
+
+
+class _ReloadCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = load_forecast_server()
+        cls.client = TestClient(cls.server.app)
+
+    def setUp(self):
+        s = self.server
+        self.original = s.forecast_artifacts
+        self.assertTrue(self.original.available)
+        s.forecast_cache.clear()
+        s.monthly_history_cache.clear()
+
+        # 새 월별 모델 실행 폴더가 생긴 것처럼 보이도록 실행 폴더 사본을 바라보게 한다 (원본 픽스처는 그대로 둔다).
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.runs_dir = Path(self._tmp.name) / "runs"
+        shutil.copytree(fixture_paths()["runs_dir"], self.runs_dir)
+
+        for patcher in (
+            patch.object(s, "forecast_artifacts", self.original),
+            patch.object(s, "RUNS_DIR", self.runs_dir),
+            patch.dict(s.forecast_reload_status),
+            patch.object(s, "create_chat_completion", AsyncMock(return_value=fake_completion({"ai_summary_comment": "가이드"}))),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def forecast(self, dept_name: str = "부서1"):
+        return self.client.post("/api/ai/forecast", json={
+            "prompt": "다음 학기 예측",
+            "conditions": {"year": 2027, "semester": "2학기", "dept_name": dept_name, "risk_level": "Medium"},
+        })
+
+
+class TestReloadForecastArtifacts(_ReloadCase):
+    def test_in_flight_request_finishes_on_old_artifacts(self):
+        s = self.server
+        original_compute = s.compute_forecast
+        entered, release = threading.Event(), threading.Event()
+        self.addCleanup(release.set)
+        used_versions = []
+
+        def compute(cond, artifacts):
+            used_versions.append(artifacts.version)
+            if cond.dept_name == "부서1":
+                entered.set()
+                release.wait(10)
+            return original_compute(cond, artifacts)
+
+        responses = {}
+        with patch.object(s, "compute_forecast", compute):
+            in_flight = threading.Thread(target=lambda: responses.update(first=self.forecast("부서1")))
+            in_flight.start()
+            self.assertTrue(entered.wait(10))
+
+            result = s.reload_forecast_artifacts()
+            self.assertTrue(result["reloaded"])
+            self.assertEqual(result["previous_version"], self.original.version)
+            self.assertIsNot(s.forecast_artifacts, self.original)
+
+            self.assertEqual(self.forecast("부서2").status_code, 200)
+            release.set()
+            in_flight.join(10)
+
+        self.assertEqual(responses["first"].status_code, 200)
+        self.assertEqual(used_versions, [self.original.version, result["version"]])
+        self.assertNotEqual(result["version"], self.original.version)
+
+    def test_unchanged_sources_are_not_reloaded(self):
+        s = self.server
+        with patch.object(s, "RUNS_DIR", fixture_paths()["runs_dir"]):
+            result = s.reload_forecast_artifacts()
+
+        self.assertEqual(result, {"reloaded": False, "reason": "unchanged", "version": self.original.version})
+        self.assertIs(s.forecast_artifacts, self.original)
+
+    def test_failed_load_keeps_old_artifacts(self):
+        s = self.server
+        with patch.object(s, "load_forecast_artifacts", side_effect=RuntimeError("corrupt pickle")):
+            result = s.reload_forecast_artifacts()
+
+        self.assertEqual(result, {"reloaded": False, "reason": "failed"})
+        self.assertIs(s.forecast_artifacts, self.original)
+        self.assertEqual(s.forecast_reload_status["state"], "failed")
+        self.assertEqual(self.forecast().status_code, 200)
+
+    def test_unavailable_candidate_keeps_old_artifacts(self):
+        s = self.server
+        broken_model_path = Path(self._tmp.name) / "missing" / "model.pkl"
+        with patch.object(s, "resolve_life_model_paths", return_value=(broken_model_path, broken_model_path.with_name("model_meta.json"))):
+            result = s.reload_forecast_artifacts()
+            # 같은 파일로는 다시 로딩하지 않는다.
+            self.assertEqual(s.reload_forecast_artifacts()["reason"], "unchanged")
+
+        self.assertEqual(result, {"reloaded": False, "reason": "unavailable"})
+        self.assertIs(s.forecast_artifacts, self.original)
+
+    def test_swap_drops_old_version_cache_entries(self):
+        s = self.server
+        self.assertEqual(self.forecast("부서1").status_code, 200)
+        self.assertEqual(self.forecast("부서3").status_code, 200)
+        old_version = self.original.version
+        self.assertEqual({key[0] for key in s.forecast_cache.keys()}, {old_version})
+        self.assertEqual({key[0] for key in s.monthly_history_cache.keys()}, {old_version})
+
+        result = s.reload_forecast_artifacts()
+
+        self.assertTrue(result["reloaded"])
+        new_version = result["version"]
+        self.assertEqual(s.forecast_cache.keys(), [])
+        # 이전 버전에서 조회되던 범위는 새 버전으로 미리 만들어 두고, 이전 버전 항목은 남기지 않는다.
+        self.assertEqual(
+            sorted(s.monthly_history_cache.keys()),
+            [(new_version, "부서1", None), (new_version, "부서3", None)],
+        )
+
+
+class TestReloadEndpoint(_ReloadCase):
+    def reload(self, headers=None):
+        return self.client.post("/api/ai/admin/forecast/reload", headers=headers or {})
+
+    def test_disabled_without_admin_token(self):
+        with patch.object(self.server, "ADMIN_TOKEN", ""):
+            self.assertEqual(self.reload().status_code, 404)
+            self.assertEqual(self.reload({"X-Admin-Token": "anything"}).status_code, 404)
+        self.assertIs(self.server.forecast_artifacts, self.original)
+
+    def test_requires_matching_token(self):
+        with patch.object(self.server, "ADMIN_TOKEN", "secret"):
+            self.assertEqual(self.reload().status_code, 403)
+            self.assertEqual(self.reload({"X-Admin-Token": "wrong"}).status_code, 403)
+            self.assertIs(self.server.forecast_artifacts, self.original)
+
+            resp = self.reload({"X-Admin-Token": "secret"})
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.json()["data"]["reloaded"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import sys
+import unittest
+from datetime import datetime
+
+import pandas as pd
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from app.tests.forecast_server import load_forecast_server
+
+
+NO_MONTHLY_FORECAST = (None, None, None)
+
+
+def _assets(rows):
+    """(고장 예상일, 리드타임_일) 목록으로 고장 예상일이 계산된 대상 자산 프레임을 만든다."""
+    frame = pd.DataFrame(rows, columns=["고장예상일", "리드타임_일"])
+    frame["고장예상일"] = pd.to_datetime(frame["고장예상일"])
+    frame["고장예상월"] = frame["고장예상일"].dt.month
+    return frame
+
+
+class TestSummarizeScopeForecast(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = load_forecast_server()
+
+    def summarize(self, semester: str, assets: pd.DataFrame, monthly_forecast=NO_MONTHLY_FORECAST, year: int = 2027):
+        cond = self.server.PredictionConditions(year=year, semester=semester, dept_name="부서1", risk_level="Medium")
+        return self.server.summarize_scope_forecast(cond, assets, monthly_forecast)
+
+    def rop_items(self, summary: dict) -> list:
+        return [item for item in summary["time_series"] if item["is_rop"]]
+
+    def test_rop_is_month_before_monthly_forecast_peak(self):
+        month_dates = list(pd.date_range("2027-09-01", "2027-12-20", freq="MS"))
+        monthly = ({9: 1, 10: 2, 11: 6, 12: 0}, 11, month_dates)
+
+        summary = self.summarize("2학기", _assets([("2027-10-15", 20)]), monthly)
+
+        self.assertEqual((summary["peak_month"], summary["final_rop_month"]), (11, 10))
+        self.assertEqual([item["month"] for item in self.rop_items(summary)], [10])
+        self.assertEqual(self.rop_items(summary)[0]["rop_date"], "2027-10-01")
+        self.assertEqual([item["quantity"] for item in summary["time_series"][8:]], [1, 2, 6, 0])
+        self.assertTrue(all(item["quantity"] == 0 for item in summary["time_series"][:8]))
+
+    def test_deadline_subtracts_longest_lead_time_of_assets_failing_in_window(self):
+        month_dates = list(pd.date_range("2027-09-01", "2027-12-20", freq="MS"))
+        monthly = ({9: 1, 10: 2, 11: 6, 12: 0}, 11, month_dates)
+        assets = _assets([
+            ("2027-09-20", 7),
+            ("2027-11-03", 20),
+            # 분석 기간 밖에서 고장 나는 장비의 리드타임은 반영하지 않는다.
+            ("2027-08-31", 38),
+            ("2027-12-21", 38),
+        ])
+
+        summary = self.summarize("2학기", assets, monthly)
+
+        # ROP 월(10월) 시작일 2027-10-01 - 20일
+        self.assertEqual(summary["earliest_order_date"], "2027-09-11")
+        self.assertTrue(summary["has_failures"])
+
+    def test_without_monthly_model_peak_comes_from_failure_months(self):
+        assets = _assets([("2027-10-02", 7), ("2027-11-05", 38), ("2027-11-20", 20), ("2027-11-28", 7)])
+
+        summary = self.summarize("2학기", assets)
+
+        self.assertEqual((summary["peak_month"], summary["final_rop_month"]), (11, 10))
+        self.assertEqual([item["quantity"] for item in summary["time_series"][8:]], [0, 1, 3, 0])
+        # ROP 월(10월) 시작일 2027-10-01 - 38일
+        self.assertEqual(summary["earliest_order_date"], "2027-08-24")
+
+    def test_empty_window_falls_back_to_semester_start(self):
+        # 1학기는 3월 2일에 시작하므로 ROP 월(3월)의 시작일이 기간에 없고, 기간 내 고장 예상 장비도 없다.
+        summary = self.summarize("1학기", _assets([("2027-07-01", 38)]))
+
+        self.assertFalse(summary["has_failures"])
+        self.assertEqual(summary["final_rop_month"], 3)
+        self.assertEqual(summary["earliest_order_date"], "2027-03-02")
+        self.assertEqual(self.rop_items(summary)[0]["rop_date"], "2027-03-02")
+        self.assertTrue(all(item["quantity"] == 0 for item in summary["time_series"]))
+
+    def test_winter_break_rop_in_december_uses_break_start(self):
+        assets = _assets([("2027-12-24", 20), ("2027-12-26", 7), ("2028-01-10", 7)])
+
+        summary = self.summarize("겨울", assets)
+
+        self.assertEqual((summary["peak_month"], summary["final_rop_month"]), (12, 12))
+        # 12월 1일은 분석 기간(12월 21일 ~ 2월 28일) 밖이므로 시작일 2027-12-21 - 20일
+        self.assertEqual(summary["earliest_order_date"], "2027-12-01")
+
+
+class TestRecommendOrderDeadline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = load_forecast_server()
+
+    def test_uses_rop_month_start_inside_period(self):
+        deadline = self.server.recommend_order_deadline(datetime(2027, 9, 1), datetime(2027, 12, 20), 11, _assets([("2027-11-02", 38)]))
+
+        self.assertEqual(deadline, "2027-09-24")
+
+    def test_no_failing_assets_means_no_lead_time(self):
+        deadline = self.server.recommend_order_deadline(datetime(2027, 9, 1), datetime(2027, 12, 20), 11, _assets([]))
+
+        self.assertEqual(deadline, "2027-11-01")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import itertools
+import os
+import sys
+import unittest
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from app.keyword_matcher import CHAT_KEYWORDS_PATH, ChatKeywordRouter, KeywordMatcher
+
+
+# 컴파일된 매처로 바꾸기 전 ai_server.py의 if/elif + any() 라우팅 테이블 (비교 기준)
+LEGACY_ROUTES = [
+    ("manual_chapter1.json", ["취득", "취득정리구분", "취득일자", "정리일자", "자산등록"]),
+    ("manual_chapter2.json", ["운용", "라벨", "물품고유번호", "운용대장"]),
+    ("manual_chapter3.json", ["반납", "반납사유", "반납일자", "반납확정일자"]),
+    ("manual_chapter4.json", ["불용", "불용일자", "불용확정일자"]),
+    ("manual_chapter5.json", ["처분", "처분정리구분", "처분일자", "처분확정일자"]),
+    ("manual_chapter6.json", ["보유현황", "보유", "현황", "조회기준", "목록"]),
+    ("manual_chapter7.json", ["사용주기", "AI예측", "수명", "교체시기", "분석"]),
+    ("manual_chapter8.json", ["챗봇", "도움말", "사용법", "가이드"]),
+]
+LEGACY_BUTTONS = [
+    ({"label": "물품 반납 관리 바로가기", "url": "/return-management"}, ["반납"]),
+    ({"label": "불용/처분 관리 바로가기", "url": "/disposal-management"}, ["처분", "불용"]),
+    ({"label": "자산 취득 등록 바로가기", "url": "/acquisition-management"}, ["취득", "자산등록"]),
+    ({"label": "보유현황조회 바로가기", "url": "/status-inquiry"}, ["보유현황", "보유현황조회", "상태"]),
+    ({"label": "사용주기 AI 예측 바로가기", "url": "/ai-forecast"}, ["사용주기", "AI예측", "AI 예측"]),
+]
+
+
+def legacy_select_manual(query: str):
+    q = query.replace(" ", "")
+    for target, words in LEGACY_ROUTES:
+        if any(w in q for w in words):
+            return target
+    return None
+
+
+def legacy_build_action_buttons(query: str, ai_reply: str) -> list:
+    q_and_a = query + " " + ai_reply
+    action_buttons = [dict(button) for button, words in LEGACY_BUTTONS if any(w in q_and_a for w in words)]
+    unique_buttons = {btn["label"]: btn for btn in action_buttons}.values()
+    return list(unique_buttons)
+
+
+ALL_KEYWORDS = sorted({kw for _, words in LEGACY_ROUTES + LEGACY_BUTTONS for kw in words})
+
+# 키워드가 없는 질문 / 띄어쓰기로 쪼개진 키워드 / 여러 챕터 키워드가 섞인 질문 / 비슷하지만 다른 단어
+SAMPLE_QUERIES = [
+    "",
+    "안녕하세요",
+    "오늘 날씨 어때?",
+    "반 납 은 어떻게 하나요",
+    "불용 처리 후 처분은 언제 하나요",
+    "보유 현황 조회 기준이 궁금해요",
+    "AI 예측 결과로 교체 시기 분석해줘",
+    "라벨 재발급과 반납확정일자",
+    "챗봇 사용법 알려줘",
+    "물품 상태를 알고 싶어요",
+    "취 득",
+    "수명이 다 된 장비 목록",
+    "ai예측",
+    "운용대장에서 물품고유번호 찾기",
+]
+
+
+class TestChatKeywordRouterMatchesLegacyRouting(unittest.TestCase):
+    def setUp(self):
+        self.router = ChatKeywordRouter.from_file(CHAT_KEYWORDS_PATH)
+
+    def test_keyword_file_matches_legacy_tables(self):
+        self.assertEqual([(r["target"], r["keywords"]) for r in self.router.routes], LEGACY_ROUTES)
+        self.assertEqual(
+            [({"label": b["label"], "url": b["url"]}, b["keywords"]) for b in self.router.action_buttons],
+            LEGACY_BUTTONS,
+        )
+
+    def _assert_same_routing(self, query: str, ai_reply: str = ""):
+        with self.subTest(query=query, ai_reply=ai_reply):
+            self.assertEqual(self.router.select_manual(query), legacy_select_manual(query))
+            self.assertEqual(
+                self.router.build_action_buttons(query + " " + ai_reply),
+                legacy_build_action_buttons(query, ai_reply),
+            )
+
+    def test_every_keyword_alone_and_inside_a_sentence(self):
+        for keyword in ALL_KEYWORDS:
+            self._assert_same_routing(keyword)
+            self._assert_same_routing(f"{keyword} 절차를 알려주세요")
+            self._assert_same_routing(f"지난주에 {keyword}했는데 다음은?")
+            self._assert_same_routing("질문", ai_reply=f"{keyword} 메뉴를 이용하세요")
+
+    def test_every_pair_of_keywords_keeps_table_priority(self):
+        for first, second in itertools.permutations(ALL_KEYWORDS, 2):
+            self._assert_same_routing(f"{first}와 {second}")
+            self._assert_same_routing(first, ai_reply=second)
+
+    def test_sample_queries(self):
+        for query in SAMPLE_QUERIES:
+            self._assert_same_routing(query)
+            self._assert_same_routing(query, ai_reply="보유현황조회 메뉴에서 상태를 확인하세요.")
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    def test_finds_overlapping_and_nested_patterns_like_substring_search(self):
+        patterns = [("he", "he"), ("she", "she"), ("his", "his"), ("hers", "hers"), ("", "empty")]
+        matcher = KeywordMatcher(patterns)
+        texts = ["ushers", "hishe", "h", "", "shhers", "sheshis"]
+
+        for text in texts:
+            with self.subTest(text=text):
+                expected = {tag for kw, tag in patterns if kw and kw in text}
+                self.assertEqual(matcher.find_tags(text), expected)
+
+    def test_same_keyword_can_carry_several_tags(self):
+        matcher = KeywordMatcher([("반납", "route"), ("반납", "button")])
+
+        self.assertEqual(matcher.find_tags("반납 절차"), {"route", "button"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from app import manual_cache
+
+
+FILE_NAME = "manual_chapter1.json"
+
+
+class TestManualCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = Path(self._tmp.name) / FILE_NAME
+        for patcher in (
+            patch.object(manual_cache, "MANUAL_DIR", Path(self._tmp.name)),
+            patch.object(manual_cache, "MANUAL_RELOAD_CHECK_INTERVAL", 0.0),
+            patch.dict(manual_cache._MANUAL_CACHE, clear=True),
+            patch.dict(manual_cache._MANUAL_STATS, clear=True),
+            patch.dict(manual_cache._LAST_CHECKED, clear=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # 파일을 실제로 다시 읽었는지 json.load 호출 수로 확인한다.
+        load_patch = patch.object(manual_cache.json, "load", wraps=json.load)
+        self.load = load_patch.start()
+        self.addCleanup(load_patch.stop)
+
+    def write(self, data: dict, mtime_ns: int = None) -> None:
+        self.path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_unchanged_file_is_served_from_cache(self):
+        self.write({"title": "반납"})
+
+        first = manual_cache.get_manual_content(FILE_NAME)
+        second = manual_cache.get_manual_content(FILE_NAME)
+
+        self.assertEqual(json.loads(first), {"title": "반납"})
+        self.assertEqual(second, first)
+        self.assertEqual(self.load.call_count, 1)
+
+    def test_changed_mtime_reloads_chapter(self):
+        self.write({"title": "반납"}, mtime_ns=1_000_000_000)
+        manual_cache.get_manual_content(FILE_NAME)
+
+        # 크기가 같은 내용으로 바꾸고 수정 시간만 달라진 경우
+        self.write({"title": "불용"}, mtime_ns=2_000_000_000)
+
+        self.assertEqual(json.loads(manual_cache.get_manual_content(FILE_NAME)), {"title": "불용"})
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_changed_size_with_same_mtime_reloads_chapter(self):
+        self.write({"title": "반납"}, mtime_ns=1_000_000_000)
+        manual_cache.get_manual_content(FILE_NAME)
+
+        # 수정 시간 해상도 안에서 다시 쓴 경우: 수정 시간은 같고 크기만 다르다.
+        self.write({"title": "반납 절차"}, mtime_ns=1_000_000_000)
+
+        self.assertEqual(json.loads(manual_cache.get_manual_content(FILE_NAME)), {"title": "반납 절차"})
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_file_is_not_checked_again_within_interval(self):
+        self.write({"title": "반납"}, mtime_ns=1_000_000_000)
+        manual_cache.get_manual_content(FILE_NAME)
+        self.write({"title": "불용"}, mtime_ns=2_000_000_000)
+
+        with patch.object(manual_cache, "MANUAL_RELOAD_CHECK_INTERVAL", 60.0):
+            self.assertEqual(json.loads(manual_cache.get_manual_content(FILE_NAME)), {"title": "반납"})
+        self.assertEqual(json.loads(manual_cache.get_manual_content(FILE_NAME)), {"title": "불용"})
+
+    def test_invalid_json_keeps_previous_chapter(self):
+        self.write({"title": "반납"}, mtime_ns=1_000_000_000)
+        manual_cache.get_manual_content(FILE_NAME)
+        self.path.write_text("{broken", encoding="utf-8")
+
+        self.assertEqual(json.loads(manual_cache.get_manual_content(FILE_NAME)), {"title": "반납"})
+
+    def test_missing_file_returns_empty_and_reloads_when_recreated(self):
+        self.assertEqual(manual_cache.get_manual_content(FILE_NAME), "")
+
+        self.write({"title": "반납"})
+
+        self.assertEqual(json.loads(manual_cache.get_manual_content(FILE_NAME)), {"title": "반납"})
+        self.assertEqual(manual_cache.preload_manuals(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from app.message_index import MessageIndex, message_ngrams, query_ngrams
+from app.session_store import InMemorySessionStore, SQLiteSessionStore
+
+
+class TestNgrams(unittest.TestCase):
+    def test_message_ngrams_are_lowercase_unigrams_and_bigrams(self):
+        self.assertEqual(message_ngrams("AB가"), {"a", "b", "가", "ab", "b가"})
+        self.assertEqual(message_ngrams(""), set())
+
+    def test_query_ngrams_use_bigrams_unless_single_character(self):
+        self.assertEqual(query_ngrams("반"), {"반"})
+        self.assertEqual(query_ngrams("반납"), {"반납"})
+        self.assertEqual(query_ngrams("G2B"), {"g2", "2b"})
+
+
+class TestMessageIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = MessageIndex()
+        self.index.add(("t", 0), "물품 반납 절차")
+        self.index.add(("t", 1), "반출 신청")
+        self.index.add(("t", 2), "불용 처리")
+
+    def test_single_character_keyword_uses_unigram_postings(self):
+        self.assertEqual(sorted(self.index.candidates("반")), [("t", 0), ("t", 1)])
+
+    def test_multi_character_keyword_intersects_bigram_postings(self):
+        self.assertEqual(self.index.candidates("반납"), [("t", 0)])
+        self.assertEqual(self.index.candidates("처리"), [("t", 2)])
+        self.assertEqual(self.index.candidates("없는말"), [])
+
+    def test_candidates_may_contain_non_substring_matches(self):
+        # "반납"과 "납기" 2-gram이 모두 있어도 "반납기"가 들어 있지는 않다 (저장소가 부분 문자열을 최종 검증한다).
+        self.index.add(("t", 3), "납기 내 반납")
+        self.assertEqual(self.index.candidates("반납기"), [("t", 3)])
+
+    def test_removed_message_is_no_longer_a_candidate(self):
+        self.index.remove_many([(("t", 0), "물품 반납 절차"), (("t", 1), "반출 신청")])
+
+        self.assertEqual(self.index.candidates("반"), [])
+        self.assertEqual(self.index.candidates("불용"), [("t", 2)])
+
+
+class _SearchCases:
+    def make_store(self):
+        raise NotImplementedError
+
+    def test_search_is_case_insensitive_substring_match(self):
+        store = self.make_store()
+        store.append_message("t", "user", "납기 내 반납", "")
+        store.append_message("t", "user", "G2B 목록번호 조회", "")
+        store.append_message("t", "user", "ÄBC 장비 반납", "")
+        store.append_message("t", "user", "목록 번호", "")
+
+        self.assertEqual([m["content"] for m in store.search_messages("g2b")], ["G2B 목록번호 조회"])
+        self.assertEqual([m["content"] for m in store.search_messages("äbc")], ["ÄBC 장비 반납"])
+        self.assertEqual([m["content"] for m in store.search_messages("목록번호")], ["G2B 목록번호 조회"])
+        self.assertEqual(store.search_messages("반납기"), [])
+
+    def test_search_pages_in_thread_then_message_order(self):
+        store = self.make_store()
+        for tid in ("a", "b"):
+            for i in range(3):
+                store.append_message(tid, "user", f"반납 {tid}{i}", "")
+                store.append_message(tid, "assistant", "다른 답변", "")
+
+        page = store.search_messages("반납", offset=2, limit=3)
+
+        self.assertEqual([m["content"] for m in page], ["반납 a2", "반납 b0", "반납 b1"])
+        self.assertEqual(page[0]["threadId"], "a")
+        self.assertEqual(store.search_messages("반납", offset=6, limit=3), [])
+
+    def test_deleted_thread_messages_are_not_found(self):
+        store = self.make_store()
+        store.append_message("a", "user", "불용 처리", "")
+        store.append_message("b", "user", "불용 신청", "")
+
+        store.delete_thread("a")
+
+        self.assertEqual([m["threadId"] for m in store.search_messages("불용")], ["b"])
+
+
+class TestInMemorySearch(_SearchCases, unittest.TestCase):
+    def make_store(self):
+        return InMemorySessionStore()
+
+
+class TestSQLiteSearch(_SearchCases, unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self._tmp.name) / "sessions.sqlite3"
+        self._stores = []
+
+    def tearDown(self):
+        for store in self._stores:
+            store.close()
+        self._tmp.cleanup()
+
+    def make_store(self):
+        store = SQLiteSessionStore(self.db_path)
+        self._stores.append(store)
+        return store
+
+    def _gram_count(self) -> int:
+        conn = sqlite3.connect(str(self.db_path))
+        try:
+            return conn.execute("SELECT COUNT(*) FROM message_grams").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_deleting_thread_cascades_to_message_grams(self):
+        store = self.make_store()
+        store.append_message("a", "user", "불용 처리", "")
+        self.assertEqual(self._gram_count(), len(message_ngrams("불용 처리")))
+
+        store.delete_thread("a")
+
+        self.assertEqual(self._gram_count(), 0)
+
+    def test_existing_messages_are_backfilled_on_open(self):
+        store = self.make_store()
+        store.append_message("a", "user", "반납 절차", "")
+        store.append_message("a", "assistant", "반출 안내", "")
+        store._conn.execute("DELETE FROM message_grams")
+        self.assertEqual(store.search_messages("반납"), [])
+        store.close()
+        self._stores.clear()
+
+        reopened = self.make_store()
+
+        self.assertEqual(self._gram_count(), len(message_ngrams("반납 절차")) + len(message_ngrams("반출 안내")))
+        self.assertEqual([m["content"] for m in reopened.search_messages("반납")], ["반납 절차"])
+        self.assertEqual([m["content"] for m in reopened.search_messages("반")], ["반납 절차", "반출 안내"])
+
+
+if __name__ == "__main__":
+    unittest.main()
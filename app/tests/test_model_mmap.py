@@ -0,0 +1,85 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from app.model_mmap import has_tree_nodes, load_model
+
+
+def _fit(model):
+    rng = np.random.default_rng(0)
+    X = rng.random((40, 3))
+    return model.fit(X, X @ np.array([1.0, 2.0, 3.0]))
+
+
+class TestHasTreeNodes(unittest.TestCase):
+    def test_detects_sklearn_trees_in_ensembles_and_pipelines(self):
+        cases = [
+            (RandomForestRegressor(n_estimators=3, random_state=0), True),
+            (GradientBoostingRegressor(n_estimators=3, random_state=0), True),
+            (make_pipeline(StandardScaler(), RandomForestRegressor(n_estimators=2, random_state=0)), True),
+            (HistGradientBoostingRegressor(max_iter=3), False),
+            (make_pipeline(StandardScaler(), Ridge()), False),
+        ]
+        for model, expected in cases:
+            with self.subTest(model=type(model).__name__):
+                self.assertEqual(has_tree_nodes(_fit(model)), expected)
+
+
+class TestLoadModel(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        self.cache_dir = self.root / "mmap"
+        self.X = np.random.default_rng(1).random((5, 3))
+
+    def _save(self, model) -> Path:
+        path = self.root / "model.pkl"
+        joblib.dump(model, path, compress=3)
+        return path
+
+    def test_tree_ensemble_is_loaded_without_mmap_copy(self):
+        model = _fit(RandomForestRegressor(n_estimators=3, random_state=0))
+
+        loaded = load_model(self._save(model), self.cache_dir)
+
+        self.assertFalse(self.cache_dir.exists() and any(self.cache_dir.iterdir()))
+        np.testing.assert_array_equal(loaded.predict(self.X), model.predict(self.X))
+
+    def test_array_model_is_read_from_memory_mapped_copy(self):
+        model = _fit(Ridge())
+        path = self._save(model)
+
+        first = load_model(path, self.cache_dir)
+        copies = list(self.cache_dir.glob("model_*.joblib"))
+        second = load_model(path, self.cache_dir)
+
+        self.assertEqual(len(copies), 1)
+        self.assertIsInstance(second.coef_, np.memmap)
+        np.testing.assert_array_equal(first.predict(self.X), model.predict(self.X))
+        np.testing.assert_array_equal(second.predict(self.X), model.predict(self.X))
+
+    def test_without_cache_dir_reads_original(self):
+        model = _fit(Ridge())
+
+        loaded = load_model(self._save(model), None)
+
+        np.testing.assert_array_equal(loaded.coef_, model.coef_)
+
+
+if __name__ == "__main__":
+    unittest.main()
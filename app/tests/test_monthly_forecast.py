@@ -0,0 +1,95 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from ai_model.monthly_forecast import MONTHLY_BASE_FEATURES, LockstepMonthlyForecaster
+
+
+class _LinearModel:
+    """특성 행렬 @ 가중치 + 절편 (특성 순서/결측 대체가 틀리면 결과가 바로 달라진다)"""
+
+    def __init__(self, weights, intercept: float):
+        self.weights = np.asarray(weights, dtype=float)
+        self.intercept = intercept
+        self.calls = 0
+
+    def predict(self, frame: pd.DataFrame) -> np.ndarray:
+        self.calls += 1
+        return frame.to_numpy(dtype=float) @ self.weights + self.intercept
+
+
+HISTORY = [12, 15, 9, 20, 18, 14, 11, 16, 22, 19, 13, 17, 21, 10, 15]
+BASE_WEIGHTS = [0.05, 0.1, 1.0, -0.5, 0.4, 0.2, 0.1, 0.05, 0.1, 0.1, 0.05, -0.3]
+BASE_FILL = [0, 0, 0, 0, 5, 5, 5, 5, 5, 5, 5, 2.0]
+
+
+class TestLockstepMonthlyForecaster(unittest.TestCase):
+    """
+    고정값 회귀 테스트. 기대값은 이전 한 달씩 예측하던 구현(1행 DataFrame + predict 반복)으로 계산한 값이다.
+    """
+
+    def test_all_base_features_for_scopes_with_different_history_and_horizon(self):
+        model = _LinearModel(BASE_WEIGHTS, 1.0)
+        forecaster = LockstepMonthlyForecaster(model, MONTHLY_BASE_FEATURES)
+
+        results = forecaster.forecast(
+            [HISTORY, HISTORY[:4], []],
+            [[4, 5, 6, 7, 8, 9], [4, 5, 6], [1, 2]],
+            np.vstack([BASE_FILL] * 3),
+        )
+
+        expected = [
+            [17.434792, 17.704046, 18.657877, 18.91987, 18.947473, 20.401068],
+            [15.882692, 15.832179, 16.336888],
+            [5.566987, 6.49282],
+        ]
+        self.assertEqual(len(results), 3)
+        for got, want in zip(results, expected):
+            np.testing.assert_allclose(got, want, atol=1e-6)
+        # 범위 수와 무관하게 예측 단계(최대 6)마다 predict를 한 번만 호출한다.
+        self.assertEqual(model.calls, 6)
+
+    def test_feature_subset_in_training_order(self):
+        features = ["lag_12", "month_sin", "lag_1", "rolling_std_6"]
+        forecaster = LockstepMonthlyForecaster(_LinearModel([0.5, 2.0, 0.5, 1.0], -2.0), features)
+
+        results = forecaster.forecast(
+            [HISTORY, HISTORY[:5]],
+            [[11, 12, 1, 2], [11, 12, 1, 2]],
+            np.array([[8.0, 0.0, 8.0, 1.5]] * 2),
+        )
+
+        np.testing.assert_allclose(results[0], [18.520779, 20.209811, 20.144796, 19.550092], atol=1e-6)
+        np.testing.assert_allclose(results[1], [11.5, 11.942255, 13.169642, 14.51565], atol=1e-6)
+
+    def test_unknown_feature_uses_fill_value(self):
+        forecaster = LockstepMonthlyForecaster(_LinearModel([1.0, 1.0], 0.0), ["lag_1", "year"])
+
+        results = forecaster.forecast([[3.0]], [[1, 2]], np.array([[0.0, 100.0]]))
+
+        np.testing.assert_allclose(results[0], [103.0, 203.0])
+
+    def test_negative_predictions_are_clipped_and_fed_back_as_zero(self):
+        forecaster = LockstepMonthlyForecaster(_LinearModel([1.0], -5.0), ["lag_1"])
+
+        results = forecaster.forecast([[3.0]], [[1, 2, 3]], np.array([[0.0]]))
+
+        np.testing.assert_allclose(results[0], [0.0, 0.0, 0.0])
+
+    def test_no_scopes_or_zero_horizon(self):
+        forecaster = LockstepMonthlyForecaster(_LinearModel([1.0], 0.0), ["lag_1"])
+
+        self.assertEqual(forecaster.forecast([], [], np.empty((0, 1))), [])
+        self.assertEqual(len(forecaster.forecast([[1.0]], [[]], np.array([[0.0]]))[0]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+import copy
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from app.rul_table import RULTable, artifact_version, load_or_build_rul_table
+
+
+class _Scorer:
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=float)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.values
+
+
+class TestArtifactVersion(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = Path(self._tmp.name) / "model.pkl"
+        self.path.write_bytes(b"model")
+
+    def test_changes_with_mtime_size_and_extra(self):
+        base = artifact_version([self.path], extra=["a", "b"])
+        self.assertEqual(artifact_version([self.path], extra=["a", "b"]), base)
+        self.assertNotEqual(artifact_version([self.path], extra=["b", "a"]), base)
+
+        stat = self.path.stat()
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        touched = artifact_version([self.path], extra=["a", "b"])
+        self.assertNotEqual(touched, base)
+
+        self.path.write_bytes(b"model v2")
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertNotEqual(artifact_version([self.path], extra=["a", "b"]), touched)
+
+    def test_missing_and_none_paths(self):
+        missing = Path(self._tmp.name) / "missing.pkl"
+
+        self.assertEqual(artifact_version([missing, None]), artifact_version([missing, None]))
+        self.assertNotEqual(artifact_version([missing]), artifact_version([None]))
+
+
+class TestLoadOrBuildRULTable(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.cache_dir = Path(self._tmp.name)
+
+    def test_builds_once_per_version_and_reuses_saved_table(self):
+        scorer = _Scorer([10.0, 20.0, 30.0])
+        for mmap in (False, True):
+            with self.subTest(mmap=mmap):
+                table = load_or_build_rul_table("v1", 3, scorer, self.cache_dir, mmap=mmap)
+                self.assertEqual(table.version, "v1")
+                self.assertEqual(table.take(np.array([2, 0])).tolist(), [30.0, 10.0])
+        self.assertEqual(scorer.calls, 1)
+        self.assertTrue((self.cache_dir / "rul_v1.npy").exists())
+
+    def test_new_version_is_rebuilt_and_old_table_removed(self):
+        load_or_build_rul_table("v1", 2, _Scorer([1.0, 2.0]), self.cache_dir)
+        scorer = _Scorer([3.0, 4.0])
+
+        table = load_or_build_rul_table("v2", 2, scorer, self.cache_dir)
+
+        self.assertEqual(scorer.calls, 1)
+        self.assertEqual(table.take(np.arange(2)).tolist(), [3.0, 4.0])
+        self.assertEqual(sorted(p.name for p in self.cache_dir.glob("rul_*.npy")), ["rul_v2.npy"])
+
+    def test_saved_table_with_wrong_row_count_is_rebuilt(self):
+        load_or_build_rul_table("v1", 2, _Scorer([1.0, 2.0]), self.cache_dir)
+        scorer = _Scorer([5.0, 6.0, 7.0])
+
+        table = load_or_build_rul_table("v1", 3, scorer, self.cache_dir)
+
+        self.assertEqual(scorer.calls, 1)
+        self.assertEqual(len(table), 3)
+
+    def test_scorer_with_wrong_row_count_raises(self):
+        with self.assertRaises(ValueError):
+            load_or_build_rul_table("v1", 3, _Scorer([1.0]), self.cache_dir)
+
+    def test_without_cache_dir(self):
+        table = load_or_build_rul_table("v1", 2, _Scorer([1.0, 2.0]))
+
+        self.assertIsInstance(table, RULTable)
+        self.assertEqual(len(table), 2)
+
+
+class TestForecastRULTable(unittest.TestCase):
+    """서버 예측 묶음의 RUL 테이블과 직접 예측 비교"""
+
+    @classmethod
+    def setUpClass(cls):
+        from app.tests.forecast_server import load_forecast_server
+
+        cls.server = load_forecast_server()
+
+    def setUp(self):
+        self.artifacts = self.server.forecast_artifacts
+        self.assertTrue(self.artifacts.rul_table_ready)
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        # 공용 픽스처의 테이블 파일이 정리되지 않도록 테이블 저장 위치를 임시 폴더로 바꾼다.
+        patcher = patch.object(self.server, "RUL_TABLE_DIR", Path(self._tmp.name) / "rul_tables")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def direct_predict(self, artifacts, positions):
+        s = self.server
+        target_df = s.add_derived_features(artifacts.df.iloc[positions].copy())
+        return artifacts.rf_model.predict(s.build_model_input(target_df, artifacts))
+
+    def scopes(self):
+        index = self.artifacts.scope_index
+        return [
+            index.positions("부서1"),
+            index.positions("부서2", "노트북컴퓨터"),
+            index.positions("부서5", "전체"),
+            np.arange(len(self.artifacts.df)),
+        ]
+
+    def test_table_equals_direct_model_prediction(self):
+        for positions in self.scopes():
+            self.assertGreater(len(positions), 0)
+            np.testing.assert_array_equal(self.artifacts.rul_table.take(positions), self.direct_predict(self.artifacts, positions))
+
+    def test_predict_asset_life_falls_back_until_table_is_ready(self):
+        s = self.server
+        positions = self.scopes()[1]
+        target_df = s.add_derived_features(self.artifacts.df.iloc[positions].copy())
+        expected = self.direct_predict(self.artifacts, positions)
+
+        not_ready = copy.copy(self.artifacts)
+        not_ready.rul_table = None
+        np.testing.assert_array_equal(s.predict_asset_life(target_df, positions, not_ready), expected)
+
+        # 다른 버전용 테이블은 쓰지 않는다.
+        stale = copy.copy(self.artifacts)
+        stale.rul_table = RULTable("stale-version", np.full(len(self.artifacts.df), -1.0))
+        self.assertFalse(stale.rul_table_ready)
+        np.testing.assert_array_equal(s.predict_asset_life(target_df, positions, stale), expected)
+
+        with patch.object(self.artifacts.rf_model, "predict", side_effect=AssertionError("테이블이 있으면 직접 예측하지 않는다")):
+            np.testing.assert_array_equal(s.predict_asset_life(target_df, positions, self.artifacts), expected)
+
+    def make_artifacts(self, model_path: Path, csv_path: Path):
+        s = self.server
+        original = self.artifacts
+        return s.ForecastArtifacts(
+            rf_model=original.rf_model,
+            model_meta=original.model_meta,
+            model_features=original.model_features,
+            model_path=model_path,
+            monthly_model=original.monthly_model,
+            monthly_features=original.monthly_features,
+            monthly_model_path=original.monthly_model_path,
+            df=original.df,
+            scope_index=original.scope_index,
+            csv_path=csv_path,
+        )
+
+    def test_table_is_rebuilt_when_model_or_data_version_changes(self):
+        s = self.server
+        root = Path(self._tmp.name)
+        model_path = root / "model.pkl"
+        csv_path = root / "data.csv"
+        shutil.copy(self.artifacts.model_path, model_path)
+        shutil.copy(self.artifacts.csv_path, csv_path)
+        builds = []
+        original_score = s.score_all_assets
+
+        def score(artifacts):
+            builds.append(artifacts.rul_table_version)
+            return original_score(artifacts)
+
+        def bump_mtime(path: Path):
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        with patch.object(s, "score_all_assets", score):
+            first = self.make_artifacts(model_path, csv_path)
+            s.prepare_rul_table(first)
+            # 같은 버전이면 저장된 테이블을 다시 읽는다.
+            s.prepare_rul_table(self.make_artifacts(model_path, csv_path))
+
+            bump_mtime(model_path)
+            model_changed = self.make_artifacts(model_path, csv_path)
+            s.prepare_rul_table(model_changed)
+
+            bump_mtime(csv_path)
+            data_changed = self.make_artifacts(model_path, csv_path)
+            s.prepare_rul_table(data_changed)
+
+        self.assertEqual(builds, [first.rul_table_version, model_changed.rul_table_version, data_changed.rul_table_version])
+        self.assertEqual(len(set(builds)), 3)
+        for artifacts in (first, model_changed, data_changed):
+            self.assertTrue(artifacts.rul_table_ready)
+            np.testing.assert_array_equal(artifacts.rul_table.take(np.arange(len(artifacts.df))), self.artifacts.rul_table.take(np.arange(len(artifacts.df))))
+        self.assertEqual([p.name for p in s.RUL_TABLE_DIR.glob("rul_*.npy")], [f"rul_{data_changed.rul_table_version}.npy"])
+
+
+if __name__ == "__main__":
+    unittest.main()
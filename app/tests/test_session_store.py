@@ -0,0 +1,182 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from app.session_store import InMemorySessionStore, SQLiteSessionStore, create_session_store
+
+
+class _SessionStoreCases:
+    """두 저장소 구현이 같은 동작을 하는지 확인하는 공통 테스트 (make_store만 구현별로 다르다)."""
+
+    def make_store(self, **kwargs):
+        raise NotImplementedError
+
+    def test_list_threads_pages_in_creation_order(self):
+        store = self.make_store()
+        for i in range(5):
+            store.ensure_thread(f"t{i}", title=f"제목{i}")
+
+        self.assertEqual([t["threadId"] for t in store.list_threads()], ["t0", "t1", "t2", "t3", "t4"])
+        self.assertEqual([t["threadId"] for t in store.list_threads(offset=1, limit=2)], ["t1", "t2"])
+        self.assertEqual([t["threadId"] for t in store.list_threads(offset=4, limit=10)], ["t4"])
+        self.assertEqual(store.list_threads(offset=5, limit=2), [])
+
+    def test_list_all_messages_pages_across_threads(self):
+        store = self.make_store()
+        for tid in ("a", "b"):
+            for i in range(3):
+                store.append_message(tid, "user", f"{tid}-{i}", "2024-01-01T00:00:00")
+
+        contents = [m["content"] for m in store.list_all_messages(offset=2, limit=3)]
+
+        self.assertEqual(contents, ["a-2", "b-0", "b-1"])
+        self.assertEqual(len(store.list_all_messages()), 6)
+
+    def test_list_forecasts_pages_newest_first(self):
+        store = self.make_store()
+        for i in range(4):
+            store.save_forecast(f"f{i}", {"title": None, "prompt": f"p{i}", "created_at": "", "data": {"i": i}})
+
+        self.assertEqual([f["forecastId"] for f in store.list_forecasts(offset=1, limit=2)], ["f2", "f1"])
+        self.assertEqual(store.get_forecast("f3")["data"], {"i": 3})
+
+    def test_forecasts_over_limit_drop_oldest(self):
+        store = self.make_store(max_forecasts=2)
+        for i in range(3):
+            store.save_forecast(f"f{i}", {"title": None, "prompt": "", "created_at": "", "data": {}})
+
+        self.assertEqual([f["forecastId"] for f in store.list_forecasts()], ["f2", "f1"])
+        self.assertIsNone(store.get_forecast("f0"))
+
+    def test_evict_idle_threads_drops_only_expired_threads(self):
+        store = self.make_store(thread_idle_ttl=60)
+        with patch("app.session_store.time.time", return_value=1000.0):
+            store.ensure_thread("old")
+            store.append_message("old", "user", "오래된 질문", "")
+        with patch("app.session_store.time.time", return_value=1050.0):
+            store.ensure_thread("recent")
+
+        with patch("app.session_store.time.time", return_value=1070.0):
+            evicted = store.evict_idle_threads()
+
+        self.assertEqual(evicted, 1)
+        self.assertFalse(store.has_thread("old"))
+        self.assertTrue(store.has_thread("recent"))
+        self.assertEqual(store.search_messages("오래된"), [])
+
+    def test_access_refreshes_idle_ttl(self):
+        store = self.make_store(thread_idle_ttl=60)
+        with patch("app.session_store.time.time", return_value=1000.0):
+            store.ensure_thread("t")
+        with patch("app.session_store.time.time", return_value=1050.0):
+            store.get_messages("t")
+
+        with patch("app.session_store.time.time", return_value=1100.0):
+            self.assertEqual(store.evict_idle_threads(), 0)
+        self.assertTrue(store.has_thread("t"))
+
+    def test_thread_limit_drops_least_recently_used(self):
+        store = self.make_store(max_threads=2)
+        with patch("app.session_store.time.time", return_value=1000.0):
+            store.ensure_thread("a")
+        with patch("app.session_store.time.time", return_value=1001.0):
+            store.ensure_thread("b")
+        with patch("app.session_store.time.time", return_value=1002.0):
+            store.rename_thread("a", "다시 사용")
+        with patch("app.session_store.time.time", return_value=1003.0):
+            store.ensure_thread("c")
+
+        self.assertEqual([t["threadId"] for t in store.list_threads()], ["a", "c"])
+
+    def test_summary_round_trip(self):
+        store = self.make_store()
+        store.ensure_thread("t")
+        self.assertEqual(store.get_summary("t"), ("", 0))
+
+        store.set_summary("t", "요약", 4)
+
+        self.assertEqual(store.get_summary("t"), ("요약", 4))
+        self.assertEqual(store.get_summary("missing"), ("", 0))
+
+
+class TestInMemorySessionStore(_SessionStoreCases, unittest.TestCase):
+    def make_store(self, **kwargs):
+        return InMemorySessionStore(**kwargs)
+
+
+class TestSQLiteSessionStore(_SessionStoreCases, unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self._tmp.name) / "sessions.sqlite3"
+        self._stores = []
+
+    def tearDown(self):
+        for store in self._stores:
+            store.close()
+        self._tmp.cleanup()
+
+    def make_store(self, **kwargs):
+        store = SQLiteSessionStore(self.db_path, **kwargs)
+        self._stores.append(store)
+        return store
+
+    def test_data_survives_reopen(self):
+        store = self.make_store()
+        store.append_message("t", "user", "반납 절차", "2024-01-01T00:00:00")
+        store.set_summary("t", "요약", 1)
+        store.close()
+        self._stores.clear()
+
+        reopened = self.make_store()
+
+        self.assertEqual(reopened.get_messages("t")[0]["content"], "반납 절차")
+        self.assertEqual(reopened.get_summary("t"), ("요약", 1))
+
+    def test_migrates_threads_table_without_summary_columns(self):
+        conn = sqlite3.connect(str(self.db_path))
+        conn.executescript(
+            """
+            CREATE TABLE threads (thread_id TEXT PRIMARY KEY, title TEXT NOT NULL, last_access REAL NOT NULL);
+            CREATE TABLE messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                thread_id TEXT NOT NULL REFERENCES threads(thread_id) ON DELETE CASCADE,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at TEXT
+            );
+            """
+        )
+        conn.execute("INSERT INTO threads VALUES ('old', '기존 채팅', 9999999999)")
+        conn.execute("INSERT INTO messages (thread_id, role, content, created_at) VALUES ('old', 'user', '불용 신청', '')")
+        conn.commit()
+        conn.close()
+
+        store = self.make_store()
+
+        self.assertEqual(store.get_summary("old"), ("", 0))
+        store.set_summary("old", "요약", 1)
+        self.assertEqual(store.get_summary("old"), ("요약", 1))
+        self.assertEqual(store.list_threads(), [{"threadId": "old", "title": "기존 채팅"}])
+        self.assertEqual([m["content"] for m in store.search_messages("불용")], ["불용 신청"])
+
+
+class TestCreateSessionStore(unittest.TestCase):
+    def test_unknown_backend_raises(self):
+        with self.assertRaises(ValueError):
+            create_session_store("redis", Path("unused.sqlite3"))
+
+    def test_memory_backend(self):
+        self.assertIsInstance(create_session_store("memory", Path("unused.sqlite3")), InMemorySessionStore)
+
+
+if __name__ == "__main__":
+    unittest.main()